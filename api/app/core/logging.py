@@ -1,58 +1,172 @@
 """
 Logging configuration for structured logging
+
+Log calls on the request path only build a LogRecord and put it on a queue;
+a QueueListener thread formats (JSON via orjson) and writes it to stdout, so
+neither formatting nor stdout I/O blocks the event loop. The request ID is
+captured when the record is queued, since the listener thread has no request
+context.
+
+Hot INFO lines (e.g. "Retrieved N items" on every list call) are logged on
+dedicated `<module>.reads` loggers and can be sampled per logger with
+LOG_SAMPLE_RATES. Use %-style arguments rather than f-strings so messages are
+only interpolated for records that are actually emitted.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-import json
-from datetime import datetime
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+
 from .config import settings
+from app.core.tracing import current_trace_id
+from app.middleware.request_id import get_request_id
+
+# Fields that are the same on every record
+STATIC_FIELDS: Dict[str, Any] = {
+    "service": "snakr-api",
+    "environment": settings.ENVIRONMENT,
+}
+
+# Distinct message templates tracked per sampling filter
+MAX_SAMPLED_TEMPLATES = 1000
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_root_handler: Optional[logging.Handler] = None
 
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
-    
+
+    def __init__(self):
+        super().__init__()
+        # strftime is only needed once per second of log output
+        self._second: Optional[int] = None
+        self._second_prefix = ""
+
+    def format_timestamp(self, created: float) -> str:
+        """Format a record's creation time as ISO 8601 UTC"""
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_prefix}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
-        # Import here to avoid circular dependency
-        from app.middleware.request_id import get_request_id
-        
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
+            **STATIC_FIELDS,
         }
-        
-        # Add request ID if available
-        request_id = get_request_id()
+
+        # Add request ID if available (captured at log time when queued)
+        request_id = getattr(record, "request_id", None)
+        if request_id is None:
+            request_id = get_request_id()
         if request_id:
             log_data["request_id"] = request_id
-        
+
+        # Join logs to traces (see app.core.tracing)
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id is None:
+            trace_id = current_trace_id()
+        if trace_id:
+            log_data["trace_id"] = trace_id
+
+        # Sampled records stand for 1 / sample_rate occurrences
+        sample_rate = getattr(record, "sample_rate", None)
+        if sample_rate is not None:
+            log_data["sample_rate"] = sample_rate
+
         # Add extra fields if present
         if hasattr(record, "extra"):
             log_data.update(record.extra)
-        
+
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
-            log_data["stack_trace"] = self.formatException(record.exc_info)
-        
-        return json.dumps(log_data)
+            log_data["stack_trace"] = log_data["exception"]
+
+        return orjson.dumps(log_data, default=str).decode()
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that captures request context and defers formatting
+
+    Unlike the stdlib QueueHandler, records are queued as-is (the queue is
+    in-process), so message interpolation and traceback formatting happen on
+    the listener thread. Don't pass log arguments you mutate afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Attach the request and trace IDs while still in the request's context"""
+        record.request_id = get_request_id()
+        record.trace_id = current_trace_id()
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep 1 in every N INFO/DEBUG records per message template
+
+    Warnings and errors always pass. Counting per template (record.msg, not
+    the interpolated message) keeps rare lines on the same logger visible:
+    the first occurrence of each template is always logged.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts: Dict[Any, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record is emitted"""
+        if record.levelno > logging.INFO:
+            return True
+        if not self.every:
+            return False
+
+        if len(self._counts) > MAX_SAMPLED_TEMPLATES:
+            self._counts.clear()
+        count = self._counts.get(record.msg, 0)
+        self._counts[record.msg] = count + 1
+
+        if count % self.every:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logging() -> None:
     """Configure application logging"""
-    
+    global _listener, _root_handler
+
     # Get log level from settings
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
-    
+
     # Create handler
     handler = logging.StreamHandler(sys.stdout)
-    
+
     # Set formatter based on configuration
     if settings.LOG_FORMAT == "json":
         formatter = JSONFormatter()
@@ -60,15 +174,38 @@ def setup_logging() -> None:
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
-    
+
     handler.setFormatter(formatter)
-    
-    # Configure root logger
+
+    # Configure root logger (replacing the handler from any earlier setup)
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(handler)
-    
+    stop_logging()
+    if _root_handler is not None:
+        root_logger.removeHandler(_root_handler)
+
+    if settings.LOG_ASYNC:
+        # Unbounded in-process queue; the listener thread does format + write
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _root_handler = ContextQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        _root_handler = handler
+    root_logger.addHandler(_root_handler)
+
+    # Per-logger sampling of hot INFO lines
+    for name, rate in settings.get_log_sample_rates().items():
+        sampled_logger = logging.getLogger(name)
+        for existing in [f for f in sampled_logger.filters if isinstance(f, SamplingFilter)]:
+            sampled_logger.removeFilter(existing)
+        if rate < 1:
+            sampled_logger.addFilter(SamplingFilter(rate))
+
     # Set specific log levels for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+
+
+atexit.register(stop_logging)
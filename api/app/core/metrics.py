@@ -0,0 +1,330 @@
+"""
+Prometheus metrics
+
+Exposed at GET /metrics (see app.routes.health). Everything here is cheap
+enough to stay on in production:
+
+- HTTP: MetricsMiddleware observes one histogram per request, labelled by
+  route template (/api/v1/households/{household_id}/items, never the raw
+  path), plus an in-flight gauge. Label children are cached per
+  (method, route, status), so a request costs two dict lookups and a few
+  lock-protected additions.
+- DB: service methods that query the database are wrapped with `db_call`,
+  which observes duration and counts errors per method (label children are
+  bound once, at decoration time). Cache loaders are wrapped, so the counts
+  are real database calls, not cache hits.
+- Cache, change feed: read from the existing counters at scrape time, so the
+  hot path pays nothing.
+- Rate limiting: rejections counted per route in the 429 handler.
+- Celery: queue depth is read from the broker at scrape time; task duration
+  is recorded in the worker (`instrument_celery`) and served from the
+  worker's own metrics port.
+
+The API runs one process per container, so the default registry is used. The
+Celery worker forks, so it uses prometheus_client's multiprocess mode when
+PROMETHEUS_MULTIPROC_DIR is set.
+"""
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+import functools
+import logging
+import os
+import re
+import time
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.errors import SNAKrException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds; tuned for API latencies (PostgREST round-trips are 5-50ms)
+LATENCY_BUCKETS = (0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Celery queues (see celery_app.task_routes)
+CELERY_QUEUES = ("receipts", "inventory", "maintenance")
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "snakr_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "snakr_http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+DB_CALL_DURATION = Histogram(
+    "snakr_db_call_duration_seconds",
+    "Database call latency by service method",
+    ["method"],
+    buckets=LATENCY_BUCKETS
+)
+DB_CALL_ERRORS = Counter(
+    "snakr_db_call_errors_total",
+    "Database calls that raised an unexpected error, by service method",
+    ["method"]
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "snakr_rate_limit_rejections_total",
+    "Requests rejected by the rate limiter, by route template",
+    ["route"]
+)
+CELERY_QUEUE_LENGTH = Gauge(
+    "snakr_celery_queue_length",
+    "Tasks waiting in each Celery queue",
+    ["queue"]
+)
+CELERY_TASK_DURATION = Histogram(
+    "snakr_celery_task_duration_seconds",
+    "Celery task run time by task and final state",
+    ["task", "state"],
+    buckets=TASK_BUCKETS
+)
+
+
+# Per-request DB time by method ([calls, seconds]), collected only while a
+# request has set it (the slow-request log, app.core.profiling)
+db_time_var: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("db_time", default=None)
+
+
+PATH_PARAM = re.compile(r"{(\w+)}")
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Route template the router matched (set once routing has run), e.g.
+    /api/v1/households/{household_id}
+
+    The matched route's template may be relative to its router's prefix, so
+    the prefix is recovered from the request path.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return UNMATCHED_ROUTE
+
+    params = scope.get("path_params") or {}
+    rendered = PATH_PARAM.sub(lambda m: str(params.get(m.group(1), m.group(0))), path_format)
+    path = scope.get("path", "")
+    if rendered and path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + path_format
+    return path_format
+
+
+class MetricsMiddleware:
+    """
+    Record latency per route template and requests in flight
+
+    Plain ASGI, like RequestIDMiddleware. The route is read from the scope
+    after the app has run, since routing happens further down the stack.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # (method, route, status) -> histogram child
+        self._children: Dict[Tuple[str, str, int], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            key = (scope["method"], route_template(scope), status_code)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_REQUEST_DURATION.labels(*key)
+            child.observe(time.perf_counter() - start)
+
+
+def db_call(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Record duration and errors of an async service method that queries the
+    database, labelled with its qualified name (e.g. ItemService.create_item)
+
+    Application errors (SNAKrException, e.g. not found or not a member) are
+    outcomes, not failures, and aren't counted as errors. Durations are also
+    added to the request's db_time_var, if set.
+    """
+    name = func.__qualname__
+    duration = DB_CALL_DURATION.labels(name)
+    errors = DB_CALL_ERRORS.labels(name)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except SNAKrException:
+            raise
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            duration.observe(elapsed)
+            request_db_time = db_time_var.get()
+            if request_db_time is not None:
+                totals = request_db_time.setdefault(name, [0, 0.0])
+                totals[0] += 1
+                totals[1] += elapsed
+
+    return wrapper
+
+
+class ServiceStatsCollector:
+    """Export cache and change feed counters at scrape time"""
+
+    def collect(self) -> Iterator[Any]:
+        from app.services.cache import get_household_cache
+        from app.services.change_feed import get_change_feed
+
+        cache = get_household_cache().stats()
+        hits = CounterMetricFamily(
+            "snakr_cache_hits", "Household cache hits by tier", labels=["tier"]
+        )
+        hits.add_metric(["local"], cache["hits_local"])
+        hits.add_metric(["redis"], cache["hits_redis"])
+        yield hits
+        for name, doc in (
+            ("misses", "Household cache misses (loads)"),
+            ("coalesced", "Household cache misses that awaited an in-flight load"),
+            ("invalidations", "Household cache invalidations"),
+            ("errors", "Household cache Redis errors"),
+        ):
+            yield CounterMetricFamily(f"snakr_cache_{name}", doc, value=cache[name])
+        yield GaugeMetricFamily("snakr_cache_entries", "Entries in the local cache tier", value=cache["entries"])
+
+        feed = get_change_feed().stats()
+        yield GaugeMetricFamily(
+            "snakr_change_feed_connected", "1 if the change feed is listening", value=int(feed["connected"])
+        )
+        yield CounterMetricFamily(
+            "snakr_change_feed_notifications", "Household change notifications received", value=feed["notifications"]
+        )
+        yield GaugeMetricFamily(
+            "snakr_change_feed_subscribers", "Open household change streams", value=feed["subscribers"]
+        )
+
+
+_broker = None
+_service_stats: Optional[ServiceStatsCollector] = None
+
+
+async def render_metrics() -> bytes:
+    """
+    Collect all API metrics in the Prometheus text format
+
+    Returns:
+        Exposition text (CONTENT_TYPE_LATEST)
+    """
+    global _service_stats
+    if _service_stats is None:
+        # Registered on first scrape so the Celery worker, which imports this
+        # module for its task metrics, doesn't export empty API stats
+        _service_stats = ServiceStatsCollector()
+        REGISTRY.register(_service_stats)
+
+    await update_celery_queue_lengths()
+    return generate_latest(REGISTRY)
+
+
+async def update_celery_queue_lengths() -> None:
+    """
+    Read Celery queue depths from the broker into CELERY_QUEUE_LENGTH
+
+    Called before each scrape. Skipped when no broker is configured; a broker
+    error leaves the previous values and is logged.
+    """
+    global _broker
+    if not settings.CELERY_BROKER_URL:
+        return
+    try:
+        if _broker is None:
+            import redis.asyncio as aioredis
+
+            _broker = aioredis.from_url(
+                settings.CELERY_BROKER_URL,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5
+            )
+        # Kombu's Redis transport keeps each queue as a list named after it
+        async with _broker.pipeline(transaction=False) as pipe:
+            for queue in CELERY_QUEUES:
+                pipe.llen(queue)
+            lengths = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to read Celery queue lengths: {e}")
+        return
+
+    for queue, length in zip(CELERY_QUEUES, lengths):
+        CELERY_QUEUE_LENGTH.labels(queue).set(length)
+
+
+def instrument_celery(celery_app) -> None:
+    """
+    Record task durations in a Celery worker and serve them on
+    CELERY_METRICS_PORT once the worker is ready
+
+    With the prefork pool, tasks run in child processes: set
+    PROMETHEUS_MULTIPROC_DIR (an empty, writable directory) so the children's
+    metrics are aggregated.
+
+    Args:
+        celery_app: Celery application
+    """
+    from celery import signals
+
+    started: Dict[str, float] = {}
+
+    @signals.task_prerun.connect(weak=False)
+    def on_task_prerun(task_id=None, **kwargs):
+        started[task_id] = time.perf_counter()
+
+    @signals.task_postrun.connect(weak=False)
+    def on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None:
+            CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
+    @signals.worker_ready.connect(weak=False)
+    def on_worker_ready(**kwargs):
+        from prometheus_client import CollectorRegistry, start_http_server
+
+        registry = REGISTRY
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        start_http_server(settings.CELERY_METRICS_PORT, registry=registry)
+        logger.info(f"Celery metrics on port {settings.CELERY_METRICS_PORT}")
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def on_worker_process_shutdown(pid=None, **kwargs):
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            from prometheus_client import multiprocess
+
+            multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,357 @@
+"""
+On-demand profiling and slow-request sampling
+
+Two tools for finding where production requests spend their time, both off
+by default and costing nothing when off (ProfilingMiddleware isn't
+installed and no thread runs):
+
+- Sampling profiler (PROFILING_ENABLED): an admin starts a session through
+  /api/v1/admin/profiler for N seconds, optionally only for requests whose
+  path matches a pattern. A background thread samples the event loop
+  thread's stack every PROFILING_SAMPLE_INTERVAL and counts stacks; the
+  result is served as a top-functions table or as folded stacks for
+  flamegraph.pl / speedscope. With a route pattern, a sample is kept only
+  when the task running on the loop belongs to a matching request.
+- Slow-request log (SLOW_REQUEST_MS): a watchdog thread takes one stack
+  sample of any request still running past the threshold, and when the
+  request finishes it is logged with its request ID, the sample and the time
+  spent in each `db_call` service method.
+
+A request blocking the event loop (e.g. a synchronous Supabase call) is
+sampled from the loop thread's real stack; a request awaiting something is
+sampled from its coroutine chain.
+
+Both are per worker process: with several workers, a profiling session only
+sees the worker that received the start request.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import db_time_var
+from app.middleware.request_id import get_request_id
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per sample, innermost last
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(code) -> str:
+    """Function name and short location of a code object"""
+    path = code.co_filename
+    parent, name = os.path.split(path)
+    return f"{code.co_name} ({os.path.basename(parent)}/{name}:{code.co_firstlineno})"
+
+
+def _thread_stack(frame) -> List[str]:
+    """Labels of a thread's frames, outermost first"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _coroutine_stack(coro) -> List[str]:
+    """Labels of a suspended coroutine chain (what a task is awaiting), outermost first"""
+    labels = []
+    while coro is not None and len(labels) < MAX_STACK_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(f"{_frame_label(frame.f_code)}:{frame.f_lineno}")
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+@dataclass
+class ProfileSession:
+    """One profiling run and its collected stacks"""
+    seconds: float
+    route: Optional[str]
+    interval: float
+    started_at: float = field(default_factory=time.time)
+    stopped_at: Optional[float] = None
+    samples: int = 0
+    idle: int = 0  # loop waiting, or running a non-matching request
+    stacks: Counter = field(default_factory=Counter)
+    # Tasks of in-flight requests matching `route`
+    tasks: Set[asyncio.Task] = field(default_factory=set)
+    requests: int = 0
+    # Guards stacks and samples: the sampler thread writes them while a
+    # request reads them
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self.stopped_at is None
+
+    def matches(self, path: str) -> bool:
+        return self.route is None or fnmatchcase(path, self.route)
+
+    def snapshot(self) -> Tuple[Counter, int]:
+        """Copy of the stacks and sample count, safe while the sampler runs"""
+        with self.lock:
+            return Counter(self.stacks), self.samples
+
+    def top(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """Functions by samples spent in them (self) and under them (total)"""
+        stacks, samples = self.snapshot()
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        return [
+            {
+                "function": label,
+                "self": round(count / samples, 4) if samples else 0.0,
+                "total": round(total[label] / samples, 4) if samples else 0.0,
+            }
+            for label, count in own.most_common(limit)
+        ]
+
+    def folded(self) -> str:
+        """Stacks in the folded format ("outer;inner count" per line)"""
+        stacks, _ = self.snapshot()
+        return "\n".join(
+            f"{';'.join(stack)} {count}" for stack, count in stacks.most_common()
+        )
+
+    def summary(self, limit: int = 25) -> Dict[str, Any]:
+        end = self.stopped_at or time.time()
+        return {
+            "running": self.running,
+            "route": self.route,
+            "seconds": self.seconds,
+            "elapsed": round(end - self.started_at, 3),
+            "interval": self.interval,
+            "samples": self.samples,
+            "idle_samples": self.idle,
+            "requests": self.requests,
+            "top": self.top(limit),
+        }
+
+
+class Profiler:
+    """
+    Sampling profiler for the event loop thread
+
+    One session at a time; the last session's results are kept until the
+    next one starts.
+    """
+
+    def __init__(self):
+        self.session: Optional[ProfileSession] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, seconds: float, route: Optional[str] = None) -> ProfileSession:
+        """
+        Start sampling; must be called from the event loop thread
+
+        Args:
+            seconds: How long to sample (capped at PROFILING_MAX_SECONDS)
+            route: Only sample requests whose path matches this pattern
+                (fnmatch, e.g. "/api/v1/households/*/items")
+
+        Returns:
+            The new session
+
+        Raises:
+            RuntimeError: If a session is already running
+        """
+        if self.session is not None and self.session.running:
+            raise RuntimeError("A profiling session is already running")
+
+        session = ProfileSession(
+            seconds=min(seconds, settings.PROFILING_MAX_SECONDS),
+            route=route,
+            interval=settings.PROFILING_SAMPLE_INTERVAL
+        )
+        self.session = session
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample,
+            args=(session, asyncio.get_running_loop(), threading.get_ident()),
+            name="snakr-profiler",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Profiling started for {session.seconds}s (route {route or 'any'})")
+        return session
+
+    def stop(self) -> Optional[ProfileSession]:
+        """Stop the running session early; returns the last session"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.session
+
+    def _sample(self, session: ProfileSession, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        deadline = time.monotonic() + session.seconds
+        while not self._stop.wait(session.interval) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(loop_thread)
+            if frame is None:
+                break
+            running = asyncio.current_task(loop)
+            if running is None or (session.route is not None and running not in session.tasks):
+                session.idle += 1
+                continue
+            stack = tuple(_thread_stack(frame))
+            with session.lock:
+                session.stacks[stack] += 1
+                session.samples += 1
+        session.stopped_at = time.time()
+        session.tasks.clear()
+        logger.info(f"Profiling stopped: {session.samples} samples")
+
+
+@dataclass
+class _InFlight:
+    start: float
+    stack: Optional[List[str]] = None
+    blocking: bool = False
+
+
+class SlowRequestWatchdog:
+    """
+    Take one stack sample of each request running past SLOW_REQUEST_MS
+
+    The checking thread starts with the first request and wakes every half
+    threshold, so a sample is taken between 1x and 1.5x the threshold.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.interval = min(max(threshold / 2, 0.01), 1.0)
+        self.in_flight: Dict[asyncio.Task, _InFlight] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, task: asyncio.Task) -> _InFlight:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._watch,
+                args=(asyncio.get_running_loop(), threading.get_ident()),
+                name="snakr-slow-requests",
+                daemon=True
+            )
+            self._thread.start()
+        entry = self.in_flight[task] = _InFlight(time.perf_counter())
+        return entry
+
+    def untrack(self, task: asyncio.Task) -> None:
+        self.in_flight.pop(task, None)
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        while not loop.is_closed():
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            for task, entry in list(self.in_flight.items()):
+                if entry.stack is None and now - entry.start >= self.threshold:
+                    self.sample(task, entry, loop, loop_thread)
+
+    @staticmethod
+    def sample(task: asyncio.Task, entry: _InFlight, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        """Record where a request is right now"""
+        if asyncio.current_task(loop) is task:
+            # Running (and so blocking the loop): the thread stack is its own
+            frame = sys._current_frames().get(loop_thread)
+            entry.stack = _thread_stack(frame)
+            entry.blocking = True
+        else:
+            entry.stack = _coroutine_stack(task.get_coro())
+
+
+class ProfilingMiddleware:
+    """
+    Register requests with the profiler and the slow-request watchdog
+
+    Plain ASGI, inside RequestIDMiddleware so the request ID is set. Only
+    installed when profiling or the slow-request log is enabled.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.profiler = get_profiler() if settings.PROFILING_ENABLED else None
+        self.watchdog = SlowRequestWatchdog(settings.SLOW_REQUEST_MS / 1000) if settings.SLOW_REQUEST_MS > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        session = self.profiler.session if self.profiler is not None else None
+        if session is not None and (not session.running or not session.matches(scope["path"])):
+            session = None
+        if session is not None:
+            session.requests += 1
+            session.tasks.add(task)
+
+        if self.watchdog is None:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if session is not None:
+                    session.tasks.discard(task)
+            return
+
+        entry = self.watchdog.track(task)
+        db_time_token = db_time_var.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - entry.start
+            db_time = db_time_var.get()
+            db_time_var.reset(db_time_token)
+            self.watchdog.untrack(task)
+            if session is not None:
+                session.tasks.discard(task)
+            if elapsed >= self.watchdog.threshold:
+                log_slow_request(scope, elapsed, entry, db_time)
+
+
+def log_slow_request(scope: Scope, elapsed: float, entry: _InFlight, db_time: Dict[str, List[float]]) -> None:
+    """Log a slow request with its stack sample and DB time per service method"""
+    db_ms = {
+        method: {"calls": int(calls), "ms": round(seconds * 1000, 1)}
+        for method, (calls, seconds) in sorted(db_time.items(), key=lambda item: -item[1][1])
+    }
+    logger.warning(
+        f"Slow request: {scope['method']} {scope['path']} took {elapsed * 1000:.0f}ms",
+        extra={"extra": {
+            "request_id": get_request_id(),
+            "duration_ms": round(elapsed * 1000, 1),
+            "path": scope["path"],
+            "method": scope["method"],
+            "db_time_ms": db_ms,
+            "stack_sample": entry.stack,
+            "stack_blocking": entry.blocking,
+        }}
+    )
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    """Get this worker's profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
@@ -0,0 +1,86 @@
+"""
+Fast JSON responses
+
+FastJSONResponse renders with msgspec instead of the stdlib json module and
+passes bytes through untouched, so services can hand back pre-serialized
+payloads (see `dump_json`) for hot list endpoints. Row structs from
+app.services.rows are encoded natively, without an intermediate dict.
+
+A route that already holds its result should return the response object
+itself (`return FastJSONResponse(payload)`): FastAPI skips response-model
+validation and `jsonable_encoder` for Response instances. Such routes set
+`response_model=None` and describe the payload with `json_responses`, which
+builds the OpenAPI schema from the same row type the service encodes.
+"""
+from typing import Any, Dict
+
+import msgspec
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+from app.core.tracing import span
+
+
+def _enc_hook(value: Any) -> Any:
+    """Encode the types jsonable_encoder handles that msgspec doesn't"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = msgspec.json.Encoder(enc_hook=_enc_hook, decimal_format="number")
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes
+
+    Args:
+        content: JSON-compatible data (datetimes, UUIDs, enums, structs and models allowed)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    with span("serialize"):
+        return _encoder.encode(content)
+
+
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Replace msgspec's $defs references with the definitions themselves"""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if ref is not None:
+            return _inline_refs(defs[ref.rsplit("/", 1)[-1]], defs)
+        return {key: _inline_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(value, defs) for value in node]
+    return node
+
+
+def json_responses(content_type: Any, status_code: int = 200) -> Dict[int, Dict[str, Any]]:
+    """
+    Document a FastJSONResponse payload for the route's `responses=`
+
+    Args:
+        content_type: Type the route sends (a row struct from app.services.rows)
+        status_code: Status code of the successful response
+
+    Returns:
+        OpenAPI responses entry with the type's JSON Schema inlined
+    """
+    (schema,), defs = msgspec.json.schema_components([content_type])
+    return {
+        status_code: {
+            "description": "Successful Response",
+            "content": {"application/json": {"schema": _inline_refs(schema, defs)}},
+        }
+    }
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with msgspec; bytes content is sent as-is"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
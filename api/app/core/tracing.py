@@ -0,0 +1,320 @@
+"""
+OpenTelemetry tracing
+
+When TRACING_ENABLED is set, the API (and Celery worker) export spans over
+OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (a local collector). A request to
+the items list then shows where its time went:
+
+    GET /api/v1/items                     (TracingMiddleware, server span)
+    ├── auth.verify_token                 (JWT decode)
+    ├── postgrest GET household_members   (each Supabase execute())
+    ├── postgrest GET items
+    └── serialize                         (dump_json)
+
+Spans carry the request ID (`snakr.request_id`, from request_id_var), and
+JSON logs written inside a span carry its `trace_id`, so logs and traces can
+be joined either way.
+
+Celery tasks continue the trace of whoever enqueued them: the W3C trace
+context and request ID travel in the task message headers, and the task runs
+inside a `celery.task <name>` span. Receipt pipeline stages run inside
+`span("receipt.<stage>")` within the task, so they appear under the upload
+request that queued them.
+
+Sampling is decided once per trace at its root (TRACING_SAMPLE_RATIO);
+downstream spans, including Celery tasks, follow the parent's decision.
+
+When tracing is disabled nothing is instrumented: the middleware isn't
+installed, Supabase builders aren't wrapped, and `span()` returns a no-op
+context manager.
+"""
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple
+from contextlib import nullcontext
+import functools
+import logging
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+from app.middleware.request_id import get_request_id, request_id_var
+
+logger = logging.getLogger(__name__)
+
+# Proxy tracer: a no-op until setup_tracing installs a provider
+tracer = trace.get_tracer("snakr")
+
+TRACE_HEADERS = (b"traceparent", b"tracestate")
+
+_enabled = False
+_provider = None
+
+
+def setup_tracing(service_name: str, exporter: Optional[Any] = None) -> None:
+    """
+    Install the tracer provider and instrument the Supabase client
+
+    Safe to call more than once; only the first call takes effect.
+
+    Args:
+        service_name: Reported service name ("snakr-api", "snakr-worker")
+        exporter: Span exporter to use instead of OTLP (exported synchronously;
+            for tests)
+    """
+    global _enabled, _provider
+    if _provider is not None:
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": service_name,
+            "service.version": settings.API_VERSION,
+            "deployment.environment": settings.ENVIRONMENT,
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    )
+    if exporter is not None:
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        # Batched off the request path; the processor re-creates its export
+        # thread after fork, so this is safe in prefork Celery workers
+        provider.add_span_processor(BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=f"{settings.OTEL_EXPORTER_OTLP_ENDPOINT.rstrip('/')}/v1/traces")
+        ))
+
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _enabled = True
+    instrument_postgrest()
+    logger.info(
+        f"Tracing enabled for {service_name} "
+        f"(sample ratio {settings.TRACING_SAMPLE_RATIO}, {settings.OTEL_EXPORTER_OTLP_ENDPOINT})"
+    )
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and stop exporting"""
+    if _provider is not None:
+        try:
+            _provider.shutdown()
+        except Exception as e:
+            logger.warning(f"Error shutting down tracing: {e}")
+
+
+def span(name: str, **attributes: Any) -> ContextManager:
+    """
+    Child span of the current span (a no-op when tracing is disabled)
+
+    Args:
+        name: Span name (e.g. "receipt.ocr")
+        **attributes: Span attributes
+
+    Returns:
+        Context manager for the span
+    """
+    if not _enabled:
+        return nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes or None)
+
+
+def current_trace_id() -> str:
+    """Trace ID of the current span as hex ("" outside a recorded trace)"""
+    if not _enabled:
+        return ""
+    span_context = trace.get_current_span().get_span_context()
+    return format(span_context.trace_id, "032x") if span_context.is_valid else ""
+
+
+class TracingMiddleware:
+    """
+    Server span per HTTP request
+
+    Plain ASGI, like RequestIDMiddleware. Continues the caller's trace when
+    the request carries W3C traceparent/tracestate headers. Must run inside
+    RequestIDMiddleware so the request ID is set.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in TRACE_HEADERS
+        }
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(carrier) if carrier else None,
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": method,
+                "url.path": scope["path"],
+                "snakr.request_id": get_request_id(),
+            }
+        ) as request_span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # Named once routing has run, by template to keep names bounded
+                route = route_template(scope)
+                request_span.update_name(f"{method} {route}")
+                request_span.set_attribute("http.route", route)
+                request_span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    request_span.set_status(Status(StatusCode.ERROR))
+
+
+def _postgrest_target(builder: Any) -> Tuple[str, str]:
+    """HTTP method and table (or rpc/<function>) of a PostgREST request builder"""
+    # postgrest >= 1.0 keeps the request in a config object; older versions
+    # keep it on the builder
+    request = getattr(builder, "request", builder)
+    method = getattr(request, "http_method", "") or ""
+    path = str(getattr(request, "path", "") or "")
+    _, _, target = path.partition("/rest/v1/")
+    return method, target or path
+
+
+def _traced_execute(execute: Callable) -> Callable:
+    @functools.wraps(execute)
+    def wrapper(self, *args, **kwargs):
+        method, target = _postgrest_target(self)
+        with tracer.start_as_current_span(
+            f"postgrest {method} {target}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.operation.name": method,
+                "db.collection.name": target,
+            }
+        ):
+            return execute(self, *args, **kwargs)
+
+    wrapper._snakr_traced = True
+    return wrapper
+
+
+def instrument_postgrest() -> None:
+    """Wrap every synchronous PostgREST builder's execute() in a client span"""
+    from postgrest._sync import request_builder
+
+    for cls in vars(request_builder).values():
+        execute = getattr(cls, "__dict__", {}).get("execute")
+        if isinstance(cls, type) and execute is not None and not getattr(execute, "_snakr_traced", False):
+            cls.execute = _traced_execute(execute)
+
+
+class _TaskRequestGetter:
+    """Read propagated headers from a Celery task request"""
+
+    def get(self, carrier: Any, key: str):
+        value = getattr(carrier, key, None)
+        return [value] if isinstance(value, str) else None
+
+    def keys(self, carrier: Any):
+        return [name.decode() for name in TRACE_HEADERS]
+
+
+class _CeleryTaskTracing:
+    """Celery signal handlers, holding the span of each running task"""
+
+    def __init__(self):
+        # task_id -> (span, context token, request_id token)
+        self.active: Dict[str, Tuple[Any, Any, Any]] = {}
+        self.getter = _TaskRequestGetter()
+
+    @staticmethod
+    def on_worker_init(**kwargs):
+        setup_tracing("snakr-worker")
+
+    @staticmethod
+    def on_before_task_publish(headers=None, **kwargs):
+        if headers is None:
+            return
+        propagate.inject(headers)
+        request_id = get_request_id()
+        if request_id:
+            headers.setdefault("request_id", request_id)
+
+    def on_task_prerun(self, task_id=None, task=None, **kwargs):
+        if not _enabled:
+            return
+        parent = propagate.extract(task.request, getter=self.getter)
+        request_id = getattr(task.request, "request_id", None) or ""
+        task_span = tracer.start_span(
+            f"celery.task {task.name}",
+            context=parent,
+            kind=SpanKind.CONSUMER,
+            attributes={
+                "celery.task_id": task_id,
+                "celery.task_name": task.name,
+                "snakr.request_id": request_id,
+            }
+        )
+        self.active[task_id] = (
+            task_span,
+            otel_context.attach(trace.set_span_in_context(task_span, parent)),
+            request_id_var.set(request_id),
+        )
+
+    def on_task_failure(self, task_id=None, exception=None, **kwargs):
+        entry = self.active.get(task_id)
+        if entry is not None and exception is not None:
+            entry[0].record_exception(exception)
+            entry[0].set_status(Status(StatusCode.ERROR, str(exception)))
+
+    def on_task_postrun(self, task_id=None, state=None, **kwargs):
+        entry = self.active.pop(task_id, None)
+        if entry is None:
+            return
+        task_span, context_token, request_id_token = entry
+        task_span.set_attribute("celery.state", state or "")
+        request_id_var.reset(request_id_token)
+        otel_context.detach(context_token)
+        task_span.end()
+
+
+def instrument_celery_tracing(celery_app) -> None:
+    """
+    Propagate trace context and request ID through task headers, and run
+    each task in a span
+
+    Publishing is instrumented wherever celery_app is imported (the API
+    enqueueing a task); task spans in the worker, which sets up tracing in
+    worker_init.
+
+    Args:
+        celery_app: Celery application
+    """
+    from celery import signals
+
+    handlers = _CeleryTaskTracing()
+    signals.worker_init.connect(handlers.on_worker_init, weak=False)
+    signals.before_task_publish.connect(handlers.on_before_task_publish, weak=False)
+    signals.task_prerun.connect(handlers.on_task_prerun, weak=False)
+    signals.task_failure.connect(handlers.on_task_failure, weak=False)
+    signals.task_postrun.connect(handlers.on_task_postrun, weak=False)
@@ -1,6 +1,8 @@
 """
 FastAPI application factory and configuration
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -9,6 +11,9 @@ from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
 from app.core.errors import (
     SNAKrException,
     snakr_exception_handler,
@@ -20,6 +25,46 @@ from app.middleware.rate_limit import limiter, rate_limit_exceeded_handler
 from app.middleware.request_id import RequestIDMiddleware
 from app.routes.health import router as health_router
 from app.routes.api_v1 import api_router
+from app.services.cache import get_household_cache
+from app.services.change_feed import get_change_feed
+from app.services.event_writer import get_event_writer
+from app.services.health import get_health_checker
+from app.services.postgres import close_pool
+from app.services.resources import get_resources
+from app.services.supabase_client import SupabaseService, get_supabase
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop per-worker background resources
+    
+    Clients, pools and caches are registered with the resource registry,
+    which closes them on shutdown: the Supabase clients' connection pool, the
+    direct Postgres pool and the Redis connections of the household cache and
+    the readiness checks (the pools are created on first use). The Supabase
+    client is built here rather than at import (keeping imports fast) or on
+    the first request (keeping that request fast). The event writer flushes
+    buffered events on shutdown (spooling them to disk if the database is
+    unreachable) and the change feed listens for household changes; both stop
+    before the resources close.
+    """
+    resources = get_resources()
+    resources.register("direct Postgres pool", close_pool)
+    resources.register("household cache", get_household_cache().close)
+    resources.register("Supabase clients", SupabaseService.close)
+    resources.register("health checks", get_health_checker().close)
+    if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+        get_supabase()
+    event_writer = get_event_writer()
+    await event_writer.start()
+    if settings.CHANGE_FEED_ENABLED:
+        await get_change_feed().start()
+    yield
+    await get_change_feed().stop()
+    await event_writer.stop()
+    await resources.close()
+    shutdown_tracing()
 
 
 def create_app() -> FastAPI:
@@ -133,14 +178,27 @@ All endpoints are prefixed with `/api/v1/`
             "description": "Receipt upload, OCR processing, item mapping, and confirmation. "
                           "Receipts are parsed asynchronously and require user review before applying to inventory.",
         },
+        {
+            "name": "iot",
+            "description": "Ingestion of IoT device readings (door sensors, scales, cameras). "
+                          "Authenticated per device; readings are coalesced and written in batches.",
+        },
         {
             "name": "restock",
             "description": "Restock list generation, dismissal, export, and Nimbly integration. "
                           "Lists are grouped by urgency (Need now, Need soon, Nice to top up).",
         },
+        {
+            "name": "admin",
+            "description": "Operator tools (ADMIN_USER_IDS only), such as the on-demand profiler.",
+        },
     ]
     
     # Create FastAPI app
+    # No custom default_response_class: with a response_model set, FastAPI
+    # serializes straight to JSON bytes via pydantic-core, and a custom class
+    # turns that off (scripts/benchmark_responses.py). Hot list endpoints
+    # return pre-serialized FastJSONResponse bodies instead (app.core.responses).
     app = FastAPI(
         title=settings.API_TITLE,
         description=description,
@@ -149,6 +207,7 @@ All endpoints are prefixed with `/api/v1/`
         redoc_url="/redoc",
         openapi_url="/openapi.json",
         openapi_tags=tags_metadata,
+        lifespan=lifespan,
         contact={
             "name": "sNAKr Team",
             "email": "support@snakr.app",
@@ -174,6 +233,16 @@ All endpoints are prefixed with `/api/v1/`
     # Add config to app state for error handlers
     app.state.config = settings
     
+    # Profiler request filter and slow-request log (innermost; not installed
+    # when both are off)
+    if settings.PROFILING_ENABLED or settings.SLOW_REQUEST_MS > 0:
+        app.add_middleware(ProfilingMiddleware)
+    
+    # Trace requests (inside RequestIDMiddleware, so spans get the request ID)
+    if settings.TRACING_ENABLED:
+        setup_tracing("snakr-api")
+        app.add_middleware(TracingMiddleware)
+    
     # Add Request ID middleware (must be first to track all requests)
     app.add_middleware(RequestIDMiddleware)
     
@@ -186,6 +255,11 @@ All endpoints are prefixed with `/api/v1/`
         allow_headers=settings.CORS_ALLOW_HEADERS,
     )
     
+    # Record latency per route and requests in flight (outermost, so it
+    # times the whole stack)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+    
     # Register exception handlers
     app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     app.add_exception_handler(SNAKrException, snakr_exception_handler)
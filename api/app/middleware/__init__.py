@@ -5,6 +5,7 @@ from app.middleware.auth import (
     JWTMiddleware,
     get_current_user,
     get_current_user_id,
+    get_user_supabase,
     verify_household_access,
     get_optional_user
 )
@@ -15,18 +16,21 @@ from app.middleware.rate_limit import (
 )
 from app.middleware.request_id import (
     RequestIDMiddleware,
-    get_request_id
+    get_request_id,
+    get_request_start
 )
 
 __all__ = [
     "JWTMiddleware",
     "get_current_user",
     "get_current_user_id",
+    "get_user_supabase",
     "verify_household_access",
     "get_optional_user",
     "limiter",
     "get_rate_limit_status",
     "rate_limit_exceeded_handler",
     "RequestIDMiddleware",
-    "get_request_id"
+    "get_request_id",
+    "get_request_start"
 ]
@@ -9,6 +9,7 @@ import logging
 
 from app.core.config import settings
 from app.core.errors import AuthenticationError, AuthorizationError
+from app.core import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -37,24 +38,25 @@ class JWTMiddleware:
             raise ValueError("SUPABASE_JWT_SECRET not configured")
         
         try:
-            # For local Supabase development, we can skip signature verification
-            # In production, you should use proper JWT secret verification
-            if settings.ENVIRONMENT == "development":
-                # Decode without verification for local development
-                # Still need to provide a key, but verification is disabled
-                payload = jwt.decode(
-                    token,
-                    key="",  # Empty key since we're not verifying
-                    options={"verify_signature": False, "verify_aud": False}
-                )
-            else:
-                # Decode and verify JWT token for production
-                payload = jwt.decode(
-                    token,
-                    settings.SUPABASE_JWT_SECRET,
-                    algorithms=["HS256"],
-                    audience="authenticated"
-                )
+            with tracing.span("auth.verify_token"):
+                # For local Supabase development, we can skip signature verification
+                # In production, you should use proper JWT secret verification
+                if settings.ENVIRONMENT == "development":
+                    # Decode without verification for local development
+                    # Still need to provide a key, but verification is disabled
+                    payload = jwt.decode(
+                        token,
+                        key="",  # Empty key since we're not verifying
+                        options={"verify_signature": False, "verify_aud": False}
+                    )
+                else:
+                    # Decode and verify JWT token for production
+                    payload = jwt.decode(
+                        token,
+                        settings.SUPABASE_JWT_SECRET,
+                        algorithms=["HS256"],
+                        audience="authenticated"
+                    )
             
             logger.debug(f"Token verified for user: {payload.get('sub')}")
             return payload
@@ -165,6 +167,34 @@ async def get_current_user_id(
     return JWTMiddleware.get_user_id(user)
 
 
+async def get_user_supabase(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Dependency to query the database as the current user, with RLS applied
+    
+    Uses a cached PostgREST session on the shared connection pool, so it
+    costs the same as querying with the service-role client; RLS policies
+    then do the household membership check.
+    
+    Args:
+        credentials: HTTP Bearer credentials from request
+        user: User payload from get_current_user dependency (verifies the token)
+        
+    Returns:
+        SyncPostgrestClient scoped to the user's JWT
+        
+    Usage:
+        @app.get("/households/{household_id}/items")
+        async def list_items(household_id: str, db = Depends(get_user_supabase)):
+            return db.table("items").select("*").eq("household_id", household_id).execute().data
+    """
+    from app.services.supabase_client import SupabaseService
+    
+    return SupabaseService.get_user_client(credentials.credentials)
+
+
 async def verify_household_access(
     household_id: str,
     user: Dict[str, Any] = Depends(get_current_user)
@@ -209,6 +239,29 @@ async def verify_household_access(
     return True
 
 
+async def require_admin(
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> str:
+    """
+    Dependency to restrict an endpoint to operators (ADMIN_USER_IDS)
+    
+    Args:
+        user: User payload from get_current_user dependency
+        
+    Returns:
+        Admin user ID
+        
+    Raises:
+        AuthorizationError: If the user isn't an operator
+    """
+    user_id = JWTMiddleware.get_user_id(user)
+    if user_id not in settings.get_admin_user_ids():
+        logger.warning(f"User {user_id} attempted to use the admin API")
+        raise AuthorizationError("Admin access required")
+    
+    return user_id
+
+
 # Optional: Extract token from request without raising error
 async def get_optional_user(request: Request) -> Optional[Dict[str, Any]]:
     """
@@ -13,6 +13,7 @@ from typing import Optional
 import logging
 
 from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_REJECTIONS, route_template
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,7 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
     
     identifier = get_user_identifier(request)
     logger.warning(f"Rate limit exceeded for {identifier}")
+    RATE_LIMIT_REJECTIONS.labels(route_template(request.scope)).inc()
     
     return JSONResponse(
         status_code=429,
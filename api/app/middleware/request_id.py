@@ -1,52 +1,93 @@
 """
 Request ID middleware for tracking requests across logs
 """
+import time
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
 from contextvars import ContextVar
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variable to store request ID
 request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 
+# Context variable to store request start time (time.perf_counter())
+request_start_var: ContextVar[float] = ContextVar("request_start", default=0.0)
+
+REQUEST_ID_HEADER = b"x-request-id"
+
 
 def get_request_id() -> str:
     """Get the current request ID from context"""
     return request_id_var.get()
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+def get_request_start() -> float:
+    """Get the current request start time (perf_counter) from context"""
+    return request_start_var.get()
+
+
+class RequestIDMiddleware:
     """
     Middleware to add request ID to all requests and responses.
     Request ID is used for log correlation and debugging.
+
+    Implemented as plain ASGI rather than BaseHTTPMiddleware: it only needs
+    to read one request header and add one response header, so there is no
+    reason to pay for the extra task and body-stream wrapping per request
+    (which also gets in the way of streaming responses).
+
+    Sets request.state.request_id and request.state.request_start.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Add request ID to request state and response headers
-        
+
         Args:
-            request: Incoming request
-            call_next: Next middleware/handler in chain
-            
-        Returns:
-            Response with X-Request-ID header
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
         # Get request ID from header or generate new one
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        
-        # Store in context variable for access in logging
+        raw_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                raw_id = value
+                break
+
+        if raw_id:
+            request_id = raw_id.decode("latin-1")
+        else:
+            request_id = str(uuid.uuid4())
+            raw_id = request_id.encode("latin-1")
+
+        # Store in context variables for access in logging and timing. Not
+        # reset afterwards: each request already runs in its own task context,
+        # and the 500 handler (ServerErrorMiddleware, outside this one) still
+        # needs the ID after the app has raised.
         request_id_var.set(request_id)
-        
+        request_start_var.set(start)
+
         # Store in request state for access in handlers
-        request.state.request_id = request_id
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["request_start"] = start
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request ID to response headers
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", ()), (REQUEST_ID_HEADER, raw_id)]
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
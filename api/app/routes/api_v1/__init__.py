@@ -9,6 +9,8 @@ from .items import router as items_router
 from .events import router as events_router
 from .receipts import router as receipts_router
 from .restock import router as restock_router
+from .iot import router as iot_router
+from .admin import router as admin_router
 
 # Create API v1 router
 api_router = APIRouter(prefix="/api/v1")
@@ -20,6 +22,8 @@ api_router.include_router(items_router)
 api_router.include_router(events_router)
 api_router.include_router(receipts_router)
 api_router.include_router(restock_router)
+api_router.include_router(iot_router)
+api_router.include_router(admin_router)
 
 
 @api_router.get("/")
@@ -66,6 +70,7 @@ async def api_v1_root():
             "items": "/api/v1/items",
             "receipts": "/api/v1/receipts",
             "restock": "/api/v1/restock",
-            "events": "/api/v1/events"
+            "events": "/api/v1/events",
+            "iot": "/api/v1/iot/events"
         }
     }
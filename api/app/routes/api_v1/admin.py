@@ -0,0 +1,164 @@
+"""
+Operator endpoints
+
+This module provides endpoints for:
+- Profiling this API worker on demand
+
+Endpoints:
+- POST /api/v1/admin/profiler - Start a sampling profiler session
+- GET /api/v1/admin/profiler - Session status and results
+- DELETE /api/v1/admin/profiler - Stop the session early
+
+Authentication: Required (Supabase JWT of a user in ADMIN_USER_IDS)
+Availability: 404 unless PROFILING_ENABLED is set
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Any, Optional
+import logging
+
+from app.core.config import settings
+from app.core.profiling import Profiler, get_profiler
+from app.middleware.auth import require_admin
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def profiler_enabled() -> Profiler:
+    """Dependency returning the worker's profiler, or 404 when profiling is off"""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    return get_profiler()
+
+
+@router.post(
+    "/profiler",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start profiling",
+    description="""
+    Sample the stack of this API worker's event loop for `seconds`.
+
+    With `route`, only time spent on requests whose path matches the pattern
+    is sampled (fnmatch, e.g. `/api/v1/households/*/items`). Sampling runs on
+    a background thread; fetch the results with `GET /api/v1/admin/profiler`.
+    Each worker process profiles itself only, so run one worker or repeat
+    per worker.
+
+    **Authentication:** Required (operator listed in `ADMIN_USER_IDS`)
+
+    **Errors:**
+    - `401 Unauthorized` - Missing or invalid authentication token
+    - `403 Forbidden` - User is not an operator
+    - `404 Not Found` - Profiling is disabled (`PROFILING_ENABLED`)
+    - `409 Conflict` - A session is already running
+    """,
+)
+async def start_profiler(
+    seconds: float = Query(10.0, gt=0, description="How long to sample (capped at PROFILING_MAX_SECONDS)"),
+    route: Optional[str] = Query(None, description="Only sample requests whose path matches this pattern"),
+    admin_id: str = Depends(require_admin),
+    profiler: Profiler = Depends(profiler_enabled)
+) -> Dict[str, Any]:
+    """
+    Start a profiling session
+
+    Args:
+        seconds: Sampling duration
+        route: Optional request path pattern
+        admin_id: Operator user ID
+        profiler: This worker's profiler
+
+    Returns:
+        Session status
+    """
+    try:
+        session = profiler.start(seconds, route)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    logger.info(f"Profiling started by {admin_id}")
+
+    return session.summary()
+
+
+@router.get(
+    "/profiler",
+    summary="Profiling results",
+    description="""
+    Status and results of the current or last profiling session.
+
+    The default JSON lists the functions with the most samples: `self` is the
+    fraction of samples spent in the function itself, `total` the fraction
+    with it anywhere on the stack. `format=folded` returns all stacks in the
+    folded format for flamegraph.pl or speedscope.
+
+    **Authentication:** Required (operator listed in `ADMIN_USER_IDS`)
+
+    **Errors:**
+    - `403 Forbidden` - User is not an operator
+    - `404 Not Found` - Profiling is disabled, or no session has run
+    """,
+)
+async def get_profile(
+    format: str = Query("json", pattern="^(json|folded)$", description="json or folded"),
+    limit: int = Query(25, ge=1, le=500, description="Functions in the top list"),
+    admin_id: str = Depends(require_admin),
+    profiler: Profiler = Depends(profiler_enabled)
+):
+    """
+    Return profiling results
+
+    Args:
+        format: Response format
+        limit: Number of functions in the top list
+        admin_id: Operator user ID
+        profiler: This worker's profiler
+
+    Returns:
+        Session summary, or folded stacks as text
+    """
+    session = profiler.session
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profiling session")
+
+    if format == "folded":
+        return PlainTextResponse(session.folded())
+    return session.summary(limit)
+
+
+@router.delete(
+    "/profiler",
+    response_model=Dict[str, Any],
+    summary="Stop profiling",
+    description="""
+    Stop the running profiling session and return its results.
+
+    **Authentication:** Required (operator listed in `ADMIN_USER_IDS`)
+
+    **Errors:**
+    - `403 Forbidden` - User is not an operator
+    - `404 Not Found` - Profiling is disabled, or no session has run
+    """,
+)
+async def stop_profiler(
+    admin_id: str = Depends(require_admin),
+    profiler: Profiler = Depends(profiler_enabled)
+) -> Dict[str, Any]:
+    """
+    Stop the profiling session
+
+    Args:
+        admin_id: Operator user ID
+        profiler: This worker's profiler
+
+    Returns:
+        Session summary
+    """
+    session = profiler.stop()
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profiling session")
+
+    return session.summary()
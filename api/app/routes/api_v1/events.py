@@ -1,17 +1,19 @@
 """
 Event log endpoints
 
-This module will provide endpoints for:
+This module provides endpoints for:
 - Viewing immutable event history
 - Filtering events by type, item, date range
 - Exporting event history for audit/ML training
 - Pagination for large event logs
 
+Endpoints:
+- GET /api/v1/events - List events with keyset pagination and filters
+- GET /api/v1/events/export - Stream events as NDJSON for audit/ML training
+
 Planned Endpoints:
-- GET /api/v1/events - List events with pagination and filters
 - GET /api/v1/events/{id} - Get event details
 - GET /api/v1/items/{item_id}/events - Get events for specific item
-- GET /api/v1/events/export - Export events as JSON
 
 Event Types:
 - inventory.used - Item marked as used
@@ -33,8 +35,197 @@ Authentication: Required (Supabase JWT)
 Rate Limit: 100 requests/minute per user
 Multi-tenant: Filtered by household membership
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Dict, Any, Optional
+import logging
+
+from app.middleware.auth import get_current_user
+from app.services.event_service import (
+    EventService,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    validate_event_type
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-# Endpoints will be implemented in task 1.4
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export household events",
+    description="""
+    Export the household event history as newline-delimited JSON (NDJSON).
+    
+    Events are streamed oldest first in batches, so exports of any size use
+    constant memory on the server. Every line carries a `cursor`; if the
+    download is interrupted, pass the last received cursor as `since` to resume
+    right after that event. The same works for incremental ML extracts.
+    
+    **Authentication:** Required (Supabase JWT)
+    
+    **Rate Limit:** 100 requests/minute per user
+    
+    **Query Parameters:**
+    - `household_id` (required): Household UUID
+    - `since`: Cursor of the last event already exported
+    - `event_type`: Filter by event type
+    
+    **Example Response:**
+    ```
+    {"id":"880e...","event_type":"inventory.used","source":"user",...,"cursor":"MjAy..."}
+    {"id":"990e...","event_type":"inventory.restocked","source":"receipt",...,"cursor":"MjAy..."}
+    ```
+    
+    **Errors:**
+    - `401 Unauthorized` - Missing or invalid authentication token
+    - `403 Forbidden` - User is not a member of the household
+    - `422 Unprocessable Entity` - Invalid filter or cursor
+    - `429 Too Many Requests` - Rate limit exceeded
+    - `500 Internal Server Error` - Database or server error
+    """,
+)
+async def export_events(
+    household_id: str = Query(..., description="Household UUID"),
+    since: Optional[str] = Query(None, description="Cursor of the last event already exported"),
+    event_type: Optional[str] = Query(None, description="Filter by event type"),
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Stream household events as NDJSON
+    
+    Args:
+        household_id: Household UUID
+        since: Optional resume cursor
+        event_type: Optional event type filter
+        user: Current authenticated user from JWT token
+        
+    Returns:
+        StreamingResponse with one event per line
+        
+    Raises:
+        AuthenticationError: If user is not authenticated
+        AuthorizationError: If user is not a member
+        ValidationError: If filters or cursor are invalid
+    """
+    user_id = user.get("sub")
+    logger.info(f"Exporting events for household {household_id} by user {user_id}")
+    
+    # Validate everything before the first byte is sent
+    validate_event_type(event_type)
+    if since:
+        decode_cursor(since)
+    
+    event_service = EventService()
+    await event_service.verify_access(household_id, user_id)
+    
+    return StreamingResponse(
+        event_service.iter_export(household_id, since=since, event_type=event_type),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="events.ndjson"'}
+    )
+
+
+@router.get(
+    "",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="List household events",
+    description="""
+    List household events, newest first, with optional filters.
+    
+    Pagination uses opaque keyset cursors instead of offsets: pass the
+    `next_cursor` from the previous page as `cursor` to get the next one. Every
+    page costs the same, no matter how far back in the history it is.
+    
+    **Authentication:** Required (Supabase JWT)
+    
+    **Rate Limit:** 100 requests/minute per user
+    
+    **Query Parameters:**
+    - `household_id` (required): Household UUID
+    - `event_type`: Filter by event type (e.g. `inventory.used`)
+    - `item_id`: Filter by item UUID
+    - `start_date`: Only events at or after this time
+    - `end_date`: Only events before this time
+    - `cursor`: Cursor from the previous page
+    - `limit`: Page size (default: 50, max: 200)
+    
+    **Example Response:**
+    ```json
+    {
+      "events": [
+        {
+          "id": "880e8400-e29b-41d4-a716-446655440003",
+          "event_type": "inventory.used",
+          "source": "user",
+          "item_id": "660e8400-e29b-41d4-a716-446655440001",
+          "receipt_id": null,
+          "payload": {"previous_state": "ok", "new_state": "low"},
+          "confidence": 1.0,
+          "created_at": "2024-01-22T14:30:00+00:00"
+        }
+      ],
+      "next_cursor": "MjAyNC0wMS0yMlQxNDozMDowMCswMDowMHw4ODBl...",
+      "has_more": true
+    }
+    ```
+    
+    **Errors:**
+    - `401 Unauthorized` - Missing or invalid authentication token
+    - `403 Forbidden` - User is not a member of the household
+    - `422 Unprocessable Entity` - Invalid filter or cursor
+    - `429 Too Many Requests` - Rate limit exceeded
+    - `500 Internal Server Error` - Database or server error
+    """,
+)
+async def list_events(
+    household_id: str = Query(..., description="Household UUID"),
+    event_type: Optional[str] = Query(None, description="Filter by event type"),
+    item_id: Optional[str] = Query(None, description="Filter by item UUID"),
+    start_date: Optional[datetime] = Query(None, description="Only events at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only events before this time"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    List household events with keyset pagination
+    
+    Args:
+        household_id: Household UUID
+        event_type: Optional event type filter
+        item_id: Optional item UUID filter
+        start_date: Optional lower bound on event time
+        end_date: Optional upper bound on event time
+        cursor: Optional cursor from the previous page
+        limit: Page size
+        user: Current authenticated user from JWT token
+        
+    Returns:
+        Dictionary with events, next_cursor and has_more
+        
+    Raises:
+        AuthenticationError: If user is not authenticated
+        AuthorizationError: If user is not a member
+        ValidationError: If filters or cursor are invalid
+    """
+    user_id = user.get("sub")
+    logger.info(f"Fetching events for household {household_id} by user {user_id}")
+    
+    event_service = EventService()
+    return await event_service.list_events(
+        household_id=household_id,
+        user_id=user_id,
+        event_type=event_type,
+        item_id=item_id,
+        start_date=start_date,
+        end_date=end_date,
+        cursor=cursor,
+        limit=limit
+    )
@@ -15,14 +15,16 @@ Endpoints:
 - DELETE /api/v1/households/{id} - Delete household (admin only)
 - POST /api/v1/households/{id}/invitations - Invite member (admin only)
 - GET /api/v1/households/{id}/invitations - List household invitations
+- GET /api/v1/households/{id}/stream - Stream household changes (SSE)
 - POST /api/v1/households/{id}/members/{user_id}/role - Update member role (admin only)
 - DELETE /api/v1/households/{id}/members/{user_id} - Remove member (admin only)
 
 Authentication: Required (Supabase JWT)
 Rate Limit: 100 requests/minute per user
 """
-from fastapi import APIRouter, Depends, status, Path
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, status, Path, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Any, Literal, Optional
 import logging
 
 from app.models import (
@@ -30,13 +32,17 @@ from app.models import (
     HouseholdUpdate,
     Household,
     InvitationCreate,
-    InvitationResponse,
-    InvitationList
+    InvitationResponse
 )
+from app.core.config import settings
+from app.core.errors import AuthorizationError, SNAKrException
+from app.core.responses import FastJSONResponse, json_responses
 from app.middleware.auth import get_current_user
 from app.middleware.rate_limit import limiter
+from app.services.change_feed import format_sse, get_change_feed
 from app.services.household_service import HouseholdService
 from app.services.invitation_service import InvitationService
+from app.services.rows import HouseholdDetail, HouseholdPage, InvitationPage
 
 logger = logging.getLogger(__name__)
 
@@ -118,7 +124,8 @@ async def create_household(
 
 @router.get(
     "",
-    response_model=Dict[str, Any],
+    response_model=None,
+    responses=json_responses(HouseholdPage),
     status_code=status.HTTP_200_OK,
     summary="Get user's households",
     description="""
@@ -133,41 +140,56 @@ async def create_household(
     
     **Rate Limit:** 100 requests/minute per user
     
-    **Example Response:**
+    **Query Parameters:**
+    - `include` - Set to `stats` to add inventory and restock counts per
+      household (one grouped query, so the home screen needs one request)
+    
+    **Example Response (`?include=stats`):**
     ```json
-    [
-      {
-        "id": "550e8400-e29b-41d4-a716-446655440000",
-        "name": "Smith Family",
-        "created_at": "2024-01-21T12:00:00Z",
-        "updated_at": "2024-01-21T12:00:00Z"
-      },
-      {
-        "id": "660e8400-e29b-41d4-a716-446655440001",
-        "name": "Work Team",
-        "created_at": "2024-01-22T10:00:00Z",
-        "updated_at": "2024-01-22T10:00:00Z"
-      }
-    ]
+    {
+      "households": [
+        {
+          "id": "550e8400-e29b-41d4-a716-446655440000",
+          "name": "Smith Family",
+          "created_at": "2024-01-21T12:00:00Z",
+          "updated_at": "2024-01-21T12:00:00Z",
+          "role": "admin",
+          "stats": {
+            "item_count": 42,
+            "states": {"plenty": 10, "ok": 20, "low": 7, "almost_out": 3, "out": 2},
+            "restock": {"need_now": 5, "need_soon": 7, "nice_to_top_up": 1}
+          }
+        }
+      ],
+      "total": 1
+    }
     ```
     
+    Without `include=stats` the `stats` field is omitted.
+    
     **Errors:**
+    - `422 Unprocessable Entity` - Unknown `include` value
     - `401 Unauthorized` - Missing or invalid authentication token
     - `429 Too Many Requests` - Rate limit exceeded
     - `500 Internal Server Error` - Database or server error
     """,
 )
 async def get_households(
+    include: Optional[Literal["stats"]] = Query(
+        None,
+        description="Set to 'stats' to include inventory and restock counts"
+    ),
     user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """
     Get all households for the authenticated user
     
     Args:
+        include: "stats" to include per-household inventory and restock counts
         user: Current authenticated user from JWT token
         
     Returns:
-        Dictionary with households list and total count
+        JSON response with households list and total count
         
     Raises:
         AuthenticationError: If user is not authenticated
@@ -176,18 +198,19 @@ async def get_households(
     logger.info(f"Fetching households for user {user_id}")
     
     household_service = HouseholdService()
-    households = await household_service.get_user_households(user_id)
+    households = await household_service.get_user_households(
+        user_id,
+        include_stats=include == "stats"
+    )
     
     logger.info(f"Found {len(households)} households for user {user_id}")
-    return {
-        "households": households,
-        "total": len(households)
-    }
+    return FastJSONResponse(HouseholdPage(households=households, total=len(households)))
 
 
 @router.get(
     "/{household_id}",
-    response_model=Dict[str, Any],
+    response_model=None,
+    responses=json_responses(HouseholdDetail),
     status_code=status.HTTP_200_OK,
     summary="Get household details",
     description="""
@@ -199,6 +222,10 @@ async def get_households(
     
     **Rate Limit:** 100 requests/minute per user
     
+    **Query Parameters:**
+    - `summary`: Return only `member_count` and `admin_count`, without the
+      `members` list (for households with many members)
+    
     **Example Response:**
     ```json
     {
@@ -221,39 +248,45 @@ async def get_households(
     
     **Errors:**
     - `401 Unauthorized` - Missing or invalid authentication token
-    - `403 Forbidden` - User is not a member of the household
-    - `404 Not Found` - Household not found
+    - `403 Forbidden` - User is not a member of the household (also returned
+      for households that don't exist)
     - `429 Too Many Requests` - Rate limit exceeded
     - `500 Internal Server Error` - Database or server error
     """,
 )
 async def get_household(
     household_id: str = Path(..., description="Household UUID"),
+    summary: bool = Query(False, description="Return counts only, without members"),
     user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """
     Get household details by ID
     
     Args:
         household_id: Household UUID
+        summary: Return counts only, without the members list
         user: Current authenticated user from JWT token
         
     Returns:
-        Household details with members
+        JSON response with household details, members and counts
         
     Raises:
         AuthenticationError: If user is not authenticated
         AuthorizationError: If user is not a member
-        NotFoundError: If household not found
     """
     user_id = user.get("sub")
     logger.info(f"Fetching household {household_id} for user {user_id}")
     
     household_service = HouseholdService()
-    household = await household_service.get_household_by_id(household_id, user_id)
+    household = await household_service.get_household_by_id(
+        household_id,
+        user_id,
+        summary=summary,
+        as_json=True
+    )
     
     logger.info(f"Retrieved household {household_id}")
-    return household
+    return FastJSONResponse(household)
 
 
 @router.patch(
@@ -425,7 +458,8 @@ async def create_invitation(
 
 @router.get(
     "/{household_id}/invitations",
-    response_model=InvitationList,
+    response_model=None,
+    responses=json_responses(InvitationPage),
     status_code=status.HTTP_200_OK,
     summary="Get household invitations",
     description="""
@@ -448,7 +482,6 @@ async def create_invitation(
           "invitee_email": "friend@example.com",
           "role": "member",
           "status": "pending",
-          "token": "abc123...",
           "expires_at": "2024-01-28T12:00:00Z",
           "accepted_at": null,
           "created_at": "2024-01-21T12:00:00Z",
@@ -470,7 +503,7 @@ async def create_invitation(
 async def get_household_invitations(
     household_id: str = Path(..., description="Household UUID"),
     user: Dict[str, Any] = Depends(get_current_user)
-) -> InvitationList:
+) -> FastJSONResponse:
     """
     Get all invitations for a household
     
@@ -479,7 +512,7 @@ async def get_household_invitations(
         user: Current authenticated user from JWT token
         
     Returns:
-        InvitationList with all invitations
+        JSON response with invitations list and total count
         
     Raises:
         AuthenticationError: If user is not authenticated
@@ -491,8 +524,128 @@ async def get_household_invitations(
     invitation_service = InvitationService()
     invitations = await invitation_service.get_household_invitations(
         household_id=household_id,
-        user_id=user_id
+        user_id=user_id,
+        as_json=True
+    )
+    
+    # Already serialized; returning the response skips re-encoding
+    return FastJSONResponse(invitations)
+
+
+@router.get(
+    "/{household_id}/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Stream household changes",
+    description="""
+    Stream changes to a household's items, inventory, restock list, members
+    and invitations as server-sent events, instead of polling.
+    
+    **Authentication:** Required (Supabase JWT)
+    
+    **Authorization:** Must be a member of the household
+    
+    **Events:**
+    - `ready` - Subscribed; fetch current state now
+    - `change` - Something changed: `{"type": "change", "table": "inventory",
+      "op": "UPDATE", "item_ids": ["..."]}`. Refetch the affected items, or
+      the whole list when `item_ids` is null
+    - `resync` - Changes may have been missed (slow client or feed
+      reconnect); refetch everything
+    - `revoked` - The user is no longer a member; the stream ends
+    
+    A `: keepalive` comment is sent every CHANGE_FEED_HEARTBEAT seconds.
+    Clients should reconnect (and refetch) when the stream drops.
+    
+    **Errors:**
+    - `401 Unauthorized` - Missing or invalid authentication token
+    - `403 Forbidden` - User is not a member of the household
+    - `503 Service Unavailable` - Change feed disabled
+    """,
+)
+async def stream_household_changes(
+    request: Request,
+    household_id: str = Path(..., description="Household UUID"),
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Stream household changes as server-sent events
+    
+    Args:
+        request: Incoming request (used to detect client disconnects)
+        household_id: Household UUID
+        user: Current authenticated user from JWT token
+        
+    Returns:
+        text/event-stream response that stays open until the client leaves
+        
+    Raises:
+        AuthenticationError: If user is not authenticated
+        AuthorizationError: If user is not a member
+        SNAKrException: If the change feed is disabled
+    """
+    if not settings.CHANGE_FEED_ENABLED:
+        raise SNAKrException(
+            "Change feed disabled",
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            user_message="Live updates aren't available right now.",
+            next_steps="Refresh to see the latest changes."
+        )
+    
+    user_id = user.get("sub")
+    
+    # Membership check (cached) before the stream opens, so it can 403
+    household_service = HouseholdService()
+    await household_service.get_household_by_id(household_id, user_id, summary=True, as_json=True)
+    
+    logger.info(f"Opening change stream for household {household_id} by user {user_id}")
+    return StreamingResponse(
+        household_event_stream(request, household_id, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
+
+
+async def household_event_stream(
+    request: Request,
+    household_id: str,
+    user_id: str
+) -> AsyncIterator[bytes]:
+    """
+    Server-sent events for one client until it disconnects or loses access
+    
+    Args:
+        request: Incoming request (used to detect client disconnects)
+        household_id: Household UUID
+        user_id: User UUID of the subscriber
+        
+    Yields:
+        Encoded SSE frames
+    """
+    household_service = HouseholdService()
     
-    logger.info(f"Found {len(invitations)} invitations for household {household_id}")
-    return InvitationList(invitations=invitations, total=len(invitations))
+    with get_change_feed().subscribe(household_id) as subscription:
+        yield format_sse("ready", {"household_id": household_id})
+        
+        while True:
+            message = await subscription.get(settings.CHANGE_FEED_HEARTBEAT)
+            if await request.is_disconnected():
+                break
+            
+            if message is None:
+                yield b": keepalive\n\n"
+                continue
+            
+            if message.get("table") == "household_members" or message["type"] == "resync":
+                # Membership may have changed; stop streaming to removed users
+                try:
+                    await household_service.get_household_by_id(
+                        household_id, user_id, summary=True, as_json=True
+                    )
+                except AuthorizationError:
+                    yield format_sse("revoked", {"household_id": household_id})
+                    break
+            
+            yield format_sse(message["type"], message)
+    
+    logger.info(f"Closed change stream for household {household_id} by user {user_id}")
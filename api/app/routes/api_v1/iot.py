@@ -0,0 +1,126 @@
+"""
+IoT ingestion endpoints
+
+This module provides endpoints for:
+- Ingesting batches of device readings (door sensors, scales, cameras)
+
+Endpoints:
+- POST /api/v1/iot/events - Ingest a batch of readings from one device
+
+Reading Types:
+- door_opened - Fridge/pantry door opened (iot.door_opened)
+- weight_changed - Scale weight delta (iot.weight_changed)
+- snapshot_available - Camera snapshot uploaded (iot.snapshot_available)
+
+Authentication: Per-device key (X-Device-Id + X-Device-Key), not a user JWT
+Rate Limit: IOT_BATCHES_PER_MINUTE batches/minute per device and client IP
+Multi-tenant: Events are written to the device's household
+"""
+from fastapi import APIRouter, Header, Request, status
+from slowapi.util import get_remote_address
+from typing import Dict, Any, Optional
+import logging
+
+from app.core.config import settings
+from app.middleware.rate_limit import limiter
+from app.services.iot_service import IoTService, parse_batch, read_body
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/iot", tags=["iot"])
+
+
+def get_device_identifier(request: Request) -> str:
+    """
+    Rate limit key: one bucket per device per client IP
+
+    The limit runs before the device is authenticated, so X-Device-Id is
+    still just a claim; including the IP stops anyone who knows (or guesses)
+    a device's ID from exhausting that device's bucket from elsewhere.
+    """
+    device_id = request.headers.get('x-device-id', 'unknown')
+    return f"device:{get_remote_address(request)}:{device_id}"
+
+
+@router.post(
+    "/events",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Ingest IoT readings",
+    description="""
+    Ingest a batch of readings from one IoT device.
+
+    The body is JSON, optionally compressed (`Content-Encoding: gzip` or
+    `deflate`). Noisy readings are coalesced before they become events:
+    weight samples for the same item/location within a short window are summed
+    into one `iot.weight_changed` event (and dropped if the net change is
+    negligible), and repeated door openings are debounced into one
+    `iot.door_opened` event. Events are written asynchronously in batches, so a
+    `202 Accepted` means the readings were validated and queued.
+
+    **Authentication:** Per-device key
+    - `X-Device-Id`: Device UUID
+    - `X-Device-Key`: Device key shown when the device was registered
+
+    **Rate Limit:** 120 batches/minute per device and client IP (configurable). Batch readings
+    on the device rather than posting them one at a time.
+
+    **Request Body:**
+    ```json
+    {
+      "readings": [
+        {"type": "weight_changed", "at": "2024-01-22T14:30:00Z", "item_id": "550e...", "weight_delta_grams": -120.5},
+        {"type": "door_opened", "at": "2024-01-22T14:30:02Z", "location": "fridge", "duration_seconds": 12}
+      ]
+    }
+    ```
+
+    **Example Response:**
+    ```json
+    {
+      "received": 2,
+      "accepted": 2,
+      "coalesced": 0
+    }
+    ```
+
+    **Errors:**
+    - `401 Unauthorized` - Unknown device, revoked device or wrong key
+    - `413 Payload Too Large` - Batch larger than the limit, before or after decompression
+    - `422 Unprocessable Entity` - Invalid readings or unsupported encoding
+    - `429 Too Many Requests` - Rate limit exceeded
+    - `500 Internal Server Error` - Server error
+    """,
+)
+@limiter.limit(f"{settings.IOT_BATCHES_PER_MINUTE}/minute", key_func=get_device_identifier)
+async def ingest_iot_events(
+    request: Request,
+    x_device_id: str = Header(..., description="Device UUID"),
+    x_device_key: str = Header(..., description="Device key"),
+    content_encoding: Optional[str] = Header(None, description="gzip, deflate or none")
+) -> Dict[str, Any]:
+    """
+    Ingest a batch of device readings
+
+    Args:
+        request: Request (raw body is streamed, not parsed by FastAPI)
+        x_device_id: Device UUID
+        x_device_key: Device key
+        content_encoding: Optional body compression
+
+    Returns:
+        Dictionary with received, accepted and coalesced counts
+
+    Raises:
+        AuthenticationError: If device credentials are invalid
+        ValidationError: If the batch is invalid
+    """
+    iot_service = IoTService()
+    device = await iot_service.authenticate_device(x_device_id, x_device_key)
+
+    readings = parse_batch(await read_body(request.stream(), content_encoding))
+    result = await iot_service.ingest(device, readings)
+
+    logger.debug(f"Ingested {result['received']} readings from device {x_device_id}")
+
+    return result
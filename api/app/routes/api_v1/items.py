@@ -30,17 +30,22 @@ from typing import Dict, Any, Optional
 import logging
 
 from app.models import ItemCreate, ItemUpdate, Category, Location, State
+from app.core.responses import FastJSONResponse, json_responses
 from app.middleware.auth import get_current_user
 from app.services.item_service import ItemService
+from app.services.rows import ItemPage, ItemRow
 
 logger = logging.getLogger(__name__)
+# Per-call read logs; sampled via LOG_SAMPLE_RATES
+read_logger = logging.getLogger(f"{__name__}.reads")
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
 @router.post(
     "",
-    response_model=Dict[str, Any],
+    response_model=None,
+    responses=json_responses(ItemRow, status.HTTP_201_CREATED),
     status_code=status.HTTP_201_CREATED,
     summary="Create a new item",
     description="""
@@ -96,7 +101,7 @@ router = APIRouter(prefix="/items", tags=["items"])
 async def create_item(
     item_data: ItemCreate,
     user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """
     Create a new item in the household catalog
     
@@ -105,7 +110,7 @@ async def create_item(
         user: Current authenticated user from JWT token
         
     Returns:
-        Created item with inventory
+        JSON response with created item and inventory
         
     Raises:
         AuthenticationError: If user is not authenticated
@@ -124,13 +129,14 @@ async def create_item(
         location=item_data.location
     )
     
-    logger.info(f"Item {item['id']} created successfully")
-    return item
+    logger.info(f"Item {item.id} created successfully")
+    return FastJSONResponse(item, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
     "",
-    response_model=Dict[str, Any],
+    response_model=None,
+    responses=json_responses(ItemPage),
     status_code=status.HTTP_200_OK,
     summary="Get household items",
     description="""
@@ -195,7 +201,7 @@ async def get_items(
     limit: int = Query(100, ge=1, le=1000, description="Max items to return"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """
     Get all items for a household with filters
     
@@ -210,14 +216,14 @@ async def get_items(
         user: Current authenticated user from JWT token
         
     Returns:
-        Dictionary with items list and total count
+        JSON response with items list and total count
         
     Raises:
         AuthenticationError: If user is not authenticated
         AuthorizationError: If user is not a member
     """
     user_id = user.get("sub")
-    logger.info(f"Fetching items for household {household_id} by user {user_id}")
+    read_logger.info("Fetching items for household %s by user %s", household_id, user_id)
     
     item_service = ItemService()
     items = await item_service.get_household_items(
@@ -228,16 +234,18 @@ async def get_items(
         category=category,
         sort_by=sort_by,
         limit=limit,
-        offset=offset
+        offset=offset,
+        as_json=True
     )
     
-    logger.info(f"Retrieved {items['total']} items for household {household_id}")
-    return items
+    # Already serialized; returning the response skips re-encoding
+    return FastJSONResponse(items)
 
 
 @router.get(
     "/{item_id}",
-    response_model=Dict[str, Any],
+    response_model=None,
+    responses=json_responses(ItemRow),
     status_code=status.HTTP_200_OK,
     summary="Get item details",
     description="""
@@ -277,7 +285,7 @@ async def get_items(
 async def get_item(
     item_id: str = Path(..., description="Item UUID"),
     user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """
     Get item details by ID
     
@@ -286,7 +294,7 @@ async def get_item(
         user: Current authenticated user from JWT token
         
     Returns:
-        Item details with inventory
+        JSON response with item details and inventory
         
     Raises:
         AuthenticationError: If user is not authenticated
@@ -294,18 +302,19 @@ async def get_item(
         NotFoundError: If item not found
     """
     user_id = user.get("sub")
-    logger.info(f"Fetching item {item_id} by user {user_id}")
+    read_logger.info("Fetching item %s by user %s", item_id, user_id)
     
     item_service = ItemService()
     item = await item_service.get_item_by_id(item_id, user_id)
     
-    logger.info(f"Retrieved item {item_id}")
-    return item
+    read_logger.info("Retrieved item %s", item_id)
+    return FastJSONResponse(item)
 
 
 @router.patch(
     "/{item_id}",
-    response_model=Dict[str, Any],
+    response_model=None,
+    responses=json_responses(ItemRow),
     status_code=status.HTTP_200_OK,
     summary="Update item",
     description="""
@@ -336,7 +345,7 @@ async def update_item(
     item_id: str = Path(..., description="Item UUID"),
     item_data: ItemUpdate = ...,
     user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> FastJSONResponse:
     """
     Update an item's details
     
@@ -346,7 +355,7 @@ async def update_item(
         user: Current authenticated user from JWT token
         
     Returns:
-        Updated item
+        JSON response with updated item
         
     Raises:
         AuthenticationError: If user is not authenticated
@@ -367,7 +376,7 @@ async def update_item(
     )
     
     logger.info(f"Item {item_id} updated successfully")
-    return item
+    return FastJSONResponse(item)
 
 
 @router.delete(
@@ -479,7 +488,7 @@ async def search_items(
         AuthorizationError: If user is not a member
     """
     user_id = user.get("sub")
-    logger.info(f"Searching items in household {household_id} with query '{q}' by user {user_id}")
+    read_logger.info("Searching items in household %s with query '%s' by user %s", household_id, q, user_id)
     
     item_service = ItemService()
     items = await item_service.search_items(
@@ -489,7 +498,7 @@ async def search_items(
         limit=limit
     )
     
-    logger.info(f"Found {len(items)} items matching '{q}'")
+    read_logger.info("Found %d items matching '%s'", len(items), q)
     return {
         'items': items,
         'total': len(items)
@@ -46,6 +46,11 @@ Authentication: Required (Supabase JWT)
 Rate Limit: 100 requests/minute per user
 Multi-tenant: Filtered by household membership
 Idempotency: Supported via Idempotency-Key header
+
+Startup: OCR and embedding libraries (pytesseract, pdf2image, PIL,
+sentence-transformers, numpy) run in the Celery worker. Import them inside
+the functions that use them, never at module level here or in services the
+API imports (tests/test_startup.py enforces this).
 """
 from fastapi import APIRouter
 
@@ -1,18 +1,20 @@
 """
 Restock list endpoints
 
-This module will provide endpoints for:
+This module provides endpoints for:
 - Generating restock lists with urgency grouping
 - Dismissing items temporarily
 - Exporting lists (text, JSON)
 - Nimbly integration (Restock Intent generation)
 - Receiving Action Options from Nimbly
 
+Endpoints:
+- GET /api/v1/restock/export - Export list (text or JSON, streamed)
+- POST /api/v1/restock/intent - Generate Restock Intent for Nimbly
+
 Planned Endpoints:
 - GET /api/v1/restock - Get restock list grouped by urgency
 - POST /api/v1/restock/{item_id}/dismiss - Dismiss item from list
-- GET /api/v1/restock/export - Export list (text or JSON)
-- POST /api/v1/restock/intent - Generate Restock Intent for Nimbly
 - POST /api/v1/restock/intent/{id}/handoff - Initiate Nimbly handoff
 - POST /api/v1/restock/intent/{id}/response - Receive Action Options from Nimbly
 
@@ -57,8 +59,191 @@ Authentication: Required (Supabase JWT)
 Rate Limit: 100 requests/minute per user
 Multi-tenant: Filtered by household membership
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Literal
+import logging
+
+from app.middleware.auth import get_current_user
+from app.services.restock_service import RestockService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/restock", tags=["restock"])
 
-# Endpoints will be implemented in Phase 3
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export restock list",
+    description="""
+    Export the household restock list as plain text or JSON.
+    
+    The export is streamed: the text format is written line by line grouped by
+    urgency, and the JSON format is the Restock Intent (integration contract v1)
+    written one item at a time.
+    
+    **Authentication:** Required (Supabase JWT)
+    
+    **Rate Limit:** 100 requests/minute per user
+    
+    **Query Parameters:**
+    - `household_id` (required): Household UUID
+    - `format`: Export format (`text` or `json`, default: `text`)
+    
+    **Example Response (text):**
+    ```
+    Need now:
+    - Milk (Out) - Currently out
+    
+    Need soon:
+    - Eggs (Low) - Predicted low in 2 days
+    ```
+    
+    **Errors:**
+    - `401 Unauthorized` - Missing or invalid authentication token
+    - `403 Forbidden` - User is not a member of the household
+    - `429 Too Many Requests` - Rate limit exceeded
+    - `500 Internal Server Error` - Database or server error
+    """,
+)
+async def export_restock_list(
+    household_id: str = Query(..., description="Household UUID"),
+    format: Literal["text", "json"] = Query("text", description="Export format (text, json)"),
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Export the restock list as a streamed text or JSON document
+    
+    Args:
+        household_id: Household UUID
+        format: Export format (text or json)
+        user: Current authenticated user from JWT token
+        
+    Returns:
+        StreamingResponse with the exported list
+        
+    Raises:
+        AuthenticationError: If user is not authenticated
+        AuthorizationError: If user is not a member
+    """
+    user_id = user.get("sub")
+    logger.info(f"Exporting restock list ({format}) for household {household_id} by user {user_id}")
+    
+    restock_service = RestockService()
+    
+    if format == "json":
+        intent = await restock_service.build_intent(household_id=household_id, user_id=user_id)
+        return StreamingResponse(
+            RestockService.iter_intent_json(intent),
+            media_type="application/json",
+            headers={"Content-Disposition": 'attachment; filename="restock-list.json"'}
+        )
+    
+    entries = await restock_service.get_restock_entries(household_id, user_id)
+    return StreamingResponse(
+        RestockService.iter_entries_text(entries),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="restock-list.txt"'}
+    )
+
+
+@router.post(
+    "/intent",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_201_CREATED,
+    summary="Generate Restock Intent",
+    description="""
+    Generate a Restock Intent for handoff to Nimbly (integration contract v1).
+    
+    The intent declares household need with confidence scores, reason codes and
+    suggested quantities. It never implies an obligation to buy. Identical
+    intents (same items and constraints) return the same `intent_id`.
+    
+    **Authentication:** Required (Supabase JWT)
+    
+    **Rate Limit:** 100 requests/minute per user
+    
+    **Example Request:**
+    ```json
+    {
+      "household_id": "550e8400-e29b-41d4-a716-446655440000",
+      "partial_fulfillment_allowed": true,
+      "local_first_preference": "neutral",
+      "budget_sensitivity": "medium"
+    }
+    ```
+    
+    **Example Response:**
+    ```json
+    {
+      "intent_id": "uuid",
+      "version": "v1",
+      "household_id": "550e8400-e29b-41d4-a716-446655440000",
+      "generated_at": "2024-01-15T10:30:00Z",
+      "overall_urgency": "medium",
+      "items": [
+        {
+          "canonical_name": "Milk 2%",
+          "category": "dairy",
+          "current_state": "low",
+          "confidence": 0.85,
+          "reason_codes": ["recent_usage_events"],
+          "suggested_quantity": 1,
+          "quantity_confidence": 0.6
+        }
+      ],
+      "constraints": {
+        "partial_fulfillment_allowed": true,
+        "local_first_preference": "neutral",
+        "budget_sensitivity": "medium"
+      }
+    }
+    ```
+    
+    **Errors:**
+    - `401 Unauthorized` - Missing or invalid authentication token
+    - `403 Forbidden` - User is not a member of the household
+    - `422 Unprocessable Entity` - Invalid constraints
+    - `429 Too Many Requests` - Rate limit exceeded
+    - `500 Internal Server Error` - Database or server error
+    """,
+)
+async def create_restock_intent(
+    household_id: str = Body(..., embed=True, description="Household UUID"),
+    partial_fulfillment_allowed: bool = Body(True, embed=True),
+    local_first_preference: Literal["neutral", "prefer", "required"] = Body("neutral", embed=True),
+    budget_sensitivity: Literal["low", "medium", "high"] = Body("medium", embed=True),
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Generate a Restock Intent for Nimbly
+    
+    Args:
+        household_id: Household UUID
+        partial_fulfillment_allowed: Whether partial fulfillment is allowed
+        local_first_preference: Local-first preference (neutral, prefer, required)
+        budget_sensitivity: Budget sensitivity (low, medium, high)
+        user: Current authenticated user from JWT token
+        
+    Returns:
+        Restock Intent with metadata, items and constraints
+        
+    Raises:
+        AuthenticationError: If user is not authenticated
+        AuthorizationError: If user is not a member
+    """
+    user_id = user.get("sub")
+    logger.info(f"Generating restock intent for household {household_id} by user {user_id}")
+    
+    restock_service = RestockService()
+    intent = await restock_service.build_intent(
+        household_id=household_id,
+        user_id=user_id,
+        partial_fulfillment_allowed=partial_fulfillment_allowed,
+        local_first_preference=local_first_preference,
+        budget_sensitivity=budget_sensitivity
+    )
+    
+    logger.info(f"Restock intent {intent['intent_id']} generated")
+    return intent
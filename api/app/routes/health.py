@@ -1,11 +1,18 @@
 """
 Health check endpoints
 """
-from fastapi import APIRouter, status, Request, Depends
+from fastapi import APIRouter, HTTPException, status, Request, Depends
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 from datetime import datetime
 from typing import Dict, Any
 
+from app.core.config import settings
+from app.core.metrics import render_metrics
 from app.middleware.rate_limit import limiter, get_rate_limit_status
+from app.services.cache import get_household_cache
+from app.services.change_feed import get_change_feed
+from app.services.health import get_health_checker
 
 router = APIRouter(tags=["health"])
 
@@ -21,6 +28,9 @@ async def health_check(request: Request) -> Dict[str, Any]:
     - Load balancers to check service availability
     - Monitoring systems to track uptime
     
+    It doesn't check dependencies; orchestrators should probe /health/live
+    and /health/ready instead.
+    
     **Rate Limit:** 100 requests per minute per IP
     
     **Authentication:** Not required
@@ -50,6 +60,68 @@ async def health_check(request: Request) -> Dict[str, Any]:
     }
 
 
+@router.get("/health/live", status_code=status.HTTP_200_OK)
+@limiter.exempt
+async def liveness() -> Dict[str, str]:
+    """
+    Liveness probe: the worker is up and its event loop is responsive
+    
+    Checks no dependencies, so an outage elsewhere doesn't get every pod
+    restarted. Not rate limited, so frequent probes from one load balancer
+    address never see a 429.
+    
+    **Authentication:** Not required
+    
+    Returns:
+        dict: {"status": "alive"}
+    """
+    return {"status": "alive"}
+
+
+@router.get(
+    "/health/ready",
+    status_code=status.HTTP_200_OK,
+    responses={503: {"description": "A dependency is down; stop routing traffic here"}}
+)
+@limiter.exempt
+async def readiness() -> JSONResponse:
+    """
+    Readiness probe: Supabase, the Celery broker and rate limit storage
+    
+    The checks run concurrently with a timeout each (HEALTH_CHECK_TIMEOUT)
+    and the result is cached for HEALTH_CACHE_SECONDS, so probe storms don't
+    fan out to the dependencies. Dependencies that aren't configured (no
+    CELERY_BROKER_URL, rate limiting off) are reported as skipped. Not rate
+    limited.
+    
+    **Authentication:** Not required
+    
+    Returns:
+        JSONResponse: 200 when every dependency is ok or skipped, else 503,
+        with per-dependency status and latency
+    
+    Example Response:
+        ```json
+        {
+          "status": "ready",
+          "checked_at": "2024-01-15T10:30:00.000000+00:00",
+          "cached": false,
+          "checks": {
+            "supabase": {"status": "ok", "latency_ms": 18.4},
+            "broker": {"status": "ok", "latency_ms": 1.2},
+            "rate_limit_storage": {"status": "ok", "latency_ms": 0.3}
+          }
+        }
+        ```
+    """
+    result = await get_health_checker().check()
+    ready = result.pop("ready")
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", **result},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
 @router.get("/", status_code=status.HTTP_200_OK)
 async def root() -> Dict[str, str]:
     """
@@ -118,3 +190,85 @@ async def rate_limit_status(request: Request) -> Dict[str, Any]:
         "rate_limiting": status_info,
         "message": "Rate limiting is active for all API endpoints"
     }
+
+
+@router.get("/cache-status", status_code=status.HTTP_200_OK)
+async def cache_status() -> Dict[str, Any]:
+    """
+    Get household cache and change feed counters for this worker
+    
+    Useful for checking that the household response cache is effective and
+    that the change feed (which invalidates it) is connected. Counters are
+    per worker process and reset on restart.
+    
+    **Authentication:** Not required
+    
+    Returns:
+        dict: Cache configuration and counters including:
+            - hit_ratio: (local + Redis hits) / lookups
+            - hits_local / hits_redis / misses: Lookup outcomes
+            - coalesced: Misses that waited on an in-flight load
+            - invalidations: Household generation bumps
+            - errors: Redis failures (cache bypassed)
+            - shared_invalidation: Writes in other workers reach this cache
+              (Redis or a connected change feed); authorization results are
+              only cached while true
+        and change_feed: listener connection, notifications received and
+        open stream subscribers
+    
+    Example Response:
+        ```json
+        {
+          "cache": {
+            "enabled": true,
+            "backend": "local",
+            "shared_invalidation": true,
+            "entries": 812,
+            "max_entries": 10000,
+            "ttl_seconds": 60.0,
+            "hits_local": 9120,
+            "hits_redis": 0,
+            "misses": 1034,
+            "coalesced": 12,
+            "invalidations": 220,
+            "errors": 0,
+            "hit_ratio": 0.8982
+          },
+          "change_feed": {
+            "connected": true,
+            "notifications": 231,
+            "households": 14,
+            "subscribers": 19
+          }
+        }
+        ```
+    """
+    return {
+        "cache": get_household_cache().stats(),
+        "change_feed": get_change_feed().stats()
+    }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus metrics for this worker
+    
+    Request latency per route template, requests in flight, database call
+    latency and errors per service method, cache and change feed counters,
+    rate limit rejections and Celery queue depth (see app.core.metrics).
+    Celery task durations are served by the worker on CELERY_METRICS_PORT.
+    
+    **Authentication:** Not required; keep this endpoint off the public
+    ingress and let Prometheus scrape it on the internal network.
+    
+    Returns:
+        Response: Prometheus text exposition format
+    
+    Raises:
+        HTTPException: 404 if METRICS_ENABLED is off
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    
+    return Response(await render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,313 @@
+"""
+Household-scoped response cache
+
+Reads of household data (items list, household detail, invitations) are
+cached as serialized JSON bytes, keyed by household and query shape:
+
+    <household_id>:<generation>:<shape>
+
+Every write to a household's data goes through `invalidate(household_id)`,
+which bumps the household's generation. Readers always build keys from the
+current generation, so entries written before the bump are never served
+again; they simply age out of the LRU (or expire in Redis). A load that was
+already running when the generation was bumped stores its result under the
+old generation, where nobody reads it.
+
+Tiers:
+- In-process LRU (CACHE_MAX_ENTRIES entries, CACHE_TTL seconds), always on.
+- Redis (CACHE_REDIS_URL), optional. When configured, generations live in
+  Redis so a write in one worker invalidates every worker, and loaded values
+  are shared between workers. If Redis is unreachable the cache is bypassed
+  (reads go to the database) rather than risk serving stale data.
+
+Without Redis, generations are per worker: a write is seen immediately by the
+worker that made it, by other workers as soon as the change feed delivers it
+(app.services.change_feed) and otherwise within CACHE_TTL seconds.
+
+Concurrent misses for the same key are coalesced (single-flight): one caller
+runs the loader, the others await its result. Loader errors are never cached.
+
+Authorization is the caller's job: shapes that depend on who is asking must
+include the user in the shape (e.g. `member:<user_id>`), and authorization
+results are loaded with shared_only=True, so they are only cached while every
+worker's writes reach this cache (Redis, or a connected change feed). A
+removed member must not keep access for CACHE_TTL on the other workers.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "snakr:cache"
+
+
+class HouseholdCache:
+    """Two-tier cache of JSON bytes with per-household generations"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        redis_url: Optional[str] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.CACHE_TTL
+        self.redis_url = settings.CACHE_REDIS_URL if redis_url is None else redis_url
+        self.enabled = settings.CACHE_ENABLED if enabled is None else enabled
+
+        # key -> (value, expires_at)
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        # household_id -> generation (local mode only; one int per household
+        # written in this worker)
+        self._generations: Dict[str, int] = {}
+        self._next_generation = 1
+        # key -> future of the load in progress
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._redis = None
+        # Set by the change feed while it is listening
+        self.feed_connected = False
+
+        self._counters = {
+            "hits_local": 0,
+            "hits_redis": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_or_load(
+        self,
+        household_id: str,
+        shape: str,
+        loader: Callable[[], Awaitable[bytes]],
+        shared_only: bool = False
+    ) -> bytes:
+        """
+        Get a cached value, loading it on a miss
+
+        Args:
+            household_id: Household the value belongs to
+            shape: Query shape (e.g. "items:fridge:-:-:name:100:0")
+            loader: Coroutine function producing the serialized value
+            shared_only: Only use the cache while invalidations are shared
+                between workers (see shared_invalidation); otherwise always
+                call the loader
+
+        Returns:
+            Serialized value (JSON bytes)
+        """
+        if not self.enabled or (shared_only and not self.shared_invalidation):
+            return await loader()
+
+        generation = await self._generation(household_id)
+        if generation is None:
+            # Redis configured but unreachable: don't trust any cached entry
+            return await loader()
+
+        key = f"{household_id}:{generation}:{shape}"
+
+        value = self._get_local(key)
+        if value is not None:
+            self._counters["hits_local"] += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._counters["coalesced"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The loading caller was cancelled; load ourselves
+                return await self.get_or_load(household_id, shape, loader, shared_only=shared_only)
+
+        return await self._load(key, loader)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Load a missing entry (Redis tier first), letting concurrent callers wait on it"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._get_redis(key)
+            if value is not None:
+                self._counters["hits_redis"] += 1
+            else:
+                self._counters["misses"] += 1
+                value = await loader()
+                await self._set_redis(key, value)
+            self._set_local(key, value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            self._inflight.pop(key, None)
+
+        return value
+
+    async def invalidate(self, household_id: str) -> None:
+        """
+        Invalidate everything cached for a household
+
+        Call after any write to the household's items, inventory, members or
+        invitations. Never raises: a failure is logged and bounded by CACHE_TTL.
+
+        Args:
+            household_id: Household UUID
+        """
+        if not self.enabled:
+            return
+
+        self._counters["invalidations"] += 1
+        self._generations[household_id] = self._next_generation
+        self._next_generation += 1
+
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.incr(f"{REDIS_KEY_PREFIX}:gen:{household_id}")
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.warning(f"Failed to invalidate cache for household {household_id} in Redis: {e}")
+
+    @property
+    def shared_invalidation(self) -> bool:
+        """Whether writes made by other workers invalidate this cache right away"""
+        return bool(self.redis_url) or self.feed_connected
+
+    def clear(self) -> None:
+        """Drop all locally cached entries and generations"""
+        self._entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters for monitoring
+
+        Returns:
+            Hit/miss counters, hit ratio and current size
+        """
+        hits = self._counters["hits_local"] + self._counters["hits_redis"]
+        lookups = hits + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if self.redis_url else "local",
+            "shared_invalidation": self.shared_invalidation,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            **self._counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Close the Redis connection, if any"""
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing cache Redis connection: {e}")
+            self._redis = None
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _set_local(self, key: str, value: bytes) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _redis_client(self):
+        """Redis client, created on first use (None when not configured)"""
+        if not self.redis_url:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                socket_timeout=0.25,
+                socket_connect_timeout=0.25
+            )
+        return self._redis
+
+    async def _generation(self, household_id: str) -> Optional[int]:
+        """Current generation of a household (None if Redis is unreachable)"""
+        client = self._redis_client()
+        if client is None:
+            return self._generations.get(household_id, 0)
+        try:
+            value = await client.get(f"{REDIS_KEY_PREFIX}:gen:{household_id}")
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.warning(f"Cache Redis unavailable, bypassing cache: {e}")
+            return None
+        return int(value) if value is not None else 0
+
+    async def _get_redis(self, key: str) -> Optional[bytes]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            return await client.get(f"{REDIS_KEY_PREFIX}:{key}")
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.warning(f"Cache Redis read failed: {e}")
+            return None
+
+    async def _set_redis(self, key: str, value: bytes) -> None:
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.set(f"{REDIS_KEY_PREFIX}:{key}", value, ex=max(1, int(self.ttl)))
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.warning(f"Cache Redis write failed: {e}")
+
+
+_cache: Optional[HouseholdCache] = None
+
+
+def get_household_cache() -> HouseholdCache:
+    """
+    Get the household cache for this worker
+
+    Returns:
+        HouseholdCache: Shared cache instance
+    """
+    global _cache
+    if _cache is None:
+        _cache = HouseholdCache()
+    return _cache
@@ -0,0 +1,261 @@
+"""
+Household change feed
+
+Listens for Postgres notifications on the household_changes channel (sent by
+statement triggers on items, inventory, restock_list, household_members and
+invitations; see 20260122140000_create_household_change_notify.sql) and, for
+each change:
+
+1. Invalidates the household in the response cache, so writes made outside
+   the API (Celery tasks, SQL, other services) are never served stale
+2. Fans the change out to this worker's subscribers for that household, which
+   the stream endpoint (GET /api/v1/households/{id}/stream) forwards to
+   clients as server-sent events
+
+Every worker runs its own listener on one dedicated connection
+(DATABASE_URL; LISTEN needs a direct or session-pooled connection, not a
+transaction pooler). The connection is watched with loop.add_reader, so
+waiting for notifications costs no thread and no polling. If the connection
+drops, the listener reconnects with backoff; since notifications sent in the
+meantime are lost, it then clears the local cache and tells every subscriber
+to resync.
+
+Subscribers get a bounded queue. A client that falls behind has its pending
+changes replaced by a single resync message rather than growing the queue.
+"""
+from typing import Any, Dict, Iterator, Optional, Set
+from contextlib import contextmanager
+import asyncio
+import json
+import logging
+
+from app.core.config import settings
+from app.services.cache import HouseholdCache, get_household_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "household_changes"
+RESYNC = {"type": "resync"}
+
+
+class Subscription:
+    """Queue of changes for one client stream"""
+
+    def __init__(self, household_id: str, maxsize: int):
+        self.household_id = household_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def put(self, message: Dict[str, Any]) -> None:
+        """Queue a message; on overflow, replace the backlog with a resync"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next message, or None if none arrives within timeout seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """LISTEN/NOTIFY consumer fanning household changes out per household"""
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        cache: Optional[HouseholdCache] = None
+    ):
+        self.dsn = dsn or settings.DATABASE_URL
+        self.queue_size = queue_size or settings.CHANGE_FEED_QUEUE_SIZE
+        self.cache = cache or get_household_cache()
+
+        # household_id -> subscriptions in this worker
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.connected = False
+        self.notifications = 0
+
+    async def start(self) -> None:
+        """Start listening in the background"""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @contextmanager
+    def subscribe(self, household_id: str) -> Iterator[Subscription]:
+        """
+        Subscribe to a household's changes for the duration of a block
+
+        Args:
+            household_id: Household UUID
+
+        Yields:
+            Subscription receiving change and resync messages
+        """
+        subscription = Subscription(household_id, self.queue_size)
+        self._subscribers.setdefault(household_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(household_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[household_id]
+
+    async def dispatch(self, payload: str) -> None:
+        """
+        Handle one notification payload
+
+        Args:
+            payload: JSON sent by notify_household_change()
+        """
+        try:
+            change = json.loads(payload)
+            household_id = change["household_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed household change: {payload[:200]}")
+            return
+
+        self.notifications += 1
+        await self.cache.invalidate(household_id)
+
+        subscribers = self._subscribers.get(household_id)
+        if subscribers:
+            message = {
+                "type": "change",
+                "table": change.get("table"),
+                "op": change.get("op"),
+                "item_ids": change.get("item_ids"),
+            }
+            for subscription in subscribers:
+                subscription.put(message)
+
+    def stats(self) -> Dict[str, Any]:
+        """Listener state and subscriber counts for monitoring"""
+        return {
+            "connected": self.connected,
+            "notifications": self.notifications,
+            "households": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+        }
+
+    def _resync_all(self) -> None:
+        """Recover from missed notifications after a reconnect"""
+        self.cache.clear()
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.put(RESYNC)
+
+    async def _run(self) -> None:
+        """Connect, listen, and reconnect with backoff until stopped"""
+        loop = asyncio.get_running_loop()
+        backoff = 1.0
+        first = True
+        while not self._stopping:
+            conn = None
+            try:
+                conn = await loop.run_in_executor(None, self._connect)
+                if not first:
+                    self._resync_all()
+                first = False
+                backoff = 1.0
+                self.connected = self.cache.feed_connected = True
+                logger.info(f"Listening for household changes on {CHANNEL}")
+                await self._listen(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Household change feed disconnected: {e}; retrying in {backoff:.0f}s")
+            finally:
+                self.connected = self.cache.feed_connected = False
+                if conn is not None:
+                    conn.close()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _connect(self):
+        """Open the LISTEN connection (blocking; run in an executor)"""
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(
+            self.dsn,
+            # Detect dead connections without polling queries
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3,
+            application_name="snakr-change-feed"
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    async def _listen(self, conn) -> None:
+        """Dispatch notifications as the connection becomes readable"""
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        fd = conn.fileno()
+        loop.add_reader(fd, readable.set)
+        try:
+            while not self._stopping:
+                await readable.wait()
+                readable.clear()
+                # Raises if the connection was lost
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    await self.dispatch(notify.payload)
+        finally:
+            loop.remove_reader(fd)
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> bytes:
+    """
+    Format a server-sent event
+
+    Args:
+        event: Event name (e.g. "change")
+        data: JSON-serializable payload
+
+    Returns:
+        Encoded SSE frame
+    """
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+_feed: Optional[ChangeFeed] = None
+
+
+def get_change_feed() -> ChangeFeed:
+    """
+    Get the change feed for this worker
+
+    Returns:
+        ChangeFeed: Shared feed instance
+    """
+    global _feed
+    if _feed is None:
+        _feed = ChangeFeed()
+    return _feed
@@ -0,0 +1,357 @@
+"""
+Event service for business logic
+
+This service reads the immutable event log. Events are paginated with keyset
+cursors over (created_at DESC, id DESC) so that every page is an index range
+scan on idx_events_household_created (or idx_events_item_created when filtered
+by item), regardless of how deep into the history the page is.
+
+Exports walk the same index in ascending order, batch by batch, and stream
+NDJSON so memory stays constant however long the household history is.
+
+The events table is partitioned by month on created_at. Every query here
+orders by created_at, and keyset pages also carry a plain created_at bound next
+to the OR predicate (which the planner cannot prune on), so only the partitions
+on one side of the cursor are scanned.
+"""
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+from datetime import datetime
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import uuid
+
+from app.services.supabase_client import get_supabase
+from app.core.errors import AuthorizationError, ValidationError
+from app.core.metrics import db_call
+
+logger = logging.getLogger(__name__)
+
+# Columns returned by the event log API (household_id is implied by the filter)
+EVENT_COLUMNS = "id, event_type, source, item_id, receipt_id, payload, confidence, created_at"
+
+# Event types accepted by the events table CHECK constraint
+EVENT_TYPES = (
+    "inventory.used",
+    "inventory.restocked",
+    "inventory.ran_out",
+    "receipt.ingested",
+    "receipt.confirmed",
+    "prediction.generated",
+    "iot.door_opened",
+    "iot.weight_changed",
+    "iot.snapshot_available",
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Rows fetched per round-trip when exporting
+EXPORT_BATCH_SIZE = 1000
+
+
+def encode_cursor(created_at: str, event_id: str) -> str:
+    """
+    Encode an event position as an opaque keyset cursor
+
+    Args:
+        created_at: Event timestamp as returned by the database
+        event_id: Event UUID
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at}|{event_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a keyset cursor into (created_at, id)
+
+    Args:
+        cursor: Cursor from a previous page
+
+    Returns:
+        Tuple of event timestamp and event UUID
+
+    Raises:
+        ValidationError: If the cursor is malformed (both halves are checked,
+            since they end up in a PostgREST filter)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, event_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        return created_at, str(uuid.UUID(event_id))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValidationError(
+            "Invalid event cursor",
+            user_message="That page link doesn't look right.",
+            next_steps="Start again from the first page."
+        )
+
+
+def validate_event_type(event_type: Optional[str]) -> None:
+    """
+    Validate an optional event type filter
+
+    Args:
+        event_type: Event type filter or None
+
+    Raises:
+        ValidationError: If the event type is unknown
+    """
+    if event_type is not None and event_type not in EVENT_TYPES:
+        raise ValidationError(
+            f"Unknown event type: {event_type}",
+            user_message="That event type isn't one we know about.",
+            next_steps=f"Use one of: {', '.join(EVENT_TYPES)}."
+        )
+
+
+def keyset_predicate(position: Tuple[str, str], descending: bool) -> str:
+    """
+    Build the PostgREST filter selecting rows strictly after a position
+
+    Args:
+        position: (created_at, id) of the last row already seen, as returned
+            by decode_cursor
+        descending: True when paging newest first
+
+    Returns:
+        Filter string for query.or_()
+    """
+    created_at, event_id = position
+    op = 'lt' if descending else 'gt'
+    return (
+        f'created_at.{op}."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.{op}."{event_id}")'
+    )
+
+
+def to_ndjson(row: Dict[str, Any]) -> str:
+    """
+    Serialize an event row as one NDJSON line with its resume cursor
+
+    Args:
+        row: Event row as returned by the database
+
+    Returns:
+        JSON line terminated by a newline
+    """
+    line = dict(row)
+    line['cursor'] = encode_cursor(row['created_at'], row['id'])
+    return json.dumps(line, separators=(',', ':')) + '\n'
+
+
+class EventService:
+    """Service for event log read operations"""
+
+    def __init__(self):
+        self.supabase = get_supabase()
+
+    @db_call
+    async def list_events(
+        self,
+        household_id: str,
+        user_id: str,
+        event_type: Optional[str] = None,
+        item_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """
+        List household events, newest first, with keyset pagination
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID making the request
+            event_type: Optional event type filter
+            item_id: Optional item UUID filter
+            start_date: Optional inclusive lower bound on created_at
+            end_date: Optional exclusive upper bound on created_at
+            cursor: Cursor from the previous page (None for the first page)
+            limit: Page size (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            Dictionary with events, next_cursor and has_more
+
+        Raises:
+            AuthorizationError: If user is not a member
+            ValidationError: If filters or cursor are invalid
+        """
+        validate_event_type(event_type)
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        position = decode_cursor(cursor) if cursor else None
+
+        await self._verify_household_member(household_id, user_id)
+
+        try:
+            query = self.supabase.table('events')\
+                .select(EVENT_COLUMNS)\
+                .eq('household_id', household_id)
+
+            if event_type:
+                query = query.eq('event_type', event_type)
+
+            if item_id:
+                query = query.eq('item_id', item_id)
+
+            if start_date:
+                query = query.gte('created_at', start_date.isoformat())
+
+            if end_date:
+                query = query.lt('created_at', end_date.isoformat())
+
+            if position:
+                # Redundant bound so the planner can prune newer partitions
+                query = query\
+                    .lte('created_at', position[0])\
+                    .or_(keyset_predicate(position, descending=True))
+
+            # Fetch one extra row to know whether another page exists
+            response = query\
+                .order('created_at', desc=True)\
+                .order('id', desc=True)\
+                .limit(limit + 1)\
+                .execute()
+
+            rows: List[Dict[str, Any]] = response.data or []
+            has_more = len(rows) > limit
+            events = rows[:limit]
+
+            next_cursor = None
+            if has_more:
+                last = events[-1]
+                next_cursor = encode_cursor(last['created_at'], last['id'])
+
+            logger.debug(f"Retrieved {len(events)} events for household {household_id}")
+
+            return {
+                'events': events,
+                'next_cursor': next_cursor,
+                'has_more': has_more
+            }
+
+        except (AuthorizationError, ValidationError):
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching events for household {household_id}: {e}", exc_info=True)
+            raise Exception(f"Failed to fetch events: {str(e)}")
+
+    async def iter_export(
+        self,
+        household_id: str,
+        since: Optional[str] = None,
+        event_type: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[str]:
+        """
+        Stream household events oldest first as NDJSON lines
+
+        Each line carries a `cursor`; passing the last received cursor as
+        `since` resumes the export right after that event. Only one batch is
+        held in memory at a time. Callers must verify membership before
+        starting the stream (see verify_access) and validate `since` and
+        `event_type`, since errors can no longer change the response status
+        once streaming has begun.
+
+        Args:
+            household_id: Household UUID
+            since: Cursor of the last event already exported
+            event_type: Optional event type filter
+            batch_size: Rows fetched per round-trip
+
+        Yields:
+            NDJSON lines
+        """
+        position = decode_cursor(since) if since else None
+        exported = 0
+
+        while True:
+            query = self.supabase.table('events')\
+                .select(EVENT_COLUMNS)\
+                .eq('household_id', household_id)
+
+            if event_type:
+                query = query.eq('event_type', event_type)
+
+            if position:
+                # Redundant bound so the planner can prune older partitions
+                query = query\
+                    .gte('created_at', position[0])\
+                    .or_(keyset_predicate(position, descending=False))
+
+            query = query\
+                .order('created_at')\
+                .order('id')\
+                .limit(batch_size)
+
+            # The Supabase client is synchronous; keep the event loop free
+            response = await asyncio.to_thread(query.execute)
+            rows: List[Dict[str, Any]] = response.data or []
+
+            for row in rows:
+                yield to_ndjson(row)
+
+            exported += len(rows)
+            if len(rows) < batch_size:
+                break
+
+            position = (rows[-1]['created_at'], rows[-1]['id'])
+
+        logger.info(f"Exported {exported} events for household {household_id}")
+
+    async def verify_access(self, household_id: str, user_id: str) -> None:
+        """
+        Verify that a user may read a household's events
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID
+
+        Raises:
+            AuthorizationError: If user is not a member
+        """
+        await self._verify_household_member(household_id, user_id)
+
+    @db_call
+    async def _verify_household_member(self, household_id: str, user_id: str) -> None:
+        """
+        Verify that a user is a member of a household
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID
+
+        Raises:
+            AuthorizationError: If user is not a member
+        """
+        try:
+            response = self.supabase.table('household_members')\
+                .select('id')\
+                .eq('household_id', household_id)\
+                .eq('user_id', user_id)\
+                .execute()
+
+            if not response.data:
+                raise AuthorizationError(
+                    "User is not a member of this household",
+                    user_message="You don't have access to this household.",
+                    next_steps="Contact the household admin for access."
+                )
+        except AuthorizationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error verifying household membership: {e}", exc_info=True)
+            raise AuthorizationError(
+                "Failed to verify household membership",
+                user_message="We couldn't verify your access.",
+                next_steps="Try again or contact support."
+            )
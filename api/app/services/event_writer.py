@@ -0,0 +1,450 @@
+"""
+Batched event writer
+
+Event producers (quick actions, receipt confirmation, predictions, IoT
+readings) hand events to a per-worker EventWriter instead of inserting them one
+row at a time. Events are buffered in memory and flushed as one multi-row
+insert when the buffer reaches EVENT_WRITER_BATCH_SIZE or every
+EVENT_WRITER_FLUSH_INTERVAL seconds, whichever comes first.
+
+Durability:
+- Event ids and timestamps are assigned when the event is written, so a row
+  keeps its identity across retries and replays.
+- If a flush fails (or the database is unreachable at shutdown), the batch is
+  appended to a spool file (JSON lines) in EVENT_WRITER_SPOOL_DIR. The flush
+  loop replays spooled events on its next cycle or at worker start, skipping
+  rows that already made it in.
+- A batch the database rejects outright (a foreign key or CHECK violation)
+  is bisected to find the rows at fault; those are set aside in a
+  bad-*.jsonl file, never replayed, and the rest of the batch is stored.
+  Spool lines that can't be parsed (a write cut short by a crash) go to the
+  same kind of file, so neither blocks a replay.
+- Events buffered at the moment a worker is killed without a graceful
+  shutdown are lost; the flush interval bounds that window.
+
+User-facing actions that must not return before their event is stored call
+write(..., sync=True). That flushes the buffer immediately (carrying any
+buffered background events along, but never waiting on a spool replay) and
+raises if the caller's events aren't stored, instead of spooling them.
+"""
+from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+from app.core.config import settings
+from app.services.supabase_client import get_supabase
+from app.services.event_service import validate_event_type
+
+logger = logging.getLogger(__name__)
+
+# Sources accepted by the events table CHECK constraint
+EVENT_SOURCES = ("user", "receipt", "prediction", "iot", "system")
+
+# SQLSTATE classes of errors that retrying the same rows can't fix:
+# data exceptions (22) and integrity constraint violations (23)
+PERMANENT_ERROR_CLASSES = ("22", "23")
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Whether an insert failed because of the rows themselves, not the database being unavailable"""
+    return str(getattr(error, 'code', None) or '').startswith(PERMANENT_ERROR_CLASSES)
+
+
+class EventWriter:
+    """Buffers events and writes them to the events table in batches"""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        spool_dir: Optional[str] = None
+    ):
+        self.batch_size = batch_size or settings.EVENT_WRITER_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.EVENT_WRITER_FLUSH_INTERVAL
+        self.spool_dir = Path(spool_dir or settings.EVENT_WRITER_SPOOL_DIR)
+        self.spool_path = self.spool_dir / f"events-{os.getpid()}.jsonl"
+
+        self._buffer: List[Dict[str, Any]] = []
+        # Sync writers waiting on rows currently buffered: (future, their row ids)
+        self._waiters: List[Tuple[asyncio.Future, Set[str]]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.flushed = 0
+        self.spooled = 0
+
+    @staticmethod
+    def build_event(
+        household_id: str,
+        event_type: str,
+        source: str,
+        payload: Optional[Dict[str, Any]] = None,
+        item_id: Optional[str] = None,
+        receipt_id: Optional[str] = None,
+        confidence: float = 1.0,
+        created_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Build an events row, assigning its id and timestamp
+
+        Args:
+            household_id: Household UUID
+            event_type: One of EVENT_TYPES
+            source: One of EVENT_SOURCES
+            payload: Event-specific data
+            item_id: Optional item UUID
+            receipt_id: Optional receipt UUID
+            confidence: Confidence score 0.0-1.0
+            created_at: Event time (defaults to now)
+
+        Returns:
+            Row dictionary ready for insert
+
+        Raises:
+            ValidationError: If event type is unknown
+            ValueError: If source or confidence is invalid
+        """
+        validate_event_type(event_type)
+        if source not in EVENT_SOURCES:
+            raise ValueError(f"Unknown event source: {source}")
+        if not 0.0 <= confidence <= 1.0:
+            raise ValueError(f"Confidence must be between 0.0 and 1.0, got {confidence}")
+
+        return {
+            'id': str(uuid.uuid4()),
+            'household_id': household_id,
+            'event_type': event_type,
+            'source': source,
+            'item_id': item_id,
+            'receipt_id': receipt_id,
+            'payload': payload or {},
+            'confidence': round(confidence, 2),
+            'created_at': (created_at or datetime.now(timezone.utc)).isoformat()
+        }
+
+    async def write(self, event: Dict[str, Any], sync: bool = False) -> Dict[str, Any]:
+        """
+        Queue an event (built with build_event) for insertion
+
+        Args:
+            event: Event row
+            sync: Wait until the event is stored; raises if the insert fails
+
+        Returns:
+            The event row
+        """
+        await self.write_many([event], sync=sync)
+        return event
+
+    async def write_many(self, events: Iterable[Dict[str, Any]], sync: bool = False) -> int:
+        """
+        Queue several events for insertion
+
+        Args:
+            events: Event rows
+            sync: Wait until the events are stored; raises if the insert fails
+
+        Returns:
+            Number of events queued
+        """
+        events = list(events)
+        if not events:
+            return 0
+
+        self._ensure_running()
+        self._buffer.extend(events)
+
+        if sync:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((waiter, {e['id'] for e in events}))
+            await self.flush()
+            # The flush that took our rows may have been another caller's
+            await waiter
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+        return len(events)
+
+    async def flush(self) -> int:
+        """
+        Write everything buffered to the database
+
+        Spooled events are replayed by the flush loop, not here, so a sync
+        writer only ever waits on the buffer.
+
+        Returns:
+            Number of events inserted
+        """
+        async with self._flush_lock:
+            rows, self._buffer = self._buffer, []
+            waiters, self._waiters = self._waiters, []
+            waited = {row_id for _, ids in waiters for row_id in ids}
+
+            rejected, unstored, error = await self._insert_batches(rows)
+            # Sync callers get the error; only background rows are set aside
+            self._quarantine_rows([row for row in rejected if row['id'] not in waited])
+            if error is not None:
+                logger.error(f"Event flush failed for {len(unstored)} events: {error}", exc_info=error)
+                self._spool([row for row in unstored if row['id'] not in waited])
+
+            failed = {row['id'] for row in rejected + unstored}
+            self._resolve(waiters, failed, error)
+
+            done = len(rows) - len(failed)
+            self.flushed += done
+            if done:
+                logger.debug(f"Flushed {done} events")
+            return done
+
+    async def start(self) -> None:
+        """Start the periodic flush loop and replay any spooled events"""
+        self._stopping = False
+        self._ensure_running()
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Flush remaining events and stop; unflushable events are spooled"""
+        self._stopping = True
+        if self._task:
+            # Let an in-flight flush finish rather than cancelling it mid-insert
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
+        logger.info(f"Event writer stopped ({self.flushed} flushed, {self.spooled} spooled)")
+
+    def _ensure_running(self) -> None:
+        """Start the flush loop lazily on the current event loop"""
+        if self._task is None and not self._stopping:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        """Flush on the size threshold or the time interval"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                if self._buffer:
+                    await self.flush()
+                if self.spool_dir.exists():
+                    await self._replay_spool()
+            except Exception as e:
+                # Keep the loop alive; the next cycle retries
+                logger.error(f"Event flush loop error: {e}", exc_info=True)
+
+    async def _insert_batches(
+        self,
+        rows: List[Dict[str, Any]],
+        replay: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Optional[Exception]]:
+        """
+        Insert rows batch by batch, stopping at the first transient error
+
+        Returns:
+            (rows the database rejected, rows not stored because of the
+            transient error, that error or None)
+        """
+        rejected: List[Dict[str, Any]] = []
+        for start in range(0, len(rows), self.batch_size):
+            try:
+                rejected += await self._insert_isolating(rows[start:start + self.batch_size], replay)
+            except Exception as e:
+                return rejected, rows[start:], e
+        return rejected, [], None
+
+    async def _insert_isolating(self, rows: List[Dict[str, Any]], replay: bool) -> List[Dict[str, Any]]:
+        """
+        Insert a batch; if the database rejects it, bisect to find the rows at fault
+
+        A failed statement stores nothing, so each half is retried on its
+        own; a bad row costs about log2(batch size) extra inserts.
+
+        Returns:
+            Rows the database rejected
+
+        Raises:
+            Exception: Any error that isn't a rejection of the rows themselves
+        """
+        try:
+            await self._insert(rows, replay=replay)
+            return []
+        except Exception as e:
+            if not is_permanent_error(e):
+                raise
+            if len(rows) == 1:
+                logger.error(f"Event {rows[0].get('id')} rejected by the database: {e}")
+                return rows
+
+        middle = len(rows) // 2
+        return (
+            await self._insert_isolating(rows[:middle], replay)
+            + await self._insert_isolating(rows[middle:], replay)
+        )
+
+    @staticmethod
+    def _resolve(
+        waiters: List[Tuple[asyncio.Future, Set[str]]],
+        failed: Set[str],
+        error: Optional[Exception]
+    ) -> None:
+        """Wake sync writers: an error for those whose rows weren't stored"""
+        for waiter, ids in waiters:
+            if waiter.done():
+                continue
+            if ids & failed:
+                reason = str(error) if error is not None else "rejected by the database"
+                waiter.set_exception(Exception(f"Failed to write events: {reason}"))
+            else:
+                waiter.set_result(None)
+
+    async def _insert(self, rows: List[Dict[str, Any]], replay: bool = False) -> None:
+        """Insert rows in one statement (replays skip rows already stored)"""
+        supabase = get_supabase()
+        if replay:
+            query = supabase.table('events').upsert(
+                rows, on_conflict='id,created_at', ignore_duplicates=True
+            )
+        else:
+            query = supabase.table('events').insert(rows)
+
+        # The Supabase client is synchronous; keep the event loop free
+        await asyncio.to_thread(query.execute)
+
+    def _spool(self, rows: List[Dict[str, Any]]) -> None:
+        """Append rows to this worker's spool file"""
+        if not rows:
+            return
+        self._append(self.spool_path, [json.dumps(row, separators=(',', ':')) for row in rows])
+        self.spooled += len(rows)
+        logger.warning(f"Spooled {len(rows)} events to {self.spool_path}")
+
+    async def _replay_spool(self) -> int:
+        """
+        Insert spooled events from any worker
+
+        Files are claimed with an atomic rename so two workers never replay
+        the same file. A file that fails to replay is put back under a new
+        name, so it can't overwrite a spool file written in the meantime,
+        and the remaining files are still tried.
+        """
+        if not self.spool_dir.exists():
+            return 0
+
+        inserted = 0
+        for path in sorted(self.spool_dir.glob('events-*.jsonl')):
+            claimed = path.with_name(f"replay-{os.getpid()}-{path.name}")
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # claimed by another worker
+            inserted += await self._replay_file(path.name, claimed)
+
+        return inserted
+
+    async def _replay_file(self, name: str, claimed: Path) -> int:
+        """Replay one claimed spool file; returns the number of events stored"""
+        try:
+            rows = self._read_spool(claimed)
+        except Exception as e:
+            logger.error(f"Reading {name} failed: {e}")
+            self._put_back(claimed, None)
+            return 0
+
+        rejected, unstored, error = await self._insert_batches(rows, replay=True)
+        self._quarantine_rows(rejected)
+        stored = len(rows) - len(rejected) - len(unstored)
+        if error is not None:
+            logger.error(f"Replaying {name} failed: {error}")
+            # Only what's left; stored rows would be skipped anyway
+            self._put_back(claimed, unstored)
+            return stored
+
+        claimed.unlink()
+        logger.info(f"Replayed {stored} spooled events from {name}")
+        return stored
+
+    def _read_spool(self, path: Path) -> List[Dict[str, Any]]:
+        """
+        Read a spool file's rows
+
+        Lines that don't parse (e.g. the last line, cut short by a crash) are
+        moved to a bad-*.jsonl file, which is never replayed, for inspection.
+        """
+        rows, bad = [], []
+        with open(path, encoding='utf-8') as spool:
+            for line in spool:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                if isinstance(row, dict):
+                    rows.append(row)
+                else:
+                    bad.append(line)
+
+        self._quarantine(bad, "unreadable spooled")
+        return rows
+
+    def _quarantine_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Set aside rows the database rejected"""
+        self._quarantine([json.dumps(row, separators=(',', ':')) for row in rows], "rejected")
+
+    def _quarantine(self, lines: List[str], kind: str) -> None:
+        """Write lines to a new bad-*.jsonl file, which is never replayed"""
+        if not lines:
+            return
+        quarantine = self.spool_dir / f"bad-{os.getpid()}-{uuid.uuid4().hex}.jsonl"
+        self._append(quarantine, lines)
+        logger.error(f"Moved {len(lines)} {kind} events to {quarantine.name}")
+
+    def _put_back(self, claimed: Path, rows: Optional[List[Dict[str, Any]]]) -> None:
+        """Return a claimed file's rows to the spool under a name no one else uses"""
+        target = self.spool_dir / f"events-{os.getpid()}-{uuid.uuid4().hex}.jsonl"
+        try:
+            if rows is None:
+                os.rename(claimed, target)
+            else:
+                # Rewritten without any lines already quarantined
+                self._append(target, [json.dumps(row, separators=(',', ':')) for row in rows])
+                claimed.unlink()
+        except OSError as e:
+            logger.error(f"Could not return {claimed.name} to the spool: {e}")
+
+    def _append(self, path: Path, lines: List[str]) -> None:
+        """Append lines to a file and fsync it"""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+_writer: Optional[EventWriter] = None
+
+
+def get_event_writer() -> EventWriter:
+    """
+    Get the event writer for this worker
+
+    Returns:
+        EventWriter: Shared writer instance
+    """
+    global _writer
+    if _writer is None:
+        _writer = EventWriter()
+    return _writer
@@ -0,0 +1,157 @@
+"""
+Dependency checks for the readiness probe
+
+GET /health/ready asks whether this worker can serve traffic: Supabase
+(PostgREST and the database behind it), the Redis broker Celery tasks are
+queued on, and the rate limiter's storage. The checks run concurrently, each
+bounded by HEALTH_CHECK_TIMEOUT, and the combined result is cached for
+HEALTH_CACHE_SECONDS; concurrent probes while a check is running wait for it
+instead of starting their own, so a probe storm (every load balancer node,
+every few seconds) costs each dependency at most one round-trip per window.
+"""
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OK, SKIPPED, ERROR, TIMEOUT = "ok", "skipped", "error", "timeout"
+
+
+class HealthChecker:
+    """Cached, concurrent dependency checks"""
+
+    def __init__(self, ttl: Optional[float] = None, timeout: Optional[float] = None):
+        self.ttl = settings.HEALTH_CACHE_SECONDS if ttl is None else ttl
+        self.timeout = settings.HEALTH_CHECK_TIMEOUT if timeout is None else timeout
+        self.checks: Dict[str, Callable[[], Awaitable[str]]] = {
+            "supabase": self._check_supabase,
+            "broker": self._check_broker,
+            "rate_limit_storage": self._check_rate_limit_storage,
+        }
+        self._result: Optional[Dict[str, Any]] = None
+        self._expires = 0.0
+        self._running: Optional[asyncio.Task] = None
+        self._broker = None
+
+    async def check(self) -> Dict[str, Any]:
+        """
+        Check every dependency, or return the cached result
+
+        Returns:
+            dict: ready (bool), checked_at, cached (bool) and checks, mapping
+            each dependency to its status ("ok", "skipped", "error" or
+            "timeout"), latency_ms and, on failure, error
+        """
+        if self._result is not None and time.monotonic() < self._expires:
+            return {**self._result, "cached": True}
+
+        if self._running is None:
+            self._running = asyncio.create_task(self._run())
+            self._running.add_done_callback(self._finished)
+        # Shielded: a probe that disconnects mustn't cancel the others' check
+        result = await asyncio.shield(self._running)
+        return {**result, "cached": False}
+
+    async def close(self) -> None:
+        """Close the broker connection, if any"""
+        if self._broker is not None:
+            try:
+                await self._broker.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing health check Redis connection: {e}")
+            self._broker = None
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running = None
+
+    async def _run(self) -> Dict[str, Any]:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._timed(self.checks[name]) for name in names))
+        checks = dict(zip(names, results))
+        ready = all(check["status"] in (OK, SKIPPED) for check in checks.values())
+        if not ready:
+            failed = [
+                name for name, check in checks.items() if check["status"] not in (OK, SKIPPED)
+            ]
+            logger.warning(f"Readiness check failed: {', '.join(failed)}")
+
+        self._result = {
+            "ready": ready,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "checks": checks,
+        }
+        self._expires = time.monotonic() + self.ttl
+        return self._result
+
+    async def _timed(self, check: Callable[[], Awaitable[str]]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result: Dict[str, Any] = {
+                "status": await asyncio.wait_for(check(), self.timeout)
+            }
+        except asyncio.TimeoutError:
+            result = {"status": TIMEOUT, "error": f"No response within {self.timeout}s"}
+        except Exception as e:
+            result = {"status": ERROR, "error": str(e) or type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    # ------------------------------------------------------------------
+    # Checks (each returns OK or SKIPPED, or raises)
+    # ------------------------------------------------------------------
+
+    async def _check_supabase(self) -> str:
+        from app.services.supabase_client import get_supabase
+
+        supabase = get_supabase()
+        # The client is synchronous; a thread keeps the event loop free. On a
+        # timeout the thread finishes on its own (bounded by SUPABASE_TIMEOUT).
+        await asyncio.to_thread(
+            lambda: supabase.table('households').select('id').limit(1).execute()
+        )
+        return OK
+
+    async def _check_broker(self) -> str:
+        if not settings.CELERY_BROKER_URL:
+            return SKIPPED
+        if self._broker is None:
+            import redis.asyncio as aioredis
+
+            self._broker = aioredis.from_url(
+                settings.CELERY_BROKER_URL,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout
+            )
+        await self._broker.ping()
+        return OK
+
+    async def _check_rate_limit_storage(self) -> str:
+        from app.middleware.rate_limit import limiter
+
+        if not settings.RATE_LIMIT_ENABLED:
+            return SKIPPED
+        # Storage backends check synchronously (a PING for Redis)
+        if not await asyncio.to_thread(limiter.limiter.storage.check):
+            raise ConnectionError("Rate limit storage unreachable")
+        return OK
+
+
+_checker: Optional[HealthChecker] = None
+
+
+def get_health_checker() -> HealthChecker:
+    """
+    Get the health checker for this worker
+
+    Returns:
+        HealthChecker: Shared checker instance
+    """
+    global _checker
+    if _checker is None:
+        _checker = HealthChecker()
+    return _checker
@@ -4,7 +4,7 @@ Household service for business logic
 This service handles household creation, member management, and role updates.
 It ensures proper multi-tenant isolation and enforces business rules.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from uuid import UUID
 from datetime import datetime
 import logging
@@ -12,6 +12,10 @@ import logging
 from app.services.supabase_client import get_supabase
 from app.models import Household, Role
 from app.core.errors import NotFoundError, ValidationError, AuthorizationError
+from app.core.metrics import db_call
+from app.core.responses import dump_json
+from app.services.cache import get_household_cache
+from app.services.rows import UserHouseholdRow, decode_json, decode_rows
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +25,9 @@ class HouseholdService:
     
     def __init__(self):
         self.supabase = get_supabase()
+        self.cache = get_household_cache()
     
+    @db_call
     async def create_household(
         self,
         name: str,
@@ -112,81 +118,85 @@ class HouseholdService:
     async def get_household_by_id(
         self,
         household_id: str,
-        user_id: str
-    ) -> Dict[str, Any]:
+        user_id: str,
+        summary: bool = False,
+        as_json: bool = False
+    ) -> Union[Dict[str, Any], bytes]:
         """
         Get a specific household by ID with member details
         
+        The membership check, household row, members and counts come from a
+        single get_household_detail RPC (one round-trip). The result is cached
+        per user (it doubles as the membership check) and invalidated by
+        household, member and invitation writes.
+        
         Args:
             household_id: Household UUID
             user_id: User UUID making the request
+            summary: Return only member/admin counts, without the members list
+            as_json: Return the result pre-serialized as JSON bytes
             
         Returns:
-            Household details with members
+            Household details with members (omitted in summary mode) and
+            counts (JSON bytes if as_json)
             
         Raises:
-            AuthorizationError: If user is not a member
-            NotFoundError: If household not found
+            AuthorizationError: If user is not a member (or the household
+                doesn't exist; the two are indistinguishable to non-members)
         """
         try:
-            # Check if user is a member of the household
-            member_response = self.supabase.table('household_members')\
-                .select('role')\
-                .eq('household_id', household_id)\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            if not member_response.data:
-                raise AuthorizationError(
-                    "User is not a member of this household",
-                    user_message="You don't have access to this household.",
-                    next_steps="Contact the household admin for access."
-                )
-            
-            # Get household details
-            household_response = self.supabase.table('households')\
-                .select('*')\
-                .eq('id', household_id)\
-                .execute()
-            
-            if not household_response.data:
-                raise NotFoundError(
-                    "Household not found",
-                    user_message="This household doesn't exist.",
-                    next_steps="Please check the household ID and try again."
-                )
-            
-            household_data = household_response.data[0]
-            
-            # Get all members
-            members_response = self.supabase.table('household_members')\
-                .select('id, user_id, role, joined_at')\
-                .eq('household_id', household_id)\
-                .execute()
-            
-            members = members_response.data if members_response.data else []
-            member_count = len(members)
-            admin_count = len([m for m in members if m['role'] == Role.ADMIN.value])
-            
-            logger.info(f"Retrieved household {household_id} with {member_count} members")
-            
-            return {
-                'id': household_data['id'],
-                'name': household_data['name'],
-                'created_at': household_data['created_at'],
-                'updated_at': household_data['updated_at'],
-                'members': members,
-                'member_count': member_count,
-                'admin_count': admin_count
-            }
-            
-        except (AuthorizationError, NotFoundError):
+            payload = await self.cache.get_or_load(
+                household_id,
+                f"detail:{user_id}:{'summary' if summary else 'full'}",
+                lambda: self._load_household_detail(household_id, user_id, summary),
+                # Also the membership check: never stale on another worker
+                shared_only=True
+            )
+        except AuthorizationError:
             raise
         except Exception as e:
             logger.error(f"Error fetching household {household_id}: {e}", exc_info=True)
             raise Exception(f"Failed to fetch household: {str(e)}")
+        
+        if as_json:
+            return payload
+        return decode_json(Dict[str, Any], payload)
+
+    @db_call
+    async def _load_household_detail(
+        self,
+        household_id: str,
+        user_id: str,
+        summary: bool
+    ) -> bytes:
+        """Fetch household detail via RPC and serialize it (cache loader)"""
+        response = self.supabase.rpc(
+            'get_household_detail',
+            {
+                'p_household_id': household_id,
+                'p_user_id': user_id,
+                'p_summary': summary
+            }
+        ).execute()
+        
+        household = response.data
+        if not household:
+            raise AuthorizationError(
+                "User is not a member of this household",
+                user_message="You don't have access to this household.",
+                next_steps="Contact the household admin for access."
+            )
+        
+        logger.info(f"Retrieved household {household_id} with {household['member_count']} members")
+        
+        return dump_json(household)
 
-    async def get_user_households(self, user_id: str) -> list[Household]:
+    @db_call
+    async def get_user_households(
+        self,
+        user_id: str,
+        include_stats: bool = False
+    ) -> list[UserHouseholdRow]:
         """
         Get all households that a user belongs to
         
@@ -194,46 +204,35 @@ class HouseholdService:
         - Users only see households they belong to
         - RLS policies enforce household boundaries
         
+        Households, the user's role and (optionally) stats come from a single
+        get_user_households RPC (one round-trip); the stats are one grouped
+        query per table over the user's households.
+        
         Args:
             user_id: User UUID
+            include_stats: Add item count, per-state inventory counts and
+                restock counts per household
             
         Returns:
-            List of households the user is a member of
+            List of households the user is a member of, with their role
             
         Raises:
             Exception: If database operation fails
         """
         try:
-            # Get household IDs where user is a member
-            members_response = self.supabase.table('household_members')\
-                .select('household_id')\
-                .eq('user_id', user_id)\
-                .execute()
-            
-            if not members_response.data:
+            response = self.supabase.rpc(
+                'get_user_households',
+                {
+                    'p_user_id': user_id,
+                    'p_include_stats': include_stats
+                }
+            ).execute()
+            
+            if not response.data:
                 logger.info(f"User {user_id} has no households")
                 return []
             
-            household_ids = [m['household_id'] for m in members_response.data]
-            
-            # Get household details
-            households_response = self.supabase.table('households')\
-                .select('*')\
-                .in_('id', household_ids)\
-                .execute()
-            
-            if not households_response.data:
-                return []
-            
-            households = [
-                Household(
-                    id=h['id'],
-                    name=h['name'],
-                    created_at=h['created_at'],
-                    updated_at=h['updated_at']
-                )
-                for h in households_response.data
-            ]
+            households = decode_rows(UserHouseholdRow, response.data)
             
             logger.info(f"Found {len(households)} households for user {user_id}")
             return households
@@ -242,6 +241,7 @@ class HouseholdService:
             logger.error(f"Error fetching households for user {user_id}: {e}", exc_info=True)
             raise Exception(f"Failed to fetch households: {str(e)}")
 
+    @db_call
     async def update_household(
         self,
         household_id: str,
@@ -317,6 +317,8 @@ class HouseholdService:
             household_data = household_response.data[0]
             logger.info(f"Household {household_id} updated to '{name}'")
             
+            await self.cache.invalidate(household_id)
+            
             return Household(
                 id=household_data['id'],
                 name=household_data['name'],
@@ -330,6 +332,7 @@ class HouseholdService:
             logger.error(f"Error updating household {household_id}: {e}", exc_info=True)
             raise Exception(f"Failed to update household: {str(e)}")
 
+    @db_call
     async def delete_household(
         self,
         household_id: str,
@@ -383,6 +386,8 @@ class HouseholdService:
             
             logger.info(f"Household {household_id} deleted by user {user_id}")
             
+            await self.cache.invalidate(household_id)
+            
         except (AuthorizationError, NotFoundError):
             raise
         except Exception as e:
@@ -7,7 +7,7 @@ This service handles:
 - Managing invitation lifecycle (expiration, status)
 - Sending invitation emails via Supabase Auth
 """
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 from datetime import datetime, timedelta
 import logging
@@ -16,10 +16,18 @@ import secrets
 from app.services.supabase_client import get_supabase
 from app.models import Role, Invitation, InvitationResponse, InvitationAcceptResponse
 from app.core.errors import NotFoundError, ValidationError, AuthorizationError
+from app.core.metrics import db_call
 from app.core.config import settings
+from app.core.responses import dump_json
+from app.services.cache import get_household_cache
+from app.services.rows import InvitationPage, InvitationRow, decode_json, decode_rows, select_columns
 
 logger = logging.getLogger(__name__)
 
+# Columns matching the response shape (InvitationRow). Never includes the
+# token: the list is visible to every member, and lookups already know it.
+INVITATION_COLUMNS = select_columns(InvitationRow)
+
 
 class InvitationService:
     """Service for invitation management operations"""
@@ -29,6 +37,7 @@ class InvitationService:
     
     def __init__(self):
         self.supabase = get_supabase()
+        self.cache = get_household_cache()
     
     def _generate_invitation_token(self) -> str:
         """
@@ -39,6 +48,7 @@ class InvitationService:
         """
         return secrets.token_urlsafe(32)
     
+    @db_call
     async def verify_admin_access(self, user_id: str, household_id: str) -> bool:
         """
         Verify that user is an admin of the household
@@ -65,6 +75,7 @@ class InvitationService:
             logger.error(f"Error verifying admin access: {e}", exc_info=True)
             return False
     
+    @db_call
     async def create_invitation(
         self,
         household_id: str,
@@ -206,6 +217,8 @@ class InvitationService:
             logger.error(f"Error creating invitation: {e}", exc_info=True)
             raise Exception(f"Failed to create invitation: {str(e)}")
         
+        await self.cache.invalidate(household_id)
+        
         # Generate invitation link
         # The link will point to the web app's invitation acceptance page
         base_url = settings.WEB_APP_URL or "http://localhost:3000"
@@ -248,6 +261,7 @@ class InvitationService:
             invite_link=invite_link
         )
     
+    @db_call
     async def get_invitation_by_token(self, token: str) -> Optional[Invitation]:
         """
         Get invitation by token
@@ -260,7 +274,7 @@ class InvitationService:
         """
         try:
             response = self.supabase.table('invitations')\
-                .select('*')\
+                .select(INVITATION_COLUMNS)\
                 .eq('token', token)\
                 .execute()
             
@@ -275,7 +289,7 @@ class InvitationService:
                 invitee_email=invitation_data['invitee_email'],
                 role=Role(invitation_data['role']),
                 status=invitation_data['status'],
-                token=invitation_data['token'],
+                token=token,
                 expires_at=invitation_data['expires_at'],
                 accepted_at=invitation_data.get('accepted_at'),
                 created_at=invitation_data['created_at'],
@@ -285,6 +299,7 @@ class InvitationService:
             logger.error(f"Error fetching invitation by token: {e}", exc_info=True)
             return None
     
+    @db_call
     async def accept_invitation(
         self,
         token: str,
@@ -338,6 +353,8 @@ class InvitationService:
             except Exception as e:
                 logger.warning(f"Error marking invitation as expired: {e}")
             
+            await self.cache.invalidate(str(invitation.household_id))
+            
             raise ValidationError(
                 "Invitation expired",
                 user_message="This invitation has expired.",
@@ -378,6 +395,7 @@ class InvitationService:
                     })\
                     .eq('id', str(invitation.id))\
                     .execute()
+                await self.cache.invalidate(str(invitation.household_id))
                 
                 raise ValidationError(
                     "Already a member",
@@ -403,6 +421,7 @@ class InvitationService:
                 raise Exception("Failed to add member to household")
             
             logger.info(f"User {user_id} added to household {invitation.household_id} with role {invitation.role.value}")
+            await self.cache.invalidate(str(invitation.household_id))
         except Exception as e:
             logger.error(f"Error adding member to household: {e}", exc_info=True)
             raise Exception(f"Failed to add member to household: {str(e)}")
@@ -447,22 +466,53 @@ class InvitationService:
     async def get_household_invitations(
         self,
         household_id: str,
-        user_id: str
-    ) -> list[Invitation]:
+        user_id: str,
+        as_json: bool = False
+    ) -> Union[list[InvitationRow], bytes]:
         """
         Get all invitations for a household
         
+        The list is cached per household (see app.services.cache) and
+        invalidated when invitations are created, accepted or expire.
+        
         Args:
             household_id: Household UUID
             user_id: User UUID (must be a member)
+            as_json: Return {"invitations": [...], "total": n} pre-serialized
+                as JSON bytes
             
         Returns:
-            List of invitations
+            List of invitations (JSON bytes of the page if as_json)
             
         Raises:
             AuthorizationError: If user is not a member
         """
         # Verify user has access to household
+        await self.cache.get_or_load(
+            household_id,
+            f"member:{user_id}",
+            lambda: self._check_household_member(household_id, user_id),
+            shared_only=True
+        )
+        
+        # Get invitations
+        try:
+            payload = await self.cache.get_or_load(
+                household_id,
+                "invitations",
+                lambda: self._load_household_invitations(household_id)
+            )
+        except Exception as e:
+            logger.error(f"Error fetching invitations: {e}", exc_info=True)
+            raise Exception(f"Failed to fetch invitations: {str(e)}")
+        
+        if as_json:
+            return payload
+        return decode_json(InvitationPage, payload).invitations
+    
+    @db_call
+    async def _check_household_member(self, household_id: str, user_id: str) -> bytes:
+        """Query household membership (cache loader); raises if not a member"""
         try:
             member_response = self.supabase.table('household_members')\
                 .select('id')\
@@ -482,33 +532,18 @@ class InvitationService:
             logger.error(f"Error verifying household access: {e}", exc_info=True)
             raise Exception(f"Failed to verify household access: {str(e)}")
         
-        # Get invitations
-        try:
-            response = self.supabase.table('invitations')\
-                .select('*')\
-                .eq('household_id', household_id)\
-                .order('created_at', desc=True)\
-                .execute()
-            
-            invitations = [
-                Invitation(
-                    id=inv['id'],
-                    household_id=inv['household_id'],
-                    inviter_id=inv['inviter_id'],
-                    invitee_email=inv['invitee_email'],
-                    role=Role(inv['role']),
-                    status=inv['status'],
-                    token=inv['token'],
-                    expires_at=inv['expires_at'],
-                    accepted_at=inv.get('accepted_at'),
-                    created_at=inv['created_at'],
-                    updated_at=inv['updated_at']
-                )
-                for inv in response.data
-            ]
-            
-            logger.info(f"Found {len(invitations)} invitations for household {household_id}")
-            return invitations
-        except Exception as e:
-            logger.error(f"Error fetching invitations: {e}", exc_info=True)
-            raise Exception(f"Failed to fetch invitations: {str(e)}")
+        return b"true"
+    
+    @db_call
+    async def _load_household_invitations(self, household_id: str) -> bytes:
+        """Query a household's invitations and serialize them (cache loader)"""
+        response = self.supabase.table('invitations')\
+            .select(INVITATION_COLUMNS)\
+            .eq('household_id', household_id)\
+            .order('created_at', desc=True)\
+            .execute()
+        
+        invitations = decode_rows(InvitationRow, response.data)
+        
+        logger.info(f"Found {len(invitations)} invitations for household {household_id}")
+        return dump_json(InvitationPage(invitations=invitations, total=len(invitations)))
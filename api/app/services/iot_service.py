@@ -0,0 +1,565 @@
+"""
+IoT service for device authentication and reading ingestion
+
+Devices post batches of readings (optionally gzip/deflate compressed) with a
+per-device key. A batch goes through four cheap steps and never touches the
+database per reading:
+
+1. Stream and decompress the body with hard caps on the raw and
+   decompressed size
+2. Validate straight from bytes with a schema compiled once at import
+3. Coalesce noisy readings: weight samples for the same item/location within
+   IOT_COALESCE_WINDOW_SECONDS become one event with the summed delta (and
+   are dropped if the net change is below IOT_WEIGHT_NOISE_GRAMS); door
+   openings within IOT_DOOR_DEBOUNCE_SECONDS of the previous one are merged
+4. Hand the resulting events to the batched event writer
+
+Device keys are checked against a SHA-256 hash in iot_devices; successful
+lookups are cached for IOT_DEVICE_CACHE_TTL seconds so a chatty device costs
+one query per TTL, not one per batch. Item ids confirmed to belong to a
+household are cached for IOT_ITEM_CACHE_TTL seconds, so a deleted item stops
+passing the check (and failing the events foreign key) within one TTL.
+"""
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, Literal
+from typing_extensions import TypedDict, NotRequired, Annotated
+from collections import OrderedDict
+from datetime import datetime, timezone
+import hashlib
+import hmac
+import logging
+import time
+import zlib
+
+from fastapi import status
+from pydantic import Field, TypeAdapter, ValidationError as SchemaValidationError
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.errors import AuthenticationError, ValidationError, SNAKrException
+from app.core.metrics import db_call
+from app.services.supabase_client import get_supabase
+from app.services.event_writer import EventWriter, get_event_writer
+
+logger = logging.getLogger(__name__)
+
+# Reading type -> events.event_type
+READING_EVENT_TYPES = {
+    "door_opened": "iot.door_opened",
+    "weight_changed": "iot.weight_changed",
+    "snapshot_available": "iot.snapshot_available",
+}
+
+# Confidence used when a reading doesn't carry its own
+DEFAULT_READING_CONFIDENCE = 0.8
+
+# Devices whose debounce state is kept per worker
+DEVICE_STATE_SIZE = 10_000
+
+
+class Reading(TypedDict):
+    """One device reading"""
+    type: Literal["door_opened", "weight_changed", "snapshot_available"]
+    at: datetime
+    item_id: NotRequired[Optional[UUID]]
+    location: NotRequired[Optional[Annotated[str, Field(max_length=50)]]]
+    weight_delta_grams: NotRequired[float]
+    duration_seconds: NotRequired[Annotated[float, Field(ge=0)]]
+    snapshot_path: NotRequired[Annotated[str, Field(max_length=500)]]
+    confidence: NotRequired[Annotated[float, Field(ge=0.0, le=1.0)]]
+
+
+class ReadingBatch(TypedDict):
+    """Batch of readings as posted by a device"""
+    readings: Annotated[List[Reading], Field(min_length=1)]
+
+
+# Built once; validate_json parses and validates in one pass without
+# materializing an intermediate dict
+BATCH_SCHEMA = TypeAdapter(ReadingBatch)
+
+
+class BodyDecoder:
+    """
+    Incremental decompression of a request body
+
+    Both the raw and the decompressed size are capped at IOT_MAX_BATCH_BYTES
+    and checked as each chunk arrives, so an oversized upload or a
+    decompression bomb is refused before it is buffered.
+    """
+
+    def __init__(self, content_encoding: Optional[str]):
+        """
+        Args:
+            content_encoding: Content-Encoding header value (gzip, deflate or None)
+
+        Raises:
+            ValidationError: If the encoding is unsupported
+        """
+        self.limit = settings.IOT_MAX_BATCH_BYTES
+        self.raw = 0
+        self.size = 0
+        self.chunks: List[bytes] = []
+
+        encoding = (content_encoding or "identity").strip().lower()
+        if encoding == "identity":
+            self.inflater = None
+        elif encoding in ("gzip", "deflate"):
+            # wbits: 16+ for gzip framing, 15 for zlib-wrapped deflate
+            self.inflater = zlib.decompressobj(
+                16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+            )
+        else:
+            raise ValidationError(
+                f"Unsupported Content-Encoding: {content_encoding}",
+                user_message="That compression format isn't supported.",
+                next_steps="Send gzip, deflate or uncompressed JSON."
+            )
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Add the next chunk of the raw body
+
+        Raises:
+            ValidationError: If the compressed data is corrupt
+            SNAKrException: 413 if the raw or decompressed body is too large
+        """
+        self.raw += len(chunk)
+        if self.raw > self.limit:
+            raise self._too_large()
+        if self.inflater is None:
+            data = chunk
+        else:
+            try:
+                data = self.inflater.decompress(chunk, self.limit + 1 - self.size)
+            except zlib.error:
+                raise ValidationError(
+                    "Corrupt compressed body",
+                    user_message="The reading batch couldn't be decompressed.",
+                    next_steps="Check the device's Content-Encoding header."
+                )
+        self.size += len(data)
+        if self.size > self.limit:
+            raise self._too_large()
+        self.chunks.append(data)
+
+    def finish(self) -> bytes:
+        """The decompressed body"""
+        return b"".join(self.chunks)
+
+    def _too_large(self) -> SNAKrException:
+        return SNAKrException(
+            f"Reading batch exceeds {self.limit} bytes",
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            user_message="That batch of readings is too large.",
+            next_steps="Send smaller batches more often."
+        )
+
+
+def decompress_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    """
+    Decompress a request body, refusing anything over IOT_MAX_BATCH_BYTES
+
+    Args:
+        body: Raw request body
+        content_encoding: Content-Encoding header value (gzip, deflate or None)
+
+    Returns:
+        Decompressed body
+
+    Raises:
+        ValidationError: If the encoding is unsupported or the data is corrupt
+        SNAKrException: 413 if the (decompressed) body is too large
+    """
+    decoder = BodyDecoder(content_encoding)
+    decoder.feed(body)
+    return decoder.finish()
+
+
+async def read_body(stream: AsyncIterator[bytes], content_encoding: Optional[str]) -> bytes:
+    """
+    Read and decompress a streamed request body, refusing anything over IOT_MAX_BATCH_BYTES
+
+    Stops reading as soon as either size limit is crossed.
+
+    Args:
+        stream: Raw body chunks (Request.stream())
+        content_encoding: Content-Encoding header value (gzip, deflate or None)
+
+    Returns:
+        Decompressed body
+
+    Raises:
+        ValidationError: If the encoding is unsupported or the data is corrupt
+        SNAKrException: 413 if the raw or decompressed body is too large
+    """
+    decoder = BodyDecoder(content_encoding)
+    async for chunk in stream:
+        decoder.feed(chunk)
+    return decoder.finish()
+
+
+def parse_batch(data: bytes) -> List[Dict[str, Any]]:
+    """
+    Validate a JSON reading batch
+
+    Args:
+        data: Decompressed JSON body
+
+    Returns:
+        List of readings
+
+    Raises:
+        ValidationError: If the batch doesn't match the schema or is too long
+    """
+    try:
+        readings = BATCH_SCHEMA.validate_json(data)["readings"]
+    except SchemaValidationError as e:
+        raise ValidationError(
+            "Invalid reading batch",
+            details={"errors": e.errors(include_url=False, include_context=False)[:10]},
+            user_message="Some readings don't look right.",
+            next_steps="Check the reading format and try again."
+        )
+
+    if len(readings) > settings.IOT_MAX_BATCH_READINGS:
+        raise ValidationError(
+            f"Batch has {len(readings)} readings (max {settings.IOT_MAX_BATCH_READINGS})",
+            user_message="That batch has too many readings.",
+            next_steps=f"Send at most {settings.IOT_MAX_BATCH_READINGS} readings per batch."
+        )
+    return readings
+
+
+def normalize_readings(
+    readings: List[Dict[str, Any]],
+    default_location: Optional[str]
+) -> List[Dict[str, Any]]:
+    """
+    Normalize readings for coalescing, in time order
+
+    Naive timestamps are taken as UTC, so a batch mixing "...Z" and naive
+    times still sorts; item ids become strings and a missing location falls
+    back to the device's.
+
+    Args:
+        readings: Validated readings
+        default_location: Device location
+
+    Returns:
+        Copies of the readings, sorted by time
+    """
+    normalized = [
+        {
+            **reading,
+            'at': reading['at'] if reading['at'].tzinfo else reading['at'].replace(tzinfo=timezone.utc),
+            'item_id': str(reading['item_id']) if reading.get('item_id') else None,
+            'location': reading.get('location') or default_location,
+        }
+        for reading in readings
+    ]
+    normalized.sort(key=lambda r: r['at'])
+    return normalized
+
+
+def hash_device_key(device_key: str) -> str:
+    """SHA-256 hex digest of a device key (as stored in iot_devices.key_hash)"""
+    return hashlib.sha256(device_key.encode("utf-8")).hexdigest()
+
+
+class IoTService:
+    """Service for IoT device authentication and reading ingestion"""
+
+    # device_id -> (key_hash, device row, expires_at); shared per worker
+    _device_cache: "OrderedDict[str, Tuple[str, Dict[str, Any], float]]" = OrderedDict()
+    # device_id -> time of the last door event emitted (debounce across batches)
+    _last_door: "OrderedDict[str, float]" = OrderedDict()
+    # household_id -> (item ids confirmed to belong to it, expires_at)
+    _household_items: "OrderedDict[str, Tuple[set, float]]" = OrderedDict()
+
+    def __init__(self, writer: Optional[EventWriter] = None):
+        self.supabase = get_supabase()
+        self.writer = writer or get_event_writer()
+
+    async def authenticate_device(self, device_id: str, device_key: str) -> Dict[str, Any]:
+        """
+        Authenticate a device by its id and key
+
+        Args:
+            device_id: Device UUID (X-Device-Id header)
+            device_key: Device key (X-Device-Key header)
+
+        Returns:
+            Device row with id, household_id and location
+
+        Raises:
+            AuthenticationError: If the device is unknown, revoked or the key is wrong
+        """
+        key_hash = hash_device_key(device_key)
+
+        cached = self._device_cache.get(device_id)
+        if cached and cached[2] > time.monotonic():
+            if hmac.compare_digest(cached[0], key_hash):
+                return cached[1]
+            raise self._auth_error()
+
+        try:
+            UUID(device_id)
+            response = self.supabase.table('iot_devices')\
+                .select('id, household_id, location, key_hash')\
+                .eq('id', device_id)\
+                .is_('revoked_at', 'null')\
+                .execute()
+        except ValueError:
+            raise self._auth_error()
+        except Exception as e:
+            logger.error(f"Error authenticating device {device_id}: {e}", exc_info=True)
+            raise AuthenticationError(
+                "Failed to authenticate device",
+                user_message="We couldn't verify this device.",
+                next_steps="Try again shortly."
+            )
+
+        if not response.data or not hmac.compare_digest(response.data[0]['key_hash'], key_hash):
+            raise self._auth_error()
+
+        device = {k: v for k, v in response.data[0].items() if k != 'key_hash'}
+        self._device_cache[device_id] = (
+            key_hash, device, time.monotonic() + settings.IOT_DEVICE_CACHE_TTL
+        )
+        self._device_cache.move_to_end(device_id)
+        while len(self._device_cache) > DEVICE_STATE_SIZE:
+            self._device_cache.popitem(last=False)
+
+        return device
+
+    async def ingest(self, device: Dict[str, Any], readings: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Coalesce readings into events and queue them for writing
+
+        Args:
+            device: Authenticated device row
+            readings: Validated readings
+
+        Returns:
+            Dictionary with received, accepted (events queued) and coalesced counts
+        """
+        await self._check_item_ids(str(device['household_id']), readings)
+        events = self.coalesce(device, readings)
+        await self.writer.write_many(events)
+
+        logger.debug(f"Device {device['id']}: {len(readings)} readings -> {len(events)} events")
+
+        return {
+            'received': len(readings),
+            'accepted': len(events),
+            'coalesced': len(readings) - len(events)
+        }
+
+    def coalesce(self, device: Dict[str, Any], readings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Turn a batch of readings into events, merging noisy ones
+
+        Args:
+            device: Authenticated device row
+            readings: Validated readings
+
+        Returns:
+            Event rows ready for the event writer
+        """
+        device_id = str(device['id'])
+        household_id = str(device['household_id'])
+
+        by_kind: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in READING_EVENT_TYPES}
+        for reading in normalize_readings(readings, device.get('location')):
+            by_kind[reading['type']].append(reading)
+
+        events = self._coalesce_weights(household_id, device_id, by_kind['weight_changed'])
+        events.extend(self._debounce_doors(household_id, device_id, by_kind['door_opened']))
+        events.extend(
+            self._snapshot_event(household_id, device_id, reading)
+            for reading in by_kind['snapshot_available']
+        )
+        return events
+
+    def _coalesce_weights(
+        self,
+        household_id: str,
+        device_id: str,
+        readings: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Sum weight samples per item/location within the coalesce window"""
+        window = settings.IOT_COALESCE_WINDOW_SECONDS
+        events: List[Dict[str, Any]] = []
+        # (item_id, location) -> open weight group
+        weights: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]] = {}
+
+        for reading in readings:
+            at = reading['at']
+            confidence = reading.get('confidence', DEFAULT_READING_CONFIDENCE)
+            key = (reading['item_id'], reading['location'])
+            group = weights.get(key)
+            if group and at.timestamp() - group['start'] <= window:
+                group['delta'] += reading.get('weight_delta_grams', 0.0)
+                group['samples'] += 1
+                group['end'] = at
+                group['confidence'] = min(group['confidence'], confidence)
+                continue
+            if group:
+                self._emit_weight(events, household_id, device_id, key, group)
+            weights[key] = {
+                'start': at.timestamp(),
+                'begin': at,
+                'end': at,
+                'delta': reading.get('weight_delta_grams', 0.0),
+                'samples': 1,
+                'confidence': confidence
+            }
+
+        for key, group in weights.items():
+            self._emit_weight(events, household_id, device_id, key, group)
+        return events
+
+    def _debounce_doors(
+        self,
+        household_id: str,
+        device_id: str,
+        readings: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Merge door openings within the debounce interval, including across batches"""
+        debounce = settings.IOT_DOOR_DEBOUNCE_SECONDS
+        events: List[Dict[str, Any]] = []
+        door: Optional[Dict[str, Any]] = None
+        last_door = self._last_door.get(device_id)
+
+        for reading in readings:
+            ts = reading['at'].timestamp()
+            if door and ts - door['last'] <= debounce:
+                door['payload']['openings'] += 1
+                door['payload']['duration_seconds'] += reading.get('duration_seconds', 0.0)
+                door['last'] = ts
+                continue
+            if last_door is not None and ts - last_door <= debounce:
+                last_door = ts  # still the same burst as the previous batch
+                continue
+            if door:
+                events.append(door['event'])
+            door = self._door_group(household_id, device_id, reading)
+            last_door = ts
+
+        if door:
+            events.append(door['event'])
+            last_door = max(last_door, door['last'])
+        if last_door is not None:
+            self._last_door[device_id] = last_door
+            self._last_door.move_to_end(device_id)
+            while len(self._last_door) > DEVICE_STATE_SIZE:
+                self._last_door.popitem(last=False)
+        return events
+
+    @staticmethod
+    def _door_group(household_id: str, device_id: str, reading: Dict[str, Any]) -> Dict[str, Any]:
+        """Open a door burst; its event's payload is updated as openings merge in"""
+        payload = {
+            'device_id': device_id,
+            'location': reading['location'],
+            'duration_seconds': reading.get('duration_seconds', 0.0),
+            'openings': 1
+        }
+        return {
+            'last': reading['at'].timestamp(),
+            'payload': payload,
+            'event': EventWriter.build_event(
+                household_id, READING_EVENT_TYPES['door_opened'], "iot", payload,
+                item_id=reading['item_id'],
+                confidence=reading.get('confidence', DEFAULT_READING_CONFIDENCE),
+                created_at=reading['at']
+            )
+        }
+
+    @staticmethod
+    def _snapshot_event(household_id: str, device_id: str, reading: Dict[str, Any]) -> Dict[str, Any]:
+        """One event per camera snapshot (never coalesced)"""
+        return EventWriter.build_event(
+            household_id, READING_EVENT_TYPES['snapshot_available'], "iot",
+            {
+                'device_id': device_id,
+                'location': reading['location'],
+                'snapshot_path': reading.get('snapshot_path')
+            },
+            item_id=reading['item_id'],
+            confidence=reading.get('confidence', DEFAULT_READING_CONFIDENCE),
+            created_at=reading['at']
+        )
+
+    @db_call
+    async def _check_item_ids(self, household_id: str, readings: List[Dict[str, Any]]) -> None:
+        """
+        Drop item ids that don't belong to the device's household
+
+        One query per batch at most, and only for ids not confirmed within
+        IOT_ITEM_CACHE_TTL.
+        """
+        cached = self._household_items.get(household_id)
+        if cached is None or cached[1] <= time.monotonic():
+            cached = (set(), time.monotonic() + settings.IOT_ITEM_CACHE_TTL)
+            self._household_items[household_id] = cached
+        known = cached[0]
+        self._household_items.move_to_end(household_id)
+        while len(self._household_items) > DEVICE_STATE_SIZE:
+            self._household_items.popitem(last=False)
+
+        unknown = {
+            str(r['item_id']) for r in readings
+            if r.get('item_id') and str(r['item_id']) not in known
+        }
+        if unknown:
+            try:
+                response = self.supabase.table('items')\
+                    .select('id')\
+                    .eq('household_id', household_id)\
+                    .in_('id', sorted(unknown))\
+                    .execute()
+                known.update(row['id'] for row in response.data or [])
+            except Exception as e:
+                logger.error(f"Error checking item ids for household {household_id}: {e}", exc_info=True)
+
+        for reading in readings:
+            if reading.get('item_id') and str(reading['item_id']) not in known:
+                logger.warning(f"Dropping unknown item {reading['item_id']} from IoT reading")
+                reading['item_id'] = None
+
+    @staticmethod
+    def _emit_weight(
+        events: List[Dict[str, Any]],
+        household_id: str,
+        device_id: str,
+        key: Tuple[Optional[str], Optional[str]],
+        group: Dict[str, Any]
+    ) -> None:
+        """Append one weight event for a coalesced group, unless it's noise"""
+        if abs(group['delta']) < settings.IOT_WEIGHT_NOISE_GRAMS:
+            return
+
+        item_id, location = key
+        events.append(EventWriter.build_event(
+            household_id, "iot.weight_changed", "iot",
+            {
+                'device_id': device_id,
+                'location': location,
+                'weight_delta_grams': round(group['delta'], 1),
+                'samples': group['samples'],
+                'window_start': group['begin'].isoformat()
+            },
+            item_id=item_id,
+            confidence=group['confidence'],
+            created_at=group['end']
+        ))
+
+    @staticmethod
+    def _auth_error() -> AuthenticationError:
+        """Error for unknown devices and wrong keys (indistinguishable on purpose)"""
+        return AuthenticationError(
+            "Invalid device credentials",
+            user_message="This device isn't recognized.",
+            next_steps="Re-register the device in your household settings."
+        )
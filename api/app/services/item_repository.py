@@ -0,0 +1,121 @@
+"""
+Direct Postgres queries for items
+
+Used by ItemService instead of PostgREST when "items" is listed in
+DIRECT_DB_SERVICES (see app.services.postgres). Queries run as the requesting
+user, so RLS policies apply on top of the service's own membership check.
+
+The items list is built as one JSON document inside Postgres, from the same
+row types as the PostgREST projection (json_object_sql), and passed through
+ItemPage on the way out, so both paths return identical bytes.
+"""
+from typing import Optional
+import logging
+
+from app.models import Category, Location, State
+from app.core.responses import dump_json
+from app.services.postgres import user_transaction
+from app.services.rows import ItemPage, ItemRow, decode_json, json_object_sql
+
+logger = logging.getLogger(__name__)
+
+ITEM_JSON = json_object_sql(ItemRow, 'i', (('inventory', 'inv'),))
+
+# Whitelisted sort orders (sort_by -> ORDER BY); unknown values fall back to
+# id so pages are stable
+ITEM_ORDER = {
+    'name': 'i.name, i.id',
+    'state': 'inv.state, i.id',
+    'last_updated': 'inv.updated_at DESC, i.id',
+}
+DEFAULT_ORDER = 'i.id'
+
+# One statement per sort order; filters are parameters so each stays a single
+# prepared statement ($2-$4 are NULL when not filtering)
+ITEM_LIST_SQL = {
+    sort_by: f"""
+        SELECT json_build_object(
+            'items', COALESCE(json_agg(page.item ORDER BY page.n), '[]'::json),
+            'total', COUNT(*)
+        )::text
+        FROM (
+            SELECT {ITEM_JSON} AS item, row_number() OVER (ORDER BY {order}) AS n
+            FROM items i
+            JOIN inventory inv ON inv.item_id = i.id
+            WHERE i.household_id = $1
+              AND ($2::text IS NULL OR i.location = $2)
+              AND ($3::text IS NULL OR inv.state = $3)
+              AND ($4::text IS NULL OR i.category = $4)
+            ORDER BY {order}
+            LIMIT $5 OFFSET $6
+        ) page
+    """
+    for sort_by, order in {**ITEM_ORDER, None: DEFAULT_ORDER}.items()
+}
+
+MEMBER_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM household_members
+        WHERE household_id = $1 AND user_id = $2
+    )
+"""
+
+
+class ItemRepository:
+    """Item queries over the direct Postgres pool"""
+
+    async def is_member(self, household_id: str, user_id: str) -> bool:
+        """
+        Check whether a user belongs to a household
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID
+
+        Returns:
+            True if the user is a member
+        """
+        async with user_transaction(user_id) as conn:
+            return await conn.fetchval(MEMBER_SQL, household_id, user_id)
+
+    async def list_household_items(
+        self,
+        household_id: str,
+        user_id: str,
+        location: Optional[Location],
+        state: Optional[State],
+        category: Optional[Category],
+        sort_by: str,
+        limit: int,
+        offset: int
+    ) -> bytes:
+        """
+        Query a page of a household's items
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID making the request
+            location: Optional location filter
+            state: Optional state filter
+            category: Optional category filter
+            sort_by: Sort field (name, state, last_updated)
+            limit: Max items to return
+            offset: Pagination offset
+
+        Returns:
+            ItemPage as JSON bytes
+        """
+        sql = ITEM_LIST_SQL.get(sort_by, ITEM_LIST_SQL[None])
+        async with user_transaction(user_id) as conn:
+            payload = await conn.fetchval(
+                sql,
+                household_id,
+                location.value if location else None,
+                state.value if state else None,
+                category.value if category else None,
+                limit,
+                offset
+            )
+        # Validates the shape and normalizes formatting (Postgres pads
+        # separators and keeps numeric scale, e.g. 1.00)
+        return dump_json(decode_json(ItemPage, payload))
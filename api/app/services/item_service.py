@@ -4,7 +4,7 @@ Item service for business logic
 This service handles item CRUD operations, fuzzy search, and category management.
 It ensures proper multi-tenant isolation and provides human-friendly item management.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from uuid import UUID
 from datetime import datetime
 import logging
@@ -12,8 +12,21 @@ import logging
 from app.services.supabase_client import get_supabase
 from app.models import Item, ItemCreate, ItemUpdate, Category, Location, State
 from app.core.errors import NotFoundError, ValidationError, AuthorizationError
+from app.core.metrics import db_call
+from app.core.responses import dump_json
+from app.services.cache import get_household_cache
+from app.services.item_repository import ItemRepository
+from app.services.postgres import uses_direct_db
+from app.services.rows import InventoryRow, ItemPage, ItemRow, decode_json, decode_row, decode_rows, select_columns
 
 logger = logging.getLogger(__name__)
+# Per-call read logs; sampled via LOG_SAMPLE_RATES
+read_logger = logging.getLogger(f"{__name__}.reads")
+
+# Columns matching the response shape (ItemRow); the list inner-joins
+# inventory so it can filter on state
+ITEM_COLUMNS = select_columns(ItemRow)
+ITEM_LIST_COLUMNS = select_columns(ItemRow, inner=('inventory',))
 
 
 class ItemService:
@@ -21,7 +34,11 @@ class ItemService:
     
     def __init__(self):
         self.supabase = get_supabase()
+        self.cache = get_household_cache()
+        # Hot reads (items list, membership) skip PostgREST when enabled
+        self.repository = ItemRepository() if uses_direct_db('items') else None
     
+    @db_call
     async def create_item(
         self,
         household_id: str,
@@ -29,7 +46,7 @@ class ItemService:
         name: str,
         category: Category,
         location: Location
-    ) -> Dict[str, Any]:
+    ) -> ItemRow:
         """
         Create a new item in the household catalog
         
@@ -104,22 +121,17 @@ class ItemService:
             
             logger.info(f"Inventory created for item {item_id} with state OK")
             
+            await self.cache.invalidate(household_id)
+            
             # Return combined item and inventory data
-            return {
-                'id': item_data['id'],
-                'household_id': item_data['household_id'],
-                'name': item_data['name'],
-                'category': item_data['category'],
-                'location': item_data['location'],
-                'created_at': item_data['created_at'],
-                'updated_at': item_data['updated_at'],
-                'inventory': {
-                    'id': inventory_data['id'],
-                    'state': inventory_data['state'],
-                    'confidence': inventory_data['confidence'],
-                    'last_updated': inventory_data['updated_at']
-                }
-            }
+            item = decode_row(ItemRow, item_data)
+            item.inventory = InventoryRow(
+                id=inventory_data['id'],
+                state=inventory_data['state'],
+                confidence=inventory_data['confidence'],
+                last_updated=inventory_data['updated_at']
+            )
+            return item
             
         except (ValidationError, AuthorizationError):
             raise
@@ -136,11 +148,15 @@ class ItemService:
         category: Optional[Category] = None,
         sort_by: str = 'name',
         limit: int = 100,
-        offset: int = 0
-    ) -> Dict[str, Any]:
+        offset: int = 0,
+        as_json: bool = False
+    ) -> Union[Dict[str, Any], bytes]:
         """
         Get all items for a household with optional filters
         
+        Pages are cached per household and filter combination (see
+        app.services.cache) and invalidated by item writes.
+        
         Args:
             household_id: Household UUID
             user_id: User UUID making the request
@@ -150,9 +166,10 @@ class ItemService:
             sort_by: Sort field (name, state, last_updated)
             limit: Max items to return
             offset: Pagination offset
+            as_json: Return the result pre-serialized as JSON bytes
             
         Returns:
-            Dictionary with items list and total count
+            Dictionary with items list (ItemRow) and total count (JSON bytes if as_json)
             
         Raises:
             AuthorizationError: If user is not a member
@@ -160,77 +177,93 @@ class ItemService:
         # Verify user is a member of the household
         await self._verify_household_member(household_id, user_id)
         
+        shape = ":".join([
+            "items",
+            location.value if location else "-",
+            state.value if state else "-",
+            category.value if category else "-",
+            sort_by,
+            str(limit),
+            str(offset)
+        ])
+        
         try:
-            # Build query with joins
-            query = self.supabase.table('items')\
-                .select('*, inventory!inner(*)')\
-                .eq('household_id', household_id)
-            
-            # Apply filters
-            if location:
-                query = query.eq('location', location.value)
-            
-            if category:
-                query = query.eq('category', category.value)
-            
-            if state:
-                query = query.eq('inventory.state', state.value)
-            
-            # Apply sorting
-            if sort_by == 'name':
-                query = query.order('name')
-            elif sort_by == 'state':
-                query = query.order('inventory.state')
-            elif sort_by == 'last_updated':
-                query = query.order('inventory.updated_at', desc=True)
-            
-            # Apply pagination
-            query = query.range(offset, offset + limit - 1)
-            
-            # Execute query
-            response = query.execute()
-            
-            if not response.data:
-                return {'items': [], 'total': 0}
-            
-            # Transform data
-            items = []
-            for row in response.data:
-                inventory = row['inventory'][0] if row['inventory'] else None
-                items.append({
-                    'id': row['id'],
-                    'household_id': row['household_id'],
-                    'name': row['name'],
-                    'category': row['category'],
-                    'location': row['location'],
-                    'created_at': row['created_at'],
-                    'updated_at': row['updated_at'],
-                    'inventory': {
-                        'id': inventory['id'],
-                        'state': inventory['state'],
-                        'confidence': inventory['confidence'],
-                        'last_updated': inventory['updated_at']
-                    } if inventory else None
-                })
-            
-            logger.info(f"Retrieved {len(items)} items for household {household_id}")
-            
-            return {
-                'items': items,
-                'total': len(items)
-            }
-            
-        except AuthorizationError:
-            raise
+            payload = await self.cache.get_or_load(
+                household_id,
+                shape,
+                lambda: self._load_household_items(
+                    household_id, user_id, location, state, category, sort_by, limit, offset
+                )
+            )
         except Exception as e:
             logger.error(f"Error fetching items for household {household_id}: {e}", exc_info=True)
             raise Exception(f"Failed to fetch items: {str(e)}")
+        
+        if as_json:
+            return payload
+        
+        page = decode_json(ItemPage, payload)
+        return {'items': page.items, 'total': page.total}
+    
+    @db_call
+    async def _load_household_items(
+        self,
+        household_id: str,
+        user_id: str,
+        location: Optional[Location],
+        state: Optional[State],
+        category: Optional[Category],
+        sort_by: str,
+        limit: int,
+        offset: int
+    ) -> bytes:
+        """Query a page of items and serialize it (cache loader)"""
+        if self.repository is not None:
+            return await self.repository.list_household_items(
+                household_id, user_id, location, state, category, sort_by, limit, offset
+            )
+        
+        # Build query with joins
+        query = self.supabase.table('items')\
+            .select(ITEM_LIST_COLUMNS)\
+            .eq('household_id', household_id)
+        
+        # Apply filters
+        if location:
+            query = query.eq('location', location.value)
+        
+        if category:
+            query = query.eq('category', category.value)
+        
+        if state:
+            query = query.eq('inventory.state', state.value)
+        
+        # Apply sorting
+        if sort_by == 'name':
+            query = query.order('name')
+        elif sort_by == 'state':
+            query = query.order('inventory.state')
+        elif sort_by == 'last_updated':
+            query = query.order('inventory.updated_at', desc=True)
+        
+        # Apply pagination
+        query = query.range(offset, offset + limit - 1)
+        
+        # Execute query
+        response = query.execute()
+        
+        items = decode_rows(ItemRow, response.data) if response.data else []
+        
+        read_logger.info("Retrieved %d items for household %s", len(items), household_id)
+        
+        return dump_json(ItemPage(items=items, total=len(items)))
     
+    @db_call
     async def get_item_by_id(
         self,
         item_id: str,
         user_id: str
-    ) -> Dict[str, Any]:
+    ) -> ItemRow:
         """
         Get a specific item by ID with inventory details
         
@@ -248,7 +281,7 @@ class ItemService:
         try:
             # Get item with inventory
             response = self.supabase.table('items')\
-                .select('*, inventory(*)')\
+                .select(ITEM_COLUMNS)\
                 .eq('id', item_id)\
                 .execute()
             
@@ -265,23 +298,7 @@ class ItemService:
             # Verify user is a member of the household
             await self._verify_household_member(household_id, user_id)
             
-            inventory = item_data['inventory'][0] if item_data['inventory'] else None
-            
-            return {
-                'id': item_data['id'],
-                'household_id': item_data['household_id'],
-                'name': item_data['name'],
-                'category': item_data['category'],
-                'location': item_data['location'],
-                'created_at': item_data['created_at'],
-                'updated_at': item_data['updated_at'],
-                'inventory': {
-                    'id': inventory['id'],
-                    'state': inventory['state'],
-                    'confidence': inventory['confidence'],
-                    'last_updated': inventory['updated_at']
-                } if inventory else None
-            }
+            return decode_row(ItemRow, item_data)
             
         except (NotFoundError, AuthorizationError):
             raise
@@ -289,6 +306,7 @@ class ItemService:
             logger.error(f"Error fetching item {item_id}: {e}", exc_info=True)
             raise Exception(f"Failed to fetch item: {str(e)}")
     
+    @db_call
     async def update_item(
         self,
         item_id: str,
@@ -296,7 +314,7 @@ class ItemService:
         name: Optional[str] = None,
         category: Optional[Category] = None,
         location: Optional[Location] = None
-    ) -> Dict[str, Any]:
+    ) -> ItemRow:
         """
         Update an item's details
         
@@ -362,6 +380,8 @@ class ItemService:
             
             logger.info(f"Item {item_id} updated")
             
+            await self.cache.invalidate(item.household_id)
+            
             # Return updated item
             return await self.get_item_by_id(item_id, user_id)
             
@@ -371,6 +391,7 @@ class ItemService:
             logger.error(f"Error updating item {item_id}: {e}", exc_info=True)
             raise Exception(f"Failed to update item: {str(e)}")
     
+    @db_call
     async def delete_item(
         self,
         item_id: str,
@@ -404,7 +425,9 @@ class ItemService:
                     next_steps="Check the item ID and try again."
                 )
             
-            logger.info(f"Item {item_id} deleted from household {item['household_id']}")
+            logger.info(f"Item {item_id} deleted from household {item.household_id}")
+            
+            await self.cache.invalidate(item.household_id)
             
         except (NotFoundError, AuthorizationError):
             raise
@@ -412,6 +435,7 @@ class ItemService:
             logger.error(f"Error deleting item {item_id}: {e}", exc_info=True)
             raise Exception(f"Failed to delete item: {str(e)}")
     
+    @db_call
     async def search_items(
         self,
         household_id: str,
@@ -455,7 +479,7 @@ class ItemService:
             if not response.data:
                 return []
             
-            logger.info(f"Found {len(response.data)} items matching '{query}' in household {household_id}")
+            read_logger.info("Found %d items matching '%s' in household %s", len(response.data), query, household_id)
             
             return response.data
             
@@ -481,6 +505,11 @@ class ItemService:
         """
         Verify that a user is a member of a household
         
+        Positive results are cached with the household's data, so membership
+        changes (which invalidate the household) take effect immediately. Only
+        while invalidations reach every worker, though (Redis or the change
+        feed); otherwise each check queries the database.
+        
         Args:
             household_id: Household UUID
             user_id: User UUID
@@ -488,14 +517,28 @@ class ItemService:
         Raises:
             AuthorizationError: If user is not a member
         """
+        await self.cache.get_or_load(
+            household_id,
+            f"member:{user_id}",
+            lambda: self._check_household_member(household_id, user_id),
+            shared_only=True
+        )
+    
+    @db_call
+    async def _check_household_member(self, household_id: str, user_id: str) -> bytes:
+        """Query household membership (cache loader); raises if not a member"""
         try:
-            response = self.supabase.table('household_members')\
-                .select('id')\
-                .eq('household_id', household_id)\
-                .eq('user_id', user_id)\
-                .execute()
+            if self.repository is not None:
+                is_member = await self.repository.is_member(household_id, user_id)
+            else:
+                response = self.supabase.table('household_members')\
+                    .select('id')\
+                    .eq('household_id', household_id)\
+                    .eq('user_id', user_id)\
+                    .execute()
+                is_member = bool(response.data)
             
-            if not response.data:
+            if not is_member:
                 raise AuthorizationError(
                     "User is not a member of this household",
                     user_message="You don't have access to this household.",
@@ -510,3 +553,5 @@ class ItemService:
                 user_message="We couldn't verify your access.",
                 next_steps="Try again or contact support."
             )
+        
+        return b"true"
@@ -0,0 +1,121 @@
+"""
+Direct Postgres connection pool
+
+Services normally query through PostgREST (app.services.supabase_client),
+which costs an HTTP round-trip plus a JSON encode/decode per query. For the
+hottest queries, services listed in DIRECT_DB_SERVICES use repositories
+(e.g. app.services.item_repository) that talk to DATABASE_URL directly over a
+pooled asyncpg connection instead. asyncpg prepares each statement once per
+connection and reuses it, so repeated queries skip parsing and planning.
+
+Row-level security applies exactly as it does for PostgREST: every query runs
+in a transaction that first switches to the `authenticated` role and sets
+`request.jwt.claims`, which is what `auth.uid()` in the RLS policies reads.
+Both settings are transaction-local, so nothing leaks to the next user of the
+pooled connection.
+
+DATABASE_URL must allow switching to the `authenticated` role (the `postgres`
+user does). Behind a transaction pooler (e.g. Supavisor on port 6543), set
+DIRECT_DB_STATEMENT_CACHE=0, since prepared statements don't survive moving
+between server connections.
+"""
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import logging
+
+from app.core.config import settings
+from app.core.tracing import span
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Same call PostgREST makes at the start of each request
+SET_REQUEST_CONTEXT = (
+    "SELECT set_config('role', 'authenticated', true), "
+    "set_config('request.jwt.claims', $1, true)"
+)
+
+_pool = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+def uses_direct_db(service: str) -> bool:
+    """
+    Check whether a service should query Postgres directly
+
+    Args:
+        service: Service name as listed in DIRECT_DB_SERVICES (e.g. "items")
+
+    Returns:
+        True if the service is configured for the direct path
+    """
+    return service in settings.get_direct_db_services()
+
+
+async def get_pool():
+    """
+    Get the connection pool for this worker, creating it on first use
+
+    Returns:
+        asyncpg.Pool
+    """
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            import asyncpg
+
+            _pool = await asyncpg.create_pool(
+                settings.DATABASE_URL,
+                min_size=settings.DIRECT_DB_POOL_MIN,
+                max_size=settings.DIRECT_DB_POOL_MAX,
+                statement_cache_size=settings.DIRECT_DB_STATEMENT_CACHE,
+                # Timestamps serialize as +00:00, like PostgREST's
+                server_settings={
+                    "application_name": "snakr-api",
+                    "timezone": "UTC",
+                }
+            )
+            logger.info(
+                f"Direct Postgres pool ready for {', '.join(settings.get_direct_db_services())}"
+            )
+    return _pool
+
+
+async def close_pool() -> None:
+    """Close the pool, if it was created"""
+    global _pool
+    if _pool is not None:
+        try:
+            await _pool.close()
+        except Exception as e:
+            logger.warning(f"Error closing direct Postgres pool: {e}")
+        _pool = None
+
+
+@asynccontextmanager
+async def user_transaction(user_id: str) -> AsyncIterator["asyncpg.Connection"]:
+    """
+    Run queries as a user, with their RLS policies applied
+
+    Args:
+        user_id: User UUID (becomes auth.uid())
+
+    Yields:
+        Connection inside a transaction scoped to the user
+    """
+    pool = await get_pool()
+    claims = json.dumps({"sub": user_id, "role": "authenticated"})
+    with span("postgres.transaction", **{"db.system": "postgresql"}):
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(SET_REQUEST_CONTEXT, claims)
+                yield conn
@@ -0,0 +1,72 @@
+"""
+Per-worker resource registry
+
+Clients, pools and caches that live for the whole worker (the Supabase
+clients and their connection pool, the direct Postgres pool, the household
+cache's Redis connection) are registered here by the app lifespan, which
+closes them all on shutdown, most recently registered first. Each resource
+is still created on first use by its own module; the registry only decides
+when it goes away, so nothing depends on garbage collection or interpreter
+exit to release sockets.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+Closer = Callable[[], Union[None, Awaitable[None]]]
+
+
+class ResourceRegistry:
+    """Resources owned by the app lifespan"""
+
+    def __init__(self):
+        self._closers: Dict[str, Closer] = {}
+
+    def register(self, name: str, close: Closer) -> None:
+        """
+        Register a resource to close on shutdown
+
+        Registering a name again replaces its closer and moves it to the end,
+        so it closes first.
+
+        Args:
+            name: Resource name (for logs)
+            close: Function (sync or async) that releases the resource; it
+                must be safe to call when the resource was never created
+        """
+        self._closers.pop(name, None)
+        self._closers[name] = close
+
+    def names(self) -> List[str]:
+        """Registered resources, in registration order"""
+        return list(self._closers)
+
+    async def close(self) -> None:
+        """Close every registered resource, newest first; errors are logged, not raised"""
+        for name, close in reversed(list(self._closers.items())):
+            try:
+                result: Any = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Error closing {name}: {e}")
+        self._closers.clear()
+        logger.info("Worker resources closed")
+
+
+_registry: Optional[ResourceRegistry] = None
+
+
+def get_resources() -> ResourceRegistry:
+    """
+    Get the resource registry for this worker
+
+    Returns:
+        ResourceRegistry: Shared registry instance
+    """
+    global _registry
+    if _registry is None:
+        _registry = ResourceRegistry()
+    return _registry
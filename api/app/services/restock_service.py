@@ -0,0 +1,335 @@
+"""
+Restock service for business logic
+
+This service builds Restock Intents for the Nimbly handoff and exports the
+household restock list as text or JSON. Intents are assembled from the
+materialized restock list joined with items, inventory and predictions in a
+single query, and identical intents are memoized by content hash.
+"""
+from typing import Dict, Any, List, Optional, Iterator
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import json
+import logging
+import uuid
+
+from app.services.supabase_client import get_supabase
+from app.core.errors import AuthorizationError
+from app.core.metrics import db_call
+
+logger = logging.getLogger(__name__)
+
+# Restock Intent contract version (see docs/contract.md)
+INTENT_VERSION = "v1"
+
+# Namespace for deterministic intent IDs derived from the content hash
+INTENT_NAMESPACE = uuid.UUID("6f1c9a52-3d0e-4c8b-9a1e-5b7d2f4e8c31")
+
+# Restock list joined with item, inventory and prediction data (one round-trip)
+RESTOCK_SELECT = (
+    "item_id, urgency, reason, days_to_low, days_to_out, confidence, "
+    "items!inner(name, category, inventory(state, confidence), "
+    "predictions(confidence, reason_codes))"
+)
+
+# Suggested quantities per current state, with the confidence of the suggestion
+SUGGESTED_QUANTITIES = {
+    "out": (2, 0.7),
+    "almost_out": (1, 0.7),
+    "low": (1, 0.6),
+    "ok": (1, 0.5),
+    "plenty": (0, 0.5),
+}
+
+URGENCY_LABELS = {
+    "need_now": "Need now",
+    "need_soon": "Need soon",
+    "nice_to_top_up": "Nice to top up",
+}
+
+STATE_LABELS = {
+    "plenty": "Plenty",
+    "ok": "OK",
+    "low": "Low",
+    "almost_out": "Almost out",
+    "out": "Out",
+}
+
+
+class RestockService:
+    """Service for restock list export and Restock Intent generation"""
+
+    # Memoized intents keyed by content hash (shared across requests)
+    INTENT_CACHE_SIZE = 256
+    _intent_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __init__(self):
+        self.supabase = get_supabase()
+
+    @db_call
+    async def get_restock_entries(
+        self,
+        household_id: str,
+        user_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Get active restock entries with item, inventory and prediction details
+
+        Dismissed entries are excluded until their dismissal expires. Entries
+        are ordered by urgency (need_now, need_soon, nice_to_top_up), then by
+        days to out.
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID making the request
+
+        Returns:
+            List of flattened restock entries
+
+        Raises:
+            AuthorizationError: If user is not a member
+        """
+        await self._verify_household_member(household_id, user_id)
+
+        try:
+            now = datetime.utcnow().isoformat()
+            response = self.supabase.table('restock_list')\
+                .select(RESTOCK_SELECT)\
+                .eq('household_id', household_id)\
+                .or_(f'dismissed_until.is.null,dismissed_until.lt.{now}')\
+                .order('urgency')\
+                .order('days_to_out', nullsfirst=False)\
+                .execute()
+
+            rows = response.data or []
+            entries = [self._to_entry(row) for row in rows]
+
+            logger.info(f"Retrieved {len(entries)} restock entries for household {household_id}")
+            return entries
+
+        except AuthorizationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching restock list for household {household_id}: {e}", exc_info=True)
+            raise Exception(f"Failed to fetch restock list: {str(e)}")
+
+    async def build_intent(
+        self,
+        household_id: str,
+        user_id: str,
+        partial_fulfillment_allowed: bool = True,
+        local_first_preference: str = "neutral",
+        budget_sensitivity: str = "medium"
+    ) -> Dict[str, Any]:
+        """
+        Build a Restock Intent for Nimbly from the current restock list
+
+        Identical intents (same household, items and constraints) hash to the
+        same content key and are served from the memo cache, so repeated
+        handoffs keep a stable intent ID and are not rebuilt.
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID making the request
+            partial_fulfillment_allowed: Whether Nimbly may fulfill partially
+            local_first_preference: neutral, prefer, or required
+            budget_sensitivity: low, medium, or high
+
+        Returns:
+            Restock Intent following integration contract v1
+
+        Raises:
+            AuthorizationError: If user is not a member
+        """
+        entries = await self.get_restock_entries(household_id, user_id)
+
+        items = [
+            {
+                'canonical_name': entry['name'],
+                'category': entry['category'],
+                'current_state': entry['state'],
+                'confidence': entry['confidence'],
+                'reason_codes': entry['reason_codes'],
+                'suggested_quantity': entry['suggested_quantity'],
+                'quantity_confidence': entry['quantity_confidence']
+            }
+            for entry in entries
+        ]
+        constraints = {
+            'partial_fulfillment_allowed': partial_fulfillment_allowed,
+            'local_first_preference': local_first_preference,
+            'budget_sensitivity': budget_sensitivity
+        }
+
+        content_hash = self._content_hash(household_id, items, constraints)
+        cached = self._intent_cache.get(content_hash)
+        if cached is not None:
+            self._intent_cache.move_to_end(content_hash)
+            logger.debug(f"Restock intent cache hit for household {household_id}")
+            return cached
+
+        intent = {
+            'intent_id': str(uuid.uuid5(INTENT_NAMESPACE, content_hash)),
+            'version': INTENT_VERSION,
+            'household_id': household_id,
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'overall_urgency': self._overall_urgency(entries),
+            'items': items,
+            'constraints': constraints
+        }
+
+        self._intent_cache[content_hash] = intent
+        if len(self._intent_cache) > self.INTENT_CACHE_SIZE:
+            self._intent_cache.popitem(last=False)
+
+        logger.info(f"Restock intent {intent['intent_id']} built with {len(items)} items")
+        return intent
+
+    @staticmethod
+    def iter_intent_json(intent: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream a Restock Intent as JSON, one item per chunk
+
+        Args:
+            intent: Restock Intent from build_intent
+
+        Yields:
+            JSON text chunks that concatenate into a single document
+        """
+        header = {key: value for key, value in intent.items() if key not in ('items', 'constraints')}
+        yield json.dumps(header)[:-1] + ', "items": ['
+
+        for index, item in enumerate(intent['items']):
+            yield (', ' if index else '') + json.dumps(item)
+
+        yield '], "constraints": ' + json.dumps(intent['constraints']) + '}'
+
+    @staticmethod
+    def iter_entries_text(entries: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Stream restock entries as a plain text list grouped by urgency
+
+        Args:
+            entries: Restock entries ordered by urgency
+
+        Yields:
+            Lines of text suitable for copy/paste
+        """
+        if not entries:
+            yield "Nothing to restock right now.\n"
+            return
+
+        current_urgency = None
+        for entry in entries:
+            if entry['urgency'] != current_urgency:
+                if current_urgency is not None:
+                    yield "\n"
+                current_urgency = entry['urgency']
+                yield f"{URGENCY_LABELS.get(current_urgency, current_urgency)}:\n"
+
+            state = STATE_LABELS.get(entry['state'], entry['state'])
+            yield f"- {entry['name']} ({state}) - {entry['reason']}\n"
+
+    @staticmethod
+    def _to_entry(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten a joined restock_list row into an export entry"""
+        item = row['items']
+        inventory = _first(item.get('inventory'))
+        prediction = _first(item.get('predictions'))
+
+        state = inventory['state'] if inventory else 'out'
+        confidence = row.get('confidence')
+        if confidence is None:
+            confidence = (prediction or inventory or {}).get('confidence', 1.0)
+
+        reason_codes = list(prediction['reason_codes']) if prediction and prediction.get('reason_codes') else []
+        if not reason_codes:
+            reason_codes = [f"currently_{state}"]
+
+        quantity, quantity_confidence = SUGGESTED_QUANTITIES.get(state, (1, 0.5))
+
+        return {
+            'item_id': row['item_id'],
+            'name': item['name'],
+            'category': item['category'],
+            'state': state,
+            'urgency': row['urgency'],
+            'reason': row['reason'],
+            'days_to_out': row.get('days_to_out'),
+            'confidence': float(confidence),
+            'reason_codes': reason_codes,
+            'suggested_quantity': quantity,
+            'quantity_confidence': round(min(quantity_confidence, float(confidence)), 2)
+        }
+
+    @staticmethod
+    def _overall_urgency(entries: List[Dict[str, Any]]) -> str:
+        """Derive overall intent urgency (low, medium, high) from entries"""
+        urgencies = {entry['urgency'] for entry in entries}
+        if 'need_now' in urgencies:
+            return 'high'
+        if 'need_soon' in urgencies:
+            return 'medium'
+        return 'low'
+
+    @staticmethod
+    def _content_hash(
+        household_id: str,
+        items: List[Dict[str, Any]],
+        constraints: Dict[str, Any]
+    ) -> str:
+        """Hash the intent content that determines identity"""
+        payload = json.dumps(
+            {
+                'version': INTENT_VERSION,
+                'household_id': household_id,
+                'items': items,
+                'constraints': constraints
+            },
+            sort_keys=True,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @db_call
+    async def _verify_household_member(self, household_id: str, user_id: str) -> None:
+        """
+        Verify that a user is a member of a household
+
+        Args:
+            household_id: Household UUID
+            user_id: User UUID
+
+        Raises:
+            AuthorizationError: If user is not a member
+        """
+        try:
+            response = self.supabase.table('household_members')\
+                .select('id')\
+                .eq('household_id', household_id)\
+                .eq('user_id', user_id)\
+                .execute()
+
+            if not response.data:
+                raise AuthorizationError(
+                    "User is not a member of this household",
+                    user_message="You don't have access to this household.",
+                    next_steps="Contact the household admin for access."
+                )
+        except AuthorizationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error verifying household membership: {e}", exc_info=True)
+            raise AuthorizationError(
+                "Failed to verify household membership",
+                user_message="We couldn't verify your access.",
+                next_steps="Try again or contact support."
+            )
+
+
+def _first(value: Any) -> Optional[Dict[str, Any]]:
+    """Return the embedded record whether PostgREST returned an object or a list"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
@@ -0,0 +1,225 @@
+"""
+Row types for PostgREST results
+
+msgspec Structs shared by the item, household and invitation services. A
+page of rows is decoded once from the PostgREST response (`decode_rows`) and
+can be handed straight to dump_json / FastJSONResponse, which encodes structs
+natively: no per-row dict rebuilding or Pydantic model on the way in or out.
+
+Each row type is also the query's projection: `select_columns` derives the
+PostgREST select list from its fields (and `json_object_sql` the equivalent
+SQL for the direct Postgres path), so a query fetches exactly what the
+response carries and the two can't drift. Field names are the API names;
+`Column` marks a field selected from a differently named column (rendered as
+a PostgREST alias, e.g. `last_updated:updated_at`), and nested row types
+become embedded resources. Values are kept as PostgREST returns them (UUIDs
+and timestamps as strings, enums as values).
+"""
+from functools import lru_cache
+from typing import Annotated, Any, Dict, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin
+
+import msgspec
+
+RowT = TypeVar("RowT", bound=msgspec.Struct)
+
+
+class Column:
+    """Field metadata: select the field from a differently named column"""
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class InventoryRow(msgspec.Struct):
+    """Current inventory state of an item"""
+    id: str
+    state: str
+    confidence: float
+    last_updated: Annotated[str, Column("updated_at")]
+
+
+class ItemRow(msgspec.Struct):
+    """Catalog item with its inventory state"""
+    id: str
+    household_id: str
+    name: str
+    category: str
+    location: str
+    created_at: str
+    updated_at: str
+    # PostgREST embeds the inventory relation as a list; normalized to one row
+    inventory: Union[InventoryRow, List[InventoryRow], None] = None
+
+    def __post_init__(self):
+        if isinstance(self.inventory, list):
+            self.inventory = self.inventory[0] if self.inventory else None
+
+
+class ItemPage(msgspec.Struct):
+    """A page of items, as the items list returns it"""
+    items: List[ItemRow]
+    total: int
+
+
+class HouseholdRow(msgspec.Struct):
+    """Household"""
+    id: str
+    name: str
+    created_at: str
+    updated_at: str
+
+
+class HouseholdStats(msgspec.Struct):
+    """Inventory and restock counts for a household"""
+    item_count: int
+    states: Dict[str, int]
+    restock: Dict[str, int]
+
+
+class UserHouseholdRow(HouseholdRow, kw_only=True, omit_defaults=True):
+    """Household with the user's role and optional stats (omitted when not requested)"""
+    role: str
+    stats: Optional[HouseholdStats] = None
+
+
+class HouseholdPage(msgspec.Struct):
+    """The user's households, as the households list returns them"""
+    households: List[UserHouseholdRow]
+    total: int
+
+
+class MemberRow(msgspec.Struct):
+    """Household member"""
+    id: str
+    user_id: str
+    role: str
+    joined_at: str
+
+
+class HouseholdDetail(HouseholdRow, kw_only=True, omit_defaults=True):
+    """Household detail, as get_household_detail returns it (members omitted in summary mode)"""
+    member_count: int
+    admin_count: int
+    members: Optional[List[MemberRow]] = None
+
+
+class InvitationRow(msgspec.Struct, kw_only=True):
+    """Household invitation (without its secret token)"""
+    id: str
+    household_id: str
+    inviter_id: str
+    invitee_email: str
+    role: str
+    status: str
+    expires_at: str
+    accepted_at: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+
+class InvitationPage(msgspec.Struct):
+    """A household's invitations, as the invitations list returns them"""
+    invitations: List[InvitationRow]
+    total: int
+
+
+def _embedded_row_type(annotation: Any) -> Optional[Type[msgspec.Struct]]:
+    """Find a row type inside a field annotation (e.g. Optional[List[Row]])"""
+    if isinstance(annotation, type) and issubclass(annotation, msgspec.Struct):
+        return annotation
+    for arg in get_args(annotation):
+        found = _embedded_row_type(arg)
+        if found is not None:
+            return found
+    return None
+
+
+def _column_name(field: msgspec.structs.FieldInfo) -> str:
+    """Database column a field is selected from"""
+    if get_origin(field.type) is Annotated:
+        for meta in field.type.__metadata__:
+            if isinstance(meta, Column):
+                return meta.name
+    return field.name
+
+
+@lru_cache(maxsize=None)
+def select_columns(row_type: Type[msgspec.Struct], inner: Tuple[str, ...] = ()) -> str:
+    """
+    Build the PostgREST select list for a row type
+
+    Args:
+        row_type: Struct type the query decodes into
+        inner: Embedded relations to inner-join (needed to filter rows on them)
+
+    Returns:
+        Select string, e.g. "id, name, inventory!inner(id, last_updated:updated_at)"
+    """
+    parts = []
+    for field in msgspec.structs.fields(row_type):
+        annotation = field.type
+        embedded = _embedded_row_type(annotation)
+        if embedded is not None:
+            relation = f"{field.name}!inner" if field.name in inner else field.name
+            parts.append(f"{relation}({select_columns(embedded)})")
+            continue
+
+        column = _column_name(field)
+        parts.append(column if column == field.name else f"{field.name}:{column}")
+
+    return ", ".join(parts)
+
+
+@lru_cache(maxsize=None)
+def json_object_sql(
+    row_type: Type[msgspec.Struct],
+    alias: str,
+    embedded: Tuple[Tuple[str, str], ...] = ()
+) -> str:
+    """
+    Build a SQL expression producing a row type's JSON object
+
+    Args:
+        row_type: Struct type the JSON must decode into
+        alias: Table alias of the row's columns
+        embedded: (field, table alias) pairs for embedded row types, which
+            must be joined in the query
+
+    Returns:
+        SQL, e.g. "json_build_object('id', i.id, 'inventory', json_build_object(...))"
+    """
+    aliases = dict(embedded)
+    parts = []
+    for field in msgspec.structs.fields(row_type):
+        nested = _embedded_row_type(field.type)
+        if nested is not None:
+            parts.append(f"'{field.name}', {json_object_sql(nested, aliases[field.name])}")
+        else:
+            parts.append(f"'{field.name}', {alias}.{_column_name(field)}")
+
+    return f"json_build_object({', '.join(parts)})"
+
+
+def decode_rows(row_type: Type[RowT], records: List[Dict[str, Any]]) -> List[RowT]:
+    """
+    Decode PostgREST records into row structs
+
+    Args:
+        row_type: Struct type to decode into
+        records: Records from a PostgREST response (extra columns are ignored)
+
+    Returns:
+        List of row structs
+    """
+    return msgspec.convert(records, List[row_type])
+
+
+def decode_row(row_type: Type[RowT], record: Dict[str, Any]) -> RowT:
+    """Decode a single PostgREST record into a row struct"""
+    return msgspec.convert(record, row_type)
+
+
+def decode_json(row_type: Type[RowT], data: bytes) -> RowT:
+    """Decode serialized JSON (e.g. a cached response) into the given type"""
+    return msgspec.json.decode(data, type=row_type)
@@ -1,23 +1,56 @@
 """
 Supabase client service for database and storage operations
 """
-from supabase import create_client, Client
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import logging
+import threading
 
 from app.core.config import settings
 from app.core.errors import AuthenticationError, NotFoundError
 
+if TYPE_CHECKING:
+    import httpx
+    from postgrest import SyncPostgrestClient
+    from supabase import Client, ClientOptions
+
 logger = logging.getLogger(__name__)
 
 
+def create_client(*args, **kwargs) -> "Client":
+    """
+    supabase.create_client, imported on first use
+    
+    The supabase package (auth, realtime, storage and PostgREST clients) takes
+    a few hundred milliseconds to import, so it stays out of app startup; the
+    lifespan handler builds the client before the first request.
+    """
+    from supabase import create_client as supabase_create_client
+    
+    return supabase_create_client(*args, **kwargs)
+
+
 class SupabaseService:
-    """Supabase client wrapper for database and storage operations"""
+    """
+    Supabase client wrapper for database and storage operations
     
-    _client: Optional[Client] = None
+    Every client shares one pooled HTTP transport, so a request reuses an
+    open keep-alive connection instead of paying for a new connection and TLS
+    handshake. Queries that must run under a user's RLS policies go through
+    a PostgREST session for that user's JWT: the same transport, with the
+    token sent as a per-request header, so they cost the same as
+    service-role queries. Sessions are kept in a small LRU keyed by token.
+    The app lifespan closes the transport on shutdown (see
+    app.services.resources).
+    """
+    
+    _client: Optional["Client"] = None
+    _http_client: Optional["httpx.Client"] = None
+    _user_sessions: "OrderedDict[str, SyncPostgrestClient]" = OrderedDict()
+    _lock = threading.Lock()
     
     @classmethod
-    def get_client(cls) -> Client:
+    def get_client(cls) -> "Client":
         """
         Get or create Supabase client instance (singleton pattern)
         
@@ -28,31 +61,113 @@ class SupabaseService:
             ValueError: If SUPABASE_URL or SUPABASE_KEY not set
         """
         if cls._client is None:
-            if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-                raise ValueError(
-                    "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
-                )
-            
+            cls._check_settings()
             cls._client = create_client(
                 settings.SUPABASE_URL,
-                settings.SUPABASE_KEY
+                settings.SUPABASE_KEY,
+                options=cls._options()
             )
             logger.info("Supabase client initialized")
         
         return cls._client
     
+    @classmethod
+    def get_user_client(cls, user_token: str) -> "SyncPostgrestClient":
+        """
+        Get a PostgREST session that acts as a user, so RLS policies apply
+        
+        Supports the same table(), from_(), rpc() and schema() calls as the
+        Supabase client's database API (not auth or storage).
+        
+        Args:
+            user_token: The user's Supabase JWT
+            
+        Returns:
+            SyncPostgrestClient: Session sending the token as its Authorization
+            header, over the shared transport
+            
+        Raises:
+            ValueError: If SUPABASE_URL or SUPABASE_KEY not set
+        """
+        with cls._lock:
+            session = cls._user_sessions.get(user_token)
+            if session is not None:
+                cls._user_sessions.move_to_end(user_token)
+                return session
+        
+        cls._check_settings()
+        from postgrest import SyncPostgrestClient
+        
+        # Never aclose() a session: that would close the shared transport
+        session = SyncPostgrestClient(
+            f"{settings.SUPABASE_URL.rstrip('/')}/rest/v1",
+            headers={
+                "apiKey": settings.SUPABASE_KEY,
+                "Authorization": f"Bearer {user_token}",
+            },
+            http_client=cls._transport()
+        )
+        with cls._lock:
+            cls._user_sessions[user_token] = session
+            while len(cls._user_sessions) > settings.SUPABASE_USER_SESSIONS:
+                cls._user_sessions.popitem(last=False)
+        return session
+    
+    @classmethod
+    def close(cls) -> None:
+        """Drop every client and close their connections"""
+        with cls._lock:
+            http_client = cls._http_client
+            cls._client = None
+            cls._http_client = None
+            cls._user_sessions.clear()
+        if http_client is not None:
+            http_client.close()
+            logger.info("Supabase connections closed")
+    
     @classmethod
     def reset_client(cls) -> None:
         """Reset the client instance (useful for testing)"""
-        cls._client = None
+        cls.close()
         logger.info("Supabase client reset")
+    
+    @staticmethod
+    def _check_settings() -> None:
+        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+            raise ValueError(
+                "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
+            )
+    
+    @classmethod
+    def _options(cls) -> "ClientOptions":
+        """Client options on the shared transport"""
+        from supabase import ClientOptions
+        
+        return ClientOptions(httpx_client=cls._transport())
+    
+    @classmethod
+    def _transport(cls) -> "httpx.Client":
+        """The pooled HTTP client every Supabase client sends through"""
+        with cls._lock:
+            if cls._http_client is None:
+                import httpx
+                
+                cls._http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=settings.SUPABASE_POOL_SIZE,
+                        max_keepalive_connections=settings.SUPABASE_POOL_SIZE
+                    ),
+                    timeout=settings.SUPABASE_TIMEOUT,
+                    follow_redirects=True
+                )
+            return cls._http_client
 
 
 class DatabaseHelper:
     """Helper methods for common database operations"""
     
     @staticmethod
-    def get_supabase() -> Client:
+    def get_supabase() -> "Client":
         """Get Supabase client instance"""
         return SupabaseService.get_client()
     
@@ -129,19 +244,13 @@ class DatabaseHelper:
         Raises:
             NotFoundError: If insert fails
         """
-        supabase = SupabaseService.get_client()
-        
         try:
-            # If user token provided, create client with user context
+            # With a user token, run as that user so RLS applies
             if user_token:
-                client = create_client(
-                    settings.SUPABASE_URL,
-                    settings.SUPABASE_KEY,
-                    options={"headers": {"Authorization": f"Bearer {user_token}"}}
-                )
-                response = client.table(table).insert(data).execute()
+                supabase = SupabaseService.get_user_client(user_token)
             else:
-                response = supabase.table(table).insert(data).execute()
+                supabase = SupabaseService.get_client()
+            response = supabase.table(table).insert(data).execute()
             
             if not response.data:
                 raise NotFoundError(f"Failed to insert into {table}")
@@ -173,18 +282,12 @@ class DatabaseHelper:
         Raises:
             NotFoundError: If update fails or record not found
         """
-        supabase = SupabaseService.get_client()
-        
         try:
             if user_token:
-                client = create_client(
-                    settings.SUPABASE_URL,
-                    settings.SUPABASE_KEY,
-                    options={"headers": {"Authorization": f"Bearer {user_token}"}}
-                )
-                response = client.table(table).update(data).eq('id', record_id).execute()
+                supabase = SupabaseService.get_user_client(user_token)
             else:
-                response = supabase.table(table).update(data).eq('id', record_id).execute()
+                supabase = SupabaseService.get_client()
+            response = supabase.table(table).update(data).eq('id', record_id).execute()
             
             if not response.data:
                 raise NotFoundError(f"Record not found in {table}")
@@ -196,7 +299,7 @@ class DatabaseHelper:
 
 
 # Convenience function to get client
-def get_supabase() -> Client:
+def get_supabase() -> "Client":
     """
     Get Supabase client instance
     
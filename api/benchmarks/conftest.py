@@ -0,0 +1,93 @@
+"""
+Shared benchmark fixtures
+
+Micro benchmarks run the service layer against a mocked Supabase client that
+returns realistic row volumes, so they measure our own decode, validation and
+serialization work, not the network. Run them with:
+
+    cd api
+    pytest benchmarks/ --benchmark-json=benchmarks.json
+"""
+import asyncio
+import uuid
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from app.services.cache import HouseholdCache
+
+HOUSEHOLD_ID = str(uuid.uuid4())
+USER_ID = str(uuid.uuid4())
+
+CATEGORIES = ("dairy", "produce", "meat", "bakery", "pantry_staple", "beverage", "snack", "condiment", "other")
+LOCATIONS = ("fridge", "pantry", "freezer")
+STATES = ("plenty", "ok", "low", "almost_out", "out")
+
+
+def item_records(count: int) -> list:
+    """Item rows with embedded inventory, as the items list query returns them"""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": HOUSEHOLD_ID,
+            "name": f"Item {n:05d}",
+            "category": CATEGORIES[n % len(CATEGORIES)],
+            "location": LOCATIONS[n % len(LOCATIONS)],
+            "created_at": "2024-01-22T12:00:00+00:00",
+            "updated_at": "2024-01-22T12:00:00+00:00",
+            "inventory": [{
+                "id": str(uuid.uuid4()),
+                "state": STATES[n % len(STATES)],
+                "confidence": 0.85,
+                "last_updated": "2024-01-22T14:30:00+00:00",
+            }],
+        }
+        for n in range(count)
+    ]
+
+
+def household_detail(members: int) -> dict:
+    """get_household_detail RPC result"""
+    return {
+        "id": HOUSEHOLD_ID,
+        "name": "Benchmark Household",
+        "created_at": "2024-01-20T12:00:00+00:00",
+        "updated_at": "2024-01-20T12:00:00+00:00",
+        "member_count": members,
+        "admin_count": 1,
+        "members": [
+            {
+                "user_id": str(uuid.uuid4()),
+                "role": "admin" if n == 0 else "member",
+                "joined_at": "2024-01-20T12:00:00+00:00",
+            }
+            for n in range(members)
+        ],
+    }
+
+
+def uncached(service):
+    """Turn off the household cache so every call does the full work"""
+    service.cache = HouseholdCache(enabled=False)
+    return service
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine factory to completion on one long-lived event loop"""
+    loop = asyncio.new_event_loop()
+    yield lambda factory: loop.run_until_complete(factory())
+    loop.close()
+
+
+@pytest.fixture
+def supabase():
+    """Mocked Supabase client; chain calls return the same query builder"""
+    client = MagicMock()
+    query = MagicMock()
+    for method in ("select", "eq", "ilike", "order", "range", "limit"):
+        getattr(query, method).return_value = query
+    client.table.return_value = query
+    client.query = query
+    client.respond = lambda data: setattr(query.execute, "return_value", Mock(data=data))
+    return client
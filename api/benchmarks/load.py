@@ -0,0 +1,326 @@
+"""
+Macro benchmark: drive a running API with a realistic request mix
+
+Virtual users (one per seeded household admin, reused round-robin) loop for
+--duration seconds, each request picked at random by scenario weight, like a
+Locust task set. Per scenario, the report has request count, errors (non-2xx
+or transport failures; 429s are counted separately as rate_limited), error
+rate, p50/p95/p99 latency and throughput, written as JSON.
+
+With --baseline, the run is compared with an earlier report and the script
+exits 1 if any scenario's p95 grew by more than --max-regression or its error
+rate rose, so it can gate a release.
+
+Needs:
+- A running API (`uvicorn main:app --workers 4`) pointed at a local Supabase
+  stack with migrations applied, with RATE_LIMIT_ENABLED=false (or every
+  user is throttled at 100 requests/minute)
+- DATABASE_URL and SUPABASE_JWT_SECRET for that stack, to seed households
+  and sign user tokens
+
+Usage:
+    cd api
+    python -m benchmarks.load --seed --households 20 --events 1000000 --output baseline.json
+    python -m benchmarks.load --run-id <run id> --users 50 --duration 120 \\
+        --baseline baseline.json --output report.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from benchmarks.seed import LOCATIONS, SeededHousehold, cleanup, load_seeded, seed
+
+API = "/api/v1"
+
+SEARCH_TERMS = ("item", "item 00", "item 01", "milk", "tem 1")
+
+
+async def list_items(client, household: SeededHousehold, rng: random.Random):
+    sort_by = rng.choice(("name", "name", "state", "last_updated"))
+    return await client.get(
+        f"{API}/items",
+        params={"household_id": household.household_id, "sort_by": sort_by, "limit": 100}
+    )
+
+
+async def search_items(client, household: SeededHousehold, rng: random.Random):
+    return await client.get(
+        f"{API}/items/search",
+        params={"household_id": household.household_id, "q": rng.choice(SEARCH_TERMS)}
+    )
+
+
+async def household_detail(client, household: SeededHousehold, rng: random.Random):
+    return await client.get(f"{API}/households/{household.household_id}")
+
+
+async def update_item(client, household: SeededHousehold, rng: random.Random):
+    # Stands in for the quick actions (Used / Restocked / Ran out): a small
+    # write that invalidates the household's cached reads
+    return await client.patch(
+        f"{API}/items/{rng.choice(household.item_ids)}",
+        json={"location": rng.choice(LOCATIONS)}
+    )
+
+
+async def list_events(client, household: SeededHousehold, rng: random.Random):
+    return await client.get(f"{API}/events", params={"household_id": household.household_id})
+
+
+async def invite(client, household: SeededHousehold, rng: random.Random):
+    return await client.post(
+        f"{API}/households/{household.household_id}/invitations",
+        json={"email": f"bench-invitee-{uuid.uuid4().hex[:12]}@example.com", "role": "member"}
+    )
+
+
+Scenario = Callable[[Any, SeededHousehold, random.Random], Awaitable[Any]]
+
+# name -> (default weight, request)
+SCENARIOS: Dict[str, Tuple[int, Scenario]] = {
+    "list_items": (40, list_items),
+    "household_detail": (20, household_detail),
+    "search_items": (15, search_items),
+    "update_item": (15, update_item),
+    "list_events": (5, list_events),
+    "invite": (5, invite),
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Scenario weights, defaults overridden by "name=weight,..." """
+    weights = {name: weight for name, (weight, _) in SCENARIOS.items()}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, weight = entry.split("=", 1)
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        weights[name] = int(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def sign_token(household: SeededHousehold, secret: str) -> str:
+    """Supabase-style access token for a seeded user"""
+    from jose import jwt
+
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {
+            "sub": household.user_id,
+            "email": household.email,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "iat": int(now.timestamp()),
+            "exp": int((now + timedelta(hours=6)).timestamp()),
+        },
+        secret,
+        algorithm="HS256"
+    )
+
+
+class Recorder:
+    """Latencies and outcomes per scenario"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rate_limited: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name: str, elapsed: float, status: int) -> None:
+        self.latencies[name].append(elapsed)
+        self.statuses[name][status] += 1
+        if status == 429:
+            self.rate_limited[name] += 1
+        elif not 200 <= status < 300:
+            self.errors[name] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        scenarios = {
+            name: summarize(self.latencies[name], self.errors[name], self.rate_limited[name], elapsed)
+            for name in sorted(self.latencies)
+        }
+        for name, summary in scenarios.items():
+            summary["statuses"] = {str(code): count for code, count in sorted(self.statuses[name].items())}
+        everything = [latency for latencies in self.latencies.values() for latency in latencies]
+        total = summarize(everything, sum(self.errors.values()), sum(self.rate_limited.values()), elapsed)
+        return {"total": total, "scenarios": scenarios}
+
+
+def summarize(latencies: List[float], errors: int, rate_limited: int, elapsed: float) -> Dict[str, Any]:
+    """Request count, error rate, latency percentiles (ms) and throughput"""
+    count = len(latencies)
+    if count >= 2:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": count,
+        "errors": errors,
+        "rate_limited": rate_limited,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+        "per_second": round(count / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def virtual_user(client, household, weights, deadline, think, rng, recorder) -> None:
+    """Send requests from one user (one connection) until the deadline"""
+    names = list(weights)
+    scenario_weights = list(weights.values())
+
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights=scenario_weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name][1](client, household, rng)
+            status = response.status_code
+        except Exception:
+            status = 0
+        recorder.record(name, time.perf_counter() - start, status)
+        if think:
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Scenarios whose p95 or error rate regressed against the baseline"""
+    regressions = []
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and current["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["error_rate"] > before["error_rate"] + 0.001:
+            regressions.append(f"{name}: error rate {before['error_rate']} -> {current['error_rate']}")
+    return regressions
+
+
+async def run(args) -> Dict[str, Any]:
+    import asyncpg
+    import httpx
+
+    from app.core.config import settings
+
+    run_id = args.run_id or uuid.uuid4().hex[:8]
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        if args.seed:
+            started = time.perf_counter()
+            households = await seed(
+                conn, run_id, args.households, args.min_items, args.max_items, args.events, args.days
+            )
+            print(f"Seeded run {run_id} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        else:
+            households = await load_seeded(conn, run_id)
+        if not households:
+            raise SystemExit(f"No seeded households for run {run_id!r}; pass --seed")
+
+        weights = parse_mix(args.mix)
+        recorder = Recorder()
+        rng = random.Random(args.random_seed)
+        users = [
+            (
+                httpx.AsyncClient(
+                    base_url=args.base_url,
+                    timeout=30.0,
+                    headers={"Authorization": f"Bearer {sign_token(household, settings.SUPABASE_JWT_SECRET)}"}
+                ),
+                household
+            )
+            for household in (households[n % len(households)] for n in range(args.users))
+        ]
+        try:
+            # Warm up connections and caches
+            for client, household in users:
+                await list_items(client, household, rng)
+
+            started = time.perf_counter()
+            deadline = time.monotonic() + args.duration
+            await asyncio.gather(*(
+                virtual_user(
+                    client,
+                    household,
+                    weights,
+                    deadline,
+                    args.think_ms / 1000,
+                    random.Random(args.random_seed + n),
+                    recorder
+                )
+                for n, (client, household) in enumerate(users)
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            await asyncio.gather(*(client.aclose() for client, _ in users))
+
+        if args.cleanup:
+            await cleanup(conn, run_id)
+    finally:
+        await conn.close()
+
+    return {
+        "run_id": run_id,
+        "config": {
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_s": args.duration,
+            "think_ms": args.think_ms,
+            "mix": weights,
+            "households": len(households),
+            "items": sum(h.items for h in households),
+        },
+        **recorder.report(elapsed),
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Load test the API with a realistic request mix")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between a user's requests")
+    parser.add_argument("--mix", default="", help='Scenario weights, e.g. "list_items=60,invite=0"')
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--run-id", help="Reuse the households of an earlier --seed run")
+    parser.add_argument("--seed", action="store_true", help="Seed new households first")
+    parser.add_argument("--households", type=int, default=20)
+    parser.add_argument("--min-items", type=int, default=50)
+    parser.add_argument("--max-items", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--cleanup", action="store_true", help="Delete the seeded households afterwards")
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="Earlier report to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 growth (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Seed a local Supabase database with synthetic benchmark households
+
+Each household gets one admin user, between --min-items and --max-items items
+(log-uniform, so most households are small and a few are large) with
+inventory, and a share of the event history proportional to its item count,
+spread over the last --days days. Everything is generated server-side with
+generate_series, so a million events take seconds, not minutes.
+
+Rows are tagged with a run ID (in household names and user emails) so a run
+can be reused with --run-id or deleted with --cleanup. Datasets loaded with
+`python -m synthetic` are tagged the same way (run ID "seed<seed>" by
+default), so the load test can run against them too.
+
+Usage:
+    cd api
+    python -m benchmarks.seed --households 20 --max-items 10000 --events 1000000
+    python -m benchmarks.seed --cleanup --run-id <run id>
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import uuid
+from dataclasses import asdict, dataclass
+from typing import List
+
+CATEGORIES = ("dairy", "produce", "meat", "bakery", "pantry_staple", "beverage", "snack", "condiment", "other")
+LOCATIONS = ("fridge", "pantry", "freezer")
+STATES = ("plenty", "ok", "low", "almost_out", "out")
+
+INSERT_ITEMS = """
+    WITH new_items AS (
+        INSERT INTO items (household_id, name, category, location)
+        SELECT $1, 'Item ' || lpad(n::text, 6, '0'),
+               ($2::text[])[1 + n % array_length($2::text[], 1)],
+               ($3::text[])[1 + n % array_length($3::text[], 1)]
+        FROM generate_series(1, $5) AS n
+        RETURNING id
+    ), new_inventory AS (
+        INSERT INTO inventory (household_id, item_id, state, confidence)
+        SELECT $1, id, ($4::text[])[1 + floor(random() * array_length($4::text[], 1))::int],
+               round(random()::numeric, 2)
+        FROM new_items
+    )
+    SELECT array_agg(id) FROM new_items
+"""
+
+# 70% used, 20% restocked, 10% ran out; item picked at random
+INSERT_EVENTS = """
+    INSERT INTO events (household_id, event_type, source, item_id, payload, confidence, created_at)
+    SELECT $1,
+           CASE WHEN r < 0.7 THEN 'inventory.used'
+                WHEN r < 0.9 THEN 'inventory.restocked'
+                ELSE 'inventory.ran_out' END,
+           'user',
+           ($2::uuid[])[1 + floor(random() * array_length($2::uuid[], 1))::int],
+           '{}'::jsonb,
+           1.0,
+           now() - random() * make_interval(days => $4)
+    FROM (SELECT random() AS r FROM generate_series(1, $3)) AS draws
+"""
+
+
+@dataclass
+class SeededHousehold:
+    """A seeded household and its admin"""
+    household_id: str
+    user_id: str
+    email: str
+    items: int
+    events: int
+    item_ids: List[str]
+
+
+def item_counts(households: int, min_items: int, max_items: int, rng: random.Random) -> List[int]:
+    """Log-uniform item counts, always including one household at max_items"""
+    low, high = math.log(min_items), math.log(max_items)
+    counts = [round(math.exp(rng.uniform(low, high))) for _ in range(households - 1)]
+    return counts + [max_items]
+
+
+async def seed(
+    conn,
+    run_id: str,
+    households: int,
+    min_items: int,
+    max_items: int,
+    events: int,
+    days: int,
+    seed_value: int = 42
+) -> List[SeededHousehold]:
+    """
+    Create benchmark households with items, inventory and events
+
+    Args:
+        conn: asyncpg connection (service role / postgres)
+        run_id: Tag for the seeded rows
+        households: Number of households
+        min_items: Fewest items in a household
+        max_items: Most items in a household
+        events: Total events, split by item count
+        days: Event history length
+
+    Returns:
+        Seeded households
+    """
+    rng = random.Random(seed_value)
+    counts = item_counts(households, min_items, max_items, rng)
+    total_items = sum(counts)
+    seeded = []
+
+    for n, items in enumerate(counts):
+        user_id = str(uuid.uuid4())
+        household_id = str(uuid.uuid4())
+        email = f"bench-{run_id}-{n}@example.com"
+        household_events = round(events * items / total_items)
+
+        async with conn.transaction():
+            await conn.execute(
+                "INSERT INTO auth.users (id, email, aud, role) VALUES ($1, $2, 'authenticated', 'authenticated')",
+                user_id, email
+            )
+            await conn.execute(
+                "INSERT INTO households (id, name) VALUES ($1, $2)",
+                household_id, f"Benchmark {run_id} #{n}"
+            )
+            await conn.execute(
+                "INSERT INTO household_members (household_id, user_id, role) VALUES ($1, $2, 'admin')",
+                household_id, user_id
+            )
+            item_ids = await conn.fetchval(
+                INSERT_ITEMS, household_id, list(CATEGORIES), list(LOCATIONS), list(STATES), items
+            )
+            if household_events:
+                await conn.execute(INSERT_EVENTS, household_id, item_ids, household_events, days)
+
+        seeded.append(SeededHousehold(
+            household_id, user_id, email, items, household_events, [str(i) for i in item_ids]
+        ))
+
+    return seeded
+
+
+async def load_seeded(conn, run_id: str) -> List[SeededHousehold]:
+    """Find the households of an earlier run"""
+    rows = await conn.fetch(
+        """
+        SELECT h.id, m.user_id, u.email,
+               (SELECT array_agg(i.id) FROM items i WHERE i.household_id = h.id) AS item_ids
+        FROM households h
+        JOIN household_members m ON m.household_id = h.id AND m.role = 'admin'
+        JOIN auth.users u ON u.id = m.user_id
+        WHERE h.name LIKE $1 OR h.name LIKE $2
+        ORDER BY h.name
+        """,
+        f"Benchmark {run_id} #%",
+        f"Synthetic {run_id} #%"
+    )
+    return [
+        SeededHousehold(
+            str(row["id"]), str(row["user_id"]), row["email"], len(row["item_ids"] or []), 0,
+            [str(i) for i in row["item_ids"] or []]
+        )
+        for row in rows
+    ]
+
+
+async def cleanup(conn, run_id: str) -> None:
+    """Delete a run's households (cascading to items and events) and users"""
+    await conn.execute(
+        "DELETE FROM households WHERE name LIKE $1 OR name LIKE $2",
+        f"Benchmark {run_id} #%", f"Synthetic {run_id} #%"
+    )
+    await conn.execute(
+        "DELETE FROM auth.users WHERE email LIKE $1 OR email LIKE $2",
+        f"bench-{run_id}-%@example.com", f"synthetic-{run_id}-%@example.com"
+    )
+
+
+async def run(args) -> dict:
+    import asyncpg
+
+    from app.core.config import settings
+
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        if args.cleanup:
+            await cleanup(conn, args.run_id)
+            return {"run_id": args.run_id, "deleted": True}
+        seeded = await seed(
+            conn, args.run_id, args.households, args.min_items, args.max_items, args.events, args.days
+        )
+    finally:
+        await conn.close()
+
+    return {
+        "run_id": args.run_id,
+        "households": [
+            {key: value for key, value in asdict(h).items() if key != "item_ids"} for h in seeded
+        ],
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark households")
+    parser.add_argument("--run-id", default=uuid.uuid4().hex[:8])
+    parser.add_argument("--households", type=int, default=20)
+    parser.add_argument("--min-items", type=int, default=50)
+    parser.add_argument("--max-items", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--cleanup", action="store_true", help="Delete the run's rows instead")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
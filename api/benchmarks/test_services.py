@@ -0,0 +1,110 @@
+"""
+Micro benchmarks for the service hot paths
+"""
+import gzip
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from benchmarks.conftest import HOUSEHOLD_ID, USER_ID, household_detail, item_records, uncached
+
+
+@pytest.mark.parametrize("count", [100, 1000])
+def test_list_items(benchmark, run, supabase, count):
+    """Items list page: PostgREST rows -> ItemPage JSON bytes"""
+    from app.services.item_service import ItemService
+
+    rows = item_records(count)
+    supabase.respond(rows)
+    with patch('app.services.item_service.get_supabase', return_value=supabase):
+        service = uncached(ItemService())
+    service._verify_household_member = lambda household_id, user_id: _noop()
+
+    payload = benchmark(run, lambda: service.get_household_items(HOUSEHOLD_ID, USER_ID, limit=count, as_json=True))
+
+    assert json.loads(payload)["total"] == count
+
+
+def test_search_items(benchmark, run, supabase):
+    """Fuzzy item search through the RPC"""
+    from app.services.item_service import ItemService
+
+    supabase.rpc.return_value.execute.return_value = Mock(data=[
+        {"id": row["id"], "name": row["name"], "category": row["category"],
+         "location": row["location"], "similarity": 0.8}
+        for row in item_records(10)
+    ])
+    with patch('app.services.item_service.get_supabase', return_value=supabase):
+        service = uncached(ItemService())
+    service._verify_household_member = lambda household_id, user_id: _noop()
+
+    results = benchmark(run, lambda: service.search_items(HOUSEHOLD_ID, USER_ID, "ite"))
+
+    assert len(results) == 10
+
+
+def test_household_detail(benchmark, run, supabase):
+    """Household detail: RPC result -> JSON bytes"""
+    from app.services.household_service import HouseholdService
+
+    supabase.rpc.return_value.execute.return_value = Mock(data=household_detail(members=8))
+    with patch('app.services.household_service.get_supabase', return_value=supabase):
+        service = uncached(HouseholdService())
+
+    payload = benchmark(run, lambda: service.get_household_by_id(HOUSEHOLD_ID, USER_ID, as_json=True))
+
+    assert json.loads(payload)["member_count"] == 8
+
+
+def test_iot_batch(benchmark, run):
+    """IoT batch of 500 noisy readings: decompress, validate, coalesce"""
+    from app.services.iot_service import IoTService, decompress_body, parse_batch
+
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    readings = [
+        {"type": "door_opened", "at": (start + timedelta(seconds=n)).isoformat(), "duration_seconds": 5}
+        if n % 10 == 0 else
+        {"type": "weight_changed", "at": (start + timedelta(seconds=n)).isoformat(),
+         "weight_delta_grams": rng.uniform(-50, 10)}
+        for n in range(500)
+    ]
+    body = gzip.compress(json.dumps({"readings": readings}).encode())
+    with patch('app.services.iot_service.get_supabase'):
+        service = IoTService(writer=Mock())
+    device = {"id": "device-1", "household_id": HOUSEHOLD_ID, "location": "fridge"}
+
+    def ingest():
+        return service.coalesce(device, parse_batch(decompress_body(body, "gzip")))
+
+    events = benchmark(ingest)
+
+    assert 0 < len(events) < 500
+
+
+def test_event_export_lines(benchmark):
+    """NDJSON export: 1000 event rows with resume cursors"""
+    from app.services.event_service import encode_cursor, to_ndjson
+
+    rows = [
+        {
+            "id": f"00000000-0000-4000-8000-{n:012d}", "event_type": "inventory.used", "source": "user",
+            "item_id": None, "receipt_id": None, "payload": {"previous_state": "ok", "new_state": "low"},
+            "confidence": 1.0, "created_at": "2024-01-22T14:30:00+00:00",
+        }
+        for n in range(1000)
+    ]
+
+    def export():
+        return [to_ndjson({**row, "cursor": encode_cursor(row["created_at"], row["id"])}) for row in rows]
+
+    lines = benchmark(export)
+
+    assert len(lines) == 1000
+
+
+async def _noop():
+    return None
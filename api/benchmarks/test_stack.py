@@ -0,0 +1,46 @@
+"""
+Micro benchmarks for the request path through the middleware stack
+"""
+import pytest
+
+from app.main import create_app
+
+
+def make_scope(path: str) -> dict:
+    """Minimal HTTP scope for a GET request"""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"origin", b"http://localhost:3000")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+
+@pytest.fixture(scope="module")
+def app():
+    return create_app()
+
+
+@pytest.mark.parametrize("path", ["/", "/api/v1/"])
+def test_request(benchmark, run, app, path):
+    """One request through every middleware to a handler without I/O"""
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    benchmark(run, lambda: app(make_scope(path), receive, send))
+
+    assert set(statuses) == {200}
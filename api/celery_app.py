@@ -3,6 +3,16 @@ Celery application for background task processing.
 """
 import os
 from celery import Celery
+from celery.schedules import crontab
+
+# In multiprocess mode prometheus_client writes per-process files from import
+# time on, so the directory must exist first
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from app.core.config import settings
+from app.core.metrics import instrument_celery
+from app.core.tracing import instrument_celery_tracing
 
 # Get Redis URL from environment
 REDIS_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
@@ -12,7 +22,7 @@ app = Celery(
     "snakr",
     broker=REDIS_URL,
     backend=os.getenv("CELERY_RESULT_BACKEND", REDIS_URL),
-    include=["tasks.receipt_processing", "tasks.inventory_updates"]
+    include=["tasks.receipt_processing", "tasks.inventory_updates", "tasks.maintenance"]
 )
 
 # Configure Celery
@@ -33,7 +43,24 @@ app.conf.update(
 app.conf.task_routes = {
     "tasks.receipt_processing.*": {"queue": "receipts"},
     "tasks.inventory_updates.*": {"queue": "inventory"},
+    "tasks.maintenance.*": {"queue": "maintenance"},
+}
+
+# Periodic tasks (run with: celery -A celery_app beat)
+app.conf.beat_schedule = {
+    "maintain-event-partitions": {
+        "task": "tasks.maintenance.maintain_event_partitions",
+        "schedule": crontab(hour=3, minute=15),
+    },
 }
 
+# Task duration metrics, served on CELERY_METRICS_PORT (set
+# PROMETHEUS_MULTIPROC_DIR for the prefork pool)
+instrument_celery(app)
+
+# Task spans continuing the enqueuing request's trace (TRACING_ENABLED)
+if settings.TRACING_ENABLED:
+    instrument_celery_tracing(app)
+
 if __name__ == "__main__":
     app.start()
@@ -0,0 +1,172 @@
+"""
+Benchmark PostgREST against the direct Postgres path
+
+Seeds a household with synthetic items in a local Supabase stack, then times
+the hot ItemService queries (membership check and a 100-item page of the
+items list) through PostgREST and through the direct asyncpg repository,
+with the response cache disabled. Reports per-query latency percentiles,
+sequential and concurrent throughput, and checks that both paths return
+identical bytes.
+
+Needs a running local stack (`supabase start`) with migrations applied, and
+DATABASE_URL, SUPABASE_URL and SUPABASE_SERVICE_KEY pointing at it (see
+.env.example). The seeded user, household and items are deleted afterwards
+unless --keep is given.
+
+Usage:
+    cd api
+    python scripts/benchmark_db_path.py --items 1000 --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+CATEGORIES = ("dairy", "produce", "meat", "bakery", "pantry_staple", "beverage", "snack", "condiment", "other")
+LOCATIONS = ("fridge", "pantry", "freezer")
+STATES = ("plenty", "ok", "low", "almost_out", "out")
+
+
+async def seed(conn, items: int):
+    """Create a user and a household with items; returns (user_id, household_id)"""
+    user_id = str(uuid.uuid4())
+    household_id = str(uuid.uuid4())
+
+    await conn.execute(
+        "INSERT INTO auth.users (id, email, aud, role) VALUES ($1, $2, 'authenticated', 'authenticated')",
+        user_id, f"bench-{user_id[:8]}@example.com"
+    )
+    await conn.execute("INSERT INTO households (id, name) VALUES ($1, 'Benchmark')", household_id)
+    await conn.execute(
+        "INSERT INTO household_members (household_id, user_id, role) VALUES ($1, $2, 'admin')",
+        household_id, user_id
+    )
+    await conn.execute(
+        """
+        WITH new_items AS (
+            INSERT INTO items (household_id, name, category, location)
+            SELECT $1, 'Item ' || lpad(n::text, 6, '0'),
+                   ($2::text[])[1 + n % array_length($2::text[], 1)],
+                   ($3::text[])[1 + n % array_length($3::text[], 1)]
+            FROM generate_series(1, $5) AS n
+            RETURNING id
+        )
+        INSERT INTO inventory (household_id, item_id, state, confidence)
+        SELECT $1, id, ($4::text[])[1 + (random() * 4)::int], round(random()::numeric, 2)
+        FROM new_items
+        """,
+        household_id, list(CATEGORIES), list(LOCATIONS), list(STATES), items
+    )
+    return user_id, household_id
+
+
+async def cleanup(conn, user_id: str, household_id: str):
+    """Delete seeded rows"""
+    await conn.execute("DELETE FROM households WHERE id = $1", household_id)
+    await conn.execute("DELETE FROM auth.users WHERE id = $1", user_id)
+
+
+def summarize(latencies, elapsed: float) -> dict:
+    """Latency percentiles (ms) and throughput"""
+    ordered = sorted(latencies)
+    quantiles = statistics.quantiles(ordered, n=100)
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "per_second": round(len(ordered) / elapsed),
+    }
+
+
+async def measure(call, requests: int, concurrency: int) -> dict:
+    """Run call() `requests` times with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def run(args) -> dict:
+    from app.services.cache import HouseholdCache
+    from app.services.item_repository import ItemRepository
+    from app.services.item_service import ItemService
+    from app.services.postgres import close_pool, get_pool
+
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        user_id, household_id = await seed(conn, args.items)
+
+    try:
+        services = {}
+        for path in ("postgrest", "direct"):
+            service = ItemService()
+            service.cache = HouseholdCache(enabled=False)
+            service.repository = ItemRepository() if path == "direct" else None
+            services[path] = service
+
+        def list_items(service):
+            return lambda: service._load_household_items(
+                household_id, user_id, None, None, None, "name", 100, 0
+            )
+
+        def check_member(service):
+            return lambda: service._check_household_member(household_id, user_id)
+
+        pages = [await list_items(s)() for s in services.values()]
+        results = {"items": args.items, "identical_pages": pages[0] == pages[1]}
+
+        for path, service in services.items():
+            for query, call in (("items_list", list_items(service)), ("membership", check_member(service))):
+                # Warm up connections and prepared statements
+                for _ in range(10):
+                    await call()
+                results[f"{path}.{query}"] = {
+                    "sequential": await measure(call, args.requests, 1),
+                    f"concurrency_{args.concurrency}": await measure(call, args.requests, args.concurrency),
+                }
+        return results
+    finally:
+        if not args.keep:
+            async with pool.acquire() as conn:
+                await cleanup(conn, user_id, household_id)
+        await close_pool()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark PostgREST vs direct Postgres")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded household")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"DB Path Benchmark ({args.items:,} items, {args.requests:,} requests per run)")
+    print("=" * 60)
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+
+    if not results["identical_pages"]:
+        print("\nWARNING: PostgREST and direct pages differ")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark event export throughput and peak memory
+
+Feeds synthetic event rows through the NDJSON export encoder and the offline
+Parquet writer, in the same batch sizes the real exports use, and reports
+throughput and peak RSS. Run it at two sizes to confirm memory stays flat as
+the number of events grows.
+
+No database is needed; rows are generated batch by batch.
+
+Usage:
+    cd api
+    python scripts/benchmark_event_export.py --events 1000000 --format ndjson
+    python scripts/benchmark_event_export.py --events 1000000 --format parquet
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+EVENT_TYPES = ("inventory.used", "inventory.restocked", "inventory.ran_out")
+
+
+def synthetic_batches(total: int, batch_size: int):
+    """Yield batches of synthetic event tuples in export column order"""
+    household_id = str(uuid.uuid4())
+    item_ids = [str(uuid.uuid4()) for _ in range(200)]
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    for offset in range(0, total, batch_size):
+        batch = []
+        for n in range(offset, min(offset + batch_size, total)):
+            batch.append((
+                str(uuid.uuid4()),
+                household_id,
+                EVENT_TYPES[n % 3],
+                "user",
+                item_ids[n % 200],
+                None,
+                {"previous_state": "ok", "new_state": "low"},
+                1.0,
+                start + timedelta(seconds=n * 30),
+            ))
+        yield batch
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_ndjson(total: int, batch_size: int) -> int:
+    """Encode all rows as NDJSON lines, discarding the output"""
+    from app.services.event_service import to_ndjson
+
+    written = 0
+    with open(os.devnull, "w") as sink:
+        for batch in synthetic_batches(total, batch_size):
+            for row in batch:
+                record = {
+                    "id": row[0], "event_type": row[2], "source": row[3],
+                    "item_id": row[4], "receipt_id": row[5], "payload": row[6],
+                    "confidence": row[7], "created_at": row[8].isoformat(),
+                }
+                written += sink.write(to_ndjson(record))
+    return written
+
+
+def run_parquet(total: int, batch_size: int) -> int:
+    """Write all rows to a temporary Parquet file"""
+    from export_events_parquet import write_parquet
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "events.parquet"
+        write_parquet(synthetic_batches(total, batch_size), output)
+        return output.stat().st_size
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark event export")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "parquet"], default="ndjson")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    batch_size = args.batch_size or (1000 if args.format == "ndjson" else 50_000)
+    sys.path.insert(0, str(Path(__file__).parent))
+
+    print("=" * 60)
+    print(f"Event Export Benchmark ({args.format}, {args.events:,} events)")
+    print("=" * 60)
+
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    size = run_ndjson(args.events, batch_size) if args.format == "ndjson" else run_parquet(args.events, batch_size)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "format": args.format,
+        "events": args.events,
+        "batch_size": batch_size,
+        "seconds": round(elapsed, 2),
+        "events_per_second": round(args.events / elapsed),
+        "output_mb": round(size / (1024 * 1024), 1),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    print(json.dumps(result, indent=2))
+    print("✓ Benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark IoT ingestion throughput on one process
+
+Runs gzip'd reading batches through the same steps as POST /api/v1/iot/events
+(decompress, schema validation, coalescing, event building) and reports
+readings per second. Device authentication is cached after the first batch in
+production, so it is left out; the event writer is replaced by a no-op.
+
+No database is needed.
+
+Usage:
+    cd api
+    python scripts/benchmark_iot_ingest.py --readings 200000 --batch-size 500
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class NullWriter:
+    """Event writer stand-in that only counts events"""
+
+    def __init__(self):
+        self.events = 0
+
+    async def write_many(self, events, sync=False):
+        self.events += len(events)
+        return len(events)
+
+
+def synthetic_batches(total: int, batch_size: int, devices: int):
+    """Yield (device, gzip body) pairs of noisy readings"""
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    device_rows = [
+        {"id": str(uuid.uuid4()), "household_id": str(uuid.uuid4()), "location": "fridge"}
+        for _ in range(devices)
+    ]
+
+    for offset in range(0, total, batch_size):
+        device = device_rows[(offset // batch_size) % devices]
+        readings = []
+        for n in range(offset, min(offset + batch_size, total)):
+            at = (start + timedelta(seconds=n * 0.5)).isoformat()
+            if n % 10 == 0:
+                readings.append({"type": "door_opened", "at": at, "duration_seconds": rng.uniform(1, 20)})
+            else:
+                readings.append({"type": "weight_changed", "at": at, "weight_delta_grams": rng.uniform(-50, 10)})
+        yield device, gzip.compress(json.dumps({"readings": readings}).encode())
+
+
+async def run(total: int, batch_size: int, devices: int) -> dict:
+    """Ingest all batches and time it"""
+    from app.services.iot_service import IoTService, decompress_body, parse_batch
+
+    writer = NullWriter()
+    batches = list(synthetic_batches(total, batch_size, devices))
+    compressed = sum(len(body) for _, body in batches)
+
+    with patch("app.services.iot_service.get_supabase"):
+        service = IoTService(writer=writer)
+        service._check_item_ids = lambda household_id, readings: asyncio.sleep(0)
+
+        start = time.perf_counter()
+        for device, body in batches:
+            readings = parse_batch(decompress_body(body, "gzip"))
+            await service.ingest(device, readings)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "readings": total,
+        "batch_size": batch_size,
+        "events_written": writer.events,
+        "compressed_mb": round(compressed / (1024 * 1024), 2),
+        "seconds": round(elapsed, 3),
+        "readings_per_second": round(total / elapsed),
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark IoT ingestion")
+    parser.add_argument("--readings", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--devices", type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"IoT Ingestion Benchmark ({args.readings:,} readings)")
+    print("=" * 60)
+
+    result = asyncio.run(run(args.readings, args.batch_size, args.devices))
+    print(json.dumps(result, indent=2))
+    print("✓ Benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
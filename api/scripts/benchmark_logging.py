@@ -0,0 +1,109 @@
+"""
+Benchmark logging cost on the calling thread
+
+Compares the previous setup (json.dumps formatter, synchronous stdout handler)
+with the current one (orjson formatter behind a queue handler) by timing
+logger.info calls as seen by the caller. Output goes to /dev/null so terminal
+speed doesn't dominate.
+
+Usage:
+    cd api
+    python scripts/benchmark_logging.py --records 100000
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.logging import ContextQueueHandler, JSONFormatter, SamplingFilter  # noqa: E402
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """The previous json.dumps formatter, kept here for comparison"""
+
+    def format(self, record):
+        from app.middleware.request_id import get_request_id
+
+        log_data = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        request_id = get_request_id()
+        if request_id:
+            log_data["request_id"] = request_id
+        return json.dumps(log_data)
+
+
+def timed(logger: logging.Logger, records: int) -> float:
+    """Log records and return caller-side microseconds per call"""
+    start = time.perf_counter()
+    for n in range(records):
+        logger.info("Retrieved %d items for household %s", n, "5d1c2b4a-0000-4000-8000-000000000000")
+    return (time.perf_counter() - start) / records * 1_000_000
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    """Isolated logger writing only to handler"""
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+    return logger
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark logging")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Logging Benchmark ({args.records:,} records)")
+    print("=" * 60)
+
+    devnull = open(os.devnull, "w")
+    results = {}
+
+    legacy = logging.StreamHandler(devnull)
+    legacy.setFormatter(LegacyJSONFormatter())
+    results["legacy_sync_us"] = timed(make_logger("legacy", legacy), args.records)
+
+    current = logging.StreamHandler(devnull)
+    current.setFormatter(JSONFormatter())
+    results["orjson_sync_us"] = timed(make_logger("sync", current), args.records)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, current)
+    listener.start()
+    results["orjson_queued_us"] = timed(make_logger("queued", ContextQueueHandler(log_queue)), args.records)
+
+    sampled = make_logger("sampled", ContextQueueHandler(log_queue))
+    sampled.addFilter(SamplingFilter(args.sample_rate))
+    results["orjson_queued_sampled_us"] = timed(sampled, args.records)
+
+    drain_start = time.perf_counter()
+    listener.stop()
+    results["listener_drain_seconds"] = time.perf_counter() - drain_start
+
+    print(json.dumps({key: round(value, 2) for key, value in results.items()}, indent=2))
+    print("✓ Benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark requests/sec through the full middleware stack
+
+Builds the real application (create_app) twice: once with the previous
+BaseHTTPMiddleware-based request ID middleware and once with the current pure
+ASGI one, then drives each with raw ASGI calls (no sockets, no HTTP client) so
+the numbers reflect server-side overhead only.
+
+Usage:
+    cd api
+    python scripts/benchmark_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation, kept here for comparison"""
+
+    async def dispatch(self, request, call_next):
+        from app.middleware.request_id import request_id_var
+
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id_var.set(request_id)
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+def make_scope(path: str) -> dict:
+    """Minimal HTTP scope for a GET request"""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"origin", b"http://localhost:3000")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+
+async def drive(app, path: str, requests: int) -> float:
+    """Send requests through the app; return requests per second"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    # Warm up (builds the middleware stack)
+    for _ in range(200):
+        await app(make_scope(path), receive, send)
+    statuses.clear()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(make_scope(path), receive, send)
+    elapsed = time.perf_counter() - start
+
+    assert all(code == 200 for code in statuses), f"non-200 responses for {path}"
+    return requests / elapsed
+
+
+def build_app(legacy: bool):
+    """Create the application with the chosen request ID middleware"""
+    import app.main as main_module
+
+    if legacy:
+        with patch.object(main_module, "RequestIDMiddleware", LegacyRequestIDMiddleware):
+            return main_module.create_app()
+    return main_module.create_app()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the middleware stack")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--path", action="append", help="Paths to hit (default: / and /api/v1/)")
+    args = parser.parse_args()
+    paths = args.path or ["/", "/api/v1/"]
+
+    print("=" * 60)
+    print(f"Middleware Stack Benchmark ({args.requests:,} requests per path)")
+    print("=" * 60)
+
+    results = {}
+    for path in paths:
+        before = asyncio.run(drive(build_app(legacy=True), path, args.requests))
+        after = asyncio.run(drive(build_app(legacy=False), path, args.requests))
+        results[path] = {
+            "base_http_middleware_rps": round(before),
+            "pure_asgi_rps": round(after),
+            "speedup": round(after / before, 2),
+        }
+
+    print(json.dumps(results, indent=2))
+    print("✓ Benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
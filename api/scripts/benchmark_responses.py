@@ -0,0 +1,218 @@
+"""
+Benchmark JSON response encoding for the items list endpoint
+
+Serves GET /items (with a mocked Supabase client returning N rows) three
+ways and reports requests/sec:
+
+- stdlib: the previous per-row dict rebuild, response_model=Dict[str, Any],
+  default response class
+- custom_default: same route with FastJSONResponse as the app default class
+- pre_serialized: ItemService.get_household_items(as_json=True) returned in a
+  FastJSONResponse, household cache disabled
+- cached: pre_serialized with the household cache enabled (every request
+  after the first is a local cache hit)
+
+Requests are driven with raw ASGI calls, so numbers reflect server-side cost.
+FastAPI's own serialization path differs between versions, so the installed
+version is included in the output.
+
+Usage:
+    cd api
+    python scripts/benchmark_responses.py --sizes 10 100 1000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+from unittest.mock import Mock, patch
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fastapi  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.services.cache import get_household_cache  # noqa: E402
+from app.services.item_service import ItemService  # noqa: E402
+
+HOUSEHOLD_ID = str(uuid.uuid4())
+
+
+def make_rows(count: int) -> list:
+    """Item rows with embedded inventory, as PostgREST returns them"""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": HOUSEHOLD_ID,
+            "name": f"Item {n}",
+            "category": "dairy",
+            "location": "fridge",
+            "created_at": "2024-01-22T12:00:00+00:00",
+            "updated_at": "2024-01-22T12:00:00+00:00",
+            "inventory": [{
+                "id": str(uuid.uuid4()),
+                "state": "low",
+                "confidence": 0.85,
+                "updated_at": "2024-01-22T14:30:00+00:00",
+                "last_updated": "2024-01-22T14:30:00+00:00",
+            }],
+        }
+        for n in range(count)
+    ]
+
+
+class FakeQuery:
+    """Chainable PostgREST query stand-in returning fixed rows
+
+    A plain object rather than MagicMock, which records every call and would
+    skew timings as the run goes on.
+    """
+
+    def __init__(self, rows: list):
+        self.result = Mock(data=rows)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return self.result
+
+
+class FakeSupabase:
+    """Supabase client stand-in returning the same query for every table"""
+
+    def __init__(self, rows: list):
+        self.query = FakeQuery(rows)
+
+    def table(self, name: str) -> FakeQuery:
+        return self.query
+
+
+def legacy_items(rows: list) -> Dict[str, Any]:
+    """The previous get_household_items transform, kept here for comparison"""
+    items = []
+    for row in rows:
+        inventory = row['inventory'][0] if row['inventory'] else None
+        items.append({
+            'id': row['id'],
+            'household_id': row['household_id'],
+            'name': row['name'],
+            'category': row['category'],
+            'location': row['location'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'inventory': {
+                'id': inventory['id'],
+                'state': inventory['state'],
+                'confidence': inventory['confidence'],
+                'last_updated': inventory['updated_at']
+            } if inventory else None
+        })
+    return {'items': items, 'total': len(items)}
+
+
+def build_app(mode: str) -> FastAPI:
+    """Application with a single items list route in the given mode"""
+    if mode == "custom_default":
+        app = FastAPI(default_response_class=FastJSONResponse)
+    else:
+        app = FastAPI()
+
+    if mode in ("pre_serialized", "cached"):
+        @app.get("/items", response_model=Dict[str, Any])
+        async def get_items():
+            items = await ItemService().get_household_items(HOUSEHOLD_ID, "user", as_json=True)
+            return FastJSONResponse(items)
+    else:
+        @app.get("/items", response_model=Dict[str, Any])
+        async def get_items():
+            service = ItemService()
+            await service._verify_household_member(HOUSEHOLD_ID, "user")
+            return legacy_items(service.supabase.table('items').execute().data)
+
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    """Send GET /items requests through the app; return requests per second"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items",
+        "raw_path": b"/items",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    for _ in range(20):
+        await app(dict(scope), receive, send)
+    statuses.clear()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+
+    assert all(code == 200 for code in statuses), "non-200 responses"
+    return requests / elapsed
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark items list response encoding")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests at 10 items (scaled down for larger sizes)")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Items List Response Benchmark (FastAPI {fastapi.__version__})")
+    print("=" * 60)
+
+    results = {}
+    for size in args.sizes:
+        requests = max(100, args.requests * 10 // max(size, 10))
+        supabase = FakeSupabase(make_rows(size))
+        with patch("app.services.item_service.get_supabase", return_value=supabase), \
+             patch.object(ItemService, "_verify_household_member", return_value=None):
+            # Best of several interleaved rounds to damp machine noise
+            rps = {mode: 0.0 for mode in ("stdlib", "custom_default", "pre_serialized", "cached")}
+            cache = get_household_cache()
+            for _ in range(args.rounds):
+                for mode in rps:
+                    cache.clear()
+                    cache.enabled = mode == "cached"
+                    rps[mode] = max(rps[mode], asyncio.run(drive(build_app(mode), requests)))
+        results[f"{size}_items"] = {
+            **{f"{mode}_rps": round(value) for mode, value in rps.items()},
+            "pre_serialized_speedup": round(rps["pre_serialized"] / rps["stdlib"], 2),
+            "cached_speedup": round(rps["cached"] / rps["stdlib"], 2),
+        }
+
+    print(json.dumps(results, indent=2))
+    print("✓ Benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Benchmark decoding and encoding PostgREST rows
+
+Compares, per batch of rows, the previous approach (rebuilding a nested dict
+per item / building a Pydantic Invitation per invitation, then letting FastAPI
+serialize the Dict[str, Any] response) with the row types in
+app.services.rows (decode once into msgspec structs, encode natively).
+Reports time and peak allocated memory per batch.
+
+No database is needed.
+
+Usage:
+    cd api
+    python scripts/benchmark_rows.py --rows 1000
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.responses import dump_json  # noqa: E402
+from app.models import Invitation, Role  # noqa: E402
+from app.services.rows import InvitationRow, ItemRow, decode_rows  # noqa: E402
+
+RESPONSE_ADAPTER = TypeAdapter(Dict[str, Any])
+
+
+def item_records(count: int, aliased: bool = False) -> list:
+    """Item records with embedded inventory, as PostgREST returns them
+
+    With aliased=True the inventory timestamp is selected as last_updated,
+    as the current item queries do.
+    """
+    household_id = str(uuid.uuid4())
+    updated_key = "last_updated" if aliased else "updated_at"
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": household_id,
+            "name": f"Item {n}",
+            "category": "dairy",
+            "location": "fridge",
+            "created_at": "2024-01-22T12:00:00+00:00",
+            "updated_at": "2024-01-22T12:00:00+00:00",
+            "inventory": [{
+                "id": str(uuid.uuid4()),
+                "state": "low",
+                "confidence": 0.85,
+                updated_key: "2024-01-22T14:30:00+00:00",
+            }],
+        }
+        for n in range(count)
+    ]
+
+
+def invitation_records(count: int) -> list:
+    """Invitation records, as PostgREST returns them"""
+    household_id = str(uuid.uuid4())
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "household_id": household_id,
+            "inviter_id": str(uuid.uuid4()),
+            "invitee_email": f"friend{n}@example.com",
+            "role": "member",
+            "status": "pending",
+            "token": uuid.uuid4().hex,
+            "expires_at": "2024-01-28T12:00:00+00:00",
+            "accepted_at": None,
+            "created_at": "2024-01-21T12:00:00+00:00",
+            "updated_at": "2024-01-21T12:00:00+00:00",
+        }
+        for n in range(count)
+    ]
+
+
+def legacy_items(records: list) -> bytes:
+    """Per-row nested dict rebuild, then FastAPI's response serialization"""
+    items = []
+    for row in records:
+        inventory = row['inventory'][0] if row['inventory'] else None
+        items.append({
+            'id': row['id'],
+            'household_id': row['household_id'],
+            'name': row['name'],
+            'category': row['category'],
+            'location': row['location'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'inventory': {
+                'id': inventory['id'],
+                'state': inventory['state'],
+                'confidence': inventory['confidence'],
+                'last_updated': inventory['updated_at']
+            } if inventory else None
+        })
+    payload = {'items': items, 'total': len(items)}
+    return RESPONSE_ADAPTER.dump_json(RESPONSE_ADAPTER.validate_python(payload))
+
+
+def row_items(records: list) -> bytes:
+    """Decode once into ItemRow structs, encode natively"""
+    items = decode_rows(ItemRow, records)
+    return dump_json({'items': items, 'total': len(items)})
+
+
+def legacy_invitations(records: list) -> bytes:
+    """Pydantic Invitation per row, then response model serialization"""
+    invitations = [
+        Invitation(
+            id=inv['id'],
+            household_id=inv['household_id'],
+            inviter_id=inv['inviter_id'],
+            invitee_email=inv['invitee_email'],
+            role=Role(inv['role']),
+            status=inv['status'],
+            token=inv['token'],
+            expires_at=inv['expires_at'],
+            accepted_at=inv.get('accepted_at'),
+            created_at=inv['created_at'],
+            updated_at=inv['updated_at']
+        )
+        for inv in records
+    ]
+    return json.dumps({
+        'invitations': [inv.model_dump(mode='json') for inv in invitations],
+        'total': len(invitations)
+    }).encode()
+
+
+def row_invitations(records: list) -> bytes:
+    """Decode once into InvitationRow structs, encode natively"""
+    invitations = decode_rows(InvitationRow, records)
+    return dump_json({'invitations': invitations, 'total': len(invitations)})
+
+
+def measure(func: Callable[[list], bytes], records: list, repeat: int) -> dict:
+    """Best time and peak traced allocation for one batch"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(records)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ms": round(best * 1000, 3), "peak_kb": round(peak / 1024, 1)}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark row decoding/encoding")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Row Layer Benchmark ({args.rows:,} rows per batch)")
+    print("=" * 60)
+
+    items = item_records(args.rows)
+    aliased_items = item_records(args.rows, aliased=True)
+    invitations = invitation_records(args.rows)
+    results = {
+        "items": {
+            "legacy": measure(legacy_items, items, args.repeat),
+            "rows": measure(row_items, aliased_items, args.repeat),
+        },
+        "invitations": {
+            "legacy": measure(legacy_invitations, invitations, args.repeat),
+            "rows": measure(row_invitations, invitations, args.repeat),
+        },
+    }
+    for result in results.values():
+        result["speedup"] = round(result["legacy"]["ms"] / result["rows"]["ms"], 2)
+
+    print(json.dumps(results, indent=2))
+    print("✓ Benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Export the event log to Parquet for the offline ML training pipeline
+
+Offline-only companion to GET /api/v1/events/export (see docs/ml.md, "Extract").
+Events are read through a server-side (named) PostgreSQL cursor and written one
+Parquet row group per batch, so memory stays bounded by the batch size no
+matter how long the history is.
+
+The export is resumable: the cursor of the last exported event is printed at
+the end and can be passed back with --since (same format as the API cursors).
+
+Requires pyarrow, which is not part of the API image:
+    pip install pyarrow
+
+Usage:
+    cd api
+    python scripts/export_events_parquet.py --output events.parquet
+    python scripts/export_events_parquet.py --household-id <uuid> --output events.parquet
+    python scripts/export_events_parquet.py --since <cursor> --output events-2.parquet
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+# Add parent directory to path so app modules can be imported
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+EXPORT_COLUMNS = (
+    "id", "household_id", "event_type", "source", "item_id",
+    "receipt_id", "payload", "confidence", "created_at",
+)
+
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+
+def load_pyarrow():
+    """Import pyarrow lazily with a helpful error"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        print("✗ pyarrow is required for Parquet export: pip install pyarrow")
+        sys.exit(1)
+    return pyarrow
+
+
+def event_schema(pa):
+    """Arrow schema for exported events"""
+    return pa.schema([
+        ("id", pa.string()),
+        ("household_id", pa.string()),
+        ("event_type", pa.string()),
+        ("source", pa.string()),
+        ("item_id", pa.string()),
+        ("receipt_id", pa.string()),
+        ("payload", pa.string()),
+        ("confidence", pa.float64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def write_parquet(
+    batches: Iterable[Sequence[Tuple[Any, ...]]],
+    output: Path,
+) -> Tuple[int, Optional[Tuple[Any, Any]]]:
+    """
+    Write event row batches to a Parquet file, one row group per batch
+
+    Args:
+        batches: Iterable of row batches ordered by (created_at, id); each row
+            is a tuple in EXPORT_COLUMNS order
+        output: Destination file
+
+    Returns:
+        Tuple of (rows written, (created_at, id) of the last row or None)
+    """
+    pa = load_pyarrow()
+    schema = event_schema(pa)
+    total = 0
+    last = None
+
+    with pa.parquet.ParquetWriter(str(output), schema, compression="zstd") as writer:
+        for batch in batches:
+            if not batch:
+                continue
+            columns: List[List[Any]] = [list(column) for column in zip(*batch)]
+            # JSONB arrives as dict; store it as JSON text
+            columns[6] = [
+                value if isinstance(value, str) else json.dumps(value, separators=(",", ":"))
+                for value in columns[6]
+            ]
+            columns[7] = [float(value) for value in columns[7]]
+            for index in (0, 1, 4, 5):
+                columns[index] = [None if value is None else str(value) for value in columns[index]]
+
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            total += len(batch)
+            last = (batch[-1][8], batch[-1][0])
+            del columns
+
+    return total, last
+
+
+def iter_database_batches(
+    database_url: str,
+    household_id: Optional[str],
+    since: Optional[Tuple[str, str]],
+    batch_size: int,
+) -> Iterable[List[Tuple[Any, ...]]]:
+    """
+    Read events oldest first through a server-side cursor
+
+    Args:
+        database_url: PostgreSQL connection URL
+        household_id: Optional household filter (all households when None)
+        since: Optional (created_at, id) to resume after
+        batch_size: Rows fetched per round-trip
+
+    Yields:
+        Lists of row tuples in EXPORT_COLUMNS order
+    """
+    import psycopg2
+
+    conditions = []
+    params: List[Any] = []
+    if household_id:
+        conditions.append("household_id = %s")
+        params.append(household_id)
+    if since:
+        # Plain created_at bound lets the planner skip older partitions
+        conditions.append("created_at >= %s::timestamptz")
+        conditions.append("(created_at, id) > (%s::timestamptz, %s::uuid)")
+        params.append(since[0])
+        params.extend(since)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = (
+        f"SELECT {', '.join(EXPORT_COLUMNS)} FROM events {where} "
+        "ORDER BY created_at, id"
+    )
+
+    conn = psycopg2.connect(database_url)
+    try:
+        # Named cursor = server-side cursor; rows are streamed, not buffered
+        with conn.cursor(name="events_export") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+    finally:
+        conn.close()
+
+
+def main():
+    """Main function"""
+    from app.core.config import settings
+    from app.services.event_service import decode_cursor, encode_cursor
+
+    parser = argparse.ArgumentParser(description="Export events to Parquet")
+    parser.add_argument("--output", type=Path, required=True, help="Parquet file to write")
+    parser.add_argument("--household-id", help="Only export this household")
+    parser.add_argument("--since", help="Resume after this cursor")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Event Parquet Export")
+    print("=" * 60)
+
+    since = decode_cursor(args.since) if args.since else None
+    batches = iter_database_batches(args.database_url, args.household_id, since, args.row_group_size)
+
+    try:
+        total, last = write_parquet(batches, args.output)
+    except Exception as e:
+        print(f"✗ Export failed: {e}")
+        return 1
+
+    print(f"✓ Wrote {total} events to {args.output}")
+    if last:
+        created_at, event_id = last
+        created_at = created_at.isoformat() if hasattr(created_at, "isoformat") else str(created_at)
+        print(f"  Resume with: --since {encode_cursor(created_at, str(event_id))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Synthetic data for benchmarks, predictions and receipt processing.
+
+Deterministic by seed: households with members, items across every category
+and location, inventory, weekly-seasonal event streams, and rendered receipts
+with ground truth, written as COPY-ready CSV. See `python -m synthetic --help`.
+"""
+from synthetic.generator import GeneratorConfig, generate
+
+__all__ = ["GeneratorConfig", "generate"]
@@ -0,0 +1,80 @@
+"""
+Generate a synthetic dataset
+
+Usage:
+    cd api
+    python -m synthetic --households 1000 --events 10000000 --receipts 200 --out data/synthetic
+    cd data/synthetic && psql "$DATABASE_URL" -f load.sql
+
+Or load straight into DATABASE_URL with --load. The same --seed (and other
+options) always produces the same files.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+
+from synthetic.generator import GeneratorConfig, generate
+from synthetic.output import load
+
+
+def main():
+    """Main function"""
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic households, events and receipts"
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--run-id", help="Tag in household names and user emails (default: seed<seed>)"
+    )
+    parser.add_argument("--households", type=int, default=defaults.households)
+    parser.add_argument("--min-items", type=int, default=defaults.min_items)
+    parser.add_argument("--max-items", type=int, default=defaults.max_items)
+    parser.add_argument("--max-members", type=int, default=defaults.max_members)
+    parser.add_argument("--days", type=int, default=defaults.days, help="Event history length")
+    parser.add_argument(
+        "--end", type=date.fromisoformat, default=defaults.end, help="Window end, YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--events", type=int, help="Approximate total events (default: from usage rates)"
+    )
+    parser.add_argument("--receipts", type=int, default=0, help="Receipts to render")
+    parser.add_argument(
+        "--receipt-format", choices=("png", "jpeg", "pdf"), default=defaults.receipt_format
+    )
+    parser.add_argument("--clean-receipts", action="store_true", help="No rotation or speckle")
+    parser.add_argument("--out", default="data/synthetic", help="Output directory")
+    parser.add_argument("--load", action="store_true", help="COPY the output into DATABASE_URL")
+    args = parser.parse_args()
+
+    try:
+        config = GeneratorConfig(
+            seed=args.seed,
+            households=args.households,
+            min_items=args.min_items,
+            max_items=args.max_items,
+            max_members=args.max_members,
+            days=args.days,
+            end=args.end,
+            events=args.events,
+            receipts=args.receipts,
+            receipt_format=args.receipt_format,
+            receipt_noise=not args.clean_receipts,
+            run_id=args.run_id,
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    manifest = generate(config, args.out, progress=lambda line: print(line, file=sys.stderr))
+    if args.load:
+        from app.core.config import settings
+
+        asyncio.run(load(settings.DATABASE_URL, args.out, list(manifest["rows"]), config.months))
+        manifest["loaded"] = True
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
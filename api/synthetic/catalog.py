@@ -0,0 +1,164 @@
+"""
+Product catalog for synthetic households
+
+Each product has a category, where it's usually kept, how fast a household
+uses it, how many uses a purchase covers, a shelf price and the abbreviation a
+store prints on the receipt. Item names combine a product with a brand, an
+optional "Organic" prefix and a pack size, so a household can have up to
+~13k distinct items.
+
+The lookup tables at the bottom are indexed by "name index" (product, brand,
+size and organic flag packed into one integer), so generators can pick names
+and prices for millions of items with array indexing.
+"""
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from app.models import Category, Location
+
+
+class Product(NamedTuple):
+    name: str
+    category: str
+    location: str
+    uses_per_day: float  # mean, for a typical household
+    uses_per_pack: float  # uses between restocks
+    price: float
+    unit: str
+    receipt_name: str
+
+
+PRODUCTS: Tuple[Product, ...] = (
+    # Dairy
+    Product("Milk", "dairy", "fridge", 0.9, 8, 3.49, "gallon", "MLK"),
+    Product("Eggs", "dairy", "fridge", 0.6, 12, 4.29, "dozen", "EGGS LG"),
+    Product("Butter", "dairy", "fridge", 0.3, 16, 4.99, "pound", "BTR UNSLTD"),
+    Product("Greek Yogurt", "dairy", "fridge", 0.5, 4, 5.49, "ounce", "GRK YGT"),
+    Product("Cheddar Cheese", "dairy", "fridge", 0.3, 8, 5.99, "ounce", "CHDR CHS"),
+    Product("Cream Cheese", "dairy", "fridge", 0.15, 8, 2.99, "ounce", "CRM CHS"),
+    # Produce
+    Product("Bananas", "produce", "pantry", 0.8, 6, 1.59, "bunch", "BANANAS"),
+    Product("Apples", "produce", "fridge", 0.6, 8, 4.99, "bag", "APPLES GALA"),
+    Product("Spinach", "produce", "fridge", 0.4, 4, 3.99, "bag", "SPNCH BBY"),
+    Product("Tomatoes", "produce", "pantry", 0.4, 5, 2.99, "pound", "TOMATOES"),
+    Product("Onions", "produce", "pantry", 0.3, 6, 3.49, "bag", "ONION YLW"),
+    Product("Berries", "produce", "fridge", 0.5, 3, 4.99, "pint", "STRWBRY"),
+    Product("Frozen Peas", "produce", "freezer", 0.15, 6, 2.49, "bag", "FRZ PEAS"),
+    # Meat
+    Product("Chicken Breast", "meat", "fridge", 0.4, 4, 9.99, "pound", "CHKN BRST"),
+    Product("Ground Beef", "meat", "fridge", 0.3, 3, 7.49, "pound", "GRND BF 80/20"),
+    Product("Bacon", "meat", "fridge", 0.2, 4, 6.99, "ounce", "BACON"),
+    Product("Frozen Fish Fillets", "meat", "freezer", 0.15, 4, 8.99, "bag", "FRZ FISH FLT"),
+    Product("Sausages", "meat", "freezer", 0.15, 5, 5.49, "pack", "SAUSAGE"),
+    # Bakery
+    Product("Sandwich Bread", "bakery", "pantry", 0.7, 10, 3.29, "loaf", "BREAD WHT"),
+    Product("Bagels", "bakery", "pantry", 0.3, 6, 3.99, "pack", "BAGELS"),
+    Product("Tortillas", "bakery", "pantry", 0.3, 10, 2.79, "pack", "TORTILLA FLR"),
+    Product("Croissants", "bakery", "freezer", 0.1, 6, 5.99, "pack", "CROISSANT"),
+    # Pantry staples
+    Product("Rice", "pantry_staple", "pantry", 0.3, 20, 4.49, "bag", "RICE JSMN"),
+    Product("Pasta", "pantry_staple", "pantry", 0.3, 8, 1.79, "box", "PASTA PENNE"),
+    Product("Flour", "pantry_staple", "pantry", 0.1, 30, 3.99, "bag", "FLOUR AP"),
+    Product("Olive Oil", "pantry_staple", "pantry", 0.2, 40, 9.99, "bottle", "OLV OIL EV"),
+    Product("Canned Beans", "pantry_staple", "pantry", 0.2, 2, 1.29, "can", "BEANS BLK"),
+    Product("Cereal", "pantry_staple", "pantry", 0.5, 10, 4.79, "box", "CEREAL"),
+    # Beverages
+    Product("Orange Juice", "beverage", "fridge", 0.6, 8, 4.49, "carton", "OJ NO PULP"),
+    Product("Coffee", "beverage", "pantry", 1.2, 40, 11.99, "bag", "COFFEE GRND"),
+    Product("Sparkling Water", "beverage", "fridge", 0.8, 12, 5.99, "pack", "SPRKL WTR"),
+    Product("Tea", "beverage", "pantry", 0.4, 20, 3.99, "box", "TEA BLK"),
+    # Snacks
+    Product("Potato Chips", "snack", "pantry", 0.4, 6, 3.99, "bag", "CHIPS"),
+    Product("Granola Bars", "snack", "pantry", 0.5, 8, 4.49, "box", "GRNLA BAR"),
+    Product("Ice Cream", "snack", "freezer", 0.3, 8, 5.49, "pint", "ICE CRM"),
+    Product("Crackers", "snack", "pantry", 0.3, 8, 3.49, "box", "CRACKERS"),
+    # Condiments
+    Product("Ketchup", "condiment", "fridge", 0.15, 30, 2.99, "bottle", "KETCHUP"),
+    Product("Mustard", "condiment", "fridge", 0.08, 30, 2.49, "bottle", "MUSTARD"),
+    Product("Mayonnaise", "condiment", "fridge", 0.12, 25, 4.49, "jar", "MAYO"),
+    Product("Soy Sauce", "condiment", "pantry", 0.1, 40, 3.29, "bottle", "SOY SCE"),
+    Product("Hot Sauce", "condiment", "pantry", 0.1, 40, 3.99, "bottle", "HOT SCE"),
+    # Other
+    Product("Paper Towels", "other", "pantry", 0.5, 12, 8.99, "pack", "PPR TWL"),
+    Product("Dish Soap", "other", "pantry", 0.3, 30, 3.99, "bottle", "DISH SOAP"),
+    Product("Trash Bags", "other", "pantry", 0.3, 20, 9.49, "box", "TRASH BAG"),
+    Product("Frozen Pizza", "other", "freezer", 0.15, 2, 6.99, "box", "FRZ PIZZA"),
+)
+
+# fmt: off
+BRANDS: Tuple[str, ...] = (
+    "Acme", "Bluebird", "Cedar Farms", "Daybreak", "Evergreen", "Fairview", "Golden Field",
+    "Harvest", "Island", "Juniper", "Kettle Creek", "Lakeside", "Meadow", "North Star", "Oak Hill",
+    "Pine Valley", "Quail Run", "Riverbend", "Sunrise", "Trailhead", "Union Market", "Valley",
+    "Willow", "Yellowstone",
+)
+
+# (item name suffix, receipt suffix, price and pack multiplier)
+SIZES: Tuple[Tuple[str, str, float], ...] = (
+    ("Small", "SM", 0.7), ("Regular", "", 1.0), ("Large", "LG", 1.4),
+    ("Family Size", "FAM", 1.9), ("Value Pack", "VP", 2.4), ("Single", "1CT", 0.5),
+)
+
+ORGANIC = ("", "Organic ")
+
+STORES: Tuple[str, ...] = (
+    "Greenway Market", "FreshCo", "Corner Grocer", "Valley Foods", "Harbor Supermarket",
+    "Maple Street Grocery",
+)
+
+# Relative activity by weekday (Monday first) and hour of day
+USE_WEEKDAY = (0.90, 0.85, 0.90, 0.95, 1.05, 1.25, 1.20)
+RESTOCK_WEEKDAY = (0.60, 0.50, 0.60, 0.70, 1.00, 2.00, 1.80)
+USE_HOURS = (
+    0.05, 0.02, 0.02, 0.02, 0.05, 0.2, 0.8, 1.6, 1.4, 0.7, 0.5, 0.8,
+    1.3, 0.9, 0.5, 0.5, 0.7, 1.2, 1.9, 1.6, 1.0, 0.7, 0.4, 0.2,
+)
+RESTOCK_HOURS = (
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.05, 0.2, 0.5, 1.0, 1.4, 1.5,
+    1.3, 1.2, 1.2, 1.3, 1.5, 1.7, 1.5, 1.0, 0.6, 0.3, 0.1, 0.0,
+)
+# fmt: on
+
+# Every Category and Location value must be reachable
+assert {p.category for p in PRODUCTS} == {c.value for c in Category}
+assert {p.location for p in PRODUCTS} == {loc.value for loc in Location}
+
+
+LOCATIONS: Tuple[str, ...] = tuple(location.value for location in Location)
+
+# Name index = product + P * (brand + B * (size + Z * organic))
+NAME_SPACE = len(PRODUCTS) * len(BRANDS) * len(SIZES) * len(ORGANIC)
+
+
+def _name_tables():
+    names, receipt_names, prices, packs = [], [], [], []
+    for organic in range(len(ORGANIC)):
+        for size_name, size_code, size_factor in SIZES:
+            for brand in BRANDS:
+                for product in PRODUCTS:
+                    suffix = "" if size_name == "Regular" else f" ({size_name})"
+                    names.append(f"{brand} {ORGANIC[organic]}{product.name}{suffix}")
+                    receipt_names.append(
+                        " ".join(
+                            filter(
+                                None,
+                                (
+                                    brand.split()[0][:5].upper(),
+                                    "ORG" if organic else "",
+                                    product.receipt_name,
+                                    size_code,
+                                ),
+                            )
+                        )
+                    )
+                    prices.append(round(product.price * size_factor * (1.2 if organic else 1.0), 2))
+                    packs.append(product.uses_per_pack * size_factor)
+    return np.array(names), np.array(receipt_names), np.array(prices), np.array(packs)
+
+
+NAMES, RECEIPT_NAMES, PRICES, PACKS = _name_tables()
+PRODUCT_INDEX = np.arange(NAME_SPACE) % len(PRODUCTS)
+USES_PER_DAY = np.array([product.uses_per_day for product in PRODUCTS])
+CATEGORY_NAMES = np.array([product.category for product in PRODUCTS])
+LOCATION_INDEX = np.array([LOCATIONS.index(product.location) for product in PRODUCTS])
@@ -0,0 +1,339 @@
+"""
+Generate a synthetic dataset into a directory
+
+Household-level draws (IDs, sizes, item counts) come from one generator
+seeded with the config seed. Items, inventory and events are then produced
+block by block (about BLOCK_ITEMS items each), every block with its own
+generator seeded from (seed, block), so memory stays flat and the output only
+depends on the config, never on timing.
+"""
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from synthetic.catalog import CATEGORY_NAMES, LOCATIONS, NAMES, PACKS, PRODUCT_INDEX
+from synthetic.output import (
+    COPY_COLUMNS,
+    CsvWriter,
+    confidence_text,
+    timestamp_text,
+    write_load_sql,
+)
+from synthetic.receipts import FILE_TYPES, build_receipt, render
+from synthetic.tables import (
+    DAY,
+    EVENT_TYPES,
+    SOURCES,
+    STATES,
+    EventModel,
+    blocks,
+    expected_events,
+    make_households,
+    make_items,
+    segment_positions,
+    usage_rates,
+    uuid4_array,
+)
+
+BLOCK_ITEMS = 20_000
+
+# Streams derived from the seed, so adding draws to one never shifts another
+_BLOCKS, _RECEIPTS = 1, 2
+
+
+@dataclass
+class GeneratorConfig:
+    """What to generate; the same config always produces the same files"""
+
+    seed: int = 42
+    households: int = 100
+    min_items: int = 20
+    max_items: int = 500
+    max_members: int = 4
+    days: int = 365
+    end: date = date(2026, 1, 1)
+    events: Optional[int] = None  # about this many in total; None follows the catalog usage rates
+    receipts: int = 0
+    receipt_format: str = "png"
+    receipt_noise: bool = True
+    run_id: Optional[str] = None
+
+    def __post_init__(self):
+        if self.run_id is None:
+            self.run_id = f"seed{self.seed}"
+        if not 1 <= self.min_items <= self.max_items <= len(NAMES):
+            raise ValueError(
+                f"Item counts must satisfy 1 <= min_items <= max_items <= {len(NAMES)}"
+            )
+        if self.households < 1 or self.days < 1 or self.max_members < 1:
+            raise ValueError("households, days and max_members must be positive")
+        if self.receipt_format not in FILE_TYPES:
+            raise ValueError(f"receipt_format must be one of {', '.join(FILE_TYPES)}")
+
+    @property
+    def end_ts(self) -> int:
+        return int(
+            datetime(self.end.year, self.end.month, self.end.day, tzinfo=timezone.utc).timestamp()
+        )
+
+    @property
+    def start_ts(self) -> int:
+        return self.end_ts - self.days * DAY
+
+    @property
+    def months(self):
+        """First and last month the events fall in"""
+        first = datetime.fromtimestamp(self.start_ts, timezone.utc).date().replace(day=1)
+        last = (self.end - timedelta(days=1)).replace(day=1)
+        return first, last
+
+
+def generate(
+    config: GeneratorConfig, directory: str, progress: Optional[Callable[[str], None]] = None
+) -> Dict[str, object]:
+    """
+    Write the dataset's CSVs, load.sql, receipts and manifest.json
+
+    Args:
+        config: What to generate
+        directory: Output directory (created if missing)
+        progress: Called with a status line after each block
+
+    Returns:
+        The manifest (config and row counts per table) plus elapsed seconds
+    """
+    started = time.perf_counter()
+    start, end = config.start_ts, config.end_ts
+    rng = np.random.default_rng(config.seed)
+    households = make_households(
+        rng, config.households, config.min_items, config.max_items, config.max_members, start
+    )
+    writer = CsvWriter(directory)
+    try:
+        _write_households(writer, config, households, rng)
+
+        receipt_households = np.sort(rng.integers(0, config.households, config.receipts))
+        wanted = set(receipt_households.tolist())
+        kept: Dict[int, tuple] = {}
+
+        scale = 1.0
+        if config.events:
+            scale = config.events / expected_events(households, config.days)
+
+        model = EventModel(start, config.days)
+        household_blocks = blocks(households.item_counts, BLOCK_ITEMS)
+        for number, (first, last) in enumerate(household_blocks):
+            block_rng = np.random.default_rng([config.seed, _BLOCKS, number])
+            items = make_items(block_rng, households, first, last)
+            packs = PACKS[items.name_index]
+            events = model.events(
+                block_rng, usage_rates(block_rng, households, items, scale), packs
+            )
+            state, confidence, last_event = model.inventory(block_rng, events, packs, end)
+            _write_block(
+                writer, households, items, events, state, confidence, last_event, block_rng
+            )
+
+            for household in wanted.intersection(range(first, last)):
+                mine = items.household == household
+                kept[household] = (items.ids[mine], items.name_index[mine])
+
+            if progress:
+                progress(
+                    f"block {number + 1}/{len(household_blocks)}: "
+                    f"households {last}/{config.households}, "
+                    f"items {writer.rows['items']}, events {writer.rows['events']}"
+                )
+
+        if config.receipts:
+            _write_receipts(writer, config, households, receipt_households, kept, directory)
+    finally:
+        writer.close()
+
+    tables = [table for table in COPY_COLUMNS if table in writer.rows]
+    write_load_sql(
+        directory,
+        tables,
+        config.months,
+        f"Synthetic data, run {config.run_id} (seed {config.seed})",
+    )
+    manifest = {
+        "config": {**asdict(config), "end": config.end.isoformat()},
+        "rows": {table: writer.rows[table] for table in tables},
+    }
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return {**manifest, "seconds": round(time.perf_counter() - started, 1)}
+
+
+def _write_households(
+    writer: CsvWriter, config: GeneratorConfig, households, rng: np.random.Generator
+) -> None:
+    count = config.households
+    created = timestamp_text(households.created_at)
+    writer.write(
+        "households",
+        [
+            households.ids,
+            [f"Synthetic {config.run_id} #{n}" for n in range(count)],
+            created,
+            created,
+        ],
+    )
+
+    owners, positions = segment_positions(households.member_counts)
+    user_ids = uuid4_array(rng, len(owners))
+    writer.write(
+        "auth_users",
+        [
+            user_ids,
+            [
+                f"synthetic-{config.run_id}-{h}-{m}@example.com"
+                for h, m in zip(owners.tolist(), positions.tolist())
+            ],
+            "authenticated",
+            "authenticated",
+        ],
+    )
+    # The first member created the household; the others joined over the next month
+    joined = households.created_at[owners] + np.where(
+        positions == 0, 0, rng.integers(DAY, 30 * DAY, len(owners))
+    )
+    writer.write(
+        "household_members",
+        [
+            uuid4_array(rng, len(owners)),
+            households.ids[owners],
+            user_ids,
+            np.where(positions == 0, "admin", "member"),
+            timestamp_text(joined),
+        ],
+    )
+
+
+def _write_block(
+    writer: CsvWriter, households, items, events, state, confidence, last_event, rng
+) -> None:
+    product = PRODUCT_INDEX[items.name_index]
+    writer.write(
+        "items",
+        [
+            items.ids,
+            households.ids[items.household],
+            NAMES[items.name_index],
+            CATEGORY_NAMES[product],
+            np.asarray(LOCATIONS)[items.location],
+            timestamp_text(items.created_at),
+        ],
+    )
+    writer.write(
+        "inventory",
+        [
+            uuid4_array(rng, len(items.ids)),
+            households.ids[items.household],
+            items.ids,
+            np.asarray(STATES)[state],
+            confidence_text(confidence),
+            np.where(last_event < 0, "", timestamp_text(np.maximum(last_event, 0))),
+        ],
+    )
+    writer.write(
+        "events",
+        [
+            uuid4_array(rng, len(events.item)),
+            households.ids[items.household[events.item]],
+            EVENT_TYPES[events.kind],
+            SOURCES[events.source],
+            items.ids[events.item],
+            "{}",
+            "1.00",
+            timestamp_text(events.created_at),
+        ],
+    )
+
+
+def _write_receipts(
+    writer: CsvWriter, config: GeneratorConfig, households, receipt_households, kept, directory: str
+) -> None:
+    """Render receipts for the chosen households, with their ground truth and table rows"""
+    rng = np.random.default_rng([config.seed, _RECEIPTS])
+    extension = config.receipt_format
+    receipt_ids = uuid4_array(rng, len(receipt_households))
+    # Shopping trips fall in the second half of the window
+    purchased = config.end_ts - rng.integers(
+        DAY, max(2, config.days // 2) * DAY, len(receipt_households)
+    )
+    receipt_rows: List[list] = []
+    item_rows: List[list] = []
+
+    for receipt_id, household, purchased_at in zip(
+        receipt_ids.tolist(), receipt_households.tolist(), purchased.tolist()
+    ):
+        household_id = str(households.ids[household])
+        item_ids, name_index = kept[household]
+        when = datetime.fromtimestamp(purchased_at, timezone.utc)
+        receipt = build_receipt(rng, receipt_id, household_id, item_ids, name_index, when)
+        content = render(receipt, extension, rng if config.receipt_noise else None)
+
+        file_path = f"{household_id}/{receipt_id}.{extension}"
+        os.makedirs(os.path.join(directory, "receipts", household_id), exist_ok=True)
+        with open(os.path.join(directory, "receipts", file_path), "wb") as f:
+            f.write(content)
+        with open(
+            os.path.join(directory, "receipts", household_id, f"{receipt_id}.json"), "w"
+        ) as f:
+            json.dump({**receipt.ground_truth(), "file_path": file_path}, f, indent=2)
+
+        # Uploaded when bought, parsed a minute later, confirmed within the hour
+        uploaded = when.isoformat()
+        parsed = (when + timedelta(seconds=60)).isoformat()
+        confirmed = (when + timedelta(seconds=60 + int(rng.integers(60, 3600)))).isoformat()
+        receipt_rows.append(
+            [
+                receipt_id,
+                household_id,
+                file_path,
+                FILE_TYPES[extension],
+                len(content),
+                "confirmed",
+                receipt.text(),
+                "1.00",
+                receipt.store_name,
+                when.date().isoformat(),
+                f"{receipt.total:.2f}",
+                len(receipt.lines),
+                len(receipt.lines),
+                uploaded,
+                uploaded,
+                parsed,
+                confirmed,
+            ]
+        )
+        line_ids = uuid4_array(rng, len(receipt.lines)).tolist()
+        for line_id, line in zip(line_ids, receipt.lines):
+            item_rows.append(
+                [
+                    line_id,
+                    receipt_id,
+                    line.item_id,
+                    line.raw_name,
+                    line.normalized_name,
+                    line.quantity,
+                    line.unit,
+                    f"{line.unit_price:.2f}",
+                    line.line_number,
+                    "1.00",
+                    "1.00",
+                    "1.00",
+                    "confirmed",
+                    confirmed,
+                ]
+            )
+
+    writer.write_rows("receipts", receipt_rows)
+    writer.write_rows("receipt_items", item_rows)
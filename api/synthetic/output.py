@@ -0,0 +1,194 @@
+"""
+COPY-ready CSV output
+
+One CSV file (with header) per table, plus a load.sql of psql \\copy commands
+in foreign key order. Columns are joined without quoting, which is safe
+because generated IDs, names, enums and timestamps never contain commas,
+quotes or newlines; free text (receipt OCR text) goes through the csv module.
+"""
+import csv
+import os
+from datetime import date
+from itertools import repeat
+from typing import Dict, Iterable, List, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+
+# table file -> (schema-qualified table, columns), in load order
+# fmt: off
+COPY_COLUMNS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "auth_users": ("auth.users", ("id", "email", "aud", "role")),
+    "households": ("public.households", ("id", "name", "created_at", "updated_at")),
+    "household_members": (
+        "public.household_members", ("id", "household_id", "user_id", "role", "joined_at")
+    ),
+    "items": (
+        "public.items", ("id", "household_id", "name", "category", "location", "created_at")
+    ),
+    "inventory": (
+        "public.inventory",
+        ("id", "household_id", "item_id", "state", "confidence", "last_event_at")
+    ),
+    "events": (
+        "public.events",
+        (
+            "id", "household_id", "event_type", "source", "item_id", "payload", "confidence",
+            "created_at",
+        )
+    ),
+    "receipts": (
+        "public.receipts",
+        (
+            "id", "household_id", "file_path", "file_type", "file_size_bytes", "status", "ocr_text",
+            "ocr_confidence", "store_name", "receipt_date", "total_amount", "item_count",
+            "confirmed_count", "uploaded_at", "processing_started_at", "parsed_at", "confirmed_at",
+        )
+    ),
+    "receipt_items": (
+        "public.receipt_items",
+        (
+            "id", "receipt_id", "item_id", "raw_name", "normalized_name", "quantity", "unit",
+            "price", "line_number", "confidence", "ocr_confidence", "parsing_confidence", "status",
+            "confirmed_at",
+        )
+    ),
+}
+# fmt: on
+
+Column = Union[str, np.ndarray, Sequence[str]]
+
+# Confidence (rounded to hundredths) -> NUMERIC(3,2) text
+CONFIDENCE_TEXT = np.array([f"{n / 100:.2f}" for n in range(101)])
+
+
+def confidence_text(values: np.ndarray) -> np.ndarray:
+    return CONFIDENCE_TEXT[np.clip(np.rint(values * 100), 0, 100).astype(np.int64)]
+
+
+def timestamp_text(seconds: np.ndarray) -> np.ndarray:
+    """Epoch seconds -> ISO 8601 UTC text"""
+    return np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s", timezone="UTC")
+
+
+class CsvWriter:
+    """Append rows to one CSV per table under a directory"""
+
+    def __init__(self, directory: str, chunk_rows: int = 250_000):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.rows: Dict[str, int] = {}
+        self._files: Dict[str, TextIO] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.csv")
+
+    def _file(self, table: str) -> TextIO:
+        if table not in self._files:
+            f = open(self.path(table), "w", newline="")
+            f.write(",".join(COPY_COLUMNS[table][1]) + "\n")
+            self._files[table] = f
+            self.rows[table] = 0
+        return self._files[table]
+
+    def write(self, table: str, columns: List[Column]) -> None:
+        """
+        Write rows given column-wise
+
+        Each column is an array or list of strings (empty string = NULL), or
+        a single string repeated on every row.
+        """
+        f = self._file(table)
+        expected = len(COPY_COLUMNS[table][1])
+        if len(columns) != expected:
+            raise ValueError(f"{table} takes {expected} columns, got {len(columns)}")
+        count = next(len(column) for column in columns if not isinstance(column, str))
+
+        for start in range(0, count, self.chunk_rows):
+            stop = min(start + self.chunk_rows, count)
+            sliced = [
+                repeat(column) if isinstance(column, str) else _as_list(column[start:stop])
+                for column in columns
+            ]
+            f.write("\n".join(map(",".join, zip(*sliced))))
+            f.write("\n")
+        self.rows[table] += count
+
+    def write_rows(self, table: str, rows: Iterable[Sequence]) -> None:
+        """Write rows that may contain free text, with CSV quoting"""
+        f = self._file(table)
+        writer = csv.writer(f, lineterminator="\n")
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+            self.rows[table] += 1
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+def _as_list(column) -> List[str]:
+    return column.tolist() if isinstance(column, np.ndarray) else list(column)
+
+
+def write_load_sql(
+    directory: str, tables: Iterable[str], months: Tuple[date, date], comment: str
+) -> str:
+    """
+    Write load.sql: create the event partitions, then \\copy every table
+
+    Run it from the output directory: psql "$DATABASE_URL" -f load.sql
+    """
+    path = os.path.join(directory, "load.sql")
+    lines = [f"-- {comment}", "BEGIN;"]
+    if "events" in tables:
+        first, last = months
+        lines.append(
+            "SELECT create_events_partition(month::date) "
+            f"FROM generate_series('{first.isoformat()}'::date, '{last.isoformat()}'::date, "
+            "interval '1 month') AS month;"
+        )
+    for table in COPY_COLUMNS:
+        if table in tables:
+            name, columns = COPY_COLUMNS[table]
+            lines.append(
+                f"\\copy {name} ({', '.join(columns)}) FROM '{table}.csv' "
+                "WITH (FORMAT csv, HEADER true)"
+            )
+    lines.append("COMMIT;")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+async def load(
+    database_url: str, directory: str, tables: Iterable[str], months: Tuple[date, date]
+) -> None:
+    """COPY the generated CSVs into a database in one transaction"""
+    import asyncpg
+
+    conn = await asyncpg.connect(database_url)
+    try:
+        async with conn.transaction():
+            if "events" in tables:
+                await conn.execute(
+                    "SELECT create_events_partition(month::date) "
+                    "FROM generate_series($1::date, $2::date, interval '1 month') AS month",
+                    *months,
+                )
+            for table in COPY_COLUMNS:
+                if table not in tables:
+                    continue
+                name, columns = COPY_COLUMNS[table]
+                schema, table_name = name.split(".")
+                await conn.copy_to_table(
+                    table_name,
+                    source=os.path.join(directory, f"{table}.csv"),
+                    columns=list(columns),
+                    schema_name=schema,
+                    format="csv",
+                    header=True,
+                )
+    finally:
+        await conn.close()
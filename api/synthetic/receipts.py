@@ -0,0 +1,216 @@
+"""
+Synthetic receipts with known ground truth
+
+A receipt is a handful of a household's items printed the way stores print
+them (abbreviated, upper case, brand-first), with quantities, prices, tax and
+a total. render() draws it as a narrow thermal-printer style image (PNG or
+JPEG) or PDF with a little rotation and speckle, and ground_truth() is what
+OCR, parsing and item mapping should recover from that file: each line's
+printed name, the household item it is, quantity and price.
+"""
+import io
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from synthetic.catalog import (
+    CATEGORY_NAMES,
+    NAMES,
+    PRICES,
+    PRODUCT_INDEX,
+    PRODUCTS,
+    RECEIPT_NAMES,
+    STORES,
+)
+
+FILE_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "pdf": "application/pdf"}
+
+# Sales tax on non-food lines
+TAX_RATE = 0.0825
+
+WIDTH = 384  # 58mm paper at 203 dpi
+MARGIN = 14
+LINE_HEIGHT = 22
+FONT_SIZE = 16
+
+
+@dataclass
+class ReceiptLine:
+    line_number: int
+    item_id: str
+    raw_name: str
+    normalized_name: str
+    category: str
+    quantity: int
+    unit: str
+    unit_price: float
+    amount: float
+    taxable: bool
+
+
+@dataclass
+class Receipt:
+    id: str
+    household_id: str
+    store_name: str
+    store_number: int
+    purchased_at: datetime
+    lines: List[ReceiptLine] = field(default_factory=list)
+
+    @property
+    def subtotal(self) -> float:
+        return round(sum(line.amount for line in self.lines), 2)
+
+    @property
+    def tax(self) -> float:
+        return round(sum(line.amount for line in self.lines if line.taxable) * TAX_RATE, 2)
+
+    @property
+    def total(self) -> float:
+        return round(self.subtotal + self.tax, 2)
+
+    def printed(self) -> List[Tuple[str, str]]:
+        """The receipt as (left, right) text pairs, top to bottom; "-" rows are rules"""
+        rows = [
+            (self.store_name.upper(), ""),
+            (f"STORE #{self.store_number:04d}", ""),
+            (self.purchased_at.strftime("%m/%d/%Y %H:%M"), ""),
+            ("-", ""),
+        ]
+        for line in self.lines:
+            rows.append((line.raw_name + (" T" if line.taxable else ""), f"{line.amount:.2f}"))
+            if line.quantity > 1:
+                rows.append((f"  {line.quantity} @ {line.unit_price:.2f}", ""))
+        rows += [
+            ("-", ""),
+            ("SUBTOTAL", f"{self.subtotal:.2f}"),
+            ("TAX", f"{self.tax:.2f}"),
+            ("TOTAL", f"{self.total:.2f}"),
+            (f"ITEMS {sum(line.quantity for line in self.lines)}", ""),
+            ("THANK YOU", ""),
+        ]
+        return rows
+
+    def text(self) -> str:
+        """Plain text of the printed receipt (what perfect OCR would read)"""
+        return "\n".join(
+            "-" * 32 if left == "-" else f"{left} {right}".rstrip()
+            for left, right in self.printed()
+        )
+
+    def ground_truth(self) -> Dict[str, Any]:
+        return {
+            "receipt_id": self.id,
+            "household_id": self.household_id,
+            "store_name": self.store_name,
+            "purchased_at": self.purchased_at.isoformat(),
+            "lines": [asdict(line) for line in self.lines],
+            "subtotal": self.subtotal,
+            "tax": self.tax,
+            "total": self.total,
+            "text": self.text(),
+        }
+
+
+def build_receipt(
+    rng: np.random.Generator,
+    receipt_id: str,
+    household_id: str,
+    item_ids: np.ndarray,
+    name_index: np.ndarray,
+    purchased_at: datetime,
+) -> Receipt:
+    """Pick 3-24 of a household's items and price them"""
+    count = min(len(item_ids), int(rng.integers(3, 25)))
+    chosen = rng.choice(len(item_ids), count, replace=False)
+    quantities = rng.choice([1, 2, 3], count, p=[0.8, 0.15, 0.05])
+    # Shelf prices drift a little from store to store
+    prices = np.round(PRICES[name_index[chosen]] * rng.lognormal(0.0, 0.05, count), 2)
+
+    store = int(rng.integers(len(STORES)))
+    receipt = Receipt(receipt_id, household_id, STORES[store], 100 + 37 * store, purchased_at)
+    for n, (index, quantity, price) in enumerate(
+        zip(chosen.tolist(), quantities.tolist(), prices.tolist()), 1
+    ):
+        name = int(name_index[index])
+        product = PRODUCTS[PRODUCT_INDEX[name]]
+        receipt.lines.append(
+            ReceiptLine(
+                line_number=n,
+                item_id=str(item_ids[index]),
+                raw_name=str(RECEIPT_NAMES[name]),
+                normalized_name=str(NAMES[name]),
+                category=str(CATEGORY_NAMES[PRODUCT_INDEX[name]]),
+                quantity=quantity,
+                unit=product.unit,
+                unit_price=price,
+                amount=round(quantity * price, 2),
+                taxable=product.category == "other",
+            )
+        )
+    return receipt
+
+
+def render(
+    receipt: Receipt, file_format: str = "png", rng: Optional[np.random.Generator] = None
+) -> bytes:
+    """
+    Draw a receipt
+
+    Args:
+        receipt: Receipt to draw
+        file_format: "png", "jpeg" or "pdf"
+        rng: Adds a slight rotation and speckle like a phone photo; None for a clean scan
+
+    Returns:
+        File contents
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    if file_format not in FILE_TYPES:
+        raise ValueError(
+            f"Unsupported receipt format {file_format!r}; choose from {', '.join(FILE_TYPES)}"
+        )
+
+    rows = receipt.printed()
+    font = ImageFont.load_default(size=FONT_SIZE)
+    image = Image.new("L", (WIDTH, MARGIN * 2 + LINE_HEIGHT * len(rows)), 255)
+    draw = ImageDraw.Draw(image)
+    for n, (left, right) in enumerate(rows):
+        y = MARGIN + n * LINE_HEIGHT
+        if left == "-":
+            draw.line(
+                (MARGIN, y + LINE_HEIGHT // 2, WIDTH - MARGIN, y + LINE_HEIGHT // 2),
+                fill=0,
+                width=1,
+            )
+            continue
+        # The header is centred, everything else left-aligned with amounts on the right
+        x = (WIDTH - draw.textlength(left, font=font)) / 2 if n < 3 else MARGIN
+        draw.text((x, y), left, fill=0, font=font)
+        if right:
+            draw.text(
+                (WIDTH - MARGIN - draw.textlength(right, font=font), y), right, fill=0, font=font
+            )
+
+    if rng is not None:
+        image = image.rotate(
+            float(rng.uniform(-2.0, 2.0)), resample=Image.BICUBIC, expand=True, fillcolor=255
+        )
+        pixels = np.asarray(image, dtype=np.int16) + rng.normal(
+            0.0, 10.0, (image.height, image.width)
+        )
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+    buffer = io.BytesIO()
+    if file_format == "pdf":
+        # Fixed dates keep the file byte-for-byte reproducible
+        created = receipt.purchased_at.utctimetuple()
+        image.save(buffer, format="PDF", resolution=203.0, creationDate=created, modDate=created)
+    elif file_format == "jpeg":
+        image.save(buffer, format="JPEG", quality=85)
+    else:
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,287 @@
+"""
+Vectorized row generation
+
+Everything is drawn as NumPy arrays: a few calls per block of items instead of
+Python loops per row, which is what keeps tens of millions of events to
+minutes. Times are int64 epoch seconds until they're formatted for output.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from app.models import State
+from synthetic.catalog import (
+    LOCATION_INDEX,
+    LOCATIONS,
+    NAME_SPACE,
+    PACKS,
+    PRODUCT_INDEX,
+    RESTOCK_HOURS,
+    RESTOCK_WEEKDAY,
+    USE_HOURS,
+    USE_WEEKDAY,
+    USES_PER_DAY,
+)
+
+DAY = 86_400
+HOUR = 3_600
+
+STATES: Tuple[str, ...] = tuple(state.value for state in State)
+
+# Event kinds, in EVENT_TYPES order
+USED, RESTOCKED, RAN_OUT = 0, 1, 2
+EVENT_TYPES = np.array(["inventory.used", "inventory.restocked", "inventory.ran_out"])
+SOURCES = np.array(["user", "receipt"])
+
+# Share of restocks preceded by running out, and of restocks entered from a receipt
+RAN_OUT_SHARE = 0.25
+RECEIPT_SHARE = 0.3
+
+# Spread of usage rates between households and between items in a household
+HOUSEHOLD_SIGMA = 0.35
+ITEM_SIGMA = 0.5
+
+# Stock used up (in packs) at which an item moves to the next state
+STATE_LEVELS = np.array([0.25, 0.5, 0.75, 1.0])
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_DASHES = [8, 13, 18, 23]
+_HEX_POSITIONS = [n for n in range(36) if n not in _DASHES]
+
+# Strides coprime with NAME_SPACE, so (offset + k * stride) % NAME_SPACE never
+# repeats a name within a household
+_STRIDES = np.arange(1, NAME_SPACE)[np.gcd(np.arange(1, NAME_SPACE), NAME_SPACE) == 1]
+
+
+def uuid4_array(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Random (version 4) UUIDs as text, drawn from rng"""
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    chars = np.full((count, 36), ord("-"), dtype=np.uint8)
+    hexed = np.empty((count, 32), dtype=np.uint8)
+    hexed[:, 0::2] = _HEX[raw >> 4]
+    hexed[:, 1::2] = _HEX[raw & 0x0F]
+    chars[:, _HEX_POSITIONS] = hexed
+    return chars.view("S36").ravel().astype("U36")
+
+
+def segment_positions(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For counts [2, 3]: owners [0, 0, 1, 1, 1] and positions [0, 1, 0, 1, 2]"""
+    owners = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return owners, np.arange(len(owners)) - starts[owners]
+
+
+@dataclass
+class Households:
+    """Household-level draws, one entry per household"""
+
+    ids: np.ndarray
+    created_at: np.ndarray
+    item_counts: np.ndarray
+    member_counts: np.ndarray
+    activity: np.ndarray
+
+
+def make_households(
+    rng: np.random.Generator,
+    count: int,
+    min_items: int,
+    max_items: int,
+    max_members: int,
+    start: int,
+) -> Households:
+    """Households with log-uniform item counts and 1..max_members members"""
+    items = np.rint(np.exp(rng.uniform(np.log(min_items), np.log(max_items), count))).astype(
+        np.int64
+    )
+    members = 1 + rng.binomial(max_members - 1, 0.35, count)
+    return Households(
+        ids=uuid4_array(rng, count),
+        created_at=start - rng.integers(DAY, 60 * DAY, count),
+        item_counts=np.clip(items, min_items, max_items),
+        member_counts=members,
+        # Bigger households get through things faster
+        activity=rng.lognormal(0.0, HOUSEHOLD_SIGMA, count) * (0.7 + 0.15 * members),
+    )
+
+
+def blocks(item_counts: np.ndarray, block_items: int) -> List[Tuple[int, int]]:
+    """Split households into [start, stop) ranges of about block_items items"""
+    bounds = [0]
+    total = 0
+    for n, items in enumerate(item_counts.tolist(), 1):
+        total += items
+        if total >= block_items:
+            bounds.append(n)
+            total = 0
+    if bounds[-1] != len(item_counts):
+        bounds.append(len(item_counts))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+@dataclass
+class Items:
+    """Items of a block of households"""
+
+    household: np.ndarray  # index into Households
+    ids: np.ndarray
+    name_index: np.ndarray  # index into the catalog name tables
+    location: np.ndarray  # index into LOCATIONS
+    created_at: np.ndarray
+
+
+def make_items(rng: np.random.Generator, households: Households, first: int, last: int) -> Items:
+    """Items with names unique per household, covering the catalog evenly"""
+    counts = households.item_counts[first:last]
+    owners, positions = segment_positions(counts)
+    offsets = rng.integers(0, NAME_SPACE, len(counts))
+    strides = rng.choice(_STRIDES, len(counts))
+    name_index = (offsets[owners] + positions * strides[owners]) % NAME_SPACE
+
+    # Most items live where they usually do; some are kept elsewhere
+    location = LOCATION_INDEX[PRODUCT_INDEX[name_index]]
+    moved = rng.random(len(name_index)) < 0.1
+    location = np.where(moved, rng.integers(0, len(LOCATIONS), len(name_index)), location)
+
+    household = owners + first
+    return Items(
+        household=household,
+        ids=uuid4_array(rng, len(name_index)),
+        name_index=name_index,
+        location=location,
+        created_at=households.created_at[household] + rng.integers(0, DAY, len(name_index)),
+    )
+
+
+def usage_rates(
+    rng: np.random.Generator, households: Households, items: Items, scale: float
+) -> np.ndarray:
+    """
+    Uses per day for each item
+
+    A household with several items of one product (two brands of milk) splits
+    its use of that product between them.
+    """
+    base = USES_PER_DAY[PRODUCT_INDEX[items.name_index]]
+    copies = np.maximum(households.item_counts[items.household] / len(USES_PER_DAY), 1.0)
+    spread = rng.lognormal(0.0, ITEM_SIGMA, len(base))
+    return base / copies * households.activity[items.household] * spread * scale
+
+
+def expected_events(households: Households, days: int) -> float:
+    """Mean total events at scale 1"""
+    uses = USES_PER_DAY[PRODUCT_INDEX]
+    per_use = 1 + (1 + RAN_OUT_SHARE) / PACKS
+    per_item_day = float((uses * per_use).mean()) * np.exp(ITEM_SIGMA**2 / 2)
+    # Each household's uses are spread over at most one item per product
+    items = np.minimum(households.item_counts, len(USES_PER_DAY))
+    return float((households.activity * items).sum()) * per_item_day * days
+
+
+def day_weights(start: int, days: int, weekday_profile) -> np.ndarray:
+    """Probability of each day in the window, from its weekday"""
+    weekdays = (start // DAY + 3 + np.arange(days)) % 7  # 1970-01-01 was a Thursday
+    weights = np.asarray(weekday_profile)[weekdays]
+    return weights / weights.sum()
+
+
+def draw_times(
+    rng: np.random.Generator, count: int, start: int, days_p: np.ndarray, hours_p: np.ndarray
+) -> np.ndarray:
+    day = rng.choice(len(days_p), count, p=days_p)
+    hour = rng.choice(24, count, p=hours_p)
+    return start + day * DAY + hour * HOUR + rng.integers(0, HOUR, count)
+
+
+@dataclass
+class Events:
+    """Events of a block, in time order"""
+
+    item: np.ndarray  # index into the block's Items
+    kind: np.ndarray  # USED, RESTOCKED or RAN_OUT
+    source: np.ndarray  # index into SOURCES
+    created_at: np.ndarray
+
+
+class EventModel:
+    """Weekly-seasonal usage, restocks and run-outs over a time window"""
+
+    def __init__(self, start: int, days: int):
+        self.start = start
+        self.days = days
+        self.use_days = day_weights(start, days, USE_WEEKDAY)
+        self.restock_days = day_weights(start, days, RESTOCK_WEEKDAY)
+        self.use_hours = np.asarray(USE_HOURS) / sum(USE_HOURS)
+        self.restock_hours = np.asarray(RESTOCK_HOURS) / sum(RESTOCK_HOURS)
+
+    def events(self, rng: np.random.Generator, rates: np.ndarray, packs: np.ndarray) -> Events:
+        """
+        Draw each item's event stream
+
+        Uses are Poisson at the item's rate, with a restock for roughly every
+        pack used up (peaking at weekends). A share of restocks are preceded,
+        by a few hours to a few days, by the item running out.
+        """
+        used = rng.poisson(rates * self.days)
+        restocked = rng.poisson(used / packs)
+        ran_out = rng.binomial(restocked, RAN_OUT_SHARE)
+
+        used_item = np.repeat(np.arange(len(rates)), used)
+        used_at = draw_times(rng, len(used_item), self.start, self.use_days, self.use_hours)
+        restock_item = np.repeat(np.arange(len(rates)), restocked)
+        restock_at = draw_times(
+            rng, len(restock_item), self.start, self.restock_days, self.restock_hours
+        )
+
+        ran_out_item = np.repeat(np.arange(len(rates)), ran_out)
+        first_restock = np.cumsum(restocked) - restocked
+        before = first_restock[ran_out_item] + (
+            rng.random(len(ran_out_item)) * restocked[ran_out_item]
+        ).astype(np.int64)
+        ran_out_at = restock_at[before] - rng.integers(2 * HOUR, 3 * DAY, len(ran_out_item))
+        in_window = ran_out_at >= self.start
+        ran_out_item, ran_out_at = ran_out_item[in_window], ran_out_at[in_window]
+
+        item = np.concatenate([used_item, restock_item, ran_out_item])
+        kind = np.concatenate(
+            [
+                np.full(len(used_item), USED),
+                np.full(len(restock_item), RESTOCKED),
+                np.full(len(ran_out_item), RAN_OUT),
+            ]
+        )
+        created_at = np.concatenate([used_at, restock_at, ran_out_at])
+        source = ((kind == RESTOCKED) & (rng.random(len(kind)) < RECEIPT_SHARE)).astype(np.int64)
+
+        order = np.argsort(created_at, kind="stable")
+        return Events(item[order], kind[order], source[order], created_at[order])
+
+    def inventory(
+        self, rng: np.random.Generator, events: Events, packs: np.ndarray, end: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Current state, confidence and last event time per item
+
+        The state follows how much of the last restock (or of the stock at the
+        start of the window) has been used; confidence decays with the time
+        since the last event. Items without events have last_event_at -1.
+        """
+        count = len(packs)
+        last_restock = np.full(count, self.start - 1, dtype=np.int64)
+        restocks = events.kind == RESTOCKED
+        np.maximum.at(last_restock, events.item[restocks], events.created_at[restocks])
+
+        since = (events.kind == USED) & (events.created_at > last_restock[events.item])
+        used = np.bincount(events.item[since], minlength=count).astype(np.float64)
+        # Stock already part-used when the window opened
+        used += np.where(last_restock < self.start, rng.random(count) * packs, 0.0)
+        state = np.searchsorted(STATE_LEVELS, used / packs, side="right")
+
+        last_event = np.full(count, -1, dtype=np.int64)
+        np.maximum.at(last_event, events.item, events.created_at)
+        idle_days = (end - last_event) / DAY
+        confidence = np.where(last_event < 0, 0.5, np.clip(0.95 - 0.01 * idle_days, 0.3, 0.95))
+        return state, confidence, last_event
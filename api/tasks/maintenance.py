@@ -0,0 +1,40 @@
+"""
+Database maintenance tasks.
+"""
+import logging
+
+from celery_app import app
+from app.core.config import settings
+from app.services.supabase_client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(name="tasks.maintenance.maintain_event_partitions")
+def maintain_event_partitions():
+    """
+    Create upcoming monthly events partitions and retire old ones.
+    
+    Partitions are created EVENTS_PARTITIONS_AHEAD months ahead so inserts
+    never land in the default partition. Partitions that ended more than
+    EVENTS_RETENTION_MONTHS ago are detached, then moved to the events_archive
+    schema (EVENTS_ARCHIVE_DETACHED) or dropped.
+    
+    Returns:
+        Dictionary with created and detached partition names
+    """
+    response = get_supabase().rpc(
+        "maintain_events_partitions",
+        {
+            "p_months_ahead": settings.EVENTS_PARTITIONS_AHEAD,
+            "p_retention_months": settings.EVENTS_RETENTION_MONTHS,
+            "p_archive": settings.EVENTS_ARCHIVE_DETACHED,
+        },
+    ).execute()
+    
+    result = response.data or {}
+    logger.info(
+        f"Event partitions maintained: created={result.get('created', [])} "
+        f"detached={result.get('detached', [])}"
+    )
+    return result
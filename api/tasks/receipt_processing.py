@@ -13,6 +13,11 @@ def process_receipt(receipt_id: str):
         receipt_id: UUID of the receipt to process
     """
     # TODO: Implement receipt processing pipeline
+    # Run each stage inside span("receipt.<stage>") (app.core.tracing) so it
+    # shows up under the upload request's trace. Import the OCR/ML libraries
+    # (pytesseract, pdf2image, PIL, sentence_transformers) inside the stage
+    # functions, so the API can import this module to enqueue tasks without
+    # loading them
     # 1. Download receipt from MinIO
     # 2. Run OCR (Tesseract)
     # 3. Parse receipt text
@@ -0,0 +1,15 @@
+"""
+Shared test fixtures
+"""
+import pytest
+
+from app.services.cache import get_household_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_household_cache():
+    """Start every test with an empty household cache"""
+    cache = get_household_cache()
+    cache.clear()
+    yield
+    cache.clear()
@@ -11,6 +11,7 @@ from app.middleware.auth import (
     JWTMiddleware,
     get_current_user,
     get_current_user_id,
+    get_user_supabase,
     verify_household_access,
     get_optional_user
 )
@@ -162,6 +163,43 @@ class TestAuthDependencies:
         result = await get_current_user_id(credentials)
         assert result == user_id
     
+    @pytest.mark.asyncio
+    @patch('app.services.supabase_client.SupabaseService.get_user_client')
+    async def test_get_user_supabase(self, mock_get_user_client):
+        """Test get_user_supabase dependency returns a session for the caller's token"""
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials="test-token"
+        )
+        
+        result = await get_user_supabase(credentials, {"sub": str(uuid4())})
+        assert result == mock_get_user_client.return_value
+        mock_get_user_client.assert_called_once_with("test-token")
+    
+    @pytest.mark.asyncio
+    async def test_get_user_supabase_builds_real_session(self):
+        """Test the dependency builds a real PostgREST session on the shared transport"""
+        from postgrest import SyncPostgrestClient
+        from app.core.config import settings
+        from app.services.supabase_client import SupabaseService
+        
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials="test-token"
+        )
+        
+        SupabaseService.reset_client()
+        try:
+            with patch.object(settings, 'SUPABASE_URL', 'https://test.supabase.co'), \
+                    patch.object(settings, 'SUPABASE_KEY', 'test-key'):
+                session = await get_user_supabase(credentials, {"sub": str(uuid4())})
+            
+            assert isinstance(session, SyncPostgrestClient)
+            assert session.session is SupabaseService._http_client
+            assert session.headers["Authorization"] == "Bearer test-token"
+        finally:
+            SupabaseService.reset_client()
+    
     @pytest.mark.asyncio
     @patch('app.middleware.auth.DatabaseHelper.verify_user_household_access')
     @patch('app.middleware.auth.JWTMiddleware.verify_token')
@@ -0,0 +1,453 @@
+"""
+Tests for the household-scoped response cache
+"""
+import asyncio
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.errors import AuthorizationError
+from app.services.cache import HouseholdCache
+
+HOUSEHOLD_ID = str(uuid4())
+USER_ID = str(uuid4())
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for redis.asyncio (get/set/incr)"""
+
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.data[key] = value
+
+    async def incr(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+def make_cache(redis=None, **kwargs) -> HouseholdCache:
+    cache = HouseholdCache(
+        max_entries=kwargs.pop("max_entries", 100),
+        ttl=kwargs.pop("ttl", 60.0),
+        redis_url="redis://test" if redis is not None else "",
+        enabled=kwargs.pop("enabled", True)
+    )
+    cache._redis = redis
+    return cache
+
+
+def counting_loader(value: bytes = b'{"ok":true}'):
+    calls = {"n": 0}
+
+    async def loader():
+        calls["n"] += 1
+        return value
+
+    return loader, calls
+
+
+class TestLocalCache:
+    """Tests for the in-process tier"""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        """Test a second lookup is served without calling the loader"""
+        cache = make_cache()
+        loader, calls = counting_loader()
+
+        first = await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        second = await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        assert first == second == b'{"ok":true}'
+        assert calls["n"] == 1
+        stats = cache.stats()
+        assert stats["hits_local"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_shapes_and_households_are_separate(self):
+        """Test keys include both household and shape"""
+        cache = make_cache()
+        loader, calls = counting_loader()
+
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await cache.get_or_load(HOUSEHOLD_ID, "invitations", loader)
+        await cache.get_or_load(str(uuid4()), "items", loader)
+
+        assert calls["n"] == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate_bumps_generation(self):
+        """Test entries are not served after the household is invalidated"""
+        cache = make_cache()
+        loader, calls = counting_loader()
+        other = str(uuid4())
+
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await cache.get_or_load(other, "items", loader)
+        await cache.invalidate(HOUSEHOLD_ID)
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await cache.get_or_load(other, "items", loader)
+
+        # Only the invalidated household reloads
+        assert calls["n"] == 3
+
+    @pytest.mark.asyncio
+    async def test_load_racing_a_write_is_not_served(self):
+        """Test a load started before an invalidation isn't served after it"""
+        cache = make_cache()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return b"stale"
+
+        task = asyncio.create_task(cache.get_or_load(HOUSEHOLD_ID, "items", slow_loader))
+        await asyncio.sleep(0)
+        await cache.invalidate(HOUSEHOLD_ID)
+        release.set()
+        assert await task == b"stale"
+
+        loader, calls = counting_loader(b"fresh")
+        assert await cache.get_or_load(HOUSEHOLD_ID, "items", loader) == b"fresh"
+        assert calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = make_cache(max_entries=2)
+        loader, calls = counting_loader()
+
+        await cache.get_or_load(HOUSEHOLD_ID, "a", loader)
+        await cache.get_or_load(HOUSEHOLD_ID, "b", loader)
+        await cache.get_or_load(HOUSEHOLD_ID, "a", loader)  # a is now most recent
+        await cache.get_or_load(HOUSEHOLD_ID, "c", loader)  # evicts b
+        await cache.get_or_load(HOUSEHOLD_ID, "a", loader)
+        await cache.get_or_load(HOUSEHOLD_ID, "b", loader)
+
+        assert calls["n"] == 4
+        assert cache.stats()["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        cache = make_cache(ttl=5.0)
+        loader, calls = counting_loader()
+
+        with patch("app.services.cache.time.monotonic", return_value=1000.0):
+            await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        with patch("app.services.cache.time.monotonic", return_value=1006.0):
+            await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test a disabled cache always calls the loader"""
+        cache = make_cache(enabled=False)
+        loader, calls = counting_loader()
+
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        assert calls["n"] == 2
+        assert cache.stats()["misses"] == 0
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent misses"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self):
+        """Test concurrent lookups of the same key share one load"""
+        cache = make_cache()
+        calls = {"n": 0}
+
+        async def loader():
+            calls["n"] += 1
+            await asyncio.sleep(0.01)
+            return b"value"
+
+        results = await asyncio.gather(*[
+            cache.get_or_load(HOUSEHOLD_ID, "items", loader) for _ in range(10)
+        ])
+
+        assert results == [b"value"] * 10
+        assert calls["n"] == 1
+        assert cache.stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_are_not_cached(self):
+        """Test a failed load raises for every waiter and is retried next time"""
+        cache = make_cache()
+
+        async def failing_loader():
+            await asyncio.sleep(0.01)
+            raise AuthorizationError("User is not a member of this household")
+
+        results = await asyncio.gather(
+            *[cache.get_or_load(HOUSEHOLD_ID, "member:x", failing_loader) for _ in range(3)],
+            return_exceptions=True
+        )
+        assert all(isinstance(r, AuthorizationError) for r in results)
+
+        loader, calls = counting_loader(b"true")
+        assert await cache.get_or_load(HOUSEHOLD_ID, "member:x", loader) == b"true"
+        assert calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loader_lets_waiters_load(self):
+        """Test waiters load themselves if the loading caller is cancelled"""
+        cache = make_cache()
+        started = asyncio.Event()
+
+        async def hanging_loader():
+            started.set()
+            await asyncio.sleep(10)
+            return b"never"
+
+        leader = asyncio.create_task(cache.get_or_load(HOUSEHOLD_ID, "items", hanging_loader))
+        await started.wait()
+        loader, calls = counting_loader(b"value")
+        waiter = asyncio.create_task(cache.get_or_load(HOUSEHOLD_ID, "items", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == b"value"
+        assert calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_waiter_retry_keeps_shared_only(self):
+        """Test a waiter that loads itself still skips the cache once invalidation isn't shared"""
+        cache = make_cache()
+        cache.feed_connected = True
+        started = asyncio.Event()
+
+        async def hanging_loader():
+            started.set()
+            await asyncio.sleep(10)
+            return b"never"
+
+        leader = asyncio.create_task(
+            cache.get_or_load(HOUSEHOLD_ID, "member:x", hanging_loader, shared_only=True)
+        )
+        await started.wait()
+        loader, calls = counting_loader(b"true")
+        waiter = asyncio.create_task(
+            cache.get_or_load(HOUSEHOLD_ID, "member:x", loader, shared_only=True)
+        )
+        await asyncio.sleep(0)
+        cache.feed_connected = False
+        leader.cancel()
+
+        assert await waiter == b"true"
+        assert calls["n"] == 1
+        assert not cache._entries
+
+
+class TestRedisTier:
+    """Tests for the optional Redis tier"""
+
+    @pytest.mark.asyncio
+    async def test_values_shared_between_workers(self):
+        """Test a value loaded by one worker is a Redis hit for another"""
+        redis = FakeRedis()
+        worker_a = make_cache(redis)
+        worker_b = make_cache(redis)
+        loader, calls = counting_loader()
+
+        await worker_a.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await worker_b.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        assert calls["n"] == 1
+        assert worker_b.stats()["hits_redis"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self):
+        """Test a write in one worker invalidates another worker's local tier"""
+        redis = FakeRedis()
+        worker_a = make_cache(redis)
+        worker_b = make_cache(redis)
+        loader, calls = counting_loader()
+
+        await worker_b.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await worker_a.invalidate(HOUSEHOLD_ID)
+        await worker_b.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_bypasses_cache(self):
+        """Test reads go to the loader when Redis is down"""
+        cache = make_cache(FakeRedis(fail=True))
+        loader, calls = counting_loader()
+
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+        await cache.invalidate(HOUSEHOLD_ID)  # logged, not raised
+
+        assert calls["n"] == 2
+        assert cache.stats()["errors"] == 3
+
+
+class TestSharedInvalidation:
+    """Authorization results are cached only while every worker's writes reach the cache"""
+
+    @staticmethod
+    def membership_loader(members: set):
+        calls = {"n": 0}
+
+        async def loader():
+            calls["n"] += 1
+            if USER_ID not in members:
+                raise AuthorizationError("not a member")
+            return b"true"
+
+        return loader, calls
+
+    @pytest.mark.asyncio
+    async def test_removed_member_denied_on_other_worker(self):
+        """Test without Redis or the change feed, each check goes to the database"""
+        members = {USER_ID}
+        worker_a, worker_b = make_cache(), make_cache()
+        loader, calls = self.membership_loader(members)
+
+        await worker_b.get_or_load(HOUSEHOLD_ID, f"member:{USER_ID}", loader, shared_only=True)
+        # Worker A removes the member; worker B never hears about it
+        members.discard(USER_ID)
+        await worker_a.invalidate(HOUSEHOLD_ID)
+
+        with pytest.raises(AuthorizationError):
+            await worker_b.get_or_load(
+                HOUSEHOLD_ID, f"member:{USER_ID}", loader, shared_only=True
+            )
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_while_change_feed_connected(self):
+        """Test the change feed (which invalidates every worker) enables caching"""
+        cache = make_cache()
+        cache.feed_connected = True
+        loader, calls = self.membership_loader({USER_ID})
+
+        for _ in range(2):
+            await cache.get_or_load(HOUSEHOLD_ID, f"member:{USER_ID}", loader, shared_only=True)
+
+        assert calls["n"] == 1
+        cache.feed_connected = False
+        await cache.get_or_load(HOUSEHOLD_ID, f"member:{USER_ID}", loader, shared_only=True)
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_with_redis(self):
+        """Test Redis generations count as shared invalidation"""
+        redis = FakeRedis()
+        worker_a, worker_b = make_cache(redis), make_cache(redis)
+        members = {USER_ID}
+        loader, calls = self.membership_loader(members)
+
+        for _ in range(2):
+            await worker_b.get_or_load(
+                HOUSEHOLD_ID, f"member:{USER_ID}", loader, shared_only=True
+            )
+        assert calls["n"] == 1
+
+        members.discard(USER_ID)
+        await worker_a.invalidate(HOUSEHOLD_ID)
+        with pytest.raises(AuthorizationError):
+            await worker_b.get_or_load(
+                HOUSEHOLD_ID, f"member:{USER_ID}", loader, shared_only=True
+            )
+
+
+class TestServiceCaching:
+    """Tests for cached reads and invalidating writes in the services"""
+
+    @pytest.mark.asyncio
+    async def test_items_list_cached_until_write(self):
+        """Test repeated item lists skip the database until an item changes"""
+        from app.services.item_service import ItemService
+
+        with patch("app.services.item_service.get_supabase") as mock_get:
+            supabase = MagicMock()
+            supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = \
+                Mock(data=[{"id": "member-row"}])
+            supabase.table.return_value.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = \
+                Mock(data=[])
+            mock_get.return_value = supabase
+
+            service = ItemService()
+            service.cache = make_cache()
+            service.cache.feed_connected = True
+            await service.get_household_items(HOUSEHOLD_ID, USER_ID, as_json=True)
+            calls_after_first = supabase.table.call_count
+            await service.get_household_items(HOUSEHOLD_ID, USER_ID, as_json=True)
+
+            assert supabase.table.call_count == calls_after_first
+
+            await service.cache.invalidate(HOUSEHOLD_ID)
+            await service.get_household_items(HOUSEHOLD_ID, USER_ID, as_json=True)
+
+            assert supabase.table.call_count > calls_after_first
+
+    @pytest.mark.asyncio
+    async def test_non_member_not_cached(self):
+        """Test a failed membership check is not remembered"""
+        from app.services.item_service import ItemService
+
+        with patch("app.services.item_service.get_supabase") as mock_get:
+            supabase = MagicMock()
+            members = supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+            members.execute.return_value = Mock(data=[])
+            mock_get.return_value = supabase
+
+            service = ItemService()
+            with pytest.raises(AuthorizationError):
+                await service.get_household_items(HOUSEHOLD_ID, USER_ID)
+
+            # User joins; the next check sees it
+            members.execute.return_value = Mock(data=[{"id": "member-row"}])
+            supabase.table.return_value.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = \
+                Mock(data=[])
+            result = await service.get_household_items(HOUSEHOLD_ID, USER_ID)
+
+            assert result == {"items": [], "total": 0}
+
+    @pytest.mark.asyncio
+    async def test_household_detail_cached_per_user(self):
+        """Test household detail is cached per user and invalidated by updates"""
+        from app.services.household_service import HouseholdService
+
+        detail = {"id": HOUSEHOLD_ID, "name": "Home", "member_count": 1, "admin_count": 1}
+        with patch("app.services.household_service.get_supabase") as mock_get:
+            supabase = MagicMock()
+            supabase.rpc.return_value.execute.return_value = Mock(data=detail)
+            mock_get.return_value = supabase
+
+            service = HouseholdService()
+            service.cache = make_cache()
+            service.cache.feed_connected = True
+            assert await service.get_household_by_id(HOUSEHOLD_ID, USER_ID, summary=True) == detail
+            assert await service.get_household_by_id(HOUSEHOLD_ID, USER_ID, summary=True) == detail
+            assert supabase.rpc.call_count == 1
+
+            await service.get_household_by_id(HOUSEHOLD_ID, str(uuid4()), summary=True)
+            assert supabase.rpc.call_count == 2
+
+            await service.cache.invalidate(HOUSEHOLD_ID)
+            await service.get_household_by_id(HOUSEHOLD_ID, USER_ID, summary=True)
+            assert supabase.rpc.call_count == 3
@@ -0,0 +1,252 @@
+"""
+Tests for the household change feed and stream endpoint
+"""
+import asyncio
+import json
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.services.cache import HouseholdCache
+from app.services.change_feed import ChangeFeed, format_sse
+
+client = TestClient(app)
+
+HOUSEHOLD_ID = str(uuid4())
+USER_ID = str(uuid4())
+
+
+def notification(household_id: str = HOUSEHOLD_ID, **fields) -> str:
+    return json.dumps({
+        "household_id": household_id,
+        "table": "inventory",
+        "op": "UPDATE",
+        "item_ids": [str(uuid4())],
+        **fields
+    })
+
+
+def make_feed(queue_size: int = 10) -> ChangeFeed:
+    cache = HouseholdCache(max_entries=100, ttl=60.0, redis_url="", enabled=True)
+    return ChangeFeed(dsn="postgresql://unused", queue_size=queue_size, cache=cache)
+
+
+class FakeRequest:
+    """Request stand-in for the SSE generator"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+@pytest.fixture
+def mock_jwt_verify():
+    with patch('app.middleware.auth.JWTMiddleware.verify_token') as mock:
+        mock.return_value = {"sub": USER_ID, "email": "test@example.com", "role": "authenticated"}
+        yield mock
+
+
+class TestDispatch:
+    """Tests for handling notifications"""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_invalidates_and_fans_out(self):
+        """Test a change invalidates the household and reaches its subscribers only"""
+        feed = make_feed()
+        other_household = str(uuid4())
+
+        async def loader():
+            return b"cached"
+
+        await feed.cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        with feed.subscribe(HOUSEHOLD_ID) as mine, feed.subscribe(other_household) as theirs:
+            await feed.dispatch(notification())
+
+            message = await mine.get(timeout=0.1)
+            assert message["type"] == "change"
+            assert message["table"] == "inventory"
+            assert await theirs.get(timeout=0.01) is None
+
+        assert feed.cache.stats()["invalidations"] == 1
+        assert feed.notifications == 1
+
+    @pytest.mark.asyncio
+    async def test_malformed_payload_ignored(self):
+        """Test malformed payloads are logged and dropped"""
+        feed = make_feed()
+
+        await feed.dispatch("not json")
+        await feed.dispatch(json.dumps({"table": "items"}))
+
+        assert feed.notifications == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_gets_resync(self):
+        """Test a full queue collapses into a single resync message"""
+        feed = make_feed(queue_size=2)
+
+        with feed.subscribe(HOUSEHOLD_ID) as subscription:
+            for _ in range(5):
+                await feed.dispatch(notification())
+
+            assert await subscription.get(timeout=0.1) == {"type": "resync"}
+            assert await subscription.get(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_on_exit(self):
+        """Test subscriptions are removed when the block exits"""
+        feed = make_feed()
+
+        with feed.subscribe(HOUSEHOLD_ID):
+            assert feed.stats()["subscribers"] == 1
+
+        assert feed.stats() == {
+            "connected": False,
+            "notifications": 0,
+            "households": 0,
+            "subscribers": 0
+        }
+
+    @pytest.mark.asyncio
+    async def test_reconnect_resyncs_everyone(self):
+        """Test missed notifications after a reconnect clear the cache and resync clients"""
+        feed = make_feed()
+
+        async def loader():
+            return b"cached"
+
+        await feed.cache.get_or_load(HOUSEHOLD_ID, "items", loader)
+
+        with feed.subscribe(HOUSEHOLD_ID) as subscription:
+            feed._resync_all()
+
+            assert await subscription.get(timeout=0.1) == {"type": "resync"}
+        assert feed.cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_knows_when_feed_listening(self):
+        """Test the cache only counts on the feed for invalidation while it is connected"""
+        feed = make_feed()
+        listening, drop = asyncio.Event(), asyncio.Event()
+
+        async def listen(conn):
+            listening.set()
+            await drop.wait()
+            raise ConnectionError("server closed the connection")
+
+        with patch.object(feed, '_connect', return_value=Mock()), \
+             patch.object(feed, '_listen', side_effect=listen):
+            await feed.start()
+            await asyncio.wait_for(listening.wait(), 1)
+            assert feed.cache.shared_invalidation is True
+
+            drop.set()
+            await asyncio.sleep(0.01)
+            assert feed.cache.shared_invalidation is False
+            await feed.stop()
+
+    def test_format_sse(self):
+        """Test SSE frames carry the event name and compact JSON"""
+        assert format_sse("change", {"a": 1}) == b'event: change\ndata: {"a":1}\n\n'
+
+
+class TestEventStream:
+    """Tests for the SSE generator behind the stream endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_stream_forwards_changes(self):
+        """Test the stream sends ready, then each change"""
+        from app.routes.api_v1.households import household_event_stream
+
+        feed = make_feed()
+        request = FakeRequest()
+        with patch('app.routes.api_v1.households.get_change_feed', return_value=feed), \
+             patch('app.services.household_service.get_supabase'):
+            stream = household_event_stream(request, HOUSEHOLD_ID, USER_ID)
+
+            assert (await stream.__anext__()).startswith(b"event: ready")
+
+            next_frame = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            await feed.dispatch(notification(op="INSERT"))
+            frame = await next_frame
+
+            assert frame.startswith(b"event: change")
+            assert b'"op":"INSERT"' in frame
+            await stream.aclose()
+
+        assert feed.stats()["subscribers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_keepalive(self):
+        """Test an idle stream sends keepalive comments"""
+        from app.routes.api_v1.households import household_event_stream
+
+        feed = make_feed()
+        with patch('app.routes.api_v1.households.get_change_feed', return_value=feed), \
+             patch('app.services.household_service.get_supabase'), \
+             patch('app.routes.api_v1.households.settings') as mock_settings:
+            mock_settings.CHANGE_FEED_HEARTBEAT = 0.01
+            stream = household_event_stream(FakeRequest(), HOUSEHOLD_ID, USER_ID)
+
+            await stream.__anext__()
+            assert await stream.__anext__() == b": keepalive\n\n"
+            await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_ends_when_member_removed(self):
+        """Test a membership change that removes the user ends the stream"""
+        from app.routes.api_v1.households import household_event_stream
+
+        feed = make_feed()
+        with patch('app.routes.api_v1.households.get_change_feed', return_value=feed), \
+             patch('app.services.household_service.get_supabase') as mock_get:
+            supabase = MagicMock()
+            supabase.rpc.return_value.execute.return_value = Mock(data=None)
+            mock_get.return_value = supabase
+
+            stream = household_event_stream(FakeRequest(), HOUSEHOLD_ID, USER_ID)
+            await stream.__anext__()
+
+            await feed.dispatch(notification(table="household_members", op="DELETE", item_ids=None))
+            frame = await stream.__anext__()
+
+            assert frame.startswith(b"event: revoked")
+            with pytest.raises(StopAsyncIteration):
+                await stream.__anext__()
+
+
+class TestStreamEndpoint:
+    """Tests for GET /api/v1/households/{id}/stream"""
+
+    def test_stream_requires_membership(self, mock_jwt_verify):
+        """Test non-members get 403 before the stream opens"""
+        with patch('app.services.household_service.get_supabase') as mock_get:
+            supabase = MagicMock()
+            supabase.rpc.return_value.execute.return_value = Mock(data=None)
+            mock_get.return_value = supabase
+
+            response = client.get(
+                f"/api/v1/households/{HOUSEHOLD_ID}/stream",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+
+        assert response.status_code == 403
+
+    def test_stream_disabled(self, mock_jwt_verify):
+        """Test 503 when the change feed is disabled"""
+        with patch('app.routes.api_v1.households.settings') as mock_settings:
+            mock_settings.CHANGE_FEED_ENABLED = False
+
+            response = client.get(
+                f"/api/v1/households/{HOUSEHOLD_ID}/stream",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+
+        assert response.status_code == 503
@@ -0,0 +1,324 @@
+"""
+Tests for the batched event writer
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock, patch, MagicMock
+from uuid import uuid4
+
+from postgrest.exceptions import APIError
+
+from app.services.event_writer import EventWriter
+from app.core.errors import ValidationError
+
+
+MOCK_HOUSEHOLD_ID = str(uuid4())
+
+
+def make_events(count: int) -> list:
+    """Build count usage events"""
+    return [
+        EventWriter.build_event(MOCK_HOUSEHOLD_ID, "iot.weight_changed", "iot", {"n": n}, confidence=0.8)
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def mock_supabase():
+    """Mock Supabase client recording inserted batches"""
+    with patch('app.services.event_writer.get_supabase') as mock:
+        mock_client = MagicMock()
+        table = MagicMock()
+        table.insert.return_value.execute.return_value = Mock(data=[])
+        table.upsert.return_value.execute.return_value = Mock(data=[])
+        mock_client.table.return_value = table
+        mock.return_value = mock_client
+        yield table
+
+
+@pytest.fixture
+def writer(tmp_path):
+    """Writer with a long interval so only thresholds trigger flushes"""
+    return EventWriter(batch_size=3, flush_interval=60, spool_dir=str(tmp_path / "spool"))
+
+
+class TestBuildEvent:
+    """Tests for EventWriter.build_event"""
+
+    def test_assigns_id_and_timestamp(self):
+        """Test rows get their identity when written"""
+        event = EventWriter.build_event(MOCK_HOUSEHOLD_ID, "inventory.used", "user")
+
+        assert event["id"]
+        assert event["created_at"]
+        assert event["payload"] == {}
+
+    def test_rejects_unknown_type(self):
+        """Test event types are validated before buffering"""
+        with pytest.raises(ValidationError):
+            EventWriter.build_event(MOCK_HOUSEHOLD_ID, "iot.teleported", "iot")
+
+    def test_rejects_unknown_source(self):
+        """Test sources are validated before buffering"""
+        with pytest.raises(ValueError):
+            EventWriter.build_event(MOCK_HOUSEHOLD_ID, "inventory.used", "robot")
+
+
+class TestEventWriter:
+    """Tests for buffering, flushing and spooling"""
+
+    @pytest.mark.asyncio
+    async def test_buffers_below_threshold(self, writer, mock_supabase):
+        """Test events below the batch size are not written yet"""
+        await writer.write_many(make_events(2))
+        await asyncio.sleep(0)
+
+        mock_supabase.insert.assert_not_called()
+        await writer.stop()
+        assert mock_supabase.insert.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_flushes_one_multi_row_insert(self, writer, mock_supabase):
+        """Test reaching the batch size writes one multi-row insert"""
+        await writer.write_many(make_events(3))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        mock_supabase.insert.assert_called_once()
+        assert len(mock_supabase.insert.call_args.args[0]) == 3
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_time_threshold_flushes(self, tmp_path, mock_supabase):
+        """Test buffered events are flushed after the interval"""
+        writer = EventWriter(batch_size=100, flush_interval=0.01, spool_dir=str(tmp_path))
+        await writer.write_many(make_events(2))
+        await asyncio.sleep(0.1)
+
+        assert mock_supabase.insert.call_count == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_sync_write_flushes_immediately(self, writer, mock_supabase):
+        """Test sync writes return only after the insert, carrying buffered rows"""
+        await writer.write_many(make_events(1))
+        event = make_events(1)[0]
+
+        await writer.write(event, sync=True)
+
+        rows = mock_supabase.insert.call_args.args[0]
+        assert len(rows) == 2
+        assert rows[-1]["id"] == event["id"]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_spools_background_events(self, writer, mock_supabase):
+        """Test background events survive a failed flush and are replayed"""
+        mock_supabase.insert.return_value.execute.side_effect = Exception("connection refused")
+        events = make_events(2)
+
+        await writer.write_many(events)
+        await writer.flush()
+
+        spooled = [json.loads(line) for line in writer.spool_path.read_text().splitlines()]
+        assert [row["id"] for row in spooled] == [e["id"] for e in events]
+
+        # The flush loop replays the spool idempotently
+        await writer._replay_spool()
+        mock_supabase.upsert.assert_called_once()
+        assert mock_supabase.upsert.call_args.kwargs["ignore_duplicates"] is True
+        assert not writer.spool_path.exists()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_write_raises_without_spooling(self, writer, mock_supabase):
+        """Test sync callers get the error and their event is not spooled"""
+        mock_supabase.insert.return_value.execute.side_effect = Exception("connection refused")
+        background = make_events(1)
+        await writer.write_many(background)
+
+        with pytest.raises(Exception, match="Failed to write events"):
+            await writer.write(make_events(1)[0], sync=True)
+
+        spooled = [json.loads(line) for line in writer.spool_path.read_text().splitlines()]
+        assert [row["id"] for row in spooled] == [background[0]["id"]]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_truncated_spool_line_quarantined(self, writer, mock_supabase):
+        """Test a line cut short by a crash is set aside and the rest replayed"""
+        spooled = make_events(2)
+        writer.spool_dir.mkdir(parents=True)
+        (writer.spool_dir / "events-999.jsonl").write_text(
+            "".join(json.dumps(row) + "\n" for row in spooled) + '{"id": "cut-sh'
+        )
+
+        await writer._replay_spool()
+
+        replayed = mock_supabase.upsert.call_args.args[0]
+        assert [row["id"] for row in replayed] == [row["id"] for row in spooled]
+        [bad] = writer.spool_dir.glob("bad-*.jsonl")
+        assert bad.read_text() == '{"id": "cut-sh\n'
+        assert not list(writer.spool_dir.glob("events-*.jsonl"))
+        assert not list(writer.spool_dir.glob("replay-*"))
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_sync_write_does_not_wait_on_replay(self, writer, mock_supabase):
+        """Test a sync write only flushes the buffer; the loop replays the spool"""
+        writer.spool_dir.mkdir(parents=True)
+        (writer.spool_dir / "events-999.jsonl").write_text(json.dumps(make_events(1)[0]) + "\n")
+
+        with patch.object(writer, '_replay_spool') as replay:
+            event = await writer.write(make_events(1)[0], sync=True)
+
+        replay.assert_not_called()
+        assert mock_supabase.insert.call_args.args[0][-1]["id"] == event["id"]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_replay_does_not_overwrite_new_spool(self, writer, mock_supabase):
+        """Test a file put back after a failed replay keeps events spooled meanwhile"""
+        old, new = make_events(1), make_events(1)
+        writer.spool_dir.mkdir(parents=True)
+        original = writer.spool_dir / "events-999.jsonl"
+        original.write_text(json.dumps(old[0]) + "\n")
+
+        def fail_after_new_spool(*args, **kwargs):
+            # Worker 999 spools again while its old file is being replayed
+            original.write_text(json.dumps(new[0]) + "\n")
+            raise Exception("connection refused")
+
+        mock_supabase.upsert.return_value.execute.side_effect = fail_after_new_spool
+        await writer._replay_spool()
+
+        ids = {
+            json.loads(line)["id"]
+            for path in writer.spool_dir.glob("events-*.jsonl")
+            for line in path.read_text().splitlines()
+        }
+        assert ids == {old[0]["id"], new[0]["id"]}
+        assert not list(writer.spool_dir.glob("replay-*"))
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flush_loop_survives_errors(self, tmp_path, mock_supabase):
+        """Test an unexpected flush error doesn't kill the background loop"""
+        writer = EventWriter(batch_size=100, flush_interval=0.01, spool_dir=str(tmp_path))
+        with patch.object(writer, 'flush', side_effect=RuntimeError("boom")) as failing:
+            await writer.write_many(make_events(1))
+            await asyncio.sleep(0.05)
+
+        assert failing.called
+        assert not writer._task.done()
+        await asyncio.sleep(0.05)
+        mock_supabase.insert.assert_called_once()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flush_loop_replays_spool(self, tmp_path, mock_supabase):
+        """Test the background loop picks up spooled events"""
+        writer = EventWriter(batch_size=100, flush_interval=0.01, spool_dir=str(tmp_path))
+        (tmp_path / "events-999.jsonl").write_text(json.dumps(make_events(1)[0]) + "\n")
+
+        await writer.start()
+        await asyncio.sleep(0.05)
+
+        mock_supabase.upsert.assert_called_once()
+        assert not list(tmp_path.glob("events-*.jsonl"))
+        await writer.stop()
+
+
+def reject_rows(bad_ids: set, insert_mock: MagicMock) -> list:
+    """
+    Make inserts fail like a foreign key violation whenever a batch holds a bad row
+
+    Returns:
+        Ids of the rows stored, filled in as inserts succeed
+    """
+    stored = []
+
+    def insert(rows, **kwargs):
+        query = MagicMock()
+        if any(row["id"] in bad_ids for row in rows):
+            query.execute.side_effect = APIError({"code": "23503", "message": "violates foreign key"})
+        else:
+            query.execute.side_effect = lambda: stored.extend(row["id"] for row in rows)
+        return query
+
+    insert_mock.side_effect = insert
+    return stored
+
+
+class TestRejectedRows:
+    """Rows the database rejects are set aside instead of failing their batch forever"""
+
+    @pytest.mark.asyncio
+    async def test_bad_row_quarantined_rest_stored(self, writer, mock_supabase):
+        events = make_events(3)
+        stored = reject_rows({events[1]["id"]}, mock_supabase.insert)
+
+        await writer.write_many(events)
+
+        assert await writer.flush() == 2
+        assert stored == [events[0]["id"], events[2]["id"]]
+        [bad] = writer.spool_dir.glob("bad-*.jsonl")
+        assert json.loads(bad.read_text())["id"] == events[1]["id"]
+        assert not writer.spool_path.exists()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_sync_writer_told_its_row_was_rejected(self, writer, mock_supabase):
+        background, own = make_events(1), make_events(1)[0]
+        stored = reject_rows({own["id"]}, mock_supabase.insert)
+        await writer.write_many(background)
+
+        with pytest.raises(Exception, match="rejected"):
+            await writer.write(own, sync=True)
+
+        # The caller has the error; their row isn't quarantined or spooled
+        assert stored == [background[0]["id"]]
+        assert not writer.spool_dir.exists()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_replay_quarantines_bad_row(self, writer, mock_supabase):
+        events = make_events(3)
+        stored = reject_rows({events[0]["id"]}, mock_supabase.upsert)
+        writer.spool_dir.mkdir(parents=True)
+        (writer.spool_dir / "events-999.jsonl").write_text(
+            "".join(json.dumps(row) + "\n" for row in events)
+        )
+
+        assert await writer._replay_spool() == 2
+        assert stored == [events[1]["id"], events[2]["id"]]
+        assert not list(writer.spool_dir.glob("events-*.jsonl"))
+        [bad] = writer.spool_dir.glob("bad-*.jsonl")
+        assert json.loads(bad.read_text())["id"] == events[0]["id"]
+
+        # Nothing left to fail on the next cycle
+        mock_supabase.upsert.reset_mock()
+        assert await writer._replay_spool() == 0
+        mock_supabase.upsert.assert_not_called()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_failing_file_does_not_block_later_files(self, writer, mock_supabase):
+        first, second = make_events(1), make_events(1)
+        writer.spool_dir.mkdir(parents=True)
+        (writer.spool_dir / "events-1.jsonl").write_text(json.dumps(first[0]) + "\n")
+        (writer.spool_dir / "events-2.jsonl").write_text(json.dumps(second[0]) + "\n")
+
+        def upsert(rows, **kwargs):
+            query = MagicMock()
+            if rows[0]["id"] == first[0]["id"]:
+                query.execute.side_effect = Exception("statement timeout")
+            return query
+
+        mock_supabase.upsert.side_effect = upsert
+        assert await writer._replay_spool() == 1
+
+        [left] = writer.spool_dir.glob("events-*.jsonl")
+        assert json.loads(left.read_text())["id"] == first[0]["id"]
+        await writer.stop()
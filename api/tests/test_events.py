@@ -0,0 +1,254 @@
+"""
+Tests for the event log read API
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch, MagicMock
+from uuid import uuid4
+
+from main import app
+from app.services.event_service import (
+    EventService,
+    EVENT_COLUMNS,
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor
+)
+from app.core.errors import ValidationError
+
+client = TestClient(app)
+
+
+MOCK_USER_ID = str(uuid4())
+MOCK_HOUSEHOLD_ID = str(uuid4())
+
+MOCK_JWT_PAYLOAD = {
+    "sub": MOCK_USER_ID,
+    "email": "test@example.com",
+    "role": "authenticated"
+}
+
+
+def make_event(minute: int) -> dict:
+    """Create a mock event row"""
+    return {
+        "id": str(uuid4()),
+        "event_type": "inventory.used",
+        "source": "user",
+        "item_id": None,
+        "receipt_id": None,
+        "payload": {},
+        "confidence": 1.0,
+        "created_at": f"2024-01-22T14:{minute:02d}:00+00:00"
+    }
+
+
+def make_query(data):
+    """Create a chainable PostgREST query mock returning data"""
+    query = MagicMock()
+    for method in ("select", "eq", "gte", "lte", "lt", "or_", "order", "limit"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = Mock(data=data)
+    return query
+
+
+@pytest.fixture
+def mock_jwt_verify():
+    """Mock JWT verification"""
+    with patch('app.middleware.auth.JWTMiddleware.verify_token') as mock:
+        mock.return_value = MOCK_JWT_PAYLOAD
+        yield mock
+
+
+@pytest.fixture
+def events_query():
+    """Events query mock (configure .execute per test)"""
+    return make_query([])
+
+
+@pytest.fixture
+def mock_supabase(events_query):
+    """Mock Supabase client with a member and an events table"""
+    with patch('app.services.event_service.get_supabase') as mock:
+        mock_client = MagicMock()
+        tables = {
+            'household_members': make_query([{"id": str(uuid4())}]),
+            'events': events_query
+        }
+        mock_client.table.side_effect = lambda name: tables[name]
+        mock.return_value = mock_client
+        yield mock_client
+
+
+class TestCursor:
+    """Tests for keyset cursor encoding"""
+
+    def test_round_trip(self):
+        """Test cursor decodes to the encoded position"""
+        event_id = str(uuid4())
+        cursor = encode_cursor("2024-01-22T14:30:00.123456+00:00", event_id)
+
+        assert decode_cursor(cursor) == ("2024-01-22T14:30:00.123456+00:00", event_id)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(ValidationError):
+            decode_cursor("not-a-cursor")
+
+    @pytest.mark.parametrize("event_id", ["not-a-uuid", f"{uuid4()}),id.gt.0", ""])
+    def test_invalid_event_id(self, event_id):
+        """Test the id half is validated too, since it goes into the filter"""
+        cursor = encode_cursor("2024-01-22T14:30:00+00:00", event_id)
+
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor)
+
+
+class TestEventService:
+    """Tests for EventService.list_events"""
+
+    @pytest.mark.asyncio
+    async def test_first_page(self, mock_supabase, events_query):
+        """Test first page selects explicit columns and returns a cursor"""
+        rows = [make_event(59 - i) for i in range(3)]
+        events_query.execute.return_value = Mock(data=rows)
+
+        page = await EventService().list_events(MOCK_HOUSEHOLD_ID, MOCK_USER_ID, limit=2)
+
+        events_query.select.assert_called_once_with(EVENT_COLUMNS)
+        events_query.limit.assert_called_once_with(3)
+        events_query.or_.assert_not_called()
+        assert len(page["events"]) == 2
+        assert page["has_more"] is True
+        assert decode_cursor(page["next_cursor"]) == (rows[1]["created_at"], rows[1]["id"])
+
+    @pytest.mark.asyncio
+    async def test_next_page_uses_keyset(self, mock_supabase, events_query):
+        """Test cursor is applied as a keyset predicate, not an offset"""
+        event_id = str(uuid4())
+        cursor = encode_cursor("2024-01-22T14:30:00+00:00", event_id)
+        events_query.execute.return_value = Mock(data=[make_event(10)])
+
+        page = await EventService().list_events(MOCK_HOUSEHOLD_ID, MOCK_USER_ID, cursor=cursor)
+
+        predicate = events_query.or_.call_args.args[0]
+        assert 'created_at.lt."2024-01-22T14:30:00+00:00"' in predicate
+        assert f'id.lt."{event_id}"' in predicate
+        # Plain bound alongside the OR lets the planner prune partitions
+        events_query.lte.assert_called_once_with('created_at', "2024-01-22T14:30:00+00:00")
+        assert page["has_more"] is False
+        assert page["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_page_size_is_capped(self, mock_supabase, events_query):
+        """Test limit is capped at MAX_PAGE_SIZE"""
+        await EventService().list_events(MOCK_HOUSEHOLD_ID, MOCK_USER_ID, limit=10_000)
+
+        events_query.limit.assert_called_once_with(MAX_PAGE_SIZE + 1)
+
+    @pytest.mark.asyncio
+    async def test_filters(self, mock_supabase, events_query):
+        """Test type and item filters are applied"""
+        item_id = str(uuid4())
+
+        await EventService().list_events(
+            MOCK_HOUSEHOLD_ID, MOCK_USER_ID, event_type="inventory.used", item_id=item_id
+        )
+
+        events_query.eq.assert_any_call('event_type', 'inventory.used')
+        events_query.eq.assert_any_call('item_id', item_id)
+
+    @pytest.mark.asyncio
+    async def test_unknown_event_type(self, mock_supabase):
+        """Test unknown event types are rejected"""
+        with pytest.raises(ValidationError):
+            await EventService().list_events(
+                MOCK_HOUSEHOLD_ID, MOCK_USER_ID, event_type="inventory.teleported"
+            )
+
+
+class TestEventExport:
+    """Tests for the streaming NDJSON export"""
+
+    @pytest.mark.asyncio
+    async def test_export_walks_batches(self, mock_supabase, events_query):
+        """Test export pages through full batches until a short one"""
+        first = [make_event(i) for i in range(2)]
+        second = [make_event(10)]
+        events_query.execute.side_effect = [Mock(data=first), Mock(data=second)]
+
+        lines = [
+            line async for line in
+            EventService().iter_export(MOCK_HOUSEHOLD_ID, batch_size=2)
+        ]
+
+        assert len(lines) == 3
+        assert all(line.endswith("\n") for line in lines)
+        assert events_query.execute.call_count == 2
+        # Second batch resumes after the last row of the first (ascending)
+        predicate = events_query.or_.call_args.args[0]
+        assert f'created_at.gt."{first[-1]["created_at"]}"' in predicate
+        events_query.order.assert_any_call('created_at')
+        events_query.gte.assert_called_once_with('created_at', first[-1]["created_at"])
+
+    @pytest.mark.asyncio
+    async def test_export_lines_carry_resume_cursor(self, mock_supabase, events_query):
+        """Test each line's cursor resumes right after that event"""
+        row = make_event(5)
+        events_query.execute.return_value = Mock(data=[row])
+
+        lines = [line async for line in EventService().iter_export(MOCK_HOUSEHOLD_ID)]
+        record = json.loads(lines[0])
+
+        assert record["id"] == row["id"]
+        assert decode_cursor(record["cursor"]) == (row["created_at"], row["id"])
+
+    def test_export_endpoint(self, mock_jwt_verify, mock_supabase, events_query):
+        """Test export endpoint streams NDJSON"""
+        events_query.execute.return_value = Mock(data=[make_event(1), make_event(2)])
+
+        response = client.get(
+            f"/api/v1/events/export?household_id={MOCK_HOUSEHOLD_ID}",
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert len(response.text.splitlines()) == 2
+
+    def test_export_invalid_since(self, mock_jwt_verify, mock_supabase):
+        """Test invalid resume cursors fail before streaming starts"""
+        response = client.get(
+            f"/api/v1/events/export?household_id={MOCK_HOUSEHOLD_ID}&since=garbage",
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 422
+
+
+class TestEventEndpoints:
+    """Tests for GET /api/v1/events"""
+
+    def test_list_events(self, mock_jwt_verify, mock_supabase, events_query):
+        """Test listing events"""
+        events_query.execute.return_value = Mock(data=[make_event(1)])
+
+        response = client.get(
+            f"/api/v1/events?household_id={MOCK_HOUSEHOLD_ID}",
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["events"]) == 1
+        assert data["has_more"] is False
+
+    def test_limit_above_cap_rejected(self, mock_jwt_verify, mock_supabase):
+        """Test limits above the hard cap are rejected"""
+        response = client.get(
+            f"/api/v1/events?household_id={MOCK_HOUSEHOLD_ID}&limit={MAX_PAGE_SIZE + 1}",
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 422
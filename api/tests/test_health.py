@@ -0,0 +1,148 @@
+"""
+Tests for the liveness and readiness probes
+"""
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.health import HealthChecker
+
+client = TestClient(app)
+
+
+def checker_with(**checks) -> HealthChecker:
+    """A checker whose dependency checks are the given coroutine functions"""
+    checker = HealthChecker(ttl=5.0, timeout=0.2)
+    checker.checks = checks
+    return checker
+
+
+async def ok():
+    return "ok"
+
+
+async def down():
+    raise ConnectionError("connection refused")
+
+
+async def hangs():
+    await asyncio.sleep(10)
+
+
+class TestHealthChecker:
+    """Concurrent checks with a cached result"""
+
+    @pytest.mark.asyncio
+    async def test_reports_status_and_latency(self):
+        result = await checker_with(supabase=ok, broker=down, storage=hangs).check()
+
+        assert result["ready"] is False
+        assert result["cached"] is False
+        checks = result["checks"]
+        assert checks["supabase"]["status"] == "ok"
+        assert checks["broker"]["status"] == "error"
+        assert checks["broker"]["error"] == "connection refused"
+        assert checks["storage"]["status"] == "timeout"
+        assert all(check["latency_ms"] >= 0 for check in checks.values())
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        async def slow():
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await checker_with(a=slow, b=slow, c=slow).check()
+
+        assert result["ready"] is True
+        assert loop.time() - start < 0.25
+
+    @pytest.mark.asyncio
+    async def test_result_cached(self):
+        calls = []
+
+        async def counted():
+            calls.append(1)
+            return "ok"
+
+        checker = checker_with(supabase=counted)
+        first = await checker.check()
+        second = await checker.check()
+
+        assert len(calls) == 1
+        assert second["cached"] is True
+        assert second["checked_at"] == first["checked_at"]
+
+        checker._expires = 0.0
+        await checker.check()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_check(self):
+        calls = []
+
+        async def counted():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        checker = checker_with(supabase=counted)
+        results = await asyncio.gather(*(checker.check() for _ in range(20)))
+
+        assert len(calls) == 1
+        assert all(result["ready"] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_broker_skipped_without_url(self):
+        with patch.object(settings, 'CELERY_BROKER_URL', ''):
+            assert await HealthChecker()._check_broker() == "skipped"
+
+    @pytest.mark.asyncio
+    async def test_supabase_check_queries_database(self):
+        supabase = Mock()
+        with patch('app.services.supabase_client.get_supabase', return_value=supabase):
+            assert await HealthChecker()._check_supabase() == "ok"
+
+        supabase.table.assert_called_once_with('households')
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_storage_check(self):
+        assert await HealthChecker()._check_rate_limit_storage() == "ok"
+
+
+class TestProbeEndpoints:
+    """GET /health/live and /health/ready"""
+
+    def test_live(self):
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_ready(self):
+        with patch('app.routes.health.get_health_checker', return_value=checker_with(
+            supabase=ok, broker=ok
+        )):
+            response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert set(data["checks"]) == {"supabase", "broker"}
+        assert "latency_ms" in data["checks"]["supabase"]
+
+    def test_not_ready(self):
+        with patch('app.routes.health.get_health_checker', return_value=checker_with(
+            supabase=down, broker=ok
+        )):
+            response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        data = response.json()
+        assert data["status"] == "not_ready"
+        assert data["checks"]["supabase"]["status"] == "error"
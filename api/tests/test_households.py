@@ -361,3 +361,127 @@ class TestHouseholdRequirements:
         # Both should succeed
         assert response1.status_code == 201
         assert response2.status_code == 201
+
+
+class TestGetHousehold:
+    """Tests for GET /api/v1/households/{household_id}"""
+    
+    def test_get_household_single_rpc(self, mock_jwt_verify):
+        """Test household detail comes from one RPC call"""
+        with patch('app.services.household_service.get_supabase') as mock:
+            mock_client = MagicMock()
+            mock_client.rpc.return_value.execute.return_value = Mock(data={
+                **MOCK_HOUSEHOLD_DATA,
+                "members": [MOCK_MEMBER_DATA],
+                "member_count": 1,
+                "admin_count": 1
+            })
+            mock.return_value = mock_client
+            
+            response = client.get(
+                f"/api/v1/households/{MOCK_HOUSEHOLD_ID}",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["member_count"] == 1
+        assert len(data["members"]) == 1
+        assert mock_client.rpc.call_count == 1
+        mock_client.table.assert_not_called()
+    
+    def test_get_household_summary(self, mock_jwt_verify):
+        """Test summary mode is passed through to the RPC"""
+        with patch('app.services.household_service.get_supabase') as mock:
+            mock_client = MagicMock()
+            mock_client.rpc.return_value.execute.return_value = Mock(data={
+                **MOCK_HOUSEHOLD_DATA,
+                "member_count": 250,
+                "admin_count": 2
+            })
+            mock.return_value = mock_client
+            
+            response = client.get(
+                f"/api/v1/households/{MOCK_HOUSEHOLD_ID}?summary=true",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+        
+        assert response.status_code == 200
+        assert "members" not in response.json()
+        assert mock_client.rpc.call_args[0][1]["p_summary"] is True
+    
+    def test_get_household_not_member(self, mock_jwt_verify):
+        """Test non-members get 403"""
+        with patch('app.services.household_service.get_supabase') as mock:
+            mock_client = MagicMock()
+            mock_client.rpc.return_value.execute.return_value = Mock(data=None)
+            mock.return_value = mock_client
+            
+            response = client.get(
+                f"/api/v1/households/{MOCK_HOUSEHOLD_ID}",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+        
+        assert response.status_code == 403
+
+
+class TestGetHouseholds:
+    """Tests for GET /api/v1/households"""
+    
+    def _mock_rpc(self, rows):
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.return_value = Mock(data=rows)
+        return mock_client
+    
+    def test_get_households_with_role(self, mock_jwt_verify):
+        """Test households are listed with role and no stats by default"""
+        with patch('app.services.household_service.get_supabase') as mock:
+            mock_client = self._mock_rpc([
+                {**MOCK_HOUSEHOLD_DATA, "role": "admin", "stats": None}
+            ])
+            mock.return_value = mock_client
+            
+            response = client.get(
+                "/api/v1/households",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["households"][0]["role"] == "admin"
+        assert "stats" not in data["households"][0]
+        assert mock_client.rpc.call_args[0][1]["p_include_stats"] is False
+    
+    def test_get_households_include_stats(self, mock_jwt_verify):
+        """Test include=stats returns per-household counts from one RPC"""
+        stats = {
+            "item_count": 3,
+            "states": {"plenty": 0, "ok": 0, "low": 2, "almost_out": 0, "out": 1},
+            "restock": {"need_now": 1, "need_soon": 0, "nice_to_top_up": 0}
+        }
+        with patch('app.services.household_service.get_supabase') as mock:
+            mock_client = self._mock_rpc([
+                {**MOCK_HOUSEHOLD_DATA, "role": "member", "stats": stats}
+            ])
+            mock.return_value = mock_client
+            
+            response = client.get(
+                "/api/v1/households?include=stats",
+                headers={"Authorization": "Bearer valid_token"}
+            )
+        
+        assert response.status_code == 200
+        assert response.json()["households"][0]["stats"] == stats
+        assert mock_client.rpc.call_count == 1
+        assert mock_client.rpc.call_args[0][1]["p_include_stats"] is True
+        mock_client.table.assert_not_called()
+    
+    def test_get_households_invalid_include(self, mock_jwt_verify):
+        """Test unknown include values are rejected"""
+        response = client.get(
+            "/api/v1/households?include=items",
+            headers={"Authorization": "Bearer valid_token"}
+        )
+        
+        assert response.status_code == 422
@@ -0,0 +1,298 @@
+"""
+Tests for IoT reading ingestion
+"""
+import gzip
+import json
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from uuid import uuid4
+
+from main import app
+from app.routes.api_v1.iot import get_device_identifier
+from app.services.iot_service import (
+    IoTService,
+    decompress_body,
+    parse_batch,
+    read_body,
+    hash_device_key
+)
+from app.core.errors import AuthenticationError, ValidationError, SNAKrException
+
+client = TestClient(app)
+
+
+MOCK_DEVICE_ID = str(uuid4())
+MOCK_DEVICE_KEY = "dev_test_key_123"
+MOCK_HOUSEHOLD_ID = str(uuid4())
+MOCK_ITEM_ID = str(uuid4())
+MOCK_DEVICE = {"id": MOCK_DEVICE_ID, "household_id": MOCK_HOUSEHOLD_ID, "location": "fridge"}
+
+START = datetime(2024, 1, 22, 14, 30, tzinfo=timezone.utc)
+
+
+def reading(kind: str, seconds: float, **fields) -> dict:
+    """Build a validated-style reading"""
+    return {"type": kind, "at": START + timedelta(seconds=seconds), **fields}
+
+
+def make_query(data):
+    """Create a chainable PostgREST query mock returning data"""
+    query = MagicMock()
+    for method in ("select", "eq", "is_", "in_"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = Mock(data=data)
+    return query
+
+
+@pytest.fixture(autouse=True)
+def clear_device_state():
+    """Start every test with empty per-worker caches"""
+    for cache in (IoTService._device_cache, IoTService._last_door, IoTService._household_items):
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def writer():
+    """Event writer mock"""
+    mock = MagicMock()
+    mock.write_many = AsyncMock(return_value=0)
+    return mock
+
+
+@pytest.fixture
+def mock_supabase():
+    """Mock Supabase client with one registered device and item"""
+    with patch('app.services.iot_service.get_supabase') as mock:
+        mock_client = MagicMock()
+        tables = {
+            'iot_devices': make_query([{**MOCK_DEVICE, "key_hash": hash_device_key(MOCK_DEVICE_KEY)}]),
+            'items': make_query([{"id": MOCK_ITEM_ID}])
+        }
+        mock_client.table.side_effect = lambda name: tables[name]
+        mock.return_value = mock_client
+        yield mock_client
+
+
+class TestBatchParsing:
+    """Tests for decompression and schema validation"""
+
+    def test_gzip_batch(self):
+        """Test gzip bodies are decompressed and validated"""
+        body = json.dumps({"readings": [
+            {"type": "door_opened", "at": "2024-01-22T14:30:00Z", "duration_seconds": 3}
+        ]}).encode()
+
+        readings = parse_batch(decompress_body(gzip.compress(body), "gzip"))
+
+        assert readings[0]["type"] == "door_opened"
+        assert readings[0]["at"] == START
+
+    def test_decompression_bomb_rejected(self):
+        """Test the size limit applies after decompression"""
+        bomb = gzip.compress(b" " * (2 * 1024 * 1024))
+
+        with pytest.raises(SNAKrException) as exc:
+            decompress_body(bomb, "gzip")
+        assert exc.value.status_code == 413
+
+    def test_unsupported_encoding(self):
+        """Test unknown encodings are rejected"""
+        with pytest.raises(ValidationError):
+            decompress_body(b"{}", "br")
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_stops_at_limit(self):
+        """Test an oversized upload is refused without reading the rest of it"""
+        consumed = []
+
+        async def stream():
+            for _ in range(10):
+                consumed.append(1)
+                yield b" " * 400_000
+
+        with pytest.raises(SNAKrException) as exc:
+            await read_body(stream(), None)
+        assert exc.value.status_code == 413
+        assert len(consumed) == 3
+
+    @pytest.mark.asyncio
+    async def test_streamed_gzip_bomb_rejected(self):
+        """Test the decompressed limit applies while streaming"""
+        bomb = gzip.compress(b" " * (4 * 1024 * 1024))
+
+        async def stream():
+            for i in range(0, len(bomb), 1024):
+                yield bomb[i:i + 1024]
+
+        with pytest.raises(SNAKrException) as exc:
+            await read_body(stream(), "gzip")
+        assert exc.value.status_code == 413
+
+    def test_invalid_reading(self):
+        """Test readings are checked against the schema"""
+        with pytest.raises(ValidationError):
+            parse_batch(b'{"readings": [{"type": "teleported", "at": "2024-01-22T14:30:00Z"}]}')
+
+
+class TestDeviceAuth:
+    """Tests for per-device key authentication"""
+
+    @pytest.mark.asyncio
+    async def test_valid_key_is_cached(self, mock_supabase, writer):
+        """Test a valid key authenticates and later batches skip the database"""
+        service = IoTService(writer=writer)
+
+        device = await service.authenticate_device(MOCK_DEVICE_ID, MOCK_DEVICE_KEY)
+        await service.authenticate_device(MOCK_DEVICE_ID, MOCK_DEVICE_KEY)
+
+        assert device["household_id"] == MOCK_HOUSEHOLD_ID
+        assert "key_hash" not in device
+        assert mock_supabase.table.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_wrong_key_rejected(self, mock_supabase, writer):
+        """Test a wrong key is rejected"""
+        with pytest.raises(AuthenticationError):
+            await IoTService(writer=writer).authenticate_device(MOCK_DEVICE_ID, "wrong")
+
+
+class TestCoalescing:
+    """Tests for debouncing and coalescing noisy readings"""
+
+    def test_weight_samples_coalesce(self, mock_supabase, writer):
+        """Test weight samples within the window become one event"""
+        readings = [
+            reading("weight_changed", s, item_id=MOCK_ITEM_ID, weight_delta_grams=-40.0)
+            for s in (0, 2, 4)
+        ]
+
+        events = IoTService(writer=writer).coalesce(MOCK_DEVICE, readings)
+
+        assert len(events) == 1
+        assert events[0]["payload"]["weight_delta_grams"] == -120.0
+        assert events[0]["payload"]["samples"] == 3
+        assert events[0]["item_id"] == MOCK_ITEM_ID
+
+    def test_weight_noise_dropped(self, mock_supabase, writer):
+        """Test jitter that nets out to nothing produces no event"""
+        readings = [
+            reading("weight_changed", 0, weight_delta_grams=2.0),
+            reading("weight_changed", 1, weight_delta_grams=-1.5)
+        ]
+
+        assert IoTService(writer=writer).coalesce(MOCK_DEVICE, readings) == []
+
+    def test_door_debounced_across_batches(self, mock_supabase, writer):
+        """Test rapid door openings merge, including across batches"""
+        service = IoTService(writer=writer)
+
+        first = service.coalesce(MOCK_DEVICE, [
+            reading("door_opened", 0, duration_seconds=2),
+            reading("door_opened", 3, duration_seconds=4)
+        ])
+        second = service.coalesce(MOCK_DEVICE, [reading("door_opened", 6)])
+        third = service.coalesce(MOCK_DEVICE, [reading("door_opened", 60)])
+
+        assert len(first) == 1
+        assert first[0]["payload"]["openings"] == 2
+        assert first[0]["payload"]["duration_seconds"] == 6
+        assert second == []
+        assert len(third) == 1
+
+    def test_mixed_timezones_in_batch(self, mock_supabase, writer):
+        """Test naive timestamps are taken as UTC and sort with aware ones"""
+        readings = parse_batch(json.dumps({"readings": [
+            {"type": "weight_changed", "at": "2024-01-22T14:30:04", "weight_delta_grams": -40},
+            {"type": "weight_changed", "at": "2024-01-22T14:30:00Z", "weight_delta_grams": -40},
+            {"type": "door_opened", "at": "2024-01-22T14:30:02"}
+        ]}).encode())
+
+        events = IoTService(writer=writer).coalesce(MOCK_DEVICE, readings)
+
+        weight = next(e for e in events if e["event_type"] == "iot.weight_changed")
+        assert weight["payload"]["weight_delta_grams"] == -80.0
+        assert weight["payload"]["window_start"] == START.isoformat()
+        assert len(events) == 2
+
+    @pytest.mark.asyncio
+    async def test_foreign_item_ids_dropped(self, mock_supabase, writer):
+        """Test item ids outside the device's household are not written"""
+        readings = [reading("snapshot_available", 0, item_id=str(uuid4()))]
+        mock_supabase.table.side_effect = lambda name: make_query([])
+
+        await IoTService(writer=writer).ingest(MOCK_DEVICE, readings)
+
+        events = writer.write_many.call_args.args[0]
+        assert events[0]["item_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_known_item_ids_expire(self, mock_supabase, writer):
+        """Test a deleted item stops passing the check once the cache expires"""
+        service = IoTService(writer=writer)
+        await service.ingest(MOCK_DEVICE, [reading("snapshot_available", 0, item_id=MOCK_ITEM_ID)])
+
+        mock_supabase.table.side_effect = lambda name: make_query([])
+        with patch('app.services.iot_service.time.monotonic', return_value=time.monotonic() + 3600):
+            await service.ingest(MOCK_DEVICE, [reading("snapshot_available", 1, item_id=MOCK_ITEM_ID)])
+
+        events = writer.write_many.call_args.args[0]
+        assert events[0]["item_id"] is None
+
+
+class TestIoTEndpoint:
+    """Tests for POST /api/v1/iot/events"""
+
+    def test_ingest_batch(self, mock_supabase):
+        """Test a compressed batch is accepted and queued"""
+        body = gzip.compress(json.dumps({"readings": [
+            {"type": "weight_changed", "at": "2024-01-22T14:30:00Z", "weight_delta_grams": -100},
+            {"type": "weight_changed", "at": "2024-01-22T14:30:01Z", "weight_delta_grams": -50}
+        ]}).encode())
+
+        with patch('app.services.iot_service.get_event_writer') as get_writer:
+            get_writer.return_value.write_many = AsyncMock(return_value=1)
+            response = client.post(
+                "/api/v1/iot/events",
+                content=body,
+                headers={
+                    "X-Device-Id": MOCK_DEVICE_ID,
+                    "X-Device-Key": MOCK_DEVICE_KEY,
+                    "Content-Encoding": "gzip",
+                    "Content-Type": "application/json"
+                }
+            )
+
+        assert response.status_code == 202
+        assert response.json() == {"received": 2, "accepted": 1, "coalesced": 1}
+
+    def test_rate_limit_key_includes_client_ip(self):
+        """Test a spoofed X-Device-Id from another IP gets its own bucket"""
+        def key(ip: str) -> str:
+            request = Mock()
+            request.headers = {"x-device-id": MOCK_DEVICE_ID}
+            request.client.host = ip
+            return get_device_identifier(request)
+
+        assert key("10.0.0.5") == key("10.0.0.5")
+        assert key("10.0.0.5") != key("203.0.113.9")
+        assert MOCK_DEVICE_ID in key("10.0.0.5")
+
+    def test_oversized_body_rejected(self, mock_supabase):
+        """Test the raw body limit applies before decompression"""
+        response = client.post(
+            "/api/v1/iot/events",
+            content=b" " * (2 * 1024 * 1024),
+            headers={"X-Device-Id": MOCK_DEVICE_ID, "X-Device-Key": MOCK_DEVICE_KEY}
+        )
+
+        assert response.status_code == 413
+
+    def test_missing_device_key(self):
+        """Test device credentials are required"""
+        response = client.post("/api/v1/iot/events", json={"readings": []})
+
+        assert response.status_code == 422
@@ -0,0 +1,157 @@
+"""
+Tests for the direct Postgres item repository
+"""
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.models import Location, State
+from app.core.errors import AuthorizationError
+from app.services.item_repository import ItemRepository, ITEM_LIST_SQL
+from app.services.postgres import SET_REQUEST_CONTEXT
+
+HOUSEHOLD_ID = str(uuid4())
+USER_ID = str(uuid4())
+
+
+class FakeConnection:
+    """Records statements run on an asyncpg connection"""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def _transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    def transaction(self):
+        return self._transaction()
+
+    async def execute(self, sql, *args):
+        assert self.in_transaction
+        self.calls.append((sql, args))
+
+    async def fetchval(self, sql, *args):
+        assert self.in_transaction
+        self.calls.append((sql, args))
+        return self.result
+
+
+class FakePool:
+    """asyncpg pool handing out one connection"""
+
+    def __init__(self, conn: FakeConnection):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def _acquire(self):
+        yield self.conn
+
+    def acquire(self):
+        return self._acquire()
+
+
+def fake_pool(result=None):
+    """Patch the shared pool with a fake one"""
+    conn = FakeConnection(result)
+
+    async def get_pool():
+        return FakePool(conn)
+
+    return conn, patch('app.services.postgres.get_pool', get_pool)
+
+
+class TestItemRepository:
+    """Tests for ItemRepository queries"""
+
+    @pytest.mark.asyncio
+    async def test_queries_run_as_user(self):
+        """Test every query first sets the authenticated role and JWT claims"""
+        conn, pool = fake_pool(result=True)
+        with pool:
+            assert await ItemRepository().is_member(HOUSEHOLD_ID, USER_ID) is True
+
+        sql, args = conn.calls[0]
+        assert sql == SET_REQUEST_CONTEXT
+        assert json.loads(args[0]) == {"sub": USER_ID, "role": "authenticated"}
+        assert conn.calls[1][1] == (HOUSEHOLD_ID, USER_ID)
+
+    @pytest.mark.asyncio
+    async def test_list_items_returns_json_bytes(self):
+        """Test the page built by Postgres is returned as compact JSON"""
+        conn, pool = fake_pool(result='{"items" : [], "total" : 0}')
+        with pool:
+            payload = await ItemRepository().list_household_items(
+                HOUSEHOLD_ID, USER_ID, Location.FRIDGE, State.LOW, None, 'name', 50, 100
+            )
+
+        assert payload == b'{"items":[],"total":0}'
+        sql, args = conn.calls[1]
+        assert sql is ITEM_LIST_SQL['name']
+        assert args == (HOUSEHOLD_ID, "fridge", "low", None, 50, 100)
+
+    @pytest.mark.asyncio
+    async def test_unknown_sort_uses_default_order(self):
+        """Test sort_by never reaches the SQL text"""
+        conn, pool = fake_pool(result='{"items":[],"total":0}')
+        with pool:
+            await ItemRepository().list_household_items(
+                HOUSEHOLD_ID, USER_ID, None, None, None, 'name; DROP TABLE items', 100, 0
+            )
+
+        assert conn.calls[1][0] is ITEM_LIST_SQL[None]
+        assert "DROP" not in conn.calls[1][0]
+
+    def test_sort_orders(self):
+        """Test each sort order has its own statement"""
+        assert "ORDER BY inv.updated_at DESC, i.id" in ITEM_LIST_SQL['last_updated']
+        assert "ORDER BY inv.state, i.id" in ITEM_LIST_SQL['state']
+
+
+class TestItemServiceDirectPath:
+    """Tests for ItemService selecting the direct path"""
+
+    @pytest.mark.asyncio
+    async def test_direct_path_skips_postgrest(self):
+        """Test membership and the items list go through the repository"""
+        from app.services.item_service import ItemService
+
+        conn, pool = fake_pool(result=True)
+        with pool, patch('app.services.item_service.get_supabase') as mock_get, \
+             patch('app.services.item_service.uses_direct_db', return_value=True):
+            service = ItemService()
+            conn.result = True
+            await service._verify_household_member(HOUSEHOLD_ID, USER_ID)
+
+            conn.result = '{"items":[],"total":0}'
+            result = await service.get_household_items(HOUSEHOLD_ID, USER_ID, as_json=True)
+
+        assert result == b'{"items":[],"total":0}'
+        mock_get.return_value.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_direct_path_non_member(self):
+        """Test a non-member is rejected on the direct path"""
+        from app.services.item_service import ItemService
+
+        conn, pool = fake_pool(result=False)
+        with pool, patch('app.services.item_service.get_supabase'), \
+             patch('app.services.item_service.uses_direct_db', return_value=True):
+            with pytest.raises(AuthorizationError):
+                await ItemService().get_household_items(HOUSEHOLD_ID, USER_ID)
+
+    def test_postgrest_by_default(self):
+        """Test services stay on PostgREST unless configured"""
+        from app.services.item_service import ItemService
+
+        with patch('app.services.item_service.get_supabase'):
+            assert ItemService().repository is None
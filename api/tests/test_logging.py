@@ -0,0 +1,92 @@
+"""
+Tests for structured logging
+"""
+import json
+import logging
+import queue
+
+from app.core.logging import ContextQueueHandler, JSONFormatter, SamplingFilter
+from app.middleware.request_id import request_id_var
+
+
+def make_record(msg="Retrieved %d items", args=(3,), level=logging.INFO, exc_info=None):
+    """Build a log record"""
+    return logging.LogRecord("app.test", level, __file__, 10, msg, args, exc_info)
+
+
+class TestJSONFormatter:
+    """Tests for JSONFormatter"""
+
+    def test_formats_json_fields(self):
+        """Test the record is rendered with message, timestamp and static fields"""
+        record = make_record()
+        record.created = 1700000000.25
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["message"] == "Retrieved 3 items"
+        assert data["timestamp"] == "2023-11-14T22:13:20.250000"
+        assert data["level"] == "INFO"
+        assert data["service"] == "snakr-api"
+        assert "request_id" not in data
+
+    def test_extra_and_exception(self):
+        """Test extra fields and tracebacks are included"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+            record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+        record.extra = {"household_id": "h1"}
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["household_id"] == "h1"
+        assert "ValueError: boom" in data["exception"]
+
+
+class TestContextQueueHandler:
+    """Tests for ContextQueueHandler"""
+
+    def test_request_id_captured_at_log_time(self):
+        """Test the request ID is attached before the record leaves the request context"""
+        log_queue = queue.SimpleQueue()
+        handler = ContextQueueHandler(log_queue)
+
+        token = request_id_var.set("req-123")
+        try:
+            handler.handle(make_record())
+        finally:
+            request_id_var.reset(token)
+
+        # Formatted later, outside the request context
+        data = json.loads(JSONFormatter().format(log_queue.get_nowait()))
+        assert data["request_id"] == "req-123"
+        assert data["message"] == "Retrieved 3 items"
+
+
+class TestSamplingFilter:
+    """Tests for SamplingFilter"""
+
+    def test_keeps_one_in_n_per_template(self):
+        """Test INFO records are sampled per message template"""
+        sampler = SamplingFilter(0.1)
+
+        kept = [sampler.filter(make_record()) for _ in range(100)]
+        other = sampler.filter(make_record(msg="Fetching item %s", args=("x",)))
+
+        assert sum(kept) == 10
+        assert kept[0] is True
+        assert other is True
+
+    def test_warnings_always_pass(self):
+        """Test warnings and errors are never sampled out"""
+        sampler = SamplingFilter(0)
+
+        assert sampler.filter(make_record()) is False
+        assert all(sampler.filter(make_record(level=logging.WARNING)) for _ in range(5))
+
+    def test_sample_rate_recorded(self):
+        """Test kept records carry the rate they were sampled at"""
+        record = make_record()
+        SamplingFilter(0.5).filter(record)
+
+        assert json.loads(JSONFormatter().format(record))["sample_rate"] == 0.5
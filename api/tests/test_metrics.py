@@ -0,0 +1,162 @@
+"""
+Tests for Prometheus metrics
+"""
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from main import app
+from app.core.errors import NotFoundError
+from app.core.metrics import db_call
+
+client = TestClient(app)
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of a sample (0 if not yet exported)"""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestHttpMetrics:
+    """Tests for MetricsMiddleware"""
+
+    def test_latency_labelled_by_route_template(self):
+        """Test requests are recorded under the route template, not the raw path"""
+        household_id = str(uuid4())
+        labels = {
+            "method": "GET",
+            "route": "/api/v1/households/{household_id}",
+            "status": "401",
+        }
+        before = sample("snakr_http_request_duration_seconds_count", **labels)
+
+        response = client.get(f"/api/v1/households/{household_id}")
+
+        assert response.status_code == 401
+        assert sample("snakr_http_request_duration_seconds_count", **labels) == before + 1
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test unknown paths don't create a series each"""
+        labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+        before = sample("snakr_http_request_duration_seconds_count", **labels)
+
+        client.get(f"/no-such-path/{uuid4()}")
+        client.get(f"/no-such-path/{uuid4()}")
+
+        assert sample("snakr_http_request_duration_seconds_count", **labels) == before + 2
+
+    def test_in_flight_returns_to_zero(self):
+        """Test the in-flight gauge is decremented when requests finish"""
+        client.get("/health")
+
+        assert sample("snakr_http_requests_in_flight") == 0
+
+
+class TestDbCallMetrics:
+    """Tests for the db_call decorator"""
+
+    @pytest.mark.asyncio
+    async def test_records_duration_and_errors(self):
+        """Test calls are timed and unexpected errors counted"""
+
+        class FakeService:
+            @db_call
+            async def load(self, fail: bool):
+                if fail:
+                    raise RuntimeError("connection reset")
+                return "rows"
+
+        method = "TestDbCallMetrics.test_records_duration_and_errors.<locals>.FakeService.load"
+
+        assert await FakeService().load(False) == "rows"
+        with pytest.raises(RuntimeError):
+            await FakeService().load(True)
+
+        assert sample("snakr_db_call_duration_seconds_count", method=method) == 2
+        assert sample("snakr_db_call_errors_total", method=method) == 1
+
+    @pytest.mark.asyncio
+    async def test_application_errors_not_counted(self):
+        """Test SNAKrException outcomes (e.g. not found) aren't DB errors"""
+
+        class FakeService:
+            @db_call
+            async def load(self):
+                raise NotFoundError("Item not found")
+
+        method = "TestDbCallMetrics.test_application_errors_not_counted.<locals>.FakeService.load"
+
+        with pytest.raises(NotFoundError):
+            await FakeService().load()
+
+        assert sample("snakr_db_call_errors_total", method=method) == 0
+
+    @pytest.mark.asyncio
+    async def test_service_methods_labelled(self):
+        """Test service loaders report under their qualified names"""
+        from app.services.item_service import ItemService
+
+        with patch('app.services.item_service.get_supabase') as mock_get:
+            supabase = MagicMock()
+            supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(data=[{"id": "m"}])
+            mock_get.return_value = supabase
+
+            await ItemService()._check_household_member(str(uuid4()), str(uuid4()))
+
+        assert sample(
+            "snakr_db_call_duration_seconds_count", method="ItemService._check_household_member"
+        ) >= 1
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics"""
+
+    def test_exposition(self):
+        """Test the endpoint serves HTTP, cache and change feed metrics"""
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "snakr_http_request_duration_seconds_bucket" in body
+        assert "snakr_cache_misses_total" in body
+        assert 'snakr_cache_hits_total{tier="local"}' in body
+        assert "snakr_change_feed_connected" in body
+
+    def test_disabled(self):
+        """Test 404 when metrics are turned off"""
+        with patch('app.routes.health.settings') as mock_settings:
+            mock_settings.METRICS_ENABLED = False
+
+            response = client.get("/metrics")
+
+        assert response.status_code == 404
+
+    def test_celery_queue_lengths(self):
+        """Test queue depths are read from the broker on scrape"""
+        from app.core import metrics
+
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+
+        async def execute():
+            return [3, 0, 1]
+
+        pipe.execute = execute
+        broker = MagicMock()
+        broker.pipeline.return_value = pipe
+
+        with patch.object(metrics, '_broker', broker), \
+             patch('app.core.metrics.settings') as mock_settings:
+            mock_settings.CELERY_BROKER_URL = "redis://broker:6379/0"
+
+            response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert sample("snakr_celery_queue_length", queue="receipts") == 3
+        assert sample("snakr_celery_queue_length", queue="maintenance") == 1
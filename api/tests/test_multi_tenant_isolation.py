@@ -5,7 +5,7 @@ These tests verify that RLS policies properly enforce household boundaries
 and prevent users from accessing data from households they don't belong to.
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from uuid import uuid4
 
 from app.services.household_service import HouseholdService
@@ -28,10 +28,8 @@ class TestMultiTenantIsolation:
         user_id = str(uuid4())
         household_id = str(uuid4())
         
-        # Mock: User is not a member of the household
-        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(
-            data=[]
-        )
+        # Mock: User is not a member of the household (RPC returns NULL)
+        mock_supabase.rpc.return_value.execute.return_value = Mock(data=None)
         
         service = HouseholdService()
         
@@ -47,24 +45,28 @@ class TestMultiTenantIsolation:
         household1_id = str(uuid4())
         household2_id = str(uuid4())
         
-        # Mock: User is member of household1 only
-        mock_members = Mock(data=[{'household_id': household1_id}])
-        mock_households = Mock(data=[{
+        # Mock: User is member of household1 only (one RPC, filtered by user)
+        mock_supabase.rpc.return_value.execute.return_value = Mock(data=[{
             'id': household1_id,
             'name': 'My Household',
             'created_at': '2024-01-21T12:00:00Z',
-            'updated_at': '2024-01-21T12:00:00Z'
+            'updated_at': '2024-01-21T12:00:00Z',
+            'role': 'member',
+            'stats': None
         }])
         
-        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_members
-        mock_supabase.table.return_value.select.return_value.in_.return_value.execute.return_value = mock_households
-        
         service = HouseholdService()
         households = await service.get_user_households(user_id)
         
         # User should only see household1
         assert len(households) == 1
         assert str(households[0].id) == household1_id
+        assert households[0].role == 'member'
+        mock_supabase.rpc.assert_called_once_with(
+            'get_user_households',
+            {'p_user_id': user_id, 'p_include_stats': False}
+        )
+        mock_supabase.table.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_member_cannot_update_household_without_admin_role(self, mock_supabase):
@@ -153,35 +155,33 @@ class TestMultiTenantIsolation:
         household3_id = str(uuid4())
         
         # Mock: User is member of 3 households
-        mock_members = Mock(data=[
-            {'household_id': household1_id},
-            {'household_id': household2_id},
-            {'household_id': household3_id}
-        ])
-        mock_households = Mock(data=[
+        mock_supabase.rpc.return_value.execute.return_value = Mock(data=[
             {
                 'id': household1_id,
                 'name': 'Household 1',
                 'created_at': '2024-01-21T12:00:00Z',
-                'updated_at': '2024-01-21T12:00:00Z'
+                'updated_at': '2024-01-21T12:00:00Z',
+                'role': 'member',
+                'stats': None
             },
             {
                 'id': household2_id,
                 'name': 'Household 2',
                 'created_at': '2024-01-21T12:00:00Z',
-                'updated_at': '2024-01-21T12:00:00Z'
+                'updated_at': '2024-01-21T12:00:00Z',
+                'role': 'member',
+                'stats': None
             },
             {
                 'id': household3_id,
                 'name': 'Household 3',
                 'created_at': '2024-01-21T12:00:00Z',
-                'updated_at': '2024-01-21T12:00:00Z'
+                'updated_at': '2024-01-21T12:00:00Z',
+                'role': 'member',
+                'stats': None
             }
         ])
         
-        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_members
-        mock_supabase.table.return_value.select.return_value.in_.return_value.execute.return_value = mock_households
-        
         service = HouseholdService()
         households = await service.get_user_households(user_id)
         
@@ -198,39 +198,23 @@ class TestMultiTenantIsolation:
         user_id = str(uuid4())
         household_id = str(uuid4())
         
-        # Mock: User is member of the household
-        mock_member = Mock(data=[{'role': 'member'}])
-        mock_household = Mock(data=[{
+        # Mock: User is member of the household; detail comes from one RPC
+        mock_supabase.rpc.return_value.execute.return_value = Mock(data={
             'id': household_id,
             'name': 'My Household',
             'created_at': '2024-01-21T12:00:00Z',
             'updated_at': '2024-01-21T12:00:00Z',
-        }])
-        mock_members = Mock(data=[
-            {
-                'id': str(uuid4()),
-                'user_id': user_id,
-                'role': 'member',
-                'joined_at': '2024-01-21T12:00:00Z'
-            }
-        ])
-        
-        # Setup mock chain - need to handle multiple calls properly
-        call_count = [0]
-        
-        def mock_execute():
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return mock_member  # First call: check membership
-            elif call_count[0] == 2:
-                return mock_household  # Second call: get household
-            else:
-                return mock_members  # Third call: get members
-        
-        mock_table = MagicMock()
-        mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.eq.return_value.execute = mock_execute
-        mock_table.select.return_value.eq.return_value.execute = mock_execute
+            'members': [
+                {
+                    'id': str(uuid4()),
+                    'user_id': user_id,
+                    'role': 'member',
+                    'joined_at': '2024-01-21T12:00:00Z'
+                }
+            ],
+            'member_count': 1,
+            'admin_count': 0
+        })
         
         service = HouseholdService()
         household = await service.get_household_by_id(household_id, user_id)
@@ -239,6 +223,11 @@ class TestMultiTenantIsolation:
         assert household['id'] == household_id
         assert household['name'] == 'My Household'
         assert household['member_count'] == 1
+        mock_supabase.rpc.assert_called_once_with(
+            'get_household_detail',
+            {'p_household_id': household_id, 'p_user_id': user_id, 'p_summary': False}
+        )
+        mock_supabase.table.assert_not_called()
 
 
 class TestInvitationIsolation:
@@ -0,0 +1,168 @@
+"""
+Tests for the on-demand profiler and slow-request log
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from main import app
+from app.core import profiling
+from app.core.metrics import db_call
+from app.core.profiling import ProfileSession, Profiler, ProfilingMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+
+client = TestClient(app)
+
+ADMIN_ID = "9b2f6a1e-0000-4000-8000-000000000001"
+
+
+def busy_wait(seconds: float):
+    """Hold the event loop, as a synchronous Supabase call would"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler:
+    """Tests for the sampling profiler"""
+
+    @pytest.mark.asyncio
+    async def test_samples_blocking_code(self):
+        """Test time spent blocking the loop shows up in the results"""
+        profiler = Profiler()
+        profiler.start(5)
+        busy_wait(0.2)
+        session = profiler.stop()
+
+        assert not session.running
+        assert session.samples > 0
+        assert any("busy_wait" in row["function"] for row in session.top(5))
+        assert "busy_wait (tests/test_profiling.py" in session.folded()
+
+    @pytest.mark.asyncio
+    async def test_route_filter_skips_other_requests(self):
+        """Test only tasks of matching requests are sampled"""
+        profiler = Profiler()
+        session = profiler.start(5, route="/api/v1/households/*/items")
+        busy_wait(0.1)
+        profiler.stop()
+
+        assert session.samples == 0
+        assert session.idle > 0
+
+    @pytest.mark.asyncio
+    async def test_one_session_at_a_time(self):
+        """Test starting while a session runs is refused"""
+        profiler = Profiler()
+        profiler.start(5)
+        try:
+            with pytest.raises(RuntimeError):
+                profiler.start(5)
+        finally:
+            profiler.stop()
+
+    def test_results_readable_while_sampling(self):
+        """Test top() and folded() don't race the sampler thread's inserts"""
+        session = ProfileSession(seconds=5, route=None, interval=0.001)
+        done = threading.Event()
+
+        def sampler():
+            n = 0
+            while not done.is_set():
+                with session.lock:
+                    session.stacks[(f"outer {n % 50}", f"inner {n}")] += 1
+                    session.samples += 1
+                n += 1
+
+        thread = threading.Thread(target=sampler)
+        thread.start()
+        try:
+            end = time.perf_counter() + 0.3
+            while time.perf_counter() < end:
+                session.top(5)
+                session.folded()
+        finally:
+            done.set()
+            thread.join()
+
+        assert len(session.top(5)) == 5
+
+
+class TestSlowRequestLog:
+    """Tests for the slow-request hook"""
+
+    def test_logs_stack_and_db_time(self):
+        """Test a slow request is logged with a stack sample and DB time per method"""
+
+        class FakeService:
+            @db_call
+            async def slow_query(self):
+                busy_wait(0.1)
+
+        slow_app = FastAPI()
+
+        @slow_app.get("/slow")
+        async def slow():
+            await FakeService().slow_query()
+            return {}
+
+        with patch.object(profiling.settings, 'SLOW_REQUEST_MS', 20), \
+             patch.object(profiling.settings, 'PROFILING_ENABLED', False), \
+             patch.object(profiling, 'log_slow_request') as mock_log:
+            slow_app.add_middleware(ProfilingMiddleware)
+            slow_app.add_middleware(RequestIDMiddleware)
+            TestClient(slow_app).get("/slow", headers={"X-Request-ID": "req-slow"})
+
+        scope, elapsed, entry, db_time = mock_log.call_args.args
+        assert scope["path"] == "/slow"
+        assert elapsed >= 0.1
+        assert entry.blocking is True
+        assert any("busy_wait" in frame for frame in entry.stack)
+        method = "TestSlowRequestLog.test_logs_stack_and_db_time.<locals>.FakeService.slow_query"
+        assert db_time[method][0] == 1
+        assert db_time[method][1] >= 0.1
+
+    def test_not_installed_by_default(self):
+        """Test nothing is added to the request path when profiling is off"""
+        assert not any(m.cls is ProfilingMiddleware for m in app.user_middleware)
+
+
+class TestProfilerEndpoints:
+    """Tests for /api/v1/admin/profiler"""
+
+    def test_requires_admin(self):
+        """Test users outside ADMIN_USER_IDS are refused"""
+        with patch('app.middleware.auth.JWTMiddleware.verify_token', return_value={"sub": "someone-else"}), \
+             patch('app.middleware.auth.settings.ADMIN_USER_IDS', ADMIN_ID):
+            response = client.get("/api/v1/admin/profiler", headers={"Authorization": "Bearer token"})
+
+        assert response.status_code == 403
+
+    def test_disabled(self):
+        """Test 404 when profiling is turned off"""
+        with patch('app.middleware.auth.JWTMiddleware.verify_token', return_value={"sub": ADMIN_ID}), \
+             patch('app.middleware.auth.settings.ADMIN_USER_IDS', ADMIN_ID):
+            response = client.post("/api/v1/admin/profiler?seconds=5", headers={"Authorization": "Bearer token"})
+
+        assert response.status_code == 404
+
+    def test_start_and_read(self):
+        """Test an admin can start a session and read it back"""
+        with patch('app.middleware.auth.JWTMiddleware.verify_token', return_value={"sub": ADMIN_ID}), \
+             patch('app.middleware.auth.settings.ADMIN_USER_IDS', ADMIN_ID), \
+             patch('app.routes.api_v1.admin.settings.PROFILING_ENABLED', True), \
+             patch('app.routes.api_v1.admin.get_profiler', return_value=Profiler()):
+            headers = {"Authorization": "Bearer token"}
+            started = client.post("/api/v1/admin/profiler?seconds=1&route=/api/v1/items*", headers=headers)
+            stopped = client.delete("/api/v1/admin/profiler", headers=headers)
+            folded = client.get("/api/v1/admin/profiler?format=folded", headers=headers)
+
+        assert started.status_code == 202
+        assert started.json()["route"] == "/api/v1/items*"
+        assert stopped.json()["running"] is False
+        assert folded.status_code == 200
+        assert folded.headers["content-type"].startswith("text/plain")
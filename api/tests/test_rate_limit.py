@@ -21,6 +21,7 @@ from app.core.config import settings
 def mock_request():
     """Create a mock request object"""
     request = Mock(spec=Request)
+    request.scope = {"type": "http", "method": "GET", "path": "/api/v1/items"}
     request.state = Mock()
     request.client = Mock()
     request.client.host = "127.0.0.1"
@@ -0,0 +1,88 @@
+"""
+Tests for the request ID middleware
+"""
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.errors import general_exception_handler
+from app.middleware.request_id import (
+    RequestIDMiddleware,
+    get_request_id,
+    get_request_start
+)
+
+
+def make_app() -> FastAPI:
+    """Minimal app exposing what the middleware sets"""
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+    app.add_exception_handler(Exception, general_exception_handler)
+
+    @app.get("/state")
+    async def state(request: Request):
+        return {
+            "state_id": request.state.request_id,
+            "context_id": get_request_id(),
+            "started": request.state.request_start == get_request_start() > 0
+        }
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for n in range(3):
+                yield f"{n}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+client = TestClient(make_app())
+
+
+def test_request_id_in_state_and_context():
+    """Test handlers see the same ID in request.state and the context var"""
+    response = client.get("/state")
+    data = response.json()
+
+    assert data["state_id"] == data["context_id"] == response.headers["X-Request-ID"]
+    uuid.UUID(data["state_id"])
+    assert data["started"] is True
+
+
+def test_incoming_request_id_honored():
+    """Test an incoming X-Request-ID is reused"""
+    response = client.get("/state", headers={"X-Request-ID": "trace-abc"})
+
+    assert response.json()["state_id"] == "trace-abc"
+    assert response.headers["X-Request-ID"] == "trace-abc"
+
+
+def test_streaming_response_gets_header():
+    """Test streamed responses pass through untouched with the header"""
+    response = client.get("/stream")
+
+    assert response.text == "0\n1\n2\n"
+    assert response.headers["X-Request-ID"]
+
+
+def test_context_reset_after_request():
+    """Test the request ID does not leak outside the request"""
+    client.get("/state")
+
+    assert get_request_id() == ""
+
+
+def test_unhandled_error_reports_request_id():
+    """Test the 500 handler, which runs outside the middleware, still sees the ID"""
+    failing_client = TestClient(make_app(), raise_server_exceptions=False)
+    response = failing_client.get("/fail", headers={"X-Request-ID": "abc-123"})
+
+    assert response.status_code == 500
+    assert response.json()["error"]["request_id"] == "abc-123"
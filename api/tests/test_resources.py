@@ -0,0 +1,51 @@
+"""
+Tests for the per-worker resource registry
+"""
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.resources import ResourceRegistry
+
+
+class TestResourceRegistry:
+    """Closing registered resources on shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_closes_newest_first(self):
+        registry = ResourceRegistry()
+        closed = []
+        registry.register("pool", lambda: closed.append("pool"))
+        registry.register("cache", AsyncMock(side_effect=lambda: closed.append("cache")))
+        registry.register("clients", lambda: closed.append("clients"))
+
+        await registry.close()
+
+        assert closed == ["clients", "cache", "pool"]
+        assert registry.names() == []
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_stop_the_rest(self):
+        registry = ResourceRegistry()
+        pool = Mock()
+        registry.register("pool", pool)
+        registry.register("cache", AsyncMock(side_effect=ConnectionError("gone")))
+
+        await registry.close()
+
+        pool.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_register_again_replaces(self):
+        registry = ResourceRegistry()
+        old, new, other = Mock(), Mock(), Mock()
+        registry.register("pool", old)
+        registry.register("cache", other)
+        registry.register("pool", new)
+        assert registry.names() == ["cache", "pool"]
+
+        await registry.close()
+
+        old.assert_not_called()
+        new.assert_called_once()
+        other.assert_called_once()
@@ -0,0 +1,138 @@
+"""
+Tests for fast JSON responses and pre-serialized payloads
+"""
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import msgspec
+import pytest
+from unittest.mock import Mock, patch, MagicMock
+
+from app.core.responses import FastJSONResponse, dump_json, json_responses
+from app.services.item_service import ITEM_LIST_COLUMNS, ItemService
+from app.services.rows import InvitationPage
+from main import app
+
+
+MOCK_HOUSEHOLD_ID = str(uuid4())
+
+
+def make_query(data):
+    """Create a chainable PostgREST query mock returning data"""
+    query = MagicMock()
+    for method in ("select", "eq", "order", "range"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = Mock(data=data)
+    return query
+
+
+class TestDumpJson:
+    """Tests for dump_json"""
+
+    def test_encodes_common_types(self):
+        """Test datetimes, UUIDs and Decimals are encoded like jsonable_encoder"""
+        item_id = uuid4()
+        data = json.loads(dump_json({
+            "id": item_id,
+            "at": datetime(2024, 1, 22, 12, 0, tzinfo=timezone.utc),
+            "confidence": Decimal("0.85"),
+            1: "non-string key"
+        }))
+
+        assert data == {
+            "id": str(item_id),
+            "at": "2024-01-22T12:00:00Z",
+            "confidence": 0.85,
+            "1": "non-string key"
+        }
+
+    def test_unknown_type_rejected(self):
+        """Test unsupported objects raise TypeError"""
+        with pytest.raises(TypeError):
+            dump_json({"value": object()})
+
+
+class TestFastJSONResponse:
+    """Tests for FastJSONResponse"""
+
+    def test_renders_dict(self):
+        """Test dict content is rendered as JSON"""
+        response = FastJSONResponse({"total": 0})
+
+        assert response.body == b'{"total":0}'
+        assert response.headers["content-type"] == "application/json"
+
+    def test_bytes_pass_through(self):
+        """Test pre-serialized content is sent unchanged"""
+        response = FastJSONResponse(b'{"items":[],"total":0}')
+
+        assert response.body == b'{"items":[],"total":0}'
+
+
+class TestJsonResponses:
+    """Tests for json_responses and the routes documented with it"""
+
+    def test_schema_inlined(self):
+        """Test nested row types are inlined, not left as $defs references"""
+        schema = json_responses(InvitationPage)[200]["content"]["application/json"]["schema"]
+
+        row = schema["properties"]["invitations"]["items"]
+        assert "$ref" not in json.dumps(schema)
+        assert "invitee_email" in row["properties"]
+        assert "token" not in row["properties"]
+
+    def test_openapi_matches_sent_payload(self):
+        """Test FastJSONResponse routes document the row types they send"""
+        paths = app.openapi()["paths"]
+        invitations = paths["/api/v1/households/{household_id}/invitations"]["get"]["responses"]
+        schema = invitations["200"]["content"]["application/json"]["schema"]
+        assert set(schema["properties"]) == {"invitations", "total"}
+        assert "token" not in schema["properties"]["invitations"]["items"]["properties"]
+
+        created = paths["/api/v1/items"]["post"]["responses"]
+        assert "inventory" in created["201"]["content"]["application/json"]["schema"]["properties"]
+
+
+class TestPreSerializedItems:
+    """Tests for ItemService.get_household_items(as_json=True)"""
+
+    @pytest.mark.asyncio
+    async def test_matches_dict_result(self):
+        """Test the JSON bytes decode to the same result as the dict form"""
+        rows = [{
+            "id": str(uuid4()),
+            "household_id": MOCK_HOUSEHOLD_ID,
+            "name": "Milk",
+            "category": "dairy",
+            "location": "fridge",
+            "created_at": "2024-01-22T12:00:00+00:00",
+            "updated_at": "2024-01-22T12:00:00+00:00",
+            "inventory": [{
+                "id": str(uuid4()),
+                "state": "low",
+                "confidence": 0.85,
+                "last_updated": "2024-01-22T14:30:00+00:00"
+            }]
+        }]
+
+        with patch('app.services.item_service.get_supabase') as mock:
+            mock_client = MagicMock()
+            tables = {
+                'household_members': make_query([{"id": str(uuid4())}]),
+                'items': make_query(rows)
+            }
+            mock_client.table.side_effect = lambda name: tables[name]
+            mock.return_value = mock_client
+
+            service = ItemService()
+            as_dict = await service.get_household_items(MOCK_HOUSEHOLD_ID, "user")
+            as_bytes = await service.get_household_items(MOCK_HOUSEHOLD_ID, "user", as_json=True)
+
+        tables['items'].select.assert_called_with(ITEM_LIST_COLUMNS)
+        assert isinstance(as_bytes, bytes)
+        assert json.loads(as_bytes) == {
+            "items": msgspec.to_builtins(as_dict["items"]),
+            "total": 1
+        }
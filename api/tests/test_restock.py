@@ -0,0 +1,227 @@
+"""
+Tests for restock export and Restock Intent generation
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch, MagicMock
+from uuid import uuid4
+
+from main import app
+from app.services.restock_service import RestockService
+from app.core.errors import AuthorizationError
+
+client = TestClient(app)
+
+
+MOCK_USER_ID = str(uuid4())
+MOCK_HOUSEHOLD_ID = str(uuid4())
+
+MOCK_JWT_PAYLOAD = {
+    "sub": MOCK_USER_ID,
+    "email": "test@example.com",
+    "role": "authenticated"
+}
+
+MOCK_RESTOCK_ROWS = [
+    {
+        "item_id": str(uuid4()),
+        "urgency": "need_now",
+        "reason": "Currently out",
+        "days_to_low": None,
+        "days_to_out": 0,
+        "confidence": 0.95,
+        "items": {
+            "name": "Milk",
+            "category": "dairy",
+            "inventory": [{"state": "out", "confidence": 1.0}],
+            "predictions": []
+        }
+    },
+    {
+        "item_id": str(uuid4()),
+        "urgency": "need_soon",
+        "reason": "Predicted low in 2 days",
+        "days_to_low": 2,
+        "days_to_out": 5,
+        "confidence": None,
+        "items": {
+            "name": "Eggs",
+            "category": "dairy",
+            "inventory": {"state": "low", "confidence": 0.9},
+            "predictions": [{"confidence": 0.8, "reason_codes": ["recent_usage_events"]}]
+        }
+    }
+]
+
+
+def make_query(data):
+    """Create a chainable PostgREST query mock returning data"""
+    query = MagicMock()
+    for method in ("select", "eq", "or_", "order", "range", "limit"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = Mock(data=data)
+    return query
+
+
+@pytest.fixture(autouse=True)
+def clear_intent_cache():
+    """Start every test with an empty intent cache"""
+    RestockService._intent_cache.clear()
+    yield
+    RestockService._intent_cache.clear()
+
+
+@pytest.fixture
+def mock_jwt_verify():
+    """Mock JWT verification"""
+    with patch('app.middleware.auth.JWTMiddleware.verify_token') as mock:
+        mock.return_value = MOCK_JWT_PAYLOAD
+        yield mock
+
+
+@pytest.fixture
+def mock_supabase():
+    """Mock Supabase client with a member and two restock rows"""
+    with patch('app.services.restock_service.get_supabase') as mock:
+        mock_client = MagicMock()
+        tables = {
+            'household_members': make_query([{"id": str(uuid4())}]),
+            'restock_list': make_query(MOCK_RESTOCK_ROWS)
+        }
+        mock_client.table.side_effect = lambda name: tables[name]
+        mock.return_value = mock_client
+        yield mock_client
+
+
+class TestRestockService:
+    """Tests for RestockService"""
+
+    @pytest.mark.asyncio
+    async def test_entries_flatten_joined_rows(self, mock_supabase):
+        """Test restock rows are flattened with state, reasons and quantities"""
+        entries = await RestockService().get_restock_entries(MOCK_HOUSEHOLD_ID, MOCK_USER_ID)
+
+        assert [e["name"] for e in entries] == ["Milk", "Eggs"]
+        assert entries[0]["state"] == "out"
+        assert entries[0]["reason_codes"] == ["currently_out"]
+        assert entries[0]["suggested_quantity"] == 2
+        assert entries[1]["state"] == "low"
+        assert entries[1]["confidence"] == 0.8
+        assert entries[1]["reason_codes"] == ["recent_usage_events"]
+
+        # Only one query against the restock list (joined select)
+        mock_supabase.table.assert_any_call('restock_list')
+        assert [c.args[0] for c in mock_supabase.table.call_args_list].count('restock_list') == 1
+
+    @pytest.mark.asyncio
+    async def test_build_intent_contract_shape(self, mock_supabase):
+        """Test intent follows integration contract v1"""
+        intent = await RestockService().build_intent(MOCK_HOUSEHOLD_ID, MOCK_USER_ID)
+
+        assert intent["version"] == "v1"
+        assert intent["household_id"] == MOCK_HOUSEHOLD_ID
+        assert intent["overall_urgency"] == "high"
+        assert intent["items"][0]["canonical_name"] == "Milk"
+        assert intent["constraints"]["local_first_preference"] == "neutral"
+        for item in intent["items"]:
+            assert 0.0 <= item["confidence"] <= 1.0
+            assert item["reason_codes"]
+
+    @pytest.mark.asyncio
+    async def test_identical_intents_are_memoized(self, mock_supabase):
+        """Test identical content returns the memoized intent"""
+        service = RestockService()
+        first = await service.build_intent(MOCK_HOUSEHOLD_ID, MOCK_USER_ID)
+        second = await service.build_intent(MOCK_HOUSEHOLD_ID, MOCK_USER_ID)
+
+        assert second is first
+        assert len(RestockService._intent_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_constraints_build_new_intent(self, mock_supabase):
+        """Test changed constraints produce a different intent"""
+        service = RestockService()
+        first = await service.build_intent(MOCK_HOUSEHOLD_ID, MOCK_USER_ID)
+        second = await service.build_intent(
+            MOCK_HOUSEHOLD_ID, MOCK_USER_ID, budget_sensitivity="high"
+        )
+
+        assert second["intent_id"] != first["intent_id"]
+        assert len(RestockService._intent_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_non_member_denied(self, mock_supabase):
+        """Test non-members cannot build intents"""
+        mock_supabase.table.side_effect = lambda name: make_query([])
+
+        with pytest.raises(AuthorizationError):
+            await RestockService().build_intent(MOCK_HOUSEHOLD_ID, MOCK_USER_ID)
+
+    def test_streamed_json_is_valid_document(self):
+        """Test streamed JSON chunks concatenate into the full intent"""
+        intent = {
+            "intent_id": "abc",
+            "version": "v1",
+            "household_id": MOCK_HOUSEHOLD_ID,
+            "generated_at": "2024-01-15T10:30:00Z",
+            "overall_urgency": "low",
+            "items": [{"canonical_name": "Milk"}, {"canonical_name": "Eggs"}],
+            "constraints": {"budget_sensitivity": "medium"}
+        }
+
+        assert json.loads("".join(RestockService.iter_intent_json(intent))) == intent
+
+        intent["items"] = []
+        assert json.loads("".join(RestockService.iter_intent_json(intent))) == intent
+
+
+class TestRestockEndpoints:
+    """Tests for restock export and intent endpoints"""
+
+    def test_export_text(self, mock_jwt_verify, mock_supabase):
+        """Test text export is grouped by urgency"""
+        response = client.get(
+            f"/api/v1/restock/export?household_id={MOCK_HOUSEHOLD_ID}",
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "Need now:\n- Milk (Out) - Currently out" in response.text
+        assert "Need soon:\n- Eggs (Low)" in response.text
+
+    def test_export_json(self, mock_jwt_verify, mock_supabase):
+        """Test JSON export streams the Restock Intent"""
+        response = client.get(
+            f"/api/v1/restock/export?household_id={MOCK_HOUSEHOLD_ID}&format=json",
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == "v1"
+        assert len(data["items"]) == 2
+
+    def test_create_intent(self, mock_jwt_verify, mock_supabase):
+        """Test intent generation endpoint"""
+        response = client.post(
+            "/api/v1/restock/intent",
+            json={"household_id": MOCK_HOUSEHOLD_ID, "budget_sensitivity": "low"},
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["constraints"]["budget_sensitivity"] == "low"
+        assert data["overall_urgency"] == "high"
+
+    def test_create_intent_invalid_constraint(self, mock_jwt_verify, mock_supabase):
+        """Test invalid constraint values are rejected"""
+        response = client.post(
+            "/api/v1/restock/intent",
+            json={"household_id": MOCK_HOUSEHOLD_ID, "local_first_preference": "always"},
+            headers={"Authorization": "Bearer mock_token"}
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,150 @@
+"""
+Tests for PostgREST row types
+"""
+import json
+from uuid import uuid4
+
+import msgspec
+import pytest
+
+from app.core.responses import dump_json
+from app.services.rows import (
+    HouseholdRow,
+    InvitationRow,
+    ItemRow,
+    decode_row,
+    decode_rows,
+    json_object_sql,
+    select_columns
+)
+
+
+MOCK_HOUSEHOLD_ID = str(uuid4())
+
+
+def make_item_record(inventory=True) -> dict:
+    """Create a mock item record with embedded (aliased) inventory"""
+    return {
+        "id": str(uuid4()),
+        "household_id": MOCK_HOUSEHOLD_ID,
+        "name": "Milk",
+        "category": "dairy",
+        "location": "fridge",
+        "created_at": "2024-01-22T12:00:00+00:00",
+        "updated_at": "2024-01-22T12:00:00+00:00",
+        "inventory": [{
+            "id": str(uuid4()),
+            "state": "low",
+            "confidence": 0.85,
+            "last_updated": "2024-01-22T14:30:00+00:00"
+        }] if inventory else []
+    }
+
+
+class TestItemRow:
+    """Tests for ItemRow"""
+
+    def test_encodes_api_shape(self):
+        """Test an item encodes to the documented API shape"""
+        record = make_item_record()
+        data = json.loads(dump_json(decode_row(ItemRow, record)))
+
+        assert data["name"] == "Milk"
+        assert data["inventory"] == record["inventory"][0]
+
+    def test_missing_inventory(self):
+        """Test items without inventory encode inventory as null"""
+        data = json.loads(dump_json(decode_row(ItemRow, make_item_record(inventory=False))))
+
+        assert data["inventory"] is None
+
+    def test_decode_rows_ignores_extra_columns(self):
+        """Test columns outside the row type are dropped"""
+        record = {**make_item_record(), "internal_note": "x"}
+
+        rows = decode_rows(ItemRow, [record, make_item_record()])
+
+        assert len(rows) == 2
+        assert "internal_note" not in json.loads(dump_json(rows[0]))
+
+    def test_missing_column_rejected(self):
+        """Test a record missing a required column fails to decode"""
+        record = make_item_record()
+        del record["name"]
+
+        with pytest.raises(msgspec.ValidationError):
+            decode_row(ItemRow, record)
+
+    def test_rows_have_no_instance_dict(self):
+        """Test rows don't carry a per-instance __dict__"""
+        row = decode_row(ItemRow, make_item_record())
+
+        assert not hasattr(row, "__dict__")
+
+
+class TestOtherRows:
+    """Tests for household and invitation rows"""
+
+    def test_household_row(self):
+        """Test households decode only their public columns"""
+        row = decode_row(HouseholdRow, {
+            "id": MOCK_HOUSEHOLD_ID,
+            "name": "Home",
+            "created_at": "2024-01-21T12:00:00Z",
+            "updated_at": "2024-01-21T12:00:00Z"
+        })
+
+        assert row.id == MOCK_HOUSEHOLD_ID
+        assert row.name == "Home"
+
+    def test_invitation_row_optional_accepted_at(self):
+        """Test pending invitations decode without accepted_at"""
+        row = decode_row(InvitationRow, {
+            "id": str(uuid4()),
+            "household_id": MOCK_HOUSEHOLD_ID,
+            "inviter_id": str(uuid4()),
+            "invitee_email": "friend@example.com",
+            "role": "member",
+            "status": "pending",
+            "token": "abc",
+            "expires_at": "2024-01-28T12:00:00Z",
+            "created_at": "2024-01-21T12:00:00Z",
+            "updated_at": "2024-01-21T12:00:00Z"
+        })
+
+        assert row.accepted_at is None
+        assert row.role == "member"
+
+
+class TestSelectColumns:
+    """Tests for select_columns"""
+
+    def test_item_projection(self):
+        """Test nested rows become embeds and Column fields become aliases"""
+        assert select_columns(ItemRow) == (
+            "id, household_id, name, category, location, created_at, updated_at, "
+            "inventory(id, state, confidence, last_updated:updated_at)"
+        )
+
+    def test_inner_join(self):
+        """Test embeds listed in inner are inner-joined"""
+        assert "inventory!inner(" in select_columns(ItemRow, inner=("inventory",))
+
+    def test_invitation_projection_excludes_token(self):
+        """Test invitation queries never select the token"""
+        columns = select_columns(InvitationRow).split(", ")
+
+        assert "token" not in columns
+        assert "invitee_email" in columns
+
+
+class TestJsonObjectSql:
+    """Tests for json_object_sql"""
+
+    def test_item_object(self):
+        """Test fields map to aliased columns and embeds to nested objects"""
+        sql = json_object_sql(ItemRow, "i", (("inventory", "inv"),))
+
+        assert sql.startswith("json_build_object('id', i.id, 'household_id', i.household_id")
+        assert "'inventory', json_build_object('id', inv.id" in sql
+        assert "'last_updated', inv.updated_at" in sql
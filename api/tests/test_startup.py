@@ -0,0 +1,122 @@
+"""
+Startup budget tests
+
+Every API worker (and every autoscaled replica) imports app.main before it
+can serve, so import time is a cold start cost. These tests import it in a
+fresh interpreter and fail if it gets slow or pulls in heavy libraries that
+belong in the Celery worker or behind first use.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+from app.services.supabase_client import SupabaseService
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+# Seconds; generous for slow CI machines (about 0.6s on a laptop)
+IMPORT_BUDGET = float(os.getenv("IMPORT_BUDGET_SECONDS", "1.5"))
+
+# Must not be imported by app.main: OCR/ML libraries, and clients that are
+# only needed once the app is running
+HEAVY_MODULES = (
+    "numpy",
+    "PIL",
+    "sentence_transformers",
+    "torch",
+    "pytesseract",
+    "pdf2image",
+    "boto3",
+    "minio",
+    "celery",
+    "supabase",
+    "asyncpg",
+    "redis",
+    "opentelemetry.sdk",
+)
+
+IMPORT_APP = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_app() -> dict:
+    """Import app.main in a new interpreter; its import time and loaded modules"""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_APP],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def imports():
+    """Best of three imports, to ride out a noisy machine"""
+    runs = [import_app() for _ in range(3)]
+    return min(runs, key=lambda run: run["seconds"])
+
+
+class TestImportTime:
+    """Importing app.main"""
+
+    def test_within_budget(self, imports):
+        assert imports["seconds"] < IMPORT_BUDGET, (
+            f"import app.main took {imports['seconds']:.2f}s (budget {IMPORT_BUDGET}s)"
+        )
+
+    def test_heavy_modules_not_imported(self, imports):
+        loaded = set(imports["modules"])
+
+        assert [name for name in HEAVY_MODULES if name in loaded] == []
+
+
+@pytest.fixture
+def background():
+    """Keep the lifespan's event writer and change feed out of these tests"""
+    with patch('app.main.get_event_writer', return_value=AsyncMock()), \
+            patch.object(settings, 'CHANGE_FEED_ENABLED', False):
+        yield
+
+
+class TestLifespan:
+    """The Supabase client is built at startup, not at import"""
+
+    def test_lifespan_builds_supabase_client(self, background):
+        with patch('app.main.get_supabase') as get_supabase, \
+                patch.object(settings, 'SUPABASE_URL', 'https://test.supabase.co'), \
+                patch.object(settings, 'SUPABASE_KEY', 'test-key'):
+            app = create_app()
+            get_supabase.assert_not_called()
+
+            with TestClient(app):
+                get_supabase.assert_called_once()
+
+    def test_lifespan_without_credentials_defers_client(self, background):
+        with patch('app.main.get_supabase') as get_supabase, \
+                patch.object(settings, 'SUPABASE_URL', ''):
+            with TestClient(create_app()):
+                get_supabase.assert_not_called()
+
+    def test_shutdown_closes_supabase_clients(self, background):
+        with patch('app.main.get_supabase'), \
+                patch.object(SupabaseService, 'close') as close:
+            with TestClient(create_app()):
+                close.assert_not_called()
+
+            close.assert_called_once()
@@ -1,10 +1,12 @@
 """
 Tests for Supabase client service
 """
+import httpx
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from uuid import uuid4
 
+from app.core.config import settings
 from app.services.supabase_client import (
     SupabaseService,
     DatabaseHelper,
@@ -27,6 +29,8 @@ class TestSupabaseService:
         """Test client is created as singleton"""
         mock_settings.SUPABASE_URL = "https://test.supabase.co"
         mock_settings.SUPABASE_KEY = "test-key"
+        mock_settings.SUPABASE_POOL_SIZE = 20
+        mock_settings.SUPABASE_TIMEOUT = 30.0
         mock_client = Mock()
         mock_create_client.return_value = mock_client
         
@@ -55,6 +59,8 @@ class TestSupabaseService:
         """Test client can be reset"""
         mock_settings.SUPABASE_URL = "https://test.supabase.co"
         mock_settings.SUPABASE_KEY = "test-key"
+        mock_settings.SUPABASE_POOL_SIZE = 20
+        mock_settings.SUPABASE_TIMEOUT = 30.0
         mock_client = Mock()
         mock_create_client.return_value = mock_client
         
@@ -72,6 +78,8 @@ class TestSupabaseService:
         """Test convenience function returns client"""
         mock_settings.SUPABASE_URL = "https://test.supabase.co"
         mock_settings.SUPABASE_KEY = "test-key"
+        mock_settings.SUPABASE_POOL_SIZE = 20
+        mock_settings.SUPABASE_TIMEOUT = 30.0
         mock_client = Mock()
         mock_create_client.return_value = mock_client
         
@@ -79,6 +87,77 @@ class TestSupabaseService:
         assert client == mock_client
 
 
+@pytest.fixture
+def supabase_settings():
+    """Real clients against a fake project (building one makes no requests)"""
+    SupabaseService.reset_client()
+    with patch.object(settings, 'SUPABASE_URL', 'https://test.supabase.co'), \
+            patch.object(settings, 'SUPABASE_KEY', 'test-key'), \
+            patch.object(settings, 'SUPABASE_USER_SESSIONS', 2):
+        yield
+    SupabaseService.reset_client()
+
+
+class TestUserClients:
+    """PostgREST sessions scoped to a user's JWT"""
+    
+    def test_user_client_cached_per_token(self, supabase_settings):
+        first = SupabaseService.get_user_client("token-1")
+        again = SupabaseService.get_user_client("token-1")
+        other = SupabaseService.get_user_client("token-2")
+        
+        assert first is again
+        assert other is not first
+    
+    def test_clients_share_one_transport(self, supabase_settings):
+        service = SupabaseService.get_client()
+        user = SupabaseService.get_user_client("token-1")
+        
+        assert service.postgrest.session is SupabaseService._http_client
+        assert user.session is SupabaseService._http_client
+        assert user.headers["Authorization"] == "Bearer token-1"
+        assert service.postgrest.headers["Authorization"] == "Bearer test-key"
+    
+    def test_user_query_sends_token_per_request(self, supabase_settings):
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[{"id": "item-1"}])
+        
+        SupabaseService._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+        for token in ("token-1", "token-2"):
+            SupabaseService.get_user_client(token).table("items").select("id").execute()
+        SupabaseService.get_client().table("items").select("id").execute()
+        
+        assert [r.headers["Authorization"] for r in requests] == [
+            "Bearer token-1", "Bearer token-2", "Bearer test-key"
+        ]
+        assert {r.headers["apikey"] for r in requests} == {"test-key"}
+        assert {r.url.path for r in requests} == {"/rest/v1/items"}
+    
+    def test_least_recently_used_evicted(self, supabase_settings):
+        first = SupabaseService.get_user_client("token-1")
+        SupabaseService.get_user_client("token-2")
+        SupabaseService.get_user_client("token-1")
+        SupabaseService.get_user_client("token-3")
+        
+        assert list(SupabaseService._user_sessions) == ["token-1", "token-3"]
+        assert SupabaseService.get_user_client("token-1") is first
+    
+    def test_close_releases_connections(self, supabase_settings):
+        SupabaseService.get_client()
+        SupabaseService.get_user_client("token-1")
+        http_client = SupabaseService._http_client
+        
+        SupabaseService.close()
+        
+        assert http_client.is_closed
+        assert SupabaseService._client is None
+        assert SupabaseService._http_client is None
+        assert not SupabaseService._user_sessions
+
+
 class TestDatabaseHelper:
     """Test database helper methods"""
     
@@ -229,6 +308,26 @@ class TestDatabaseHelper:
         result = await DatabaseHelper.update_with_rls("test_table", record_id, {"name": "Updated"})
         assert result == updated_data
     
+    @pytest.mark.asyncio
+    @patch('app.services.supabase_client.SupabaseService.get_client')
+    @patch('app.services.supabase_client.SupabaseService.get_user_client')
+    async def test_insert_with_rls_as_user(self, mock_get_user_client, mock_get_client):
+        """Test insert with a user token goes through that user's client"""
+        inserted_data = {"id": str(uuid4()), "name": "Test"}
+        mock_client = Mock()
+        mock_client.table.return_value.insert.return_value.execute.return_value.data = [
+            inserted_data
+        ]
+        mock_get_user_client.return_value = mock_client
+        
+        result = await DatabaseHelper.insert_with_rls(
+            "test_table", {"name": "Test"}, user_token="token-1"
+        )
+        
+        assert result == inserted_data
+        mock_get_user_client.assert_called_once_with("token-1")
+        mock_get_client.assert_not_called()
+    
     def test_get_db_helper_convenience_function(self):
         """Test convenience function returns helper"""
         helper = get_db_helper()
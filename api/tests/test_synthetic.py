@@ -0,0 +1,167 @@
+"""
+Tests for the synthetic data generator
+"""
+import csv
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.models import Category, Location
+from synthetic import GeneratorConfig, generate
+from synthetic.output import COPY_COLUMNS
+from synthetic.receipts import build_receipt, render
+from synthetic.tables import uuid4_array
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    """A small dataset with receipts"""
+    directory = str(tmp_path_factory.mktemp("synthetic"))
+    manifest = generate(
+        GeneratorConfig(seed=7, households=12, max_items=120, receipts=3), directory
+    )
+    return directory, manifest
+
+
+def read_csv(directory, table):
+    with open(os.path.join(directory, f"{table}.csv"), newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestDeterminism:
+    """Same config, same files"""
+
+    def test_same_seed_same_output(self, dataset, tmp_path):
+        directory, _ = dataset
+        generate(GeneratorConfig(seed=7, households=12, max_items=120, receipts=3), str(tmp_path))
+
+        for table in COPY_COLUMNS:
+            with open(os.path.join(directory, f"{table}.csv"), "rb") as a, open(
+                tmp_path / f"{table}.csv", "rb"
+            ) as b:
+                assert a.read() == b.read(), table
+
+    def test_different_seed_different_output(self, dataset, tmp_path):
+        directory, _ = dataset
+        generate(GeneratorConfig(seed=8, households=12, max_items=120), str(tmp_path))
+
+        assert (
+            read_csv(directory, "households")[0]["id"]
+            != read_csv(str(tmp_path), "households")[0]["id"]
+        )
+
+
+class TestTables:
+    """Rows match the schema and each other"""
+
+    def test_headers_match_copy_columns(self, dataset):
+        directory, manifest = dataset
+
+        for table, count in manifest["rows"].items():
+            with open(os.path.join(directory, f"{table}.csv"), newline="") as f:
+                assert tuple(next(csv.reader(f))) == COPY_COLUMNS[table][1]
+            assert len(read_csv(directory, table)) == count
+
+    def test_items_cover_categories_and_locations(self, dataset):
+        directory, _ = dataset
+        items = read_csv(directory, "items")
+
+        assert {row["category"] for row in items} == {c.value for c in Category}
+        assert {row["location"] for row in items} == {loc.value for loc in Location}
+
+    def test_item_names_unique_per_household(self, dataset):
+        directory, _ = dataset
+        items = read_csv(directory, "items")
+
+        assert len({(row["household_id"], row["name"]) for row in items}) == len(items)
+
+    def test_events_reference_items_of_their_household(self, dataset):
+        directory, _ = dataset
+        owner = {row["id"]: row["household_id"] for row in read_csv(directory, "items")}
+
+        for row in read_csv(directory, "events"):
+            assert owner[row["item_id"]] == row["household_id"]
+
+    def test_one_admin_per_household(self, dataset):
+        directory, _ = dataset
+        members = read_csv(directory, "household_members")
+
+        admins = [row["household_id"] for row in members if row["role"] == "admin"]
+        assert sorted(admins) == sorted(row["id"] for row in read_csv(directory, "households"))
+
+    def test_load_sql_copies_in_foreign_key_order(self, dataset):
+        directory, _ = dataset
+        with open(os.path.join(directory, "load.sql")) as f:
+            sql = f.read()
+
+        positions = [sql.index(f"FROM '{table}.csv'") for table in COPY_COLUMNS]
+        assert positions == sorted(positions)
+        assert sql.index("create_events_partition") < positions[0]
+
+
+class TestEvents:
+    """Event volume and seasonality"""
+
+    def test_events_target(self, tmp_path):
+        manifest = generate(GeneratorConfig(seed=3, households=30, events=50_000), str(tmp_path))
+
+        assert manifest["rows"]["events"] == pytest.approx(50_000, rel=0.1)
+
+    def test_restocks_peak_at_weekends(self, dataset):
+        directory, _ = dataset
+        restocks = np.array(
+            [
+                row["created_at"][:10]
+                for row in read_csv(directory, "events")
+                if row["event_type"] == "inventory.restocked"
+            ],
+            dtype="datetime64[D]",
+        )
+        weekday = (restocks.astype(np.int64) + 3) % 7  # Monday = 0
+        by_day = np.bincount(weekday, minlength=7)
+
+        assert by_day[5:].mean() > 1.5 * by_day[:5].mean()
+
+
+class TestReceipts:
+    """Rendered receipts and their ground truth"""
+
+    def test_ground_truth_matches_rows(self, dataset):
+        directory, _ = dataset
+        receipts = read_csv(directory, "receipts")
+        lines = read_csv(directory, "receipt_items")
+        item_ids = {row["id"] for row in read_csv(directory, "items")}
+
+        assert len(receipts) == 3
+        for receipt in receipts:
+            with open(os.path.join(directory, "receipts", receipt["file_path"]), "rb") as f:
+                assert len(f.read()) == int(receipt["file_size_bytes"])
+            truth_path = os.path.join(
+                directory, "receipts", receipt["file_path"].rsplit(".", 1)[0] + ".json"
+            )
+            with open(truth_path) as f:
+                truth = json.load(f)
+
+            assert f"{truth['total']:.2f}" == receipt["total_amount"]
+            assert truth["total"] == pytest.approx(truth["subtotal"] + truth["tax"])
+            mine = [line for line in lines if line["receipt_id"] == receipt["id"]]
+            assert [line["item_id"] for line in mine] == [
+                line["item_id"] for line in truth["lines"]
+            ]
+            assert {line["item_id"] for line in mine} <= item_ids
+
+    @pytest.mark.parametrize(
+        "file_format,magic", [("png", b"\x89PNG"), ("jpeg", b"\xff\xd8"), ("pdf", b"%PDF")]
+    )
+    def test_render_formats(self, file_format, magic):
+        rng = np.random.default_rng(1)
+        purchased_at = datetime(2025, 6, 7, 11, 30, tzinfo=timezone.utc)
+        receipt = build_receipt(
+            rng, "receipt-1", "household-1", uuid4_array(rng, 10), np.arange(10) * 97, purchased_at
+        )
+
+        assert render(receipt, file_format, rng).startswith(magic)
+        assert len(receipt.lines) >= 3
@@ -0,0 +1,143 @@
+"""
+Tests for OpenTelemetry tracing
+"""
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.logging import JSONFormatter
+from app.middleware.request_id import RequestIDMiddleware
+
+exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tracing_enabled():
+    """Export every span to memory for this module, then switch tracing off"""
+    with patch.object(settings, 'TRACING_SAMPLE_RATIO', 1.0):
+        tracing.setup_tracing("snakr-test", exporter=exporter)
+    tracing._enabled = True
+    yield
+    tracing._enabled = False
+
+
+@pytest.fixture(autouse=True)
+def clear_spans():
+    exporter.clear()
+
+
+def make_client() -> TestClient:
+    """App with the API's middleware order: request ID outside tracing"""
+    app = FastAPI()
+
+    @app.get("/households/{household_id}")
+    async def get_household(household_id: str):
+        with tracing.span("serialize"):
+            return {"id": household_id}
+
+    app.add_middleware(tracing.TracingMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return TestClient(app)
+
+
+def spans_by_name():
+    return {s.name: s for s in exporter.get_finished_spans()}
+
+
+class TestTracingMiddleware:
+    """Tests for the request server span"""
+
+    def test_span_named_by_route_with_request_id(self):
+        """Test the server span uses the route template and carries the request ID"""
+        response = make_client().get("/households/abc", headers={"X-Request-ID": "req-123"})
+
+        assert response.status_code == 200
+        spans = spans_by_name()
+        server = spans["GET /households/{household_id}"]
+        assert server.kind == trace.SpanKind.SERVER
+        assert server.attributes["snakr.request_id"] == "req-123"
+        assert server.attributes["http.response.status_code"] == 200
+        # Newer FastAPI versions add their own spans in between
+        assert spans["serialize"].context.trace_id == server.context.trace_id
+
+    def test_continues_incoming_trace(self):
+        """Test a W3C traceparent header makes the request part of the caller's trace"""
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        make_client().get(
+            "/households/abc",
+            headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+        )
+
+        server = spans_by_name()["GET /households/{household_id}"]
+        assert format(server.context.trace_id, "032x") == trace_id
+        assert server.parent.span_id == 0x00f067aa0ba902b7
+
+
+class TestPostgrestSpans:
+    """Tests for Supabase execute() spans"""
+
+    def test_builders_instrumented(self):
+        """Test the sync PostgREST builders' execute() is wrapped"""
+        from postgrest._sync.request_builder import SyncQueryRequestBuilder
+
+        assert SyncQueryRequestBuilder.execute._snakr_traced is True
+
+    def test_span_per_execute(self):
+        """Test each execute() runs in a client span named by method and table"""
+
+        class FakeBuilder:
+            request = SimpleNamespace(http_method="GET", path="http://localhost:54321/rest/v1/items")
+
+            def execute(self):
+                return "rows"
+
+        FakeBuilder.execute = tracing._traced_execute(FakeBuilder.execute)
+
+        assert FakeBuilder().execute() == "rows"
+        db_span = spans_by_name()["postgrest GET items"]
+        assert db_span.kind == trace.SpanKind.CLIENT
+        assert db_span.attributes["db.collection.name"] == "items"
+
+
+class TestTraceCorrelation:
+    """Tests for trace IDs in logs and task headers"""
+
+    def test_span_disabled(self):
+        """Test span() records nothing when tracing is off"""
+        with patch.object(tracing, '_enabled', False):
+            with tracing.span("receipt.ocr"):
+                assert tracing.current_trace_id() == ""
+
+        assert exporter.get_finished_spans() == ()
+
+    def test_log_records_carry_trace_id(self):
+        """Test JSON logs written inside a span include its trace ID"""
+        record = logging.LogRecord("snakr", logging.INFO, __file__, 1, "parsed receipt", None, None)
+
+        with tracing.span("receipt.parse"):
+            trace_id = tracing.current_trace_id()
+            log = json.loads(JSONFormatter().format(record))
+
+        assert len(trace_id) == 32
+        assert log["trace_id"] == trace_id
+
+    def test_task_headers_round_trip(self):
+        """Test context injected into task headers is read back from the task request"""
+        headers = {}
+        with tracing.span("POST /api/v1/receipts"):
+            trace_id = tracing.current_trace_id()
+            propagate.inject(headers)
+
+        task_request = SimpleNamespace(**headers)
+        parent = propagate.extract(task_request, getter=tracing._TaskRequestGetter())
+
+        assert format(trace.get_current_span(parent).get_span_context().trace_id, "032x") == trace_id
@@ -0,0 +1,357 @@
+-- Migration: Partition events table by month
+-- Description: Convert the events log to monthly range partitions on created_at,
+--              with partition maintenance and retention functions
+-- Created: 2026-01-22 10:00:00
+
+-- ============================================================================
+-- Why
+-- ============================================================================
+-- events is append-only and grows forever. Every insert maintained seven
+-- secondary indexes, and household history queries walked ever-larger btrees.
+--
+-- After this migration:
+-- - events is partitioned by RANGE (created_at), one partition per month
+--   (events_YYYY_MM), plus events_default as a safety net for out-of-range rows
+-- - Queries that bound created_at (or order by it with a LIMIT) only touch the
+--   partitions they need
+-- - Indexes are trimmed to the ones the API actually uses:
+--     events_pkey                   (id, created_at)
+--     idx_events_household_created  (household_id, created_at DESC)
+--     idx_events_item_created       (item_id, created_at DESC) WHERE item_id IS NOT NULL
+--     idx_events_receipt_id         (receipt_id) WHERE receipt_id IS NOT NULL
+--   The dropped single-column indexes on household_id, item_id and created_at
+--   are covered by the composites (and by pruning); event_type alone is too
+--   low-cardinality to be worth an index.
+-- - maintain_events_partitions() creates future partitions and detaches
+--   partitions older than the retention window, moving them to the
+--   events_archive schema (or dropping them). It is run daily by the
+--   tasks.maintenance.maintain_event_partitions Celery task.
+
+-- ============================================================================
+-- Move the existing table aside
+-- ============================================================================
+
+ALTER TABLE events RENAME TO events_unpartitioned;
+ALTER INDEX events_pkey RENAME TO events_unpartitioned_pkey;
+
+-- Index names are schema-wide; free them for the partitioned table
+DROP INDEX IF EXISTS idx_events_household_id;
+DROP INDEX IF EXISTS idx_events_event_type;
+DROP INDEX IF EXISTS idx_events_item_id;
+DROP INDEX IF EXISTS idx_events_receipt_id;
+DROP INDEX IF EXISTS idx_events_created_at;
+DROP INDEX IF EXISTS idx_events_household_created;
+DROP INDEX IF EXISTS idx_events_item_created;
+
+-- ============================================================================
+-- Partitioned Events Table
+-- ============================================================================
+-- Same columns and constraints as before. The primary key must include the
+-- partition key, so it becomes (id, created_at); id is still a random UUID.
+
+CREATE TABLE events (
+    -- Primary key (with partition key)
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+
+    -- Multi-tenant isolation
+    household_id UUID NOT NULL REFERENCES households(id) ON DELETE CASCADE,
+
+    -- Event metadata
+    event_type TEXT NOT NULL CHECK (event_type IN (
+        'inventory.used',
+        'inventory.restocked',
+        'inventory.ran_out',
+        'receipt.ingested',
+        'receipt.confirmed',
+        'prediction.generated',
+        'iot.door_opened',
+        'iot.weight_changed',
+        'iot.snapshot_available'
+    )),
+
+    -- Event source (who/what triggered this event)
+    source TEXT NOT NULL CHECK (source IN (
+        'user',
+        'receipt',
+        'prediction',
+        'iot',
+        'system'
+    )),
+
+    -- Related entities
+    item_id UUID REFERENCES items(id) ON DELETE SET NULL,
+    receipt_id UUID,
+
+    -- Event data
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    -- Confidence score (0.0-1.0)
+    confidence NUMERIC(3,2) NOT NULL DEFAULT 1.0 CHECK (confidence >= 0.0 AND confidence <= 1.0),
+
+    -- Timestamp (immutable, set once) and partition key
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catches rows outside every monthly partition (e.g. far-backdated imports)
+-- so inserts never fail. Normally empty; create_events_partition() moves any
+-- rows it holds into the matching month when that partition is created.
+CREATE TABLE events_default PARTITION OF events DEFAULT;
+
+-- ============================================================================
+-- Indexes (created on every partition automatically)
+-- ============================================================================
+
+-- Household history, newest first (events API, exports, predictions)
+CREATE INDEX idx_events_household_created ON events(household_id, created_at DESC);
+
+-- Item history queries
+CREATE INDEX idx_events_item_created ON events(item_id, created_at DESC) WHERE item_id IS NOT NULL;
+
+-- Get events for a specific receipt
+CREATE INDEX idx_events_receipt_id ON events(receipt_id) WHERE receipt_id IS NOT NULL;
+
+-- ============================================================================
+-- Archive Schema
+-- ============================================================================
+-- Detached partitions are moved here when archiving. The schema is not exposed
+-- through the API; the offline Parquet export can still read it directly.
+
+CREATE SCHEMA IF NOT EXISTS events_archive;
+REVOKE ALL ON SCHEMA events_archive FROM PUBLIC;
+
+-- ============================================================================
+-- Partition Maintenance Functions
+-- ============================================================================
+
+-- Create the partition holding the month of p_month (no-op if it exists).
+-- Returns the partition name, or NULL when it already existed.
+CREATE OR REPLACE FUNCTION create_events_partition(p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::date;
+    v_name TEXT := 'events_' || to_char(date_trunc('month', p_month), 'YYYY_MM');
+    v_from TIMESTAMPTZ := v_start::timestamp AT TIME ZONE 'UTC';
+    v_to TIMESTAMPTZ := (v_start + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass('public.' || v_name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Build the table standalone, move any rows for this month out of the
+    -- default partition, then attach (attaching fails if default still has them)
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    EXECUTE format(
+        'WITH moved AS (
+            DELETE FROM events_default
+            WHERE created_at >= %L AND created_at < %L
+            RETURNING *
+        )
+        INSERT INTO %I SELECT * FROM moved',
+        v_from, v_to, v_name
+    );
+    EXECUTE format(
+        'ALTER TABLE events ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_from, v_to
+    );
+
+    -- Partitions are only meant to be read through events, where RLS applies
+    EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', v_name);
+    EXECUTE format('REVOKE ALL ON %I FROM anon, authenticated', v_name);
+
+    RETURN v_name;
+END;
+$$;
+
+-- Make sure partitions exist for the current month and the next p_months_ahead.
+-- Returns the names of partitions that were created.
+CREATE OR REPLACE FUNCTION ensure_events_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS SETOF TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_month DATE;
+    v_name TEXT;
+BEGIN
+    FOR v_month IN
+        SELECT generate_series(
+            date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+            date_trunc('month', NOW() AT TIME ZONE 'UTC') + make_interval(months => p_months_ahead),
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        v_name := create_events_partition(v_month);
+        IF v_name IS NOT NULL THEN
+            RETURN NEXT v_name;
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Detach monthly partitions that ended more than p_retention_months ago.
+-- Archived partitions move to the events_archive schema; otherwise they are
+-- dropped. Returns the names of partitions that were detached.
+CREATE OR REPLACE FUNCTION detach_old_events_partitions(
+    p_retention_months INTEGER,
+    p_archive BOOLEAN DEFAULT TRUE
+)
+RETURNS SETOF TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_cutoff DATE := (
+        date_trunc('month', NOW() AT TIME ZONE 'UTC') - make_interval(months => p_retention_months)
+    )::date;
+    v_partition RECORD;
+BEGIN
+    IF p_retention_months < 1 THEN
+        RAISE EXCEPTION 'Retention must be at least one month (got %)', p_retention_months;
+    END IF;
+
+    FOR v_partition IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'public.events'::regclass
+        AND c.relname ~ '^events_[0-9]{4}_[0-9]{2}$'
+        AND to_date(substring(c.relname FROM 8), 'YYYY_MM') + INTERVAL '1 month' <= v_cutoff
+        ORDER BY c.relname
+    LOOP
+        EXECUTE format('ALTER TABLE events DETACH PARTITION %I', v_partition.relname);
+
+        IF p_archive THEN
+            EXECUTE format('ALTER TABLE %I SET SCHEMA events_archive', v_partition.relname);
+        ELSE
+            EXECUTE format('DROP TABLE %I', v_partition.relname);
+        END IF;
+
+        RETURN NEXT v_partition.relname;
+    END LOOP;
+END;
+$$;
+
+-- Entry point for the maintenance task (one RPC call)
+CREATE OR REPLACE FUNCTION maintain_events_partitions(
+    p_months_ahead INTEGER DEFAULT 3,
+    p_retention_months INTEGER DEFAULT 24,
+    p_archive BOOLEAN DEFAULT TRUE
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_created TEXT[];
+    v_detached TEXT[];
+BEGIN
+    SELECT COALESCE(array_agg(name), '{}') INTO v_created
+    FROM ensure_events_partitions(p_months_ahead) AS name;
+
+    SELECT COALESCE(array_agg(name), '{}') INTO v_detached
+    FROM detach_old_events_partitions(p_retention_months, p_archive) AS name;
+
+    RETURN jsonb_build_object(
+        'created', to_jsonb(v_created),
+        'detached', to_jsonb(v_detached),
+        'archived', p_archive
+    );
+END;
+$$;
+
+-- Maintenance is for the service role only
+REVOKE EXECUTE ON FUNCTION create_events_partition(DATE) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION ensure_events_partitions(INTEGER) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION detach_old_events_partitions(INTEGER, BOOLEAN) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION maintain_events_partitions(INTEGER, INTEGER, BOOLEAN) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION create_events_partition(DATE) FROM anon, authenticated;
+REVOKE EXECUTE ON FUNCTION ensure_events_partitions(INTEGER) FROM anon, authenticated;
+REVOKE EXECUTE ON FUNCTION detach_old_events_partitions(INTEGER, BOOLEAN) FROM anon, authenticated;
+REVOKE EXECUTE ON FUNCTION maintain_events_partitions(INTEGER, INTEGER, BOOLEAN) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION maintain_events_partitions(INTEGER, INTEGER, BOOLEAN) TO service_role;
+
+-- ============================================================================
+-- Copy Existing Events
+-- ============================================================================
+
+-- Partitions covering the existing history plus the next three months
+SELECT create_events_partition(month::date)
+FROM generate_series(
+    date_trunc('month', COALESCE(
+        (SELECT MIN(created_at) FROM events_unpartitioned),
+        NOW()
+    ) AT TIME ZONE 'UTC'),
+    date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS month;
+
+INSERT INTO events (
+    id, household_id, event_type, source, item_id,
+    receipt_id, payload, confidence, created_at
+)
+SELECT
+    id, household_id, event_type, source, item_id,
+    receipt_id, payload, confidence, created_at
+FROM events_unpartitioned;
+
+DROP TABLE events_unpartitioned;
+
+-- ============================================================================
+-- Row Level Security (RLS)
+-- ============================================================================
+-- Policies on the parent apply to every query through events. Partitions have
+-- RLS enabled with no policies and no grants, so they can't be read directly.
+
+ALTER TABLE events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE events_default ENABLE ROW LEVEL SECURITY;
+REVOKE ALL ON events_default FROM anon, authenticated;
+
+-- Users can view events from their households
+CREATE POLICY events_select_policy ON events
+    FOR SELECT
+    USING (
+        household_id IN (
+            SELECT household_id
+            FROM household_members
+            WHERE user_id = auth.uid()
+        )
+    );
+
+-- Users can create events in their households
+CREATE POLICY events_insert_policy ON events
+    FOR INSERT
+    WITH CHECK (
+        household_id IN (
+            SELECT household_id
+            FROM household_members
+            WHERE user_id = auth.uid()
+        )
+    );
+
+-- Events are immutable - no UPDATE or DELETE policies
+
+-- ============================================================================
+-- Comments
+-- ============================================================================
+
+COMMENT ON TABLE events IS 'Immutable event log, partitioned monthly by created_at';
+COMMENT ON COLUMN events.event_type IS 'Type of event: inventory.*, receipt.*, prediction.*, iot.*';
+COMMENT ON COLUMN events.source IS 'Event source: user, receipt, prediction, iot, system';
+COMMENT ON COLUMN events.payload IS 'Flexible JSON payload for event-specific data';
+COMMENT ON COLUMN events.confidence IS 'Confidence score 0.0-1.0 (1.0 for user actions, lower for predictions)';
+COMMENT ON COLUMN events.created_at IS 'Event timestamp (immutable, append-only); partition key';
+COMMENT ON TABLE events_default IS 'Default partition for events outside the monthly partitions';
+COMMENT ON FUNCTION maintain_events_partitions(INTEGER, INTEGER, BOOLEAN) IS
+    'Create upcoming monthly events partitions and detach those past retention';
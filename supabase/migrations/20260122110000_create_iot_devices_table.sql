@@ -0,0 +1,84 @@
+-- Create iot_devices table for IoT event ingestion
+-- Each device belongs to one household and authenticates with its own key.
+-- Only a SHA-256 hash of the key is stored; the key itself is shown once when
+-- the device is registered.
+
+CREATE TABLE IF NOT EXISTS iot_devices (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id UUID NOT NULL REFERENCES households(id) ON DELETE CASCADE,
+    name TEXT NOT NULL CHECK (length(name) BETWEEN 1 AND 100),
+    location TEXT, -- Default location for readings (e.g. fridge, pantry)
+    key_hash TEXT NOT NULL UNIQUE CHECK (key_hash ~ '^[0-9a-f]{64}$'), -- SHA-256 hex of the device key
+    key_prefix TEXT NOT NULL, -- First characters of the key, to tell keys apart in the UI
+    created_by UUID REFERENCES auth.users(id) ON DELETE SET NULL,
+    last_seen_at TIMESTAMPTZ,
+    revoked_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Create indexes for performance
+CREATE INDEX idx_iot_devices_household_id ON iot_devices(household_id);
+
+-- Create updated_at trigger
+CREATE TRIGGER update_iot_devices_updated_at
+    BEFORE UPDATE ON iot_devices
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Enable Row Level Security
+-- Device authentication runs with the service role; these policies cover
+-- household members managing their devices.
+ALTER TABLE iot_devices ENABLE ROW LEVEL SECURITY;
+
+-- Policy: Users can view devices of households they are members of
+CREATE POLICY iot_devices_select_policy ON iot_devices
+    FOR SELECT
+    USING (
+        household_id IN (
+            SELECT household_id
+            FROM household_members
+            WHERE user_id = auth.uid()
+        )
+    );
+
+-- Policy: Only admins can register devices
+CREATE POLICY iot_devices_insert_policy ON iot_devices
+    FOR INSERT
+    WITH CHECK (
+        household_id IN (
+            SELECT household_id
+            FROM household_members
+            WHERE user_id = auth.uid()
+            AND role = 'admin'
+        )
+    );
+
+-- Policy: Only admins can update devices (e.g., to revoke)
+CREATE POLICY iot_devices_update_policy ON iot_devices
+    FOR UPDATE
+    USING (
+        household_id IN (
+            SELECT household_id
+            FROM household_members
+            WHERE user_id = auth.uid()
+            AND role = 'admin'
+        )
+    );
+
+-- Policy: Only admins can delete devices
+CREATE POLICY iot_devices_delete_policy ON iot_devices
+    FOR DELETE
+    USING (
+        household_id IN (
+            SELECT household_id
+            FROM household_members
+            WHERE user_id = auth.uid()
+            AND role = 'admin'
+        )
+    );
+
+-- Add comment to table
+COMMENT ON TABLE iot_devices IS 'IoT devices allowed to post readings for a household';
+COMMENT ON COLUMN iot_devices.key_hash IS 'SHA-256 hex digest of the per-device key (the key itself is never stored)';
+COMMENT ON COLUMN iot_devices.revoked_at IS 'When set, the device key is no longer accepted';
@@ -0,0 +1,70 @@
+-- Create get_household_detail function
+-- Returns a household, its members and member/admin counts in one statement,
+-- with the membership check in the same query (one round-trip instead of
+-- three for the household screen)
+
+-- ============================================================================
+-- Household Detail
+-- ============================================================================
+
+-- Returns NULL when p_user_id is not a member of p_household_id (which also
+-- covers households that don't exist), so callers can't probe for household
+-- IDs. With p_summary the members array is omitted and only counts are
+-- returned, for households with many members.
+--
+-- SECURITY INVOKER: when called with a user's JWT, RLS on households and
+-- household_members still applies on top of the explicit membership check.
+CREATE OR REPLACE FUNCTION get_household_detail(
+    p_household_id UUID,
+    p_user_id UUID,
+    p_summary BOOLEAN DEFAULT FALSE
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT jsonb_build_object(
+        'id', h.id,
+        'name', h.name,
+        'created_at', h.created_at,
+        'updated_at', h.updated_at,
+        'member_count', counts.member_count,
+        'admin_count', counts.admin_count
+    ) || CASE
+        WHEN p_summary THEN '{}'::JSONB
+        ELSE jsonb_build_object('members', (
+            SELECT COALESCE(
+                jsonb_agg(
+                    jsonb_build_object(
+                        'id', m.id,
+                        'user_id', m.user_id,
+                        'role', m.role,
+                        'joined_at', m.joined_at
+                    )
+                    ORDER BY m.joined_at
+                ),
+                '[]'::JSONB
+            )
+            FROM household_members m
+            WHERE m.household_id = h.id
+        ))
+    END
+    FROM household_members me
+    JOIN households h ON h.id = me.household_id
+    CROSS JOIN LATERAL (
+        SELECT
+            COUNT(*) AS member_count,
+            COUNT(*) FILTER (WHERE m.role = 'admin') AS admin_count
+        FROM household_members m
+        WHERE m.household_id = h.id
+    ) counts
+    WHERE me.household_id = p_household_id
+      AND me.user_id = p_user_id;
+$$;
+
+COMMENT ON FUNCTION get_household_detail(UUID, UUID, BOOLEAN) IS 'Household with members and member/admin counts, or NULL if the user is not a member; p_summary omits the members array';
+
+REVOKE EXECUTE ON FUNCTION get_household_detail(UUID, UUID, BOOLEAN) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION get_household_detail(UUID, UUID, BOOLEAN) FROM anon;
+GRANT EXECUTE ON FUNCTION get_household_detail(UUID, UUID, BOOLEAN) TO authenticated, service_role;
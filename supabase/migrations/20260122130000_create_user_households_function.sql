@@ -0,0 +1,101 @@
+-- Create get_user_households function
+-- Returns the households a user belongs to with their role and, optionally,
+-- inventory and restock stats, in one statement (the home screen needs one
+-- request instead of one per household)
+
+-- ============================================================================
+-- User Households
+-- ============================================================================
+
+-- One row per household the user is a member of, ordered by when they joined.
+-- With p_include_stats, `stats` holds the item count, per-state inventory
+-- counts and per-urgency restock counts (dismissed entries excluded);
+-- otherwise it is NULL and the stats aggregates are skipped.
+--
+-- Each stats aggregate is a single GROUP BY household_id over the user's
+-- households, with FILTER clauses for the per-state/urgency counts, so it can
+-- be answered from idx_inventory_household_state and
+-- idx_restock_list_household_urgency without touching other households' rows.
+--
+-- SECURITY INVOKER: when called with a user's JWT, RLS on every table read
+-- still applies on top of the explicit membership filter.
+CREATE OR REPLACE FUNCTION get_user_households(
+    p_user_id UUID,
+    p_include_stats BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+    id UUID,
+    name TEXT,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    role TEXT,
+    stats JSONB
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    WITH memberships AS (
+        SELECT hm.household_id, hm.role, hm.joined_at
+        FROM household_members hm
+        WHERE hm.user_id = p_user_id
+    ),
+    inventory_stats AS (
+        SELECT
+            inv.household_id,
+            COUNT(*) AS item_count,
+            COUNT(*) FILTER (WHERE inv.state = 'plenty') AS plenty,
+            COUNT(*) FILTER (WHERE inv.state = 'ok') AS ok,
+            COUNT(*) FILTER (WHERE inv.state = 'low') AS low,
+            COUNT(*) FILTER (WHERE inv.state = 'almost_out') AS almost_out,
+            COUNT(*) FILTER (WHERE inv.state = 'out') AS out
+        FROM inventory inv
+        WHERE p_include_stats
+          AND inv.household_id IN (SELECT m.household_id FROM memberships m)
+        GROUP BY inv.household_id
+    ),
+    restock_stats AS (
+        SELECT
+            rl.household_id,
+            COUNT(*) FILTER (WHERE rl.urgency = 'need_now') AS need_now,
+            COUNT(*) FILTER (WHERE rl.urgency = 'need_soon') AS need_soon,
+            COUNT(*) FILTER (WHERE rl.urgency = 'nice_to_top_up') AS nice_to_top_up
+        FROM restock_list rl
+        WHERE p_include_stats
+          AND rl.household_id IN (SELECT m.household_id FROM memberships m)
+          AND (rl.dismissed_until IS NULL OR rl.dismissed_until <= NOW())
+        GROUP BY rl.household_id
+    )
+    SELECT
+        h.id,
+        h.name,
+        h.created_at,
+        h.updated_at,
+        m.role,
+        CASE WHEN p_include_stats THEN jsonb_build_object(
+            'item_count', COALESCE(s.item_count, 0),
+            'states', jsonb_build_object(
+                'plenty', COALESCE(s.plenty, 0),
+                'ok', COALESCE(s.ok, 0),
+                'low', COALESCE(s.low, 0),
+                'almost_out', COALESCE(s.almost_out, 0),
+                'out', COALESCE(s.out, 0)
+            ),
+            'restock', jsonb_build_object(
+                'need_now', COALESCE(r.need_now, 0),
+                'need_soon', COALESCE(r.need_soon, 0),
+                'nice_to_top_up', COALESCE(r.nice_to_top_up, 0)
+            )
+        ) END
+    FROM memberships m
+    JOIN households h ON h.id = m.household_id
+    LEFT JOIN inventory_stats s ON s.household_id = m.household_id
+    LEFT JOIN restock_stats r ON r.household_id = m.household_id
+    ORDER BY m.joined_at;
+$$;
+
+COMMENT ON FUNCTION get_user_households(UUID, BOOLEAN) IS 'Households the user belongs to with their role; p_include_stats adds item, per-state inventory and restock counts';
+
+REVOKE EXECUTE ON FUNCTION get_user_households(UUID, BOOLEAN) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION get_user_households(UUID, BOOLEAN) FROM anon;
+GRANT EXECUTE ON FUNCTION get_user_households(UUID, BOOLEAN) TO authenticated, service_role;
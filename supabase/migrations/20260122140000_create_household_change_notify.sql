@@ -0,0 +1,149 @@
+-- Create household change notifications
+-- Publishes a NOTIFY on the household_changes channel whenever a household
+-- (its name) or its items, inventory, restock entries, members or invitations
+-- change.
+-- The API listens on this channel to invalidate its household cache and push
+-- updates to connected clients (GET /api/v1/households/{id}/stream), so
+-- clients no longer need to poll.
+
+-- ============================================================================
+-- Notify Function
+-- ============================================================================
+
+-- Statement-level: one notification per household per statement, however
+-- many rows it touched (a receipt confirmation updating 40 inventory rows
+-- sends one message). Payload:
+--
+--   {"household_id": "...", "table": "inventory", "op": "UPDATE",
+--    "item_ids": ["...", ...]}
+--
+-- item_ids lists the affected items (for items, inventory and restock_list)
+-- and is NULL when more than 50 rows changed or the table has no item, in
+-- which case clients should refetch the household's list. TG_ARGV[0] names
+-- the item column (id for items, item_id otherwise; empty or omitted for
+-- none) and TG_ARGV[1] the household column (household_id unless given; id
+-- for households itself).
+--
+-- Rows are read from the transition table `changed_rows`, declared by each
+-- trigger as the NEW (INSERT/UPDATE) or OLD (DELETE) table. NOTIFY payloads
+-- are delivered on commit only, so rolled-back writes never notify.
+CREATE OR REPLACE FUNCTION notify_household_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_item_column TEXT := NULLIF(TG_ARGV[0], '');
+    v_household_column TEXT := COALESCE(TG_ARGV[1], 'household_id');
+BEGIN
+    PERFORM pg_notify(
+        'household_changes',
+        jsonb_build_object(
+            'household_id', changes.household_id,
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'item_ids', CASE WHEN changes.row_count <= 50 THEN changes.item_ids END
+        )::TEXT
+    )
+    FROM (
+        SELECT
+            to_jsonb(c)->>v_household_column AS household_id,
+            COUNT(*) AS row_count,
+            jsonb_agg(DISTINCT to_jsonb(c)->>v_item_column)
+                FILTER (WHERE v_item_column IS NOT NULL) AS item_ids
+        FROM changed_rows c
+        GROUP BY 1
+    ) changes;
+
+    RETURN NULL;
+END;
+$$;
+
+COMMENT ON FUNCTION notify_household_change() IS 'Statement trigger: NOTIFY household_changes once per affected household';
+
+-- ============================================================================
+-- Triggers
+-- ============================================================================
+
+-- Transition tables allow a single event per trigger, hence three per table
+
+-- households (the name is part of cached detail payloads). No INSERT
+-- trigger: nothing is cached for a household before its first member is
+-- added, which notifies.
+CREATE TRIGGER notify_households_update
+    AFTER UPDATE ON households
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('', 'id');
+CREATE TRIGGER notify_households_delete
+    AFTER DELETE ON households
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('', 'id');
+
+-- items
+CREATE TRIGGER notify_items_insert
+    AFTER INSERT ON items
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('id');
+CREATE TRIGGER notify_items_update
+    AFTER UPDATE ON items
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('id');
+CREATE TRIGGER notify_items_delete
+    AFTER DELETE ON items
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('id');
+
+-- inventory
+CREATE TRIGGER notify_inventory_insert
+    AFTER INSERT ON inventory
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('item_id');
+CREATE TRIGGER notify_inventory_update
+    AFTER UPDATE ON inventory
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('item_id');
+CREATE TRIGGER notify_inventory_delete
+    AFTER DELETE ON inventory
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('item_id');
+
+-- restock_list
+CREATE TRIGGER notify_restock_list_insert
+    AFTER INSERT ON restock_list
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('item_id');
+CREATE TRIGGER notify_restock_list_update
+    AFTER UPDATE ON restock_list
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('item_id');
+CREATE TRIGGER notify_restock_list_delete
+    AFTER DELETE ON restock_list
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change('item_id');
+
+-- household_members (membership is cached by the API)
+CREATE TRIGGER notify_household_members_insert
+    AFTER INSERT ON household_members
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change();
+CREATE TRIGGER notify_household_members_update
+    AFTER UPDATE ON household_members
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change();
+CREATE TRIGGER notify_household_members_delete
+    AFTER DELETE ON household_members
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change();
+
+-- invitations
+CREATE TRIGGER notify_invitations_insert
+    AFTER INSERT ON invitations
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change();
+CREATE TRIGGER notify_invitations_update
+    AFTER UPDATE ON invitations
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change();
+CREATE TRIGGER notify_invitations_delete
+    AFTER DELETE ON invitations
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_household_change();
@@ -0,0 +1,185 @@
+-- Benchmark: Events Partitioning
+-- Purpose: Compare insert latency and index size of the old events layout
+--          (one heap, seven secondary indexes) against the monthly partitioned
+--          layout (three secondary indexes), and check partition pruning
+-- Runs inside a transaction and rolls back; nothing is left behind.
+--
+-- Usage:
+--   psql $DATABASE_URL -f supabase/migrations/tests/events_partitioning.sql
+--
+-- Tune the volume with: psql -v rows=1000000 ...
+
+\if :{?rows}
+\else
+\set rows 200000
+\endif
+
+BEGIN;
+
+-- ============================================================================
+-- Setup: Old Layout
+-- ============================================================================
+
+CREATE TEMP TABLE bench_events_plain (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id UUID NOT NULL,
+    event_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    item_id UUID,
+    receipt_id UUID,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    confidence NUMERIC(3,2) NOT NULL DEFAULT 1.0,
+    created_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX ON bench_events_plain(household_id);
+CREATE INDEX ON bench_events_plain(event_type);
+CREATE INDEX ON bench_events_plain(item_id) WHERE item_id IS NOT NULL;
+CREATE INDEX ON bench_events_plain(receipt_id) WHERE receipt_id IS NOT NULL;
+CREATE INDEX ON bench_events_plain(created_at DESC);
+CREATE INDEX ON bench_events_plain(household_id, created_at DESC);
+CREATE INDEX ON bench_events_plain(item_id, created_at DESC) WHERE item_id IS NOT NULL;
+
+-- ============================================================================
+-- Setup: Partitioned Layout (12 monthly partitions)
+-- ============================================================================
+
+CREATE TEMP TABLE bench_events_partitioned (
+    LIKE bench_events_plain INCLUDING DEFAULTS,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(DATE '2025-01-01', DATE '2025-12-01', INTERVAL '1 month')::date
+    LOOP
+        EXECUTE format(
+            'CREATE TEMP TABLE %I PARTITION OF bench_events_partitioned FOR VALUES FROM (%L) TO (%L)',
+            'bench_events_' || to_char(month, 'YYYY_MM'), month, month + INTERVAL '1 month'
+        );
+    END LOOP;
+END $$;
+
+CREATE INDEX ON bench_events_partitioned(household_id, created_at DESC);
+CREATE INDEX ON bench_events_partitioned(item_id, created_at DESC) WHERE item_id IS NOT NULL;
+CREATE INDEX ON bench_events_partitioned(receipt_id) WHERE receipt_id IS NOT NULL;
+
+-- ============================================================================
+-- Synthetic Events (50 households x 40 items, spread over 2025)
+-- ============================================================================
+
+CREATE TEMP TABLE bench_source AS
+SELECT
+    gen_random_uuid() AS id,
+    ('00000000-0000-0000-0000-' || lpad((n % 50)::text, 12, '0'))::uuid AS household_id,
+    (ARRAY['inventory.used', 'inventory.restocked', 'inventory.ran_out'])[1 + n % 3] AS event_type,
+    'user' AS source,
+    ('00000000-0000-0000-0001-' || lpad((n % 2000)::text, 12, '0'))::uuid AS item_id,
+    CASE WHEN n % 20 = 0 THEN gen_random_uuid() END AS receipt_id,
+    '{"previous_state": "ok", "new_state": "low"}'::jsonb AS payload,
+    1.0 AS confidence,
+    TIMESTAMPTZ '2025-01-01' + (n * (INTERVAL '365 days' / :rows)) AS created_at
+FROM generate_series(1, :rows) AS n;
+
+-- ============================================================================
+-- Test 1: Insert Latency
+-- ============================================================================
+
+\echo 'Insert latency (old layout, 7 secondary indexes):'
+\timing on
+INSERT INTO bench_events_plain SELECT * FROM bench_source;
+\timing off
+
+\echo 'Insert latency (partitioned, 3 secondary indexes):'
+\timing on
+INSERT INTO bench_events_partitioned SELECT * FROM bench_source;
+\timing off
+
+-- ============================================================================
+-- Test 2: Index Size
+-- ============================================================================
+
+SELECT
+    'old layout' AS layout,
+    pg_size_pretty(pg_indexes_size('bench_events_plain')) AS index_size,
+    pg_size_pretty(pg_relation_size('bench_events_plain')) AS heap_size
+UNION ALL
+SELECT
+    'partitioned',
+    pg_size_pretty(SUM(pg_indexes_size(i.inhrelid))),
+    pg_size_pretty(SUM(pg_relation_size(i.inhrelid)))
+FROM pg_inherits i
+WHERE i.inhparent = 'bench_events_partitioned'::regclass;
+
+-- Largest single btree a household query has to descend
+SELECT
+    'old layout' AS layout,
+    pg_size_pretty(MAX(pg_relation_size(indexrelid))) AS household_created_index
+FROM pg_index
+WHERE indrelid = 'bench_events_plain'::regclass
+AND pg_get_indexdef(indexrelid) LIKE '%(household_id, created_at DESC)%'
+UNION ALL
+SELECT
+    'partitioned (per month)',
+    pg_size_pretty(MAX(pg_relation_size(x.indexrelid)))
+FROM pg_inherits i
+JOIN pg_index x ON x.indrelid = i.inhrelid
+WHERE i.inhparent = 'bench_events_partitioned'::regclass
+AND pg_get_indexdef(x.indexrelid) LIKE '%(household_id, created_at DESC)%';
+
+-- ============================================================================
+-- Test 3: Partition Pruning
+-- ============================================================================
+
+ANALYZE bench_events_plain;
+ANALYZE bench_events_partitioned;
+
+DO $$
+DECLARE
+    plan JSONB;
+    scanned INTEGER;
+BEGIN
+    -- Events API page: one household, bounded to a month, newest first
+    EXECUTE
+        'EXPLAIN (FORMAT JSON)
+        SELECT id, created_at FROM bench_events_partitioned
+        WHERE household_id = ''00000000-0000-0000-0000-000000000007''
+        AND created_at >= ''2025-06-01'' AND created_at <= ''2025-06-20''
+        ORDER BY created_at DESC, id DESC
+        LIMIT 51'
+    INTO plan;
+
+    SELECT COUNT(*) INTO scanned
+    FROM regexp_matches(plan::text, '"Relation Name": "bench_events_2025_[0-9]+"', 'g');
+
+    IF scanned != 1 THEN
+        RAISE EXCEPTION 'FAILED: Bounded query scanned % partitions', scanned;
+    END IF;
+    RAISE NOTICE 'PASSED: Bounded household query scans 1 of 12 partitions';
+
+    -- Keyset page: the OR predicate alone cannot prune; the extra
+    -- created_at <= cursor bound the API adds lets the planner skip later months
+    EXECUTE
+        'EXPLAIN (FORMAT JSON)
+        SELECT id, created_at FROM bench_events_partitioned
+        WHERE household_id = ''00000000-0000-0000-0000-000000000007''
+        AND created_at <= ''2025-03-15''
+        AND (created_at < ''2025-03-15''
+             OR (created_at = ''2025-03-15'' AND id < ''ffffffff-ffff-ffff-ffff-ffffffffffff''))
+        ORDER BY created_at DESC, id DESC
+        LIMIT 51'
+    INTO plan;
+
+    SELECT COUNT(*) INTO scanned
+    FROM regexp_matches(plan::text, '"Relation Name": "bench_events_2025_[0-9]+"', 'g');
+
+    IF scanned > 3 THEN
+        RAISE EXCEPTION 'FAILED: Keyset query scanned % partitions', scanned;
+    END IF;
+    RAISE NOTICE 'PASSED: Keyset page scans % of 12 partitions', scanned;
+END $$;
+
+ROLLBACK;
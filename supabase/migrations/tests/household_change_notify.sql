@@ -0,0 +1,44 @@
+-- Household change notification test
+-- Run with psql (not inside a transaction): psql prints each notification as
+--   Asynchronous notification "household_changes" with payload "..." received
+--
+-- Expected, in order:
+--   1. items INSERT with 2 item_ids (one notification for a 2-row insert)
+--   2. inventory INSERT with 2 item_ids
+--   3. inventory UPDATE with 2 item_ids (one statement, one notification)
+--   4. households UPDATE with null item_ids (rename)
+--   5. households, items and inventory DELETE (cleanup, cascaded from the
+--      household)
+-- Nothing is printed for the rolled-back update.
+
+LISTEN household_changes;
+
+CREATE TEMP TABLE notify_test AS
+SELECT gen_random_uuid() AS household_id;
+
+INSERT INTO households (id, name) SELECT household_id, 'Notify Test' FROM notify_test;
+
+INSERT INTO items (household_id, name, category, location)
+SELECT household_id, name, 'dairy', 'fridge'
+FROM notify_test, (VALUES ('Milk'), ('Eggs')) AS v(name);
+
+INSERT INTO inventory (household_id, item_id, state)
+SELECT i.household_id, i.id, 'ok'
+FROM items i JOIN notify_test t ON t.household_id = i.household_id;
+
+UPDATE inventory SET state = 'low'
+WHERE household_id = (SELECT household_id FROM notify_test);
+
+UPDATE households SET name = 'Notify Test (renamed)'
+WHERE id = (SELECT household_id FROM notify_test);
+
+BEGIN;
+UPDATE inventory SET state = 'out'
+WHERE household_id = (SELECT household_id FROM notify_test);
+ROLLBACK;
+
+-- Cleanup
+DELETE FROM households WHERE id = (SELECT household_id FROM notify_test);
+DROP TABLE notify_test;
+
+UNLISTEN household_changes;
@@ -41,16 +41,14 @@ END $$;
 -- ============================================================================
 -- 3. Verify Indexes
 -- ============================================================================
+-- Index set after 20260122100000_partition_events_table.sql (see
+-- verify/events_partitions.sql for partition checks)
 
 DO $$
 DECLARE
     expected_indexes TEXT[] := ARRAY[
         'events_pkey',
-        'idx_events_household_id',
-        'idx_events_event_type',
-        'idx_events_item_id',
         'idx_events_receipt_id',
-        'idx_events_created_at',
         'idx_events_household_created',
         'idx_events_item_created'
     ];
@@ -0,0 +1,157 @@
+-- Verification Script: Events Partitioning Migration
+-- Purpose: Verify that events is range-partitioned by month, that maintenance
+--          functions work and that household queries prune partitions
+-- Run this after applying 20260122100000_partition_events_table.sql
+
+-- ============================================================================
+-- 1. Verify Table Is Partitioned
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = 'events' AND pt.partstrat = 'r'
+    ) THEN
+        RAISE EXCEPTION 'FAILED: events is not range partitioned';
+    END IF;
+    RAISE NOTICE 'PASSED: events is range partitioned';
+END $$;
+
+-- ============================================================================
+-- 2. Verify Partitions Exist
+-- ============================================================================
+
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    IF to_regclass('public.events_default') IS NULL THEN
+        RAISE EXCEPTION 'FAILED: events_default partition does not exist';
+    END IF;
+
+    -- Current month plus three ahead
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+            date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        IF to_regclass('public.events_' || to_char(month, 'YYYY_MM')) IS NULL THEN
+            RAISE EXCEPTION 'FAILED: Partition for % does not exist', to_char(month, 'YYYY-MM');
+        END IF;
+    END LOOP;
+    RAISE NOTICE 'PASSED: Current and upcoming partitions exist';
+END $$;
+
+-- ============================================================================
+-- 3. Verify Partitions Are Locked Down
+-- ============================================================================
+
+DO $$
+DECLARE
+    part RECORD;
+BEGIN
+    FOR part IN
+        SELECT c.relname, c.relrowsecurity
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'public.events'::regclass
+    LOOP
+        IF NOT part.relrowsecurity THEN
+            RAISE EXCEPTION 'FAILED: RLS not enabled on partition %', part.relname;
+        END IF;
+        IF has_table_privilege('authenticated', part.relname, 'SELECT') THEN
+            RAISE EXCEPTION 'FAILED: authenticated can read partition % directly', part.relname;
+        END IF;
+    END LOOP;
+    RAISE NOTICE 'PASSED: Partitions are only reachable through events';
+END $$;
+
+-- ============================================================================
+-- 4. Verify Rows Route To Monthly Partitions
+-- ============================================================================
+
+DO $$
+DECLARE
+    test_household_id UUID;
+    test_event_id UUID;
+    partition_name TEXT;
+BEGIN
+    SELECT id INTO test_household_id FROM households LIMIT 1;
+
+    INSERT INTO events (household_id, event_type, source, payload)
+    VALUES (test_household_id, 'inventory.used', 'user', '{}'::jsonb)
+    RETURNING id INTO test_event_id;
+
+    SELECT tableoid::regclass::text INTO partition_name
+    FROM events WHERE id = test_event_id;
+
+    IF partition_name != 'events_' || to_char(NOW() AT TIME ZONE 'UTC', 'YYYY_MM') THEN
+        RAISE EXCEPTION 'FAILED: Event landed in % instead of the current month', partition_name;
+    END IF;
+    RAISE NOTICE 'PASSED: Events route to the current month partition';
+
+    DELETE FROM events WHERE id = test_event_id;
+END $$;
+
+-- ============================================================================
+-- 5. Verify Maintenance Is Idempotent
+-- ============================================================================
+
+DO $$
+DECLARE
+    result JSONB;
+BEGIN
+    -- Partitions already exist and nothing is past a 100 year retention
+    result := maintain_events_partitions(3, 1200, TRUE);
+
+    IF jsonb_array_length(result->'created') != 0 OR jsonb_array_length(result->'detached') != 0 THEN
+        RAISE EXCEPTION 'FAILED: Maintenance was not a no-op: %', result;
+    END IF;
+    RAISE NOTICE 'PASSED: Maintenance is idempotent';
+END $$;
+
+-- ============================================================================
+-- 6. Verify Household Queries Prune Partitions
+-- ============================================================================
+-- Mirrors the events API page query (household + created_at bound, newest
+-- first). Only the partitions overlapping the bound may appear in the plan.
+
+DO $$
+DECLARE
+    plan JSONB;
+    plan_text TEXT;
+    scanned INTEGER;
+BEGIN
+    EXECUTE format(
+        'EXPLAIN (FORMAT JSON)
+        SELECT id, created_at FROM events
+        WHERE household_id = %L
+        AND created_at >= %L AND created_at <= %L
+        ORDER BY created_at DESC, id DESC
+        LIMIT 51',
+        gen_random_uuid(),
+        date_trunc('month', NOW()),
+        NOW()
+    ) INTO plan;
+
+    plan_text := plan::text;
+    SELECT COUNT(*) INTO scanned
+    FROM regexp_matches(plan_text, '"Relation Name": "events_[0-9_]+"', 'g');
+
+    IF scanned > 2 OR plan_text LIKE '%events_default%' THEN
+        RAISE EXCEPTION 'FAILED: Query scanned % partitions: %', scanned, plan_text;
+    END IF;
+    RAISE NOTICE 'PASSED: Bounded household query scans % partition(s)', scanned;
+END $$;
+
+-- ============================================================================
+-- Summary
+-- ============================================================================
+
+SELECT
+    'Events partitioning verification complete!' as status,
+    'All tests passed' as result;
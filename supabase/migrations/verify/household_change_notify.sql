@@ -0,0 +1,35 @@
+-- Verification Script: Household Change Notifications
+-- Purpose: Verify the notify_household_change triggers are installed on every
+--          household table the API caches or streams
+-- Run this after applying 20260122140000_create_household_change_notify.sql
+-- (tests/household_change_notify.sql exercises the notifications themselves)
+
+BEGIN;
+
+DO $$
+DECLARE
+    v_table TEXT;
+    v_count INT;
+BEGIN
+    IF to_regprocedure('notify_household_change()') IS NULL THEN
+        RAISE EXCEPTION 'FAILED: notify_household_change() missing';
+    END IF;
+
+    FOREACH v_table IN ARRAY ARRAY['households', 'items', 'inventory', 'restock_list', 'household_members', 'invitations'] LOOP
+        SELECT COUNT(*) INTO v_count
+        FROM pg_trigger t
+        JOIN pg_proc p ON p.oid = t.tgfoid
+        WHERE t.tgrelid = v_table::regclass
+          AND p.proname = 'notify_household_change'
+          AND NOT t.tgisinternal;
+
+        -- households: UPDATE and DELETE only
+        IF v_count <> CASE WHEN v_table = 'households' THEN 2 ELSE 3 END THEN
+            RAISE EXCEPTION 'FAILED: wrong number of notify triggers on % (found %)', v_table, v_count;
+        END IF;
+    END LOOP;
+
+    RAISE NOTICE 'PASSED: notify triggers installed on all household tables';
+END $$;
+
+ROLLBACK;
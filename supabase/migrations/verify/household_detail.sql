@@ -0,0 +1,74 @@
+-- Verification Script: Household Detail Function
+-- Purpose: Verify get_household_detail returns the household, members and
+--          counts for members only, and that summary mode omits members
+-- Run this after applying 20260122120000_create_household_detail_function.sql
+
+BEGIN;
+
+-- ============================================================================
+-- 1. Verify Function Exists And Is Locked Down
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF to_regprocedure('get_household_detail(uuid, uuid, boolean)') IS NULL THEN
+        RAISE EXCEPTION 'FAILED: get_household_detail(uuid, uuid, boolean) missing';
+    END IF;
+
+    IF has_function_privilege('anon', 'get_household_detail(uuid, uuid, boolean)', 'EXECUTE') THEN
+        RAISE EXCEPTION 'FAILED: anon can execute get_household_detail';
+    END IF;
+
+    RAISE NOTICE 'PASSED: get_household_detail exists and anon cannot execute it';
+END $$;
+
+-- ============================================================================
+-- 2. Verify Detail, Summary And Authorization
+-- ============================================================================
+
+DO $$
+DECLARE
+    admin_id UUID := 'd0000000-0000-0000-0000-000000000001'::UUID;
+    member_id UUID := 'd0000000-0000-0000-0000-000000000002'::UUID;
+    outsider_id UUID := 'd0000000-0000-0000-0000-000000000003'::UUID;
+    v_household_id UUID;
+    v_detail JSONB;
+BEGIN
+    INSERT INTO auth.users (id, email) VALUES
+        (admin_id, 'detail-admin@test.com'),
+        (member_id, 'detail-member@test.com'),
+        (outsider_id, 'detail-outsider@test.com');
+
+    INSERT INTO households (name) VALUES ('Detail Test') RETURNING id INTO v_household_id;
+    INSERT INTO household_members (household_id, user_id, role) VALUES
+        (v_household_id, admin_id, 'admin'),
+        (v_household_id, member_id, 'member');
+
+    -- Full detail for a member
+    v_detail := get_household_detail(v_household_id, member_id);
+    IF v_detail->>'name' <> 'Detail Test'
+       OR (v_detail->>'member_count')::INT <> 2
+       OR (v_detail->>'admin_count')::INT <> 1
+       OR jsonb_array_length(v_detail->'members') <> 2 THEN
+        RAISE EXCEPTION 'FAILED: unexpected detail %', v_detail;
+    END IF;
+    RAISE NOTICE 'PASSED: detail includes household, members and counts';
+
+    -- Summary mode
+    v_detail := get_household_detail(v_household_id, admin_id, TRUE);
+    IF v_detail ? 'members' OR (v_detail->>'member_count')::INT <> 2 THEN
+        RAISE EXCEPTION 'FAILED: unexpected summary %', v_detail;
+    END IF;
+    RAISE NOTICE 'PASSED: summary mode returns counts only';
+
+    -- Non-members and unknown households get NULL
+    IF get_household_detail(v_household_id, outsider_id) IS NOT NULL THEN
+        RAISE EXCEPTION 'FAILED: non-member received household detail';
+    END IF;
+    IF get_household_detail(gen_random_uuid(), admin_id) IS NOT NULL THEN
+        RAISE EXCEPTION 'FAILED: unknown household returned detail';
+    END IF;
+    RAISE NOTICE 'PASSED: non-members and unknown households get NULL';
+END $$;
+
+ROLLBACK;
@@ -0,0 +1,103 @@
+-- Verification Script: User Households Function
+-- Purpose: Verify get_user_households returns only the user's households with
+--          their role, and that stats count inventory states and restock entries
+-- Run this after applying 20260122130000_create_user_households_function.sql
+
+BEGIN;
+
+-- ============================================================================
+-- 1. Verify Function Exists And Is Locked Down
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF to_regprocedure('get_user_households(uuid, boolean)') IS NULL THEN
+        RAISE EXCEPTION 'FAILED: get_user_households(uuid, boolean) missing';
+    END IF;
+
+    IF has_function_privilege('anon', 'get_user_households(uuid, boolean)', 'EXECUTE') THEN
+        RAISE EXCEPTION 'FAILED: anon can execute get_user_households';
+    END IF;
+
+    RAISE NOTICE 'PASSED: get_user_households exists and anon cannot execute it';
+END $$;
+
+-- ============================================================================
+-- 2. Verify Households, Roles And Stats
+-- ============================================================================
+
+DO $$
+DECLARE
+    user_a UUID := 'e0000000-0000-0000-0000-000000000001'::UUID;
+    user_b UUID := 'e0000000-0000-0000-0000-000000000002'::UUID;
+    household_a UUID;
+    household_b UUID;
+    item_1 UUID;
+    item_2 UUID;
+    item_3 UUID;
+    v_row RECORD;
+    v_count INT;
+BEGIN
+    INSERT INTO auth.users (id, email) VALUES
+        (user_a, 'stats-a@test.com'),
+        (user_b, 'stats-b@test.com');
+
+    INSERT INTO households (name) VALUES ('Stats A') RETURNING id INTO household_a;
+    INSERT INTO households (name) VALUES ('Stats B') RETURNING id INTO household_b;
+    INSERT INTO household_members (household_id, user_id, role) VALUES
+        (household_a, user_a, 'admin'),
+        (household_b, user_a, 'member'),
+        (household_b, user_b, 'admin');
+
+    INSERT INTO items (household_id, name, category, location)
+        VALUES (household_a, 'Milk', 'dairy', 'fridge') RETURNING id INTO item_1;
+    INSERT INTO items (household_id, name, category, location)
+        VALUES (household_a, 'Eggs', 'dairy', 'fridge') RETURNING id INTO item_2;
+    INSERT INTO items (household_id, name, category, location)
+        VALUES (household_a, 'Bread', 'bakery', 'pantry') RETURNING id INTO item_3;
+    INSERT INTO inventory (household_id, item_id, state) VALUES
+        (household_a, item_1, 'low'),
+        (household_a, item_2, 'low'),
+        (household_a, item_3, 'out');
+    INSERT INTO restock_list (household_id, item_id, urgency, reason, dismissed_until) VALUES
+        (household_a, item_3, 'need_now', 'Currently out', NULL),
+        (household_a, item_1, 'need_soon', 'Running low', NOW() + INTERVAL '3 days');
+
+    -- Without stats: both households, roles, no stats
+    SELECT COUNT(*) INTO v_count FROM get_user_households(user_a) g WHERE g.stats IS NULL;
+    IF v_count <> 2 THEN
+        RAISE EXCEPTION 'FAILED: expected 2 households without stats, got %', v_count;
+    END IF;
+    SELECT * INTO v_row FROM get_user_households(user_a) g WHERE g.id = household_b;
+    IF v_row.role <> 'member' THEN
+        RAISE EXCEPTION 'FAILED: expected member role, got %', v_row.role;
+    END IF;
+    RAISE NOTICE 'PASSED: households listed with role';
+
+    -- With stats
+    SELECT * INTO v_row FROM get_user_households(user_a, TRUE) g WHERE g.id = household_a;
+    IF (v_row.stats->>'item_count')::INT <> 3
+       OR (v_row.stats->'states'->>'low')::INT <> 2
+       OR (v_row.stats->'states'->>'out')::INT <> 1
+       OR (v_row.stats->'states'->>'plenty')::INT <> 0
+       OR (v_row.stats->'restock'->>'need_now')::INT <> 1
+       OR (v_row.stats->'restock'->>'need_soon')::INT <> 0 THEN
+        RAISE EXCEPTION 'FAILED: unexpected stats %', v_row.stats;
+    END IF;
+    RAISE NOTICE 'PASSED: stats count states and active restock entries';
+
+    SELECT * INTO v_row FROM get_user_households(user_a, TRUE) g WHERE g.id = household_b;
+    IF (v_row.stats->>'item_count')::INT <> 0 THEN
+        RAISE EXCEPTION 'FAILED: empty household should have zero items, got %', v_row.stats;
+    END IF;
+    RAISE NOTICE 'PASSED: empty households get zero counts';
+
+    -- Isolation: user_b only sees household_b
+    SELECT COUNT(*) INTO v_count FROM get_user_households(user_b, TRUE);
+    IF v_count <> 1 THEN
+        RAISE EXCEPTION 'FAILED: user_b should see 1 household, got %', v_count;
+    END IF;
+    RAISE NOTICE 'PASSED: users only see their own households';
+END $$;
+
+ROLLBACK;